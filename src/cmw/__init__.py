@@ -22,9 +22,14 @@ from .graph_visualizer import GraphVisualizer
 from .prompt_template import PromptTemplate
 from .static_analyzer import StaticAnalyzer
 from .interactive_fixer import InteractiveFixer
-from .response_parser import ResponseParser
+from .response_parser import ResponseParser, ResponseEvent
 from .dependency_analyzer import DependencyAnalyzer
 from .smart_prompt_generator import SmartPromptGenerator
+from .task_id import TaskIdScheme
+from .lease import Lease, LeaseError, LeaseManager
+from .task_loop import TaskLoop
+from .scheduler import WorkStealingScheduler
+from .worker_pool import WorkerPool
 
 __all__ = [
     "Task",
@@ -52,6 +57,14 @@ __all__ = [
     "StaticAnalyzer",
     "InteractiveFixer",
     "ResponseParser",
+    "ResponseEvent",
     "DependencyAnalyzer",
     "SmartPromptGenerator",
+    "TaskIdScheme",
+    "Lease",
+    "LeaseError",
+    "LeaseManager",
+    "TaskLoop",
+    "WorkStealingScheduler",
+    "WorkerPool",
 ]
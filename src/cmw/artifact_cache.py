@@ -0,0 +1,290 @@
+"""
+成果物のコンテンツアドレス型キャッシュ
+
+成果物から取り出したコンテキストの断片（全文・シグネチャの行・先頭部分）を
+内容のハッシュをキーに shared/coordination/cache に保存します。パスごとに
+mtime とサイズを記録し、変わっていないファイルは読み込まずに断片を再利用します。
+"""
+
+import codecs
+import hashlib
+import json
+import os
+import re
+import threading
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+# キャッシュの形式（変更時は既存の断片を作り直す）
+CACHE_VERSION = 1
+
+# ファイルを読み込む単位
+CHUNK_SIZE = 64 * 1024
+
+# バイナリ判定に使う先頭のバイト数
+BINARY_SNIFF_SIZE = 8 * 1024
+
+# シグネチャの判定に使う行の先頭のバイト数（長い行の残りは保持しない）
+MAX_LINE_BYTES = 4 * 1024
+
+# シグネチャとみなす行（Python / JS・TS / Go / Rust の定義とデコレータ）
+SIGNATURE_PATTERN = re.compile(
+    rb"^\s*(?:@[\w.]+"
+    rb"|(?:export\s+)?(?:default\s+)?(?:async\s+)?(?:def|class|function|interface|type|enum)\b"
+    rb"|(?:pub(?:\([\w\s]*\))?\s+)?(?:fn|struct|trait|impl|mod)\b"
+    rb"|func\b)"
+)
+
+
+@dataclass
+class Fragment:
+    """
+    成果物から取り出したコンテキストの断片
+
+    Attributes:
+        digest: 内容のハッシュ（SHA-256）
+        binary: バイナリか（NULバイトを含む、またはUTF-8でない）
+        text: 全文（max_bytes 以下の場合のみ）
+        outline: シグネチャの行（max_bytes まで）
+        head: 先頭部分（max_bytes まで）
+    """
+
+    digest: str
+    binary: bool
+    text: Optional[str]
+    outline: str
+    head: str
+
+
+def extract_fragment(path: Path, max_bytes: int, chunk_size: int = CHUNK_SIZE) -> Fragment:
+    """
+    ファイルを一定サイズずつ1回だけ読み込み、ハッシュと断片を同時に求める
+
+    Args:
+        path: ファイルのパス
+        max_bytes: 全文・シグネチャ・先頭部分として保持する上限（バイト）
+        chunk_size: 読み込む単位（バイト）
+
+    Returns:
+        Fragment
+    """
+    hasher = hashlib.sha256()
+    decoder = codecs.getincrementaldecoder("utf-8")()
+    binary = False
+    head = bytearray()
+    outline = bytearray()
+    outline_full = False
+    line = bytearray()
+    line_overflow = False
+    total = 0
+
+    def add_line(data: bytes) -> None:
+        nonlocal outline_full
+        if outline_full or not SIGNATURE_PATTERN.match(data):
+            return
+        if len(outline) + len(data) > max_bytes:
+            outline_full = True
+        else:
+            outline.extend(data)
+
+    with open(path, "rb") as f:
+        while True:
+            chunk = f.read(chunk_size)
+            if not chunk:
+                break
+            hasher.update(chunk)
+            if binary:
+                continue
+
+            if total < BINARY_SNIFF_SIZE and b"\0" in chunk[: BINARY_SNIFF_SIZE - total]:
+                binary = True
+                continue
+            try:
+                decoder.decode(chunk)
+            except UnicodeDecodeError:
+                binary = True
+                continue
+
+            if len(head) <= max_bytes:
+                head.extend(chunk[: max_bytes + 1 - len(head)])
+            total += len(chunk)
+
+            # 行単位でシグネチャを集める（チャンクをまたぐ行は持ち越す）
+            start = 0
+            while True:
+                end = chunk.find(b"\n", start)
+                if end < 0:
+                    break
+                if not line_overflow:
+                    line.extend(chunk[start : end + 1])
+                    add_line(bytes(line))
+                line.clear()
+                line_overflow = False
+                start = end + 1
+            if not line_overflow:
+                line.extend(chunk[start:])
+                if len(line) > MAX_LINE_BYTES:
+                    # 長すぎる行は先頭だけで判定し、残りは読み捨てる
+                    add_line(bytes(line[:MAX_LINE_BYTES]) + b"\n")
+                    line.clear()
+                    line_overflow = True
+
+    if not binary:
+        try:
+            decoder.decode(b"", final=True)
+        except UnicodeDecodeError:
+            binary = True
+    if line and not line_overflow and not binary:
+        add_line(bytes(line))
+
+    if binary:
+        return Fragment(hasher.hexdigest(), True, None, "", "")
+
+    text = bytes(head).decode("utf-8") if len(head) <= max_bytes else None
+    return Fragment(
+        digest=hasher.hexdigest(),
+        binary=False,
+        text=text,
+        outline=bytes(outline).decode("utf-8", "replace"),
+        head=bytes(head[:max_bytes]).decode("utf-8", "ignore"),
+    )
+
+
+class ArtifactCache:
+    """
+    成果物の断片のキャッシュ
+
+    断片は内容のハッシュごとに1つだけ保存されるため、同じ内容のファイルや
+    多数のタスクから参照される成果物も読み込みは1回です。
+
+    Attributes:
+        reads: 実際にファイルを読み込んだ回数
+    """
+
+    def __init__(
+        self, cache_dir: Optional[Path], max_bytes: int, chunk_size: int = CHUNK_SIZE
+    ) -> None:
+        """
+        Args:
+            cache_dir: キャッシュディレクトリ（None の場合はメモリ上のみ）
+            max_bytes: 断片として保持する上限（バイト）
+            chunk_size: ファイルを読み込む単位（バイト）
+        """
+        self.cache_dir = Path(cache_dir) if cache_dir is not None else None
+        self.max_bytes = max_bytes
+        self.chunk_size = chunk_size
+        self.reads = 0
+        # パス -> (mtime_ns, サイズ, ハッシュ)
+        self._paths: Optional[Dict[str, Tuple[int, int, str]]] = None
+        # ハッシュ -> 断片
+        self._fragments: Dict[str, Fragment] = {}
+        self._dirty = False
+        self._lock = threading.Lock()
+
+    @property
+    def index_file(self) -> Optional[Path]:
+        """パス -> ハッシュの対応を保存するファイル"""
+        return self.cache_dir / "index.json" if self.cache_dir is not None else None
+
+    def get(self, key: str, path: Path, mtime_ns: int, size: int) -> Fragment:
+        """
+        ファイルの断片を取得（mtime・サイズが変わっていなければ読み込まない）
+
+        Args:
+            key: インデックスのキー（成果物ディレクトリからの相対パス）
+            path: ファイルのパス
+            mtime_ns: 最終更新時刻
+            size: ファイルサイズ
+
+        Returns:
+            Fragment
+        """
+        with self._lock:
+            paths = self._load_index()
+            entry = paths.get(key)
+            if entry and entry[0] == mtime_ns and entry[1] == size:
+                fragment = self._fragments.get(entry[2]) or self._read_fragment(entry[2])
+                if fragment is not None:
+                    self._fragments[fragment.digest] = fragment
+                    return fragment
+
+            fragment = extract_fragment(path, self.max_bytes, self.chunk_size)
+            self.reads += 1
+            if fragment.digest not in self._fragments:
+                self._fragments[fragment.digest] = fragment
+                self._write_fragment(fragment)
+            paths[key] = (mtime_ns, size, fragment.digest)
+            self._dirty = True
+            return self._fragments[fragment.digest]
+
+    def save(self) -> None:
+        """パス -> ハッシュの対応を保存（変更がない場合は何もしない）"""
+        with self._lock:
+            if not self._dirty or self.index_file is None or self._paths is None:
+                return
+            data = {
+                "version": CACHE_VERSION,
+                "max_bytes": self.max_bytes,
+                "paths": {key: list(entry) for key, entry in self._paths.items()},
+            }
+            _write_json(self.index_file, data)
+            self._dirty = False
+
+    def _load_index(self) -> Dict[str, Tuple[int, int, str]]:
+        """保存済みのパス -> ハッシュの対応を読み込む（初回のみ）"""
+        if self._paths is None:
+            self._paths = {}
+            data = _read_json(self.index_file) if self.index_file is not None else None
+            if (
+                data
+                and data.get("version") == CACHE_VERSION
+                and data.get("max_bytes") == self.max_bytes
+            ):
+                for key, (mtime_ns, size, digest) in data.get("paths", {}).items():
+                    self._paths[key] = (mtime_ns, size, digest)
+        return self._paths
+
+    def _fragment_file(self, digest: str) -> Path:
+        assert self.cache_dir is not None
+        return self.cache_dir / digest[:2] / f"{digest}-{self.max_bytes}.json"
+
+    def _read_fragment(self, digest: str) -> Optional[Fragment]:
+        """保存済みの断片を読み込む（ない・壊れている場合はNone）"""
+        if self.cache_dir is None:
+            return None
+        data = _read_json(self._fragment_file(digest))
+        if not data or data.get("version") != CACHE_VERSION:
+            return None
+        try:
+            return Fragment(**data["fragment"])
+        except (KeyError, TypeError):
+            return None
+
+    def _write_fragment(self, fragment: Fragment) -> None:
+        if self.cache_dir is not None:
+            _write_json(
+                self._fragment_file(fragment.digest),
+                {"version": CACHE_VERSION, "fragment": asdict(fragment)},
+            )
+
+
+def _read_json(path: Path) -> Optional[Dict]:
+    """JSONファイルを読み込む（ない・壊れている場合はNone）"""
+    try:
+        data = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, json.JSONDecodeError):
+        return None
+    return data if isinstance(data, dict) else None
+
+
+def _write_json(path: Path, data: Dict) -> None:
+    """JSONファイルを保存（一時ファイルへの書き込み後に置き換え、失敗しても処理は続行）"""
+    tmp_path = path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path.write_text(json.dumps(data, ensure_ascii=False), encoding="utf-8")
+        os.replace(tmp_path, path)
+    except OSError:
+        if tmp_path.exists():
+            tmp_path.unlink()
@@ -6,11 +6,12 @@ cmw コマンドの実装
 
 import json
 import click
+from datetime import datetime
 from pathlib import Path
-from typing import Optional, Dict
+from typing import Optional, Dict, List, Tuple
 
 from . import __version__
-from .models import TaskStatus, Task, Priority
+from .models import TaskStatus, Task, Priority, ExecutionResult
 from .coordinator import Coordinator
 from .requirements_parser import RequirementsParser
 from .conflict_detector import ConflictDetector
@@ -19,6 +20,8 @@ from .dashboard import Dashboard
 from .dependency_validator import DependencyValidator
 from .task_filter import TaskFilter
 from .git_integration import GitIntegration
+from .lease import DEFAULT_LEASE_TTL
+from .task_id import DEFAULT_TASK_ID_SCHEME, TaskIdScheme, load_task_id_scheme
 
 
 @click.group()
@@ -124,13 +127,35 @@ def tasks() -> None:
     "--output", "-o", default="shared/coordination/tasks.json", help="出力先のtasks.jsonパス"
 )
 @click.option("--force", "-f", is_flag=True, help="既存のtasks.jsonを上書き")
-def generate_tasks(requirements: str, output: str, force: bool) -> None:
+@click.option("--reduce", is_flag=True, help="推移的に冗長な依存関係を削除")
+@click.option(
+    "--static-deps",
+    type=click.Choice(["file", "symbol"]),
+    default=None,
+    help="既存コードの静的解析で依存関係を追加（粒度: file / symbol）",
+)
+@click.option("--id-prefix", default=None, help="タスクIDの接頭辞（例: API → API-001）")
+@click.option(
+    "--id-width", type=click.IntRange(min=1), default=None, help="タスクIDの連番の最小桁数"
+)
+def generate_tasks(
+    requirements: str,
+    output: str,
+    force: bool,
+    reduce: bool,
+    static_deps: Optional[str],
+    id_prefix: Optional[str],
+    id_width: Optional[int],
+) -> None:
     """requirements.mdからタスクを自動生成
 
     examples:
         cmw task generate
         cmw task generate -r docs/requirements.md
         cmw task generate --force
+        cmw task generate --reduce
+        cmw task generate --static-deps symbol
+        cmw task generate --id-prefix API --id-width 4
     """
     project_path = Path.cwd()
     requirements_path = project_path / requirements
@@ -143,8 +168,11 @@ def generate_tasks(requirements: str, output: str, force: bool) -> None:
         return
 
     try:
-        tasks = _parse_requirements(requirements_path, requirements)
-        _save_tasks_to_file(tasks, output_path, output)
+        id_scheme = _resolve_id_scheme(output_path, id_prefix, id_width)
+        tasks = _parse_requirements(requirements_path, requirements, reduce, id_scheme)
+        if static_deps:
+            tasks = _infer_static_dependencies(tasks, project_path, static_deps)
+        _save_tasks_to_file(tasks, output_path, output, id_scheme)
         _print_task_summary(tasks)
     except FileNotFoundError as e:
         click.echo(f"❌ エラー: {str(e)}", err=True)
@@ -181,18 +209,52 @@ def _confirm_overwrite(output_path: Path, output: str, force: bool) -> bool:
     return False
 
 
-def _parse_requirements(requirements_path: Path, requirements: str) -> list:
+def _resolve_id_scheme(
+    output_path: Path, id_prefix: Optional[str], id_width: Optional[int]
+) -> TaskIdScheme:
+    """タスクIDの形式を決定（オプション > 既存の tasks.json の "task_id" 設定 > デフォルト）"""
+    scheme = load_task_id_scheme(output_path)
+    return TaskIdScheme(
+        prefix=id_prefix if id_prefix is not None else scheme.prefix,
+        width=id_width if id_width is not None else scheme.width,
+    )
+
+
+def _parse_requirements(
+    requirements_path: Path,
+    requirements: str,
+    reduce: bool = False,
+    id_scheme: Optional[TaskIdScheme] = None,
+) -> list:
     """requirements.mdを解析してタスクを生成"""
     click.echo(f"\n📄 {requirements} を解析中...")
-    parser = RequirementsParser()
-    tasks = parser.parse(requirements_path)
+    parser = RequirementsParser(id_scheme)
+    tasks = parser.parse(requirements_path, reduce_dependencies=reduce)
     click.echo(f"✅ {len(tasks)} 個のタスクを生成しました\n")
     return tasks
 
 
-def _save_tasks_to_file(tasks: list, output_path: Path, output: str) -> None:
-    """タスクをJSONファイルに保存"""
-    tasks_data = {
+def _infer_static_dependencies(tasks: list, project_path: Path, granularity: str) -> list:
+    """既存コードの静的解析で依存関係を追加"""
+    from .static_analyzer import StaticAnalyzer
+
+    before = sum(len(task.dependencies) for task in tasks)
+    tasks = StaticAnalyzer(project_path).infer_task_dependencies(
+        tasks, existing_dependencies=True, granularity=granularity
+    )
+    added = sum(len(task.dependencies) for task in tasks) - before
+    click.echo(f"🔎 静的解析（{granularity}単位）で {added} 件の依存関係を追加しました\n")
+    return tasks
+
+
+def _save_tasks_to_file(
+    tasks: list, output_path: Path, output: str, id_scheme: Optional[TaskIdScheme] = None
+) -> None:
+    """タスクをJSONファイルに保存（デフォルト以外のタスクID形式は "task_id" に記録）"""
+    tasks_data: dict = {}
+    if id_scheme is not None and id_scheme != DEFAULT_TASK_ID_SCHEME:
+        tasks_data["task_id"] = id_scheme.to_dict()
+    tasks_data.update({
         "tasks": [
             {
                 "id": task.id,
@@ -207,7 +269,7 @@ def _save_tasks_to_file(tasks: list, output_path: Path, output: str) -> None:
             for task in tasks
         ],
         "workers": [],
-    }
+    })
 
     output_path.parent.mkdir(parents=True, exist_ok=True)
     output_path.write_text(json.dumps(tasks_data, ensure_ascii=False, indent=2), encoding="utf-8")
@@ -335,12 +397,19 @@ def show_task(task_id: str) -> None:
 
 @task.command("analyze")
 @click.option("--show-order", is_flag=True, help="推奨実行順序も表示")
-def analyze_conflicts(show_order: bool) -> None:
+@click.option(
+    "--granularity",
+    type=click.Choice(["file", "symbol"]),
+    default="file",
+    help="競合判定の粒度（symbol: target_filesの 'path::Symbol' 指定をシンボル単位で判定）",
+)
+def analyze_conflicts(show_order: bool, granularity: str) -> None:
     """タスク間のファイル競合を分析
 
     examples:
         cmw task analyze
         cmw task analyze --show-order
+        cmw task analyze --granularity symbol
     """
     project_path = Path.cwd()
     coordinator = Coordinator(project_path)
@@ -350,7 +419,7 @@ def analyze_conflicts(show_order: bool) -> None:
         return
 
     # ConflictDetectorで分析
-    detector = ConflictDetector()
+    detector = ConflictDetector(granularity=granularity)
     tasks_list = list(coordinator.tasks.values())
 
     # 競合レポートを生成
@@ -387,7 +456,19 @@ def analyze_conflicts(show_order: bool) -> None:
 @click.option(
     "--tasks-file", default="shared/coordination/tasks.json", help="検証するtasks.jsonのパス"
 )
-def validate_tasks(fix: bool, tasks_file: str) -> None:
+@click.option(
+    "--max-cycles", default=10, type=int, help="循環成分ごとに列挙する循環の上限"
+)
+@click.option("--reduce", is_flag=True, help="推移的に冗長な依存関係を削除")
+@click.option(
+    "--static-deps",
+    type=click.Choice(["file", "symbol"]),
+    default=None,
+    help="既存コードの静的解析で依存関係を追加してから検証（--fix で保存）",
+)
+def validate_tasks(
+    fix: bool, tasks_file: str, max_cycles: int, reduce: bool, static_deps: Optional[str]
+) -> None:
     """タスクの品質を検証
 
     循環依存、非タスク項目、依存関係の妥当性をチェックします。
@@ -395,6 +476,8 @@ def validate_tasks(fix: bool, tasks_file: str) -> None:
     examples:
         cmw task validate
         cmw task validate --fix
+        cmw task validate --reduce
+        cmw task validate --static-deps symbol --fix
     """
     from rich.console import Console
     from rich.panel import Panel
@@ -436,12 +519,21 @@ def validate_tasks(fix: bool, tasks_file: str) -> None:
 
     console.print(Panel.fit("🔍 タスクの品質を検証中...", border_style="blue"))
 
+    if static_deps:
+        tasks_list = _infer_static_dependencies(tasks_list, project_path, static_deps)
+        if fix:
+            _save_validated_tasks(tasks_path, tasks_data, tasks_list)
+
     # 1. 循環依存チェック
     console.print("\n[bold cyan]1. 循環依存チェック[/bold cyan]")
-    cycles = validator.detect_cycles(tasks_list)
+    components = validator.summarize_cycles(tasks_list, max_cycles_per_component=max_cycles)
+    cycles = [cycle for component in components for cycle in component["cycles"]]
 
     if cycles:
-        console.print(f"[yellow]⚠️  {len(cycles)}件の循環依存を検出しました:[/yellow]\n")
+        console.print(
+            f"[yellow]⚠️  {len(components)}個の循環成分で"
+            f"{len(cycles)}件の循環依存を検出しました:[/yellow]\n"
+        )
 
         for i, cycle in enumerate(cycles, 1):
             # cycleはエッジのリスト [(from, to), ...]
@@ -450,51 +542,29 @@ def validate_tasks(fix: bool, tasks_file: str) -> None:
             cycle_str = " → ".join(cycle_nodes) + f" → {cycle_nodes[0]}"
             console.print(f"  {i}. {cycle_str}")
 
+        truncated = [c for c in components if c["truncated"]]
+        if truncated:
+            console.print(
+                f"\n[dim]{len(truncated)}個の循環成分は上限({max_cycles}件)で列挙を打ち切りました"
+                f"（最大成分: {len(components[0]['tasks'])}タスク）[/dim]"
+            )
+
         if fix:
             console.print("\n[blue]🔧 自動修正を適用中...[/blue]")
-            suggestions = validator.suggest_fixes(cycles, tasks_list)
-
-            # 修正提案を表示
-            removed_deps = []
-            for suggestion in suggestions:
-                # suggestion['cycle']はエッジのリスト
-                cycle_edges = suggestion['cycle']
-                cycle_nodes = [edge[0] for edge in cycle_edges]
-                console.print(f"\n循環: {' ↔ '.join(cycle_nodes)}")
-                for fix_suggestion in suggestion["suggestions"][:1]:  # 最も信頼度の高い提案のみ
-                    console.print(
-                        f"  ✓ {fix_suggestion['from_task']} → {fix_suggestion['to_task']} を削除"
-                    )
-                    console.print(f"    理由: {fix_suggestion['reason']}")
-                    console.print(f"    信頼度: {fix_suggestion['confidence'] * 100:.0f}%")
-                    removed_deps.append(
-                        (fix_suggestion['from_task'], fix_suggestion['to_task'],
-                         fix_suggestion['reason'], fix_suggestion['confidence'])
-                    )
-
-            # 自動修正を適用
-            tasks_list = validator.auto_fix_cycles(tasks_list, cycles, auto_apply=True)
+            # 強連結成分ごとに最小のフィードバックアークセットを求めて一括適用
+            removed_deps = validator.find_feedback_arc_set(tasks_list, auto_apply=True)
+            for removal in removed_deps:
+                console.print(f"  ✓ {removal['from_task']} → {removal['to_task']} を削除")
+                console.print(f"    理由: {removal['reason']}")
+                console.print(f"    信頼度: {removal['confidence'] * 100:.0f}%")
+
+            tasks_list = validator.remove_dependencies(tasks_list, removed_deps)
 
             # tasks.jsonを更新（修正内容を保存）
-            tasks_data["tasks"] = [
-                {
-                    "id": task.id,
-                    "title": task.title,
-                    "description": task.description,
-                    "assigned_to": task.assigned_to,
-                    "dependencies": task.dependencies,
-                    "target_files": task.target_files,
-                    "acceptance_criteria": task.acceptance_criteria,
-                    "priority": task.priority,
-                }
-                for task in tasks_list
-            ]
-            tasks_path.write_text(
-                json.dumps(tasks_data, ensure_ascii=False, indent=2), encoding="utf-8"
-            )
+            _save_validated_tasks(tasks_path, tasks_data, tasks_list)
 
             # 残りの循環をチェック
-            remaining_cycles = validator.detect_cycles(tasks_list)
+            remaining_cycles = validator.detect_cycles(tasks_list, max_cycles)
 
             # 結果サマリー
             console.print("\n[bold cyan]修正結果:[/bold cyan]")
@@ -506,8 +576,10 @@ def validate_tasks(fix: bool, tasks_file: str) -> None:
                 console.print(
                     f"\n[yellow]⚠️  {len(remaining_cycles)}件の循環依存が残っています[/yellow]"
                 )
-                if len(remaining_cycles) < len(cycles):
-                    console.print("[blue]ヒント: もう一度 --fix を実行すると、さらに循環を解消できる可能性があります[/blue]")
+                console.print(
+                    "[blue]ヒント: 残りの循環は削除理由を特定できない依存関係を含みます。"
+                    "手動で確認してください[/blue]"
+                )
                 console.print(f"[green]💾 {tasks_file} を更新しました（一部修正を適用）[/green]")
             else:
                 console.print("\n[green]✅ 全ての循環依存を解決しました！[/green]")
@@ -534,22 +606,7 @@ def validate_tasks(fix: bool, tasks_file: str) -> None:
             tasks_list = implementation_tasks
 
             # tasks.jsonを更新
-            tasks_data["tasks"] = [
-                {
-                    "id": task.id,
-                    "title": task.title,
-                    "description": task.description,
-                    "assigned_to": task.assigned_to,
-                    "dependencies": task.dependencies,
-                    "target_files": task.target_files,
-                    "acceptance_criteria": task.acceptance_criteria,
-                    "priority": task.priority,
-                }
-                for task in tasks_list
-            ]
-            tasks_path.write_text(
-                json.dumps(tasks_data, ensure_ascii=False, indent=2), encoding="utf-8"
-            )
+            _save_validated_tasks(tasks_path, tasks_data, tasks_list)
             console.print(f"[green]✅ {len(non_tasks)}件の非タスク項目を除外しました[/green]")
             console.print(f"[green]💾 {tasks_file} を更新しました[/green]")
         else:
@@ -578,6 +635,22 @@ def validate_tasks(fix: bool, tasks_file: str) -> None:
     if not issues_found:
         console.print("[green]✅ 全ての依存関係が正しく設定されています[/green]")
 
+    # 4. 推移的に冗長な依存関係の削減
+    if reduce:
+        console.print("\n[bold cyan]4. 冗長な依存関係の削減[/bold cyan]")
+        total_deps = sum(len(task.dependencies) for task in tasks_list)
+        removed_edges = validator.transitive_reduction(tasks_list)
+
+        if removed_edges:
+            _save_validated_tasks(tasks_path, tasks_data, tasks_list)
+            console.print(
+                f"[green]✅ {len(removed_edges)}/{total_deps}件の冗長な依存関係を削除しました"
+                "（到達可能性は維持）[/green]"
+            )
+            console.print(f"[green]💾 {tasks_file} を更新しました[/green]")
+        else:
+            console.print("[green]✅ 冗長な依存関係はありません[/green]")
+
     # サマリー
     console.print("\n" + "=" * 80)
 
@@ -587,7 +660,7 @@ def validate_tasks(fix: bool, tasks_file: str) -> None:
     summary_table.add_column("詳細")
 
     # 循環依存（修正後の状態を反映）
-    current_cycles = validator.detect_cycles(tasks_list)
+    current_cycles = validator.detect_cycles(tasks_list, max_cycles)
     cycle_status = "✅ PASS" if not current_cycles else f"⚠️  {len(current_cycles)}件"
     cycle_detail = (
         "循環依存なし"
@@ -621,6 +694,24 @@ def validate_tasks(fix: bool, tasks_file: str) -> None:
         console.print("[green]🎉 全ての検証項目をパスしました！[/green]")
 
 
+def _save_validated_tasks(tasks_path: Path, tasks_data: dict, tasks_list: list) -> None:
+    """検証・修正したタスクを tasks.json に保存"""
+    tasks_data["tasks"] = [
+        {
+            "id": task.id,
+            "title": task.title,
+            "description": task.description,
+            "assigned_to": task.assigned_to,
+            "dependencies": task.dependencies,
+            "target_files": task.target_files,
+            "acceptance_criteria": task.acceptance_criteria,
+            "priority": task.priority,
+        }
+        for task in tasks_list
+    ]
+    tasks_path.write_text(json.dumps(tasks_data, ensure_ascii=False, indent=2), encoding="utf-8")
+
+
 @task.command("graph")
 @click.option(
     "--format",
@@ -709,16 +800,52 @@ def show_graph(format: str, stats: bool) -> None:
 
 
 @task.command("prompt")
-@click.argument("task_id")
+@click.argument("task_id", required=False)
 @click.option("--output", "-o", type=click.Path(), help="プロンプトをファイルに保存")
 @click.option("--review", is_flag=True, help="レビュー用プロンプトを生成")
-def generate_prompt(task_id: str, output: Optional[str], review: bool) -> None:
+@click.option(
+    "--wave",
+    is_flag=True,
+    help="次の並列実行ウェーブ（競合のない実行可能タスク）のプロンプトを一括生成",
+)
+@click.option("--ids", help="プロンプトを一括生成するタスクID（カンマ区切り）")
+@click.option(
+    "--out-dir",
+    default=".cmw_prompts",
+    show_default=True,
+    type=click.Path(),
+    help="一括生成したプロンプトの保存先ディレクトリ",
+)
+@click.option("--max-parallel", type=int, default=None, help="--wave で選ぶタスク数の上限")
+@click.option(
+    "--granularity",
+    type=click.Choice(["file", "symbol"]),
+    default="file",
+    help="--wave の競合判定の粒度（symbol: 'path::Symbol' 指定をシンボル単位で判定）",
+)
+@click.option(
+    "--threads", type=click.IntRange(min=1), default=None, help="一括生成に使うスレッド数"
+)
+def generate_prompt(
+    task_id: Optional[str],
+    output: Optional[str],
+    review: bool,
+    wave: bool,
+    ids: Optional[str],
+    out_dir: str,
+    max_parallel: Optional[int],
+    granularity: str,
+    threads: Optional[int],
+) -> None:
     """タスク実行用のプロンプトを生成
 
     examples:
         cmw task prompt TASK-001
         cmw task prompt TASK-001 --output prompt.md
         cmw task prompt TASK-001 --review
+        cmw task prompt --wave
+        cmw task prompt --wave --granularity symbol
+        cmw task prompt --ids TASK-001,TASK-002 --out-dir prompts
     """
     from rich.console import Console
     from rich.panel import Panel
@@ -727,6 +854,14 @@ def generate_prompt(task_id: str, output: Optional[str], review: bool) -> None:
 
     console = Console()
     project_path = Path.cwd()
+
+    if sum([bool(task_id), wave, bool(ids)]) != 1:
+        console.print("[red]❌ TASK_ID、--wave、--ids のいずれか1つを指定してください[/red]")
+        return
+
+    if (wave or ids) and (output or review):
+        raise click.UsageError("--output と --review は --wave / --ids と同時に指定できません")
+
     coordinator = Coordinator(project_path)
 
     if not coordinator.tasks:
@@ -735,6 +870,13 @@ def generate_prompt(task_id: str, output: Optional[str], review: bool) -> None:
         )
         return
 
+    if wave or ids:
+        _generate_prompt_batch(
+            coordinator, project_path, ids, Path(out_dir), max_parallel, threads, granularity
+        )
+        return
+
+    assert task_id is not None
     # タスクを取得
     task = coordinator.get_task(task_id)
     if not task:
@@ -777,34 +919,99 @@ def generate_prompt(task_id: str, output: Optional[str], review: bool) -> None:
     console.print(md)
 
 
+def _generate_prompt_batch(
+    coordinator: Coordinator,
+    project_path: Path,
+    ids: Optional[str],
+    out_dir: Path,
+    max_parallel: Optional[int],
+    threads: Optional[int],
+    granularity: str = "file",
+) -> None:
+    """ウェーブまたは指定タスクのスマートプロンプトを一括生成してファイルに保存"""
+    from .conflict_detector import ConflictDetector
+    from .smart_prompt_generator import SmartPromptGenerator
+
+    tasks_list = list(coordinator.tasks.values())
+
+    if ids:
+        task_ids = [t.strip() for t in ids.split(",") if t.strip()]
+        missing = [t for t in task_ids if t not in coordinator.tasks]
+        if missing:
+            click.echo(f"❌ エラー: タスクが見つかりません: {', '.join(missing)}", err=True)
+            return
+    else:
+        task_ids = ConflictDetector(granularity=granularity).get_safe_parallel_tasks(
+            tasks_list, max_parallel=max_parallel or len(tasks_list)
+        )
+        if not task_ids:
+            click.echo("実行可能なタスクがありません")
+            return
+
+    # タスクの読み込みと依存関係グラフの構築は1回のみ
+    generator = SmartPromptGenerator(tasks_list, project_path)
+    prompts = generator.generate_many(task_ids, max_workers=threads)
+
+    if not out_dir.is_absolute():
+        out_dir = project_path / out_dir
+    out_dir.mkdir(parents=True, exist_ok=True)
+
+    for tid, prompt in prompts.items():
+        (out_dir / f"{tid}.md").write_text(prompt, encoding="utf-8")
+
+    click.echo(f"✅ {len(prompts)}件のプロンプトを {out_dir} に保存しました")
+    for tid in prompts:
+        click.echo(f"  - {tid}: {coordinator.tasks[tid].title}")
+
+
 @task.command("complete")
-@click.argument("task_id")
+@click.argument("task_ids", nargs=-1, required=True)
 @click.option("--artifacts", "-a", help="生成されたファイル（JSON配列形式）")
 @click.option("--message", "-m", help="完了メッセージ")
-def complete_task(task_id: str, artifacts: Optional[str], message: Optional[str]) -> None:
+@click.option("--token", help="cmw task exec で取得したリースのトークン（再送しても1回だけ記録）")
+def complete_task(
+    task_ids: Tuple[str, ...],
+    artifacts: Optional[str],
+    message: Optional[str],
+    token: Optional[str],
+) -> None:
     """タスクを完了としてマーク
 
+    複数のタスクIDを指定した場合、progress.json はまとめて1回だけ保存されます。
+
     examples:
         cmw task complete TASK-001
+        cmw task complete TASK-001 TASK-002 TASK-003
         cmw task complete TASK-001 --artifacts '["file1.py", "file2.py"]'
         cmw task complete TASK-001 -m "実装完了"
+        cmw task complete TASK-001 --token 3f2a...
     """
     from rich.console import Console
 
+    from .lease import LeaseError, LeaseManager
+
     console = Console()
     project_path = Path.cwd()
     coordinator = Coordinator(project_path)
+    leases = LeaseManager(project_path)
 
-    # タスクの存在確認
-    task = coordinator.get_task(task_id)
-    if not task:
-        console.print(f"[red]❌ タスク {task_id} が見つかりません[/red]")
-        return
-
-    # すでに完了している場合
-    if task.status == TaskStatus.COMPLETED:
-        console.print(f"[yellow]⚠️  タスク {task_id} は既に完了しています[/yellow]")
-        return
+    if token is not None:
+        if len(task_ids) != 1:
+            console.print(
+                "[red]❌ エラー: --token を指定する場合はタスクIDを1つだけ指定してください[/red]"
+            )
+            return
+        holder = leases.get(task_ids[0])
+        try:
+            if holder is not None and holder.token != token:
+                raise LeaseError(f"他のセッション（{holder.owner}）が実行中です")
+            # トークンは progress.json への保存に成功してから消費する
+            if not leases.check(token, task_ids[0]):
+                console.print(f"[yellow]⚠️  タスク {task_ids[0]} の完了は記録済みです[/yellow]")
+                return
+        except LeaseError as e:
+            console.print(f"[red]❌ リースが無効です: {e}[/red]")
+            return
 
     # artifacts をパース
     artifacts_list = []
@@ -816,16 +1023,45 @@ def complete_task(task_id: str, artifacts: Optional[str], message: Optional[str]
             console.print('[dim]例: --artifacts \'["file1.py", "file2.py"]\'[/dim]')
             return
 
-    # タスクを完了マーク
+    # タスクの存在確認
+    completable = []
+    for task_id in task_ids:
+        task = coordinator.get_task(task_id)
+        if not task:
+            console.print(f"[red]❌ タスク {task_id} が見つかりません[/red]")
+        elif task.status == TaskStatus.COMPLETED:
+            # すでに完了している場合
+            console.print(f"[yellow]⚠️  タスク {task_id} は既に完了しています[/yellow]")
+        elif task_id not in completable:
+            completable.append(task_id)
+
+    if not completable:
+        return
+
+    # タスクを完了マーク（保存は1回）
     try:
-        coordinator.update_task_status(
-            task_id=task_id,
-            status=TaskStatus.COMPLETED,
+        coordinator.update_many(
+            completable,
+            TaskStatus.COMPLETED,
             artifacts=artifacts_list if artifacts_list else None,
         )
 
-        console.print(f"[green]✅ タスク {task_id} を完了としてマークしました[/green]")
-        console.print(f"[dim]{task.title}[/dim]")
+        if token is not None:
+            try:
+                leases.finish(token, "completed")
+            except LeaseError as e:
+                # 完了は記録済み（確認後にリースが回収された場合）
+                console.print(f"[yellow]⚠️  リースの解放に失敗しました: {e}[/yellow]")
+
+        # トークンなしで完了した場合も残っているリースは解放
+        for task_id in completable:
+            lease = leases.get(task_id)
+            if lease is not None:
+                leases.release(lease.token)
+
+        for task_id in completable:
+            console.print(f"[green]✅ タスク {task_id} を完了としてマークしました[/green]")
+            console.print(f"[dim]{coordinator.tasks[task_id].title}[/dim]")
 
         if artifacts_list:
             console.print("\n[cyan]生成されたファイル:[/cyan]")
@@ -839,11 +1075,187 @@ def complete_task(task_id: str, artifacts: Optional[str], message: Optional[str]
         console.print(f"[red]❌ エラー: {str(e)}[/red]")
 
 
+@task.command("heartbeat")
+@click.argument("token")
+@click.option("--ttl", type=float, default=None, help="延長する期間（秒、省略時は既定値）")
+def heartbeat_task(token: str, ttl: Optional[float]) -> None:
+    """実行中のタスクのリースを延長
+
+    cmw task exec で取得したリースは、期限までに延長しないと回収され、
+    他のセッションがタスクを実行できるようになります。
+
+    examples:
+        cmw task heartbeat 3f2a...
+    """
+    from .lease import LeaseError, LeaseManager
+
+    try:
+        lease = LeaseManager(Path.cwd()).renew(token, ttl)
+    except LeaseError as e:
+        click.echo(f"❌ エラー: {e}", err=True)
+        return
+
+    expires = datetime.fromtimestamp(lease.expires_at).strftime("%H:%M:%S")
+    click.echo(f"✅ {lease.task_id} のリースを {expires} まで延長しました")
+
+
+@task.command("reclaim")
+def reclaim_tasks() -> None:
+    """期限の切れたリースを回収し、実行中のままのタスクを実行待ちに戻す
+
+    クラッシュしたセッションが確保していたタスクを他のセッションが実行できるようにします。
+    cmw run は開始時とハートビートごとに自動で回収します。
+
+    examples:
+        cmw task reclaim
+    """
+    from .lease import LeaseError, LeaseManager
+
+    project_path = Path.cwd()
+    coordinator = Coordinator(project_path)
+    try:
+        expired = LeaseManager(project_path).reclaim_expired()
+    except LeaseError as e:
+        click.echo(f"❌ エラー: {e}", err=True)
+        return
+
+    requeued = []
+    with coordinator.batch():
+        for lease in expired:
+            task = coordinator.get_task(lease.task_id)
+            if task is not None and task.status == TaskStatus.IN_PROGRESS:
+                task.started_at = None
+                coordinator.update_task_status(task.id, TaskStatus.PENDING)
+                requeued.append(task.id)
+
+    if not expired:
+        click.echo("期限の切れたリースはありません")
+        return
+    for lease in expired:
+        state = "実行待ちに戻しました" if lease.task_id in requeued else "リースのみ回収しました"
+        click.echo(f"♻️  {lease.task_id}: {state}（所有者: {lease.owner}）")
+
+
+@task.command("track")
+@click.argument("transcript", default="-")
+@click.option(
+    "--task", "-t", "task_ids", multiple=True, required=True, help="対象タスクID（複数指定可）"
+)
+@click.option("--follow", "-f", is_flag=True, help="ファイルへの追記を読み続ける（tail -f）")
+@click.option(
+    "--idle-timeout",
+    type=float,
+    default=30.0,
+    show_default=True,
+    help="--follow 時、追記がないまま経過したら終了する秒数",
+)
+@click.option(
+    "--format",
+    "transcript_format",
+    type=click.Choice(["auto", "text", "jsonl"]),
+    default="auto",
+    show_default=True,
+    help="出力形式（jsonl: --output-format stream-json の出力）",
+)
+@click.option("--dry-run", is_flag=True, help="イベントの表示のみ行い、完了マークしない")
+def track_transcript(
+    transcript: str,
+    task_ids: Tuple[str, ...],
+    follow: bool,
+    idle_timeout: float,
+    transcript_format: str,
+    dry_run: bool,
+) -> None:
+    """Claude Codeのセッション出力を逐次解析し、終了時にタスクを完了マーク
+
+    TRANSCRIPT を省略するか "-" を指定すると標準入力から読み込みます。
+    出力全体をメモリに保持せず、成果物・完了・エラーを検出した時点で表示します。
+    JSON Lines 形式の場合、成果物は Write/Edit 等のツール呼び出しから取得します。
+
+    examples:
+        claude -p "..." | cmw task track -t TASK-001
+        claude -p "..." --output-format stream-json --verbose | cmw task track -t TASK-001
+        cmw task track session.log -t TASK-001 --follow
+    """
+    import sys
+    from rich.console import Console
+    from .response_parser import ResponseParser, follow_file, read_chunks
+
+    console = Console()
+    project_path = Path.cwd()
+    parser = ResponseParser(
+        load_task_id_scheme(project_path / "shared" / "coordination" / "tasks.json")
+    )
+
+    if transcript == "-":
+        chunks = read_chunks(sys.stdin.buffer)
+    elif not Path(transcript).exists():
+        console.print(f"[red]❌ エラー: {transcript} が見つかりません[/red]")
+        return
+    else:
+        # --follow なしの場合は末尾まで読んだら終了
+        chunks = follow_file(transcript, idle_timeout=idle_timeout if follow else 0)
+
+    artifacts: list = []
+    mentioned: list = []
+    is_completed = False
+
+    try:
+        events = parser.iter_transcript_events(chunks, format=transcript_format, root=project_path)
+        for event in events:
+            if event.kind == "artifact":
+                artifacts.append(event.value)
+                console.print(f"[cyan]📄 {event.value}[/cyan]")
+            elif event.kind == "task_id":
+                mentioned.append(event.value)
+                console.print(f"[dim]🔖 {event.value}[/dim]")
+            elif event.kind == "completion":
+                is_completed = True
+                console.print(f"[green]✓ 完了キーワード: {event.value}[/green]")
+            elif event.kind == "error":
+                console.print(f"[red]⚠️  {event.error_type}: {event.value}[/red]")
+    finally:
+        close = getattr(chunks, "close", None)
+        if close:
+            close()
+
+    if not is_completed:
+        console.print("\n[yellow]完了は検出されませんでした[/yellow]")
+        return
+
+    if dry_run:
+        console.print("\n[dim]--dry-run のため完了マークは行いません[/dim]")
+        return
+
+    result = {"artifacts": sorted(artifacts), "task_ids": mentioned, "is_completed": is_completed}
+    try:
+        marked = parser.mark_completed_from_result(result, list(task_ids), project_path)
+    except (OSError, ValueError, KeyError) as e:
+        console.print(f"\n[red]❌ 完了マークに失敗しました: {e}[/red]")
+        sys.exit(1)
+    if not marked:
+        console.print("\n[yellow]完了としてマークできるタスクはありませんでした[/yellow]")
+        return
+
+    for task_id in marked:
+        console.print(f"\n[green]✅ タスク {task_id} を完了としてマークしました[/green]")
+
+
 @cli.command()
 @click.option("--compact", is_flag=True, help="コンパクト表示")
-def status(compact: bool) -> None:
+@click.option("--watch", "-w", is_flag=True, help="ファイルの変更を監視して表示を更新し続ける")
+@click.option(
+    "--fps", type=float, default=4.0, show_default=True, help="--watch 時の1秒あたりの最大描画回数"
+)
+def status(compact: bool, watch: bool, fps: float) -> None:
     """プロジェクトの進捗状況を表示"""
     project_path = Path.cwd()
+
+    if watch:
+        # 監視モード: 起動時に1回読み込み、以降は変更の差分のみ反映
+        Dashboard().watch(project_path, max_fps=fps)
+        return
+
     coordinator = Coordinator(project_path)
 
     if not coordinator.tasks:
@@ -854,6 +1266,12 @@ def status(compact: bool) -> None:
     tracker = ProgressTracker(project_path)
     dashboard = Dashboard()
 
+    # 進捗の時系列に記録（前回から変化がない場合は追記しない）
+    try:
+        tracker.append_snapshot(tracker.aggregate(tasks_list))
+    except OSError:
+        pass
+
     if compact:
         # コンパクト表示
         dashboard.show_compact_summary(tracker, tasks_list)
@@ -871,13 +1289,35 @@ def status(compact: bool) -> None:
 )
 @click.option("--branch", default="HEAD", help="対象ブランチ（デフォルト: HEAD）")
 @click.option("--dry-run", is_flag=True, help="実際には更新せず、検出結果のみ表示")
-def sync(from_git: bool, since: str, branch: str, dry_run: bool) -> None:
+@click.option("--full", is_flag=True, help="前回同期した位置を無視して全コミットを再スキャン")
+@click.option(
+    "--match-files", is_flag=True, help="変更ファイルとtarget_filesを照合した結果を表示（更新なし）"
+)
+@click.option(
+    "--mark-files",
+    is_flag=True,
+    help="変更ファイルとtarget_filesの照合結果で完了・作業中をマーク（--match-filesを含む）",
+)
+def sync(
+    from_git: bool,
+    since: str,
+    branch: str,
+    dry_run: bool,
+    full: bool,
+    match_files: bool,
+    mark_files: bool,
+) -> None:
     """進捗を同期
 
+    2回目以降は前回同期したコミット以降のみを読み込みます。
+
     examples:
         cmw sync --from-git
         cmw sync --from-git --since=1.day.ago
         cmw sync --from-git --dry-run
+        cmw sync --from-git --full
+        cmw sync --from-git --match-files
+        cmw sync --from-git --mark-files
     """
     from rich.console import Console
     from rich.panel import Panel
@@ -893,7 +1333,7 @@ def sync(from_git: bool, since: str, branch: str, dry_run: bool) -> None:
         return
 
     try:
-        git = GitIntegration()
+        git = GitIntegration(Coordinator(project_path).id_scheme)
 
         console.print(
             Panel.fit(
@@ -903,22 +1343,33 @@ def sync(from_git: bool, since: str, branch: str, dry_run: bool) -> None:
         )
 
         if dry_run:
-            # Dry-runモード: 検出のみ
-            commits = git._get_commit_log(project_path, since, branch)
-            task_ids = git._extract_task_ids(commits)
+            # Dry-runモード: 検出のみ（git_sync.json / progress.json は更新しない）
+            result = git.sync_progress_from_git(
+                project_path,
+                since,
+                branch,
+                full=full,
+                match_files=match_files,
+                dry_run=True,
+                mark_files=mark_files,
+            )
+            task_ids = result["completed_tasks"]
 
             console.print(f"\n[cyan]📝 検出されたタスク ({len(task_ids)}件):[/cyan]")
-            for task_id in sorted(task_ids):
+            for task_id in task_ids:
                 console.print(f"  • {task_id}")
 
-            console.print(f"\n[cyan]📊 分析したコミット数:[/cyan] {len(commits)}")
+            console.print(f"\n[cyan]📊 分析したコミット数:[/cyan] {result['commits_analyzed']}")
+            console.print(f"[cyan]📊 更新対象のタスク数:[/cyan] {result['updated_count']}")
             console.print(
                 "\n[dim]ヒント: --dry-run なしで実行すると、これらのタスクが完了にマークされます[/dim]"
             )
             return
 
         # 実際に同期
-        result = git.sync_progress_from_git(project_path, since, branch)
+        result = git.sync_progress_from_git(
+            project_path, since, branch, full=full, match_files=match_files, mark_files=mark_files
+        )
 
         # 結果をテーブルで表示
         console.print("\n[bold green]✅ 同期完了[/bold green]\n")
@@ -931,6 +1382,11 @@ def sync(from_git: bool, since: str, branch: str, dry_run: bool) -> None:
         table.add_row("検出したタスク数", str(len(result["completed_tasks"])))
         table.add_row("更新したタスク数", str(result["updated_count"]))
         table.add_row("スキップしたタスク数", str(result["skipped_count"]))
+        if match_files or mark_files:
+            table.add_row(
+                "変更ファイルで完了と判定したタスク数", str(len(result["file_completed_tasks"]))
+            )
+            table.add_row("作業中と判定したタスク数", str(len(result["partial_tasks"])))
 
         console.print(table)
 
@@ -943,6 +1399,17 @@ def sync(from_git: bool, since: str, branch: str, dry_run: bool) -> None:
                     if task.status == TaskStatus.COMPLETED:
                         console.print(f"  ✓ {task_id}: {task.title}")
 
+        if result["file_completed_tasks"] and not mark_files:
+            console.print("\n[cyan]全ての target_files が変更済みのタスク:[/cyan]")
+            for task_id in result["file_completed_tasks"]:
+                console.print(f"  • {task_id}")
+            console.print("[dim]ヒント: --mark-files で完了としてマークできます[/dim]")
+
+        if result["partial_tasks"]:
+            console.print("\n[yellow]一部のファイルが変更済みのタスク:[/yellow]")
+            for task_id in result["partial_tasks"]:
+                console.print(f"  … {task_id}")
+
         # タスク参照の検証
         console.print("\n[cyan]🔍 タスク参照を検証中...[/cyan]")
         validation = git.validate_task_references(project_path)
@@ -971,6 +1438,152 @@ def sync(from_git: bool, since: str, branch: str, dry_run: bool) -> None:
         traceback.print_exc()
 
 
+@cli.command()
+@click.option(
+    "--workers", "-w", type=int, default=3, show_default=True, help="同時に実行するワーカー数"
+)
+@click.option(
+    "--command",
+    "worker_command",
+    help="ワーカーコマンド（プロンプトは標準入力に渡す。{task_id} / {prompt_file} を置換）。"
+    "省略時はスタブ（python -m cmw.stub_worker）",
+)
+@click.option("--timeout", type=float, default=None, help="1タスクあたりの制限時間（秒）")
+@click.option("--max-tasks", type=int, default=None, help="起動するタスク数の上限")
+@click.option(
+    "--require-completion",
+    is_flag=True,
+    help="トランスクリプトに完了の報告がないタスクも失敗とする",
+)
+@click.option(
+    "--watch",
+    is_flag=True,
+    help="他のプロセスによる progress.json / tasks.json の更新を取り込む",
+)
+@click.option(
+    "--git-sync",
+    type=float,
+    default=None,
+    metavar="SECONDS",
+    help="指定した間隔でコミットを確認し、参照されたタスクを完了にする",
+)
+@click.option("--dashboard", is_flag=True, help="実行中の進捗をダッシュボードで表示")
+@click.option(
+    "--no-steal",
+    is_flag=True,
+    help="tasks.json の workers ごとに担当（assigned_to）のタスクのみを実行する",
+)
+@click.option(
+    "--lease-ttl",
+    type=float,
+    default=DEFAULT_LEASE_TTL,
+    show_default=True,
+    help="実行中のタスクのリースの有効期間（秒、1/3の間隔で延長）",
+)
+def run(
+    workers: int,
+    worker_command: Optional[str],
+    timeout: Optional[float],
+    max_tasks: Optional[int],
+    require_completion: bool,
+    watch: bool,
+    git_sync: Optional[float],
+    dashboard: bool,
+    no_steal: bool,
+    lease_ttl: float,
+) -> None:
+    """ワーカーを並列に起動してタスクを実行
+
+    実行可能でファイル競合のないタスクを空きスロットの数だけ起動し、
+    終了コードとトランスクリプト（shared/coordination/runs/）から完了・失敗を記録します。
+    実行可能なタスクがなくなるまで、空いたスロットに次のタスクを割り当てます。
+
+    tasks.json に workers がある場合、各スロットは順にワーカーの担当（id / skills）を持ち、
+    担当のタスクを優先します。担当のタスクがないスロットは、スキルの重なる他の担当の
+    タスクを実行します（--no-steal で無効）。
+
+    examples:
+        cmw run --workers 4
+        cmw run -w 2 --command "claude -p --output-format stream-json --verbose"
+        cmw run --command "claude -p" --timeout 1800 --require-completion
+        cmw run --watch --git-sync 30 --dashboard
+    """
+    from .worker_pool import BackgroundJob, WorkerPool, parse_command
+
+    project_path = Path.cwd()
+
+    if workers < 1:
+        click.echo("❌ エラー: --workers は1以上を指定してください", err=True)
+        return
+    if lease_ttl <= 0:
+        click.echo("❌ エラー: --lease-ttl は0より大きい値を指定してください", err=True)
+        return
+
+    try:
+        command = parse_command(worker_command) if worker_command else None
+    except ValueError as e:
+        click.echo(f"❌ エラー: {e}", err=True)
+        return
+
+    if git_sync is not None and not (project_path / ".git").exists():
+        click.echo("❌ エラー: --git-sync にはGitリポジトリが必要です", err=True)
+        return
+
+    def report(event: str, task: Task, result: Optional[ExecutionResult]) -> None:
+        if event == "started":
+            click.echo(f"▶ {task.id}: {task.title}")
+        elif event == "completed" and result is not None:
+            click.echo(f"✅ {task.id} 完了 ({result.execution_time or 0:.1f}秒)")
+        elif result is not None:
+            click.echo(f"❌ {task.id} 失敗: {result.error}")
+
+    pool = WorkerPool(
+        project_path,
+        workers=workers,
+        command=command,
+        timeout=timeout,
+        require_completion=require_completion,
+        # ダッシュボード表示中は1行ずつの出力を抑止
+        reporter=None if dashboard else report,
+        steal=not no_steal,
+        lease_ttl=lease_ttl,
+    )
+    if not pool.coordinator.tasks:
+        click.echo("タスクが見つかりません。'cmw task generate' を実行してください。")
+        return
+
+    background: List[BackgroundJob] = []
+    if watch:
+        background.append(lambda loop: loop.watch())
+    if git_sync is not None:
+        interval = git_sync
+        background.append(lambda loop: loop.sync_git(interval))
+    if dashboard:
+        from .dashboard import Dashboard
+
+        background.append(Dashboard().follow)
+
+    try:
+        results = pool.run(max_tasks=max_tasks, background=background)
+    except KeyboardInterrupt:
+        click.echo("\n中断しました（実行中のタスクは実行待ちに戻しました）")
+        return
+
+    if not results:
+        click.echo("実行可能なタスクがありません")
+        return
+
+    completed = sum(1 for r in results if r.success)
+    pending = sum(1 for t in pool.coordinator.tasks.values() if t.status == TaskStatus.PENDING)
+    click.echo(f"\n完了: {completed}件 / 失敗: {len(results) - completed}件 / 未実行: {pending}件")
+    if pool.coordinator.workers and pool.scheduler.steals:
+        stolen = ", ".join(
+            f"{worker_id}: {count}件" for worker_id, count in sorted(pool.scheduler.steals.items())
+        )
+        click.echo(f"他の担当から実行: {stolen}")
+    click.echo(f"トランスクリプト: {pool.runs_dir}")
+
+
 @cli.group(name="requirements")
 def requirements() -> None:
     """Requirements.md管理コマンド"""
@@ -1225,9 +1838,31 @@ def critical_path(coordination: str) -> None:
 @task.command("exec")
 @click.argument("task_id")
 @click.option("--coordination", "-c", default="shared/coordination", help="coordinationディレクトリのパス")
-def exec_task(task_id: str, coordination: str) -> None:
-    """タスクを実行（スマートプロンプト表示）"""
+@click.option(
+    "--owner",
+    envvar="CMW_SESSION_ID",
+    default=None,
+    help="リースの所有者ID（省略時は環境変数 CMW_SESSION_ID、なければホスト名:親プロセスID）",
+)
+@click.option(
+    "--lease-ttl",
+    type=float,
+    default=DEFAULT_LEASE_TTL,
+    show_default=True,
+    help="リースの有効期間（秒）",
+)
+def exec_task(task_id: str, coordination: str, owner: Optional[str], lease_ttl: float) -> None:
+    """タスクを実行（スマートプロンプト表示）
+
+    タスクのリースを取得し、他のセッションが同じタスクを実行しないようにします。
+    リースは cmw task heartbeat で延長しない限り有効期間の経過後に回収されます。
+    """
+    import os
+    import socket
+
     from rich.console import Console
+
+    from .lease import LeaseManager
     from .smart_prompt_generator import SmartPromptGenerator
 
     console = Console()
@@ -1268,6 +1903,22 @@ def exec_task(task_id: str, coordination: str) -> None:
         console.print(f"[red]❌ エラー: タスク {task_id} が見つかりません[/red]")
         return
 
+    # リースを取得（他のセッションが実行中なら中止）
+    lease = None
+    if target_task.status != TaskStatus.COMPLETED:
+        leases = LeaseManager(project_path, ttl=lease_ttl)
+        lease = leases.acquire(task_id, owner or f"{socket.gethostname()}:{os.getppid()}")
+        if lease is None:
+            holder = leases.get(task_id)
+            holder_info = ""
+            if holder is not None:
+                expires = datetime.fromtimestamp(holder.expires_at).strftime("%H:%M:%S")
+                holder_info = f"（{holder.owner}、期限 {expires}）"
+            console.print(
+                f"[red]❌ エラー: タスク {task_id} は他のセッションが実行中です{holder_info}[/red]"
+            )
+            return
+
     # ステータスを in_progress に更新
     if target_task.status == TaskStatus.PENDING:
         target_task.status = TaskStatus.IN_PROGRESS
@@ -1299,6 +1950,12 @@ def exec_task(task_id: str, coordination: str) -> None:
     prompt_file.write_text(prompt, encoding="utf-8")
     console.print(f"\n[dim]プロンプトを {prompt_file} に保存しました[/dim]")
 
+    if lease is not None:
+        expires = datetime.fromtimestamp(lease.expires_at).strftime("%H:%M:%S")
+        console.print(f"[dim]リース: {lease.token}（期限 {expires}）[/dim]")
+        console.print(f"[dim]  延長: cmw task heartbeat {lease.token}[/dim]")
+        console.print(f"[dim]  完了: cmw task complete {task_id} --token {lease.token}[/dim]")
+
 
 # 後方互換性: task のすべてのコマンドを tasks にもコピー
 for name, cmd in task.commands.items():
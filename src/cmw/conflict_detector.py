@@ -9,6 +9,7 @@ from typing import List, Dict, Set, Any
 import networkx as nx
 
 from .models import Task, TaskStatus
+from .static_analyzer import split_symbol_target
 
 
 class ConflictType:
@@ -54,8 +55,16 @@ class Conflict:
 class ConflictDetector:
     """ファイル競合の検出と解決提案"""
 
-    def __init__(self) -> None:
-        pass
+    def __init__(self, granularity: str = "file") -> None:
+        """
+        Args:
+            granularity: "file"（ファイル単位）または "symbol"（シンボル単位）
+                シンボル単位では "backend/models.py::User" と "backend/models.py::Post"
+                のように別シンボルを編集するタスク同士は競合しません
+        """
+        if granularity not in ("file", "symbol"):
+            raise ValueError(f"Unknown granularity: {granularity}")
+        self.granularity = granularity
 
     def detect_conflicts(self, tasks: List[Task]) -> List[Conflict]:
         """
@@ -68,7 +77,7 @@ class ConflictDetector:
             競合情報のリスト
         """
         conflicts = []
-        file_to_tasks = self._group_by_file(tasks)
+        file_to_tasks = self._group_by_resource(tasks)
 
         for file, task_ids in file_to_tasks.items():
             if len(task_ids) > 1:
@@ -126,22 +135,13 @@ class ConflictDetector:
             並列実行可能なタスクIDのリスト
         """
         # 実行可能なタスク（依存関係が解決済み）を取得
-        ready_tasks = []
-        for task in tasks:
-            if task.status != TaskStatus.PENDING:
-                continue
-
-            # 依存関係チェック
-            if task.dependencies:
-                deps_met = all(
-                    any(t.id == dep_id and t.status == TaskStatus.COMPLETED for t in tasks)
-                    for dep_id in task.dependencies
-                )
-                if deps_met:
-                    ready_tasks.append(task)
-            else:
-                # 依存関係がない
-                ready_tasks.append(task)
+        completed = {t.id for t in tasks if t.status == TaskStatus.COMPLETED}
+        ready_tasks = [
+            task
+            for task in tasks
+            if task.status == TaskStatus.PENDING
+            and all(dep_id in completed for dep_id in task.dependencies)
+        ]
 
         if not ready_tasks:
             return []
@@ -149,10 +149,11 @@ class ConflictDetector:
         # ファイル競合をチェック
         parallel_tasks: List[str] = []
         used_files: Set[str] = set()
+        resources = self._get_task_resources(tasks)
 
         for task in ready_tasks:
             # このタスクのファイルが既に使用されているかチェック
-            task_files = set(task.target_files)
+            task_files = resources[task.id]
             if not (task_files & used_files):
                 # 競合なし
                 parallel_tasks.append(task.id)
@@ -206,17 +207,48 @@ class ConflictDetector:
 
         return file_usage
 
-    def _group_by_file(self, tasks: List[Task]) -> Dict[str, List[str]]:
-        """ファイルごとにタスクをグループ化"""
-        file_to_tasks: Dict[str, List[str]] = {}
+    def _get_task_resources(self, tasks: List[Task]) -> Dict[str, Set[str]]:
+        """タスクごとの競合判定リソースを取得
 
+        ファイル単位ではシンボル指定を取り除いたファイルパス、シンボル単位では
+        シンボル指定をそのまま使い、ファイル全体を編集するタスクには
+        そのファイル内で他タスクが指定した全シンボルを含めます。
+        """
+        if self.granularity == "file":
+            return {
+                task.id: {split_symbol_target(target)[0] for target in task.target_files}
+                for task in tasks
+            }
+
+        symbols_by_file: Dict[str, Set[str]] = {}
         for task in tasks:
-            for file in task.target_files:
-                if file not in file_to_tasks:
-                    file_to_tasks[file] = []
-                file_to_tasks[file].append(task.id)
+            for target in task.target_files:
+                file, symbol = split_symbol_target(target)
+                if symbol:
+                    symbols_by_file.setdefault(file, set()).add(target)
+
+        resources: Dict[str, Set[str]] = {}
+        for task in tasks:
+            task_resources: Set[str] = set()
+            for target in task.target_files:
+                file, symbol = split_symbol_target(target)
+                task_resources.add(target)
+                if symbol is None:
+                    task_resources.update(symbols_by_file.get(file, set()))
+            resources[task.id] = task_resources
+
+        return resources
+
+    def _group_by_resource(self, tasks: List[Task]) -> Dict[str, List[str]]:
+        """競合判定リソース（ファイルまたはシンボル）ごとにタスクをグループ化"""
+        resource_to_tasks: Dict[str, List[str]] = {}
+        resources = self._get_task_resources(tasks)
+
+        for task in tasks:
+            for resource in sorted(resources[task.id]):
+                resource_to_tasks.setdefault(resource, []).append(task.id)
 
-        return file_to_tasks
+        return resource_to_tasks
 
     def _determine_severity(self, task_ids: List[str], tasks: List[Task]) -> str:
         """競合の深刻度を判定"""
@@ -293,13 +325,14 @@ class ConflictDetector:
         """ファイル競合を考慮してタスクをフィルタリング"""
         selected: List[str] = []
         used_files: Set[str] = set()
+        resources = self._get_task_resources(list(tasks_by_id.values()))
 
         for task_id in task_ids:
             task = tasks_by_id.get(task_id)
             if not task:
                 continue
 
-            task_files = set(task.target_files)
+            task_files = resources[task_id]
 
             # ファイル競合チェック
             if not (task_files & used_files):
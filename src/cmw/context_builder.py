@@ -0,0 +1,247 @@
+"""
+タスクのコンテキスト構築
+
+対象ファイルと依存タスクの成果物を優先度順に並べ、予算の範囲で読み込みます。
+予算を超える大きなファイルはシグネチャの一覧に要約し、バイナリは読み込みません。
+ファイルの断片は ArtifactCache で内容ごとにキャッシュされます。
+"""
+
+import stat
+from collections import deque
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Mapping, Optional, Tuple
+
+from .artifact_cache import CHUNK_SIZE, ArtifactCache
+from .models import Task, TaskStatus
+from .static_analyzer import StaticAnalyzer, split_symbol_target
+
+# トークン数からバイト数への換算（英語・コードで1トークン ≒ 4バイト）
+BYTES_PER_TOKEN = 4
+
+# コンテキスト全体とファイル1つあたりの予算（トークン）
+DEFAULT_MAX_TOKENS = 50_000
+DEFAULT_MAX_FILE_TOKENS = 8_000
+
+# 成果物を集める依存関係の深さ（1 = 直接の依存のみ）
+DEPENDENCY_DEPTH = 2
+
+# 対象ファイルからインポートをたどる深さ
+IMPORT_DEPTH = 3
+
+@dataclass
+class ContextSource:
+    """
+    コンテキストの候補となるファイル
+
+    Attributes:
+        path: 成果物ディレクトリからの相対パス
+        kind: "target"（タスクの対象ファイル）または "dependency"（依存タスクの成果物）
+        task_id: 成果物を生成したタスクID（対象ファイルの場合はNone）
+        depth: 依存関係の深さ（対象ファイルは0、直接の依存は1）
+        import_distance: 対象ファイルからのインポートの距離（到達しない場合はNone）
+        mtime_ns: 最終更新時刻
+        size: ファイルサイズ（バイト）
+    """
+
+    path: str
+    kind: str
+    task_id: Optional[str]
+    depth: int
+    import_distance: Optional[int]
+    mtime_ns: int
+    size: int
+
+    def rank(self) -> Tuple[int, int, int]:
+        """並び順（依存関係の近さ → インポートの近さ → 新しさ）"""
+        distance = self.import_distance if self.import_distance is not None else IMPORT_DEPTH + 1
+        return (self.depth, distance, -self.mtime_ns)
+
+
+class ContextBuilder:
+    """予算付きでタスクのコンテキストを構築"""
+
+    def __init__(
+        self,
+        artifacts_dir: Path,
+        max_tokens: int = DEFAULT_MAX_TOKENS,
+        max_file_tokens: int = DEFAULT_MAX_FILE_TOKENS,
+        chunk_size: int = CHUNK_SIZE,
+        cache_dir: Optional[Path] = None,
+    ) -> None:
+        """
+        Args:
+            artifacts_dir: 成果物ディレクトリ（shared/artifacts）
+            max_tokens: コンテキスト全体の予算（トークン）
+            max_file_tokens: ファイル1つあたりの予算（トークン）
+            chunk_size: ファイルを読み込む単位（バイト）
+            cache_dir: 断片のキャッシュディレクトリ（None の場合はメモリ上のみ）
+        """
+        self.artifacts_dir = Path(artifacts_dir)
+        self.max_bytes = max_tokens * BYTES_PER_TOKEN
+        self.max_file_bytes = max_file_tokens * BYTES_PER_TOKEN
+        self.cache = ArtifactCache(cache_dir, self.max_file_bytes, chunk_size)
+        self.analyzer = StaticAnalyzer(self.artifacts_dir)
+
+    def build(self, task: Task, tasks: Mapping[str, Task]) -> Dict:
+        """
+        タスクのコンテキストを構築
+
+        Args:
+            task: 対象タスク
+            tasks: タスクID -> タスク
+
+        Returns:
+            related_files（対象ファイル）、dependencies_artifacts（依存タスクの成果物）、
+            budget（予算と使用量、読み込まなかったファイル）を含む辞書
+        """
+        related: List[Dict] = []
+        artifacts: List[Dict] = []
+        skipped: List[Dict] = []
+        remaining = self.max_bytes
+
+        for source in self.collect(task, tasks):
+            if remaining <= 0:
+                skipped.append({"path": source.path, "reason": "budget"})
+                continue
+
+            fragment = self._extract(source, min(self.max_file_bytes, remaining))
+            if fragment is None:
+                skipped.append({"path": source.path, "reason": "binary"})
+                continue
+
+            content, mode, used = fragment
+            remaining -= used
+            entry = {"path": source.path, "content": content, "mode": mode, "size": source.size}
+            if source.kind == "target":
+                related.append(entry)
+            else:
+                artifacts.append({"task_id": source.task_id, **entry})
+
+        self.cache.save()
+
+        return {
+            "related_files": related,
+            "dependencies_artifacts": artifacts,
+            "budget": {
+                "max_bytes": self.max_bytes,
+                "used_bytes": self.max_bytes - remaining,
+                "skipped": skipped,
+            },
+        }
+
+    def collect(self, task: Task, tasks: Mapping[str, Task]) -> List[ContextSource]:
+        """
+        コンテキストの候補を優先度順に列挙（ファイルは読み込まない）
+
+        対象ファイルを先頭に、依存タスクの成果物を依存関係の近さ、
+        対象ファイルからのインポートの近さ、新しさの順に並べます。
+        """
+        targets: List[ContextSource] = []
+        seen = set()
+        for target in task.target_files:
+            path, _ = split_symbol_target(target)
+            source = self._source(path, "target", None, 0)
+            if source and path not in seen:
+                seen.add(path)
+                targets.append(source)
+
+        dependencies: List[ContextSource] = []
+        for dep_task, depth in self._completed_dependencies(task, tasks):
+            for path in dep_task.artifacts:
+                source = self._source(path, "dependency", dep_task.id, depth)
+                if source and path not in seen:
+                    seen.add(path)
+                    dependencies.append(source)
+
+        if dependencies and targets:
+            distances = self._import_distances([t.path for t in targets])
+            for source in dependencies:
+                source.import_distance = distances.get(source.path)
+
+        return targets + sorted(dependencies, key=ContextSource.rank)
+
+    def _source(
+        self, path: str, kind: str, task_id: Optional[str], depth: int
+    ) -> Optional[ContextSource]:
+        """成果物ディレクトリ内のファイルを候補にする（存在しない場合はNone）"""
+        try:
+            st = (self.artifacts_dir / path).stat()
+        except OSError:
+            return None
+        if not stat.S_ISREG(st.st_mode):
+            return None
+        return ContextSource(path, kind, task_id, depth, None, st.st_mtime_ns, st.st_size)
+
+    def _completed_dependencies(
+        self, task: Task, tasks: Mapping[str, Task]
+    ) -> List[Tuple[Task, int]]:
+        """完了済みの依存タスクを深さ DEPENDENCY_DEPTH まで幅優先でたどる"""
+        result: List[Tuple[Task, int]] = []
+        visited = {task.id}
+        queue = deque((dep_id, 1) for dep_id in task.dependencies)
+
+        while queue:
+            dep_id, depth = queue.popleft()
+            dep_task = tasks.get(dep_id)
+            if dep_id in visited or dep_task is None or dep_task.status != TaskStatus.COMPLETED:
+                continue
+            visited.add(dep_id)
+            result.append((dep_task, depth))
+            if depth < DEPENDENCY_DEPTH:
+                queue.extend((next_id, depth + 1) for next_id in dep_task.dependencies)
+
+        return result
+
+    def _import_distances(self, targets: List[str]) -> Dict[str, int]:
+        """対象ファイルからインポートをたどった距離（IMPORT_DEPTH まで）"""
+        distances = {path: 0 for path in targets}
+        frontier = list(targets)
+
+        for distance in range(1, IMPORT_DEPTH + 1):
+            next_frontier = []
+            for path in frontier:
+                for dep in self.analyzer.analyze_file_dependencies(path):
+                    if dep not in distances:
+                        distances[dep] = distance
+                        next_frontier.append(dep)
+            frontier = next_frontier
+
+        return distances
+
+    def _extract(self, source: ContextSource, limit: int) -> Optional[Tuple[str, str, int]]:
+        """
+        ファイルの断片から予算内の内容を取り出す
+
+        Args:
+            source: 対象ファイル
+            limit: 使用できるバイト数
+
+        Returns:
+            (内容, モード, 使用バイト数)。モードは "full"（全文）、
+            "outline"（シグネチャのみ）、"truncated"（先頭のみ）。バイナリの場合はNone
+        """
+        fragment = self.cache.get(
+            source.path, self.artifacts_dir / source.path, source.mtime_ns, source.size
+        )
+        if fragment.binary:
+            return None
+
+        if fragment.text is not None and source.size <= limit:
+            return fragment.text, "full", source.size
+
+        outline = _trim_lines(fragment.outline.encode("utf-8"), limit)
+        if outline:
+            return outline.decode("utf-8", "replace"), "outline", len(outline)
+
+        head = fragment.head.encode("utf-8")
+        # 行の途中で切らない（1行目が収まらない場合は途中まで）
+        data = _trim_lines(head, limit) or head[:limit]
+        return data.decode("utf-8", "ignore"), "truncated", len(data)
+
+
+def _trim_lines(data: bytes, limit: int) -> bytes:
+    """上限に収まる行までに切り詰める"""
+    if len(data) <= limit:
+        return data
+    return data[: data.rfind(b"\n", 0, limit) + 1]
@@ -5,9 +5,25 @@
 """
 
 import json
+import os
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Optional, List, Dict
+from typing import Optional, List, Dict, Iterable, Iterator
 from .models import Task, TaskStatus, Worker
+from .task_id import DEFAULT_TASK_ID_SCHEME, TaskIdScheme
+
+# progress.json からマージする進捗項目
+PROGRESS_FIELDS = (
+    "status",
+    "artifacts",
+    "completed_at",
+    "started_at",
+    "failed_at",
+    "error_message",
+)
+
+# batch() の例外時に元に戻す項目（TaskProvider が記録する error を含む）
+SNAPSHOT_FIELDS = PROGRESS_FIELDS + ("error",)
 
 
 class Coordinator:
@@ -25,6 +41,14 @@ class Coordinator:
         self.progress_file = project_path / "shared" / "coordination" / "progress.json"
         self.tasks: Dict[str, Task] = {}
         self.workers: Dict[str, Worker] = {}
+        # tasks.json の "task_id" 設定（タスクIDの形式）
+        self.id_scheme: TaskIdScheme = DEFAULT_TASK_ID_SCHEME
+        # 最後に読み込んだ progress.json の進捗項目（reload_progress の差分検出用）
+        self._progress_entries: Dict[str, Dict] = {}
+
+        # バッチ更新中は保存を遅延（ネスト可）
+        self._batch_depth = 0
+        self._dirty = False
 
         # タスクとワーカーを読み込む
         self._load_tasks()
@@ -37,6 +61,9 @@ class Coordinator:
         with open(self.tasks_file, "r", encoding="utf-8") as f:
             data = json.load(f)
 
+            if "task_id" in data:
+                self.id_scheme = TaskIdScheme.from_dict(data["task_id"])
+
             # タスクを読み込む
             for task_data in data.get("tasks", []):
                 task = Task.from_dict(task_data)
@@ -64,26 +91,67 @@ class Coordinator:
                         continue
                     task_id = task_data.get("id")
                     if task_id in self.tasks:
-                        # 進捗状況のみをマージ（status, artifacts, completed_at, error_message など）
-                        task = self.tasks[task_id]
-                        if "status" in task_data:
-                            task.status = TaskStatus(task_data["status"])
-                        if "artifacts" in task_data:
-                            task.artifacts = task_data["artifacts"]
-                        if "completed_at" in task_data and task_data["completed_at"]:
-                            from datetime import datetime
-
-                            task.completed_at = datetime.fromisoformat(task_data["completed_at"])
-                        if "started_at" in task_data and task_data["started_at"]:
-                            from datetime import datetime
-
-                            task.started_at = datetime.fromisoformat(task_data["started_at"])
-                        if "failed_at" in task_data and task_data["failed_at"]:
-                            from datetime import datetime
-
-                            task.failed_at = datetime.fromisoformat(task_data["failed_at"])
-                        if "error_message" in task_data:
-                            task.error_message = task_data["error_message"]
+                        self._merge_progress(self.tasks[task_id], task_data)
+                        self._progress_entries[task_id] = self._progress_fields(task_data)
+
+    def _merge_progress(self, task: Task, task_data: Dict) -> None:
+        """進捗状況のみをマージ（status, artifacts, completed_at, error_message など）"""
+        from datetime import datetime
+
+        if "status" in task_data:
+            task.status = TaskStatus(task_data["status"])
+        if "artifacts" in task_data:
+            task.artifacts = task_data["artifacts"]
+        if "completed_at" in task_data and task_data["completed_at"]:
+            task.completed_at = datetime.fromisoformat(task_data["completed_at"])
+        if "started_at" in task_data and task_data["started_at"]:
+            task.started_at = datetime.fromisoformat(task_data["started_at"])
+        if "failed_at" in task_data and task_data["failed_at"]:
+            task.failed_at = datetime.fromisoformat(task_data["failed_at"])
+        if "error_message" in task_data:
+            task.error_message = task_data["error_message"]
+
+    @staticmethod
+    def _progress_fields(task_data: Dict) -> Dict:
+        """progress.json のエントリのうち、マージ対象の項目"""
+        return {key: task_data.get(key) for key in PROGRESS_FIELDS}
+
+    def reload_progress(self) -> List[str]:
+        """
+        progress.json を読み直し、前回の読み込みから変わったタスクだけをマージ
+
+        ダッシュボードの監視モードなど、他のプロセスによる更新を取り込むために使います。
+        読み込めない場合（書き込み途中など）は何も変更しません。
+
+        Returns:
+            進捗が変わったタスクIDのリスト
+        """
+        try:
+            with open(self.progress_file, "r", encoding="utf-8") as f:
+                progress_data = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return []
+
+        changed: List[str] = []
+        for task_data in progress_data.get("tasks", []):
+            if not isinstance(task_data, dict):
+                continue
+            task_id = task_data.get("id")
+            fields = self._progress_fields(task_data)
+            if task_id not in self.tasks or self._progress_entries.get(task_id) == fields:
+                continue
+            self._merge_progress(self.tasks[task_id], task_data)
+            self._progress_entries[task_id] = fields
+            changed.append(task_id)
+        return changed
+
+    def reload(self) -> None:
+        """tasks.json と progress.json を読み直す（未保存の変更は破棄）"""
+        self.tasks = {}
+        self.workers = {}
+        self.id_scheme = DEFAULT_TASK_ID_SCHEME
+        self._progress_entries = {}
+        self._load_tasks()
 
     def get_task(self, task_id: str) -> Optional[Task]:
         """
@@ -128,18 +196,102 @@ class Coordinator:
 
             task.completed_at = datetime.now()
 
-        # progress.json を更新
-        self._save_progress()
+        # progress.json を更新（バッチ更新中は終了時にまとめて保存）
+        if self._batch_depth:
+            self._dirty = True
+        else:
+            self._save_progress()
+
+    def update_many(
+        self,
+        task_ids: Iterable[str],
+        status: TaskStatus,
+        error_message: Optional[str] = None,
+        artifacts: Optional[List[str]] = None,
+    ) -> List[str]:
+        """
+        複数タスクのステータスをまとめて更新（progress.json の保存は1回）
+
+        Args:
+            task_ids: タスクIDのリスト
+            status: 新しいステータス
+            error_message: エラーメッセージ（任意）
+            artifacts: 生成されたファイルのリスト（任意）
+
+        Returns:
+            更新したタスクIDのリスト（存在しないタスクは除外）
+        """
+        updated = []
+        with self.batch():
+            for task_id in task_ids:
+                if task_id in self.tasks:
+                    self.update_task_status(task_id, status, error_message, artifacts)
+                    updated.append(task_id)
+        return updated
+
+    @contextmanager
+    def batch(self) -> Iterator["Coordinator"]:
+        """
+        複数の更新を1回の保存にまとめるトランザクション
+
+        ブロック内の update_task_status は保存を遅延し、終了時に progress.json を
+        1回だけアトミックに書き込みます。例外が発生した場合は変更を破棄します。
+
+        Example:
+            with coordinator.batch():
+                for task_id in task_ids:
+                    coordinator.update_task_status(task_id, TaskStatus.COMPLETED)
+        """
+        snapshot = None
+        if self._batch_depth == 0:
+            snapshot = {
+                task_id: {name: getattr(task, name) for name in SNAPSHOT_FIELDS}
+                for task_id, task in self.tasks.items()
+            }
+            for fields in snapshot.values():
+                fields["artifacts"] = list(fields["artifacts"])
+            self._dirty = False
+
+        self._batch_depth += 1
+        try:
+            yield self
+        except BaseException:
+            if snapshot is not None:
+                # 変更を破棄
+                for task_id, fields in snapshot.items():
+                    task = self.tasks[task_id]
+                    for name, value in fields.items():
+                        setattr(task, name, value)
+                self._dirty = False
+            raise
+        finally:
+            self._batch_depth -= 1
+
+        if self._batch_depth == 0 and self._dirty:
+            self._dirty = False
+            self._save_progress()
 
     def _save_progress(self) -> None:
-        """進捗状況を保存"""
+        """進捗状況を保存（一時ファイルへの書き込み後に置き換え）"""
         progress_data = {"tasks": [task.to_dict() for task in self.tasks.values()]}
 
         # ディレクトリが存在しない場合は作成
         self.progress_file.parent.mkdir(parents=True, exist_ok=True)
 
-        with open(self.progress_file, "w", encoding="utf-8") as f:
-            json.dump(progress_data, f, indent=2, ensure_ascii=False)
+        tmp_path = self.progress_file.with_name(f".{self.progress_file.name}.{os.getpid()}.tmp")
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(progress_data, f, indent=2, ensure_ascii=False)
+            os.replace(tmp_path, self.progress_file)
+        except BaseException:
+            if tmp_path.exists():
+                tmp_path.unlink()
+            raise
+
+        # 自身の書き込みは reload_progress で変更として扱わない
+        self._progress_entries = {
+            entry["id"]: self._progress_fields(entry) for entry in progress_data["tasks"]
+        }
 
     def get_executable_tasks(self) -> List[Task]:
         """
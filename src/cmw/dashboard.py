@@ -4,22 +4,28 @@
 リアルタイムでタスク進捗を表示するターミナルダッシュボード
 """
 
-from typing import List
-from rich.console import Console
+import time
+from pathlib import Path
+from typing import TYPE_CHECKING, List, Optional
+from rich.console import Console, Group, RenderableType
 from rich.table import Table
 from rich.progress import Progress, BarColumn, TextColumn
 from rich.panel import Panel
+from rich.rule import Rule
 from rich import box
 
 from .models import Task
-from .progress_tracker import ProgressTracker
+from .progress_tracker import ProgressAggregate, ProgressTracker
+
+if TYPE_CHECKING:
+    from .task_loop import TaskLoop
 
 
 class Dashboard:
     """ターミナルダッシュボード"""
 
-    def __init__(self) -> None:
-        self.console = Console()
+    def __init__(self, console: Optional[Console] = None) -> None:
+        self.console = console or Console()
 
     def format_duration(self, seconds: float) -> str:
         """秒数を人間が読みやすい形式に変換"""
@@ -33,9 +39,14 @@ class Dashboard:
             minutes = int((seconds % 3600) / 60)
             return f"{hours}時間{minutes}分"
 
-    def create_summary_panel(self, tracker: ProgressTracker, tasks: List[Task]) -> Panel:
-        """サマリーパネルを作成"""
-        summary = tracker.get_progress_summary(tasks)
+    def create_summary_panel(
+        self,
+        tracker: ProgressTracker,
+        tasks: List[Task],
+        aggregate: Optional[ProgressAggregate] = None,
+    ) -> Panel:
+        """サマリーパネルを作成（aggregate を渡すと集計済みの値を使用）"""
+        summary = aggregate.summary() if aggregate else tracker.get_progress_summary(tasks)
 
         content = f"""
 📊 総タスク数: {summary["total"]}
@@ -50,15 +61,22 @@ class Dashboard:
 """
 
         # 残り時間推定
-        remaining = tracker.estimate_remaining_time(tasks)
+        remaining = (
+            aggregate.estimate_remaining() if aggregate else tracker.estimate_remaining_time(tasks)
+        )
         if remaining:
             content += f"\n⏱️  推定残り時間: {self.format_duration(remaining.total_seconds())}"
 
         return Panel(content.strip(), title="プロジェクト概要", border_style="cyan")
 
-    def create_velocity_panel(self, tracker: ProgressTracker, tasks: List[Task]) -> Panel:
+    def create_velocity_panel(
+        self,
+        tracker: ProgressTracker,
+        tasks: List[Task],
+        aggregate: Optional[ProgressAggregate] = None,
+    ) -> Panel:
         """ベロシティパネルを作成"""
-        velocity = tracker.get_velocity_metrics(tasks)
+        velocity = aggregate.velocity() if aggregate else tracker.get_velocity_metrics(tasks)
 
         content = f"""
 🚀 タスク/時間: {velocity["tasks_per_hour"]:.2f}
@@ -68,9 +86,16 @@ class Dashboard:
 
         return Panel(content.strip(), title="ベロシティ", border_style="green")
 
-    def create_priority_table(self, tracker: ProgressTracker, tasks: List[Task]) -> Table:
+    def create_priority_table(
+        self,
+        tracker: ProgressTracker,
+        tasks: List[Task],
+        aggregate: Optional[ProgressAggregate] = None,
+    ) -> Table:
         """優先度別進捗テーブルを作成"""
-        breakdown = tracker.get_priority_breakdown(tasks)
+        breakdown = (
+            aggregate.priority_breakdown() if aggregate else tracker.get_priority_breakdown(tasks)
+        )
 
         table = Table(title="優先度別進捗", box=box.ROUNDED)
         table.add_column("優先度", style="cyan")
@@ -101,9 +126,14 @@ class Dashboard:
 
         return table
 
-    def create_worker_table(self, tracker: ProgressTracker, tasks: List[Task]) -> Table:
+    def create_worker_table(
+        self,
+        tracker: ProgressTracker,
+        tasks: List[Task],
+        aggregate: Optional[ProgressAggregate] = None,
+    ) -> Table:
         """担当者別進捗テーブルを作成"""
-        workers = tracker.get_worker_breakdown(tasks)
+        workers = aggregate.worker_breakdown() if aggregate else tracker.get_worker_breakdown(tasks)
 
         table = Table(title="担当者別進捗", box=box.ROUNDED)
         table.add_column("担当者", style="cyan")
@@ -150,39 +180,167 @@ class Dashboard:
 
         return table
 
-    def show_dashboard(self, tracker: ProgressTracker, tasks: List[Task]) -> None:
-        """ダッシュボードを表示"""
-        self.console.clear()
-        self.console.print("\n")
-        self.console.print("=" * 80, style="bold cyan")
-        self.console.print("  📊 CMW プロジェクトダッシュボード", style="bold cyan")
-        self.console.print("=" * 80, style="bold cyan")
-        self.console.print("\n")
-
-        # サマリーとベロシティを横並びで表示
+    def render_dashboard(
+        self,
+        tracker: ProgressTracker,
+        tasks: List[Task],
+        aggregate: Optional[ProgressAggregate] = None,
+    ) -> RenderableType:
+        """ダッシュボード全体を1つの描画対象として作成"""
         from rich.columns import Columns
 
-        self.console.print(
+        # 集計は1回だけ行い、各パネル・テーブルで共有
+        aggregate = aggregate or tracker.aggregate(tasks)
+
+        return Group(
+            Rule("📊 CMW プロジェクトダッシュボード", style="bold cyan"),
+            "",
+            # サマリーとベロシティを横並びで表示
             Columns(
                 [
-                    self.create_summary_panel(tracker, tasks),
-                    self.create_velocity_panel(tracker, tasks),
+                    self.create_summary_panel(tracker, tasks, aggregate),
+                    self.create_velocity_panel(tracker, tasks, aggregate),
                 ]
-            )
+            ),
+            "",
+            # 優先度別テーブル
+            self.create_priority_table(tracker, tasks, aggregate),
+            "",
+            # 担当者別テーブル
+            self.create_worker_table(tracker, tasks, aggregate),
+            "",
+            # 最近のアクティビティ
+            self.create_recent_tasks_table(tracker, tasks),
         )
-        self.console.print("\n")
 
-        # 優先度別テーブル
-        self.console.print(self.create_priority_table(tracker, tasks))
-        self.console.print("\n")
+    def show_dashboard(self, tracker: ProgressTracker, tasks: List[Task]) -> None:
+        """ダッシュボードを表示"""
+        self.console.clear()
+        self.console.print()
+        self.console.print(self.render_dashboard(tracker, tasks))
+        self.console.print()
 
-        # 担当者別テーブル
-        self.console.print(self.create_worker_table(tracker, tasks))
-        self.console.print("\n")
+    def watch(
+        self,
+        project_path: Path,
+        max_fps: float = 4.0,
+        poll_interval: float = 1.0,
+        duration: Optional[float] = None,
+        use_inotify: bool = True,
+    ) -> int:
+        """
+        coordination ファイルの変更を監視し、ダッシュボードを描画し続ける
+
+        tasks.json / progress.json は起動時に1回だけ読み込み、以降は progress.json の
+        変更を検知したら変わったタスクの差分だけを集計に反映します（tasks.json が
+        変わった場合のみ再読み込み）。描画は max_fps 回/秒以下にまとめます。
+
+        Args:
+            project_path: プロジェクトのルートパス
+            max_fps: 1秒あたりの最大描画回数
+            poll_interval: inotify が使えない場合のポーリング間隔（秒）
+            duration: 監視を終了するまでの秒数（None の場合は Ctrl+C まで）
+            use_inotify: inotify を使用するか
+
+        Returns:
+            描画した回数
+        """
+        from rich.live import Live
+
+        from .coordinator import Coordinator
+        from .file_watcher import FileWatcher
+
+        tracker = ProgressTracker(project_path)
+        coordinator = Coordinator(project_path)
+        aggregate = tracker.aggregate(list(coordinator.tasks.values()))
+        frame_interval = 1.0 / max_fps if max_fps > 0 else 0.0
+        deadline = None if duration is None else time.monotonic() + duration
+
+        def render() -> RenderableType:
+            footer = f"[dim]監視中（{watcher.backend}）… Ctrl+C で終了[/dim]"
+            return Group(
+                self.render_dashboard(tracker, list(coordinator.tasks.values()), aggregate), footer
+            )
 
-        # 最近のアクティビティ
-        self.console.print(self.create_recent_tasks_table(tracker, tasks))
-        self.console.print("\n")
+        watcher = FileWatcher(
+            [coordinator.tasks_file, coordinator.progress_file],
+            poll_interval=poll_interval,
+            use_inotify=use_inotify,
+        )
+        frames = 1
+        try:
+            with watcher, Live(render(), console=self.console, auto_refresh=False) as live:
+                last_frame = time.monotonic()
+                dirty = False
+
+                while deadline is None or time.monotonic() < deadline:
+                    now = time.monotonic()
+                    # 未描画の変更があれば次のフレームまで、なければ変更か終了まで待つ
+                    timeout = max(0.0, last_frame + frame_interval - now) if dirty else None
+                    if deadline is not None:
+                        remaining = max(0.0, deadline - now)
+                        timeout = remaining if timeout is None else min(timeout, remaining)
+
+                    changed = watcher.wait(timeout)
+                    if coordinator.tasks_file in changed:
+                        coordinator = Coordinator(project_path)
+                        aggregate = tracker.aggregate(list(coordinator.tasks.values()))
+                        dirty = True
+                    elif coordinator.progress_file in changed:
+                        for task_id in coordinator.reload_progress():
+                            aggregate.update(coordinator.tasks[task_id])
+                            dirty = True
+
+                    if dirty and time.monotonic() - last_frame >= frame_interval:
+                        live.update(render(), refresh=True)
+                        last_frame = time.monotonic()
+                        frames += 1
+                        dirty = False
+        except KeyboardInterrupt:
+            pass
+
+        return frames
+
+    async def follow(self, task_loop: "TaskLoop", max_fps: float = 4.0) -> None:
+        """
+        TaskLoop の状態の変化に合わせてダッシュボードを描画し続ける（cmw run --dashboard）
+
+        ファイルを監視する watch と異なり、同じプロセス内のワーカーによる変更を
+        イベントで受け取り、変わったタスクの差分だけを集計に反映します。
+        描画は max_fps 回/秒以下にまとめます。キャンセルされるまで続きます。
+
+        Args:
+            task_loop: 状態を所有する TaskLoop
+            max_fps: 1秒あたりの最大描画回数
+        """
+        import asyncio
+
+        from rich.live import Live
+
+        tracker = ProgressTracker(Path(task_loop.coordinator.project_path))
+        tasks = task_loop.tasks
+        aggregate = tracker.aggregate(list(tasks.values()))
+        frame_interval = 1.0 / max_fps if max_fps > 0 else 0.0
+        version = task_loop.version
+
+        def render() -> RenderableType:
+            footer = "[dim]実行中… Ctrl+C で中断[/dim]"
+            return Group(self.render_dashboard(tracker, list(tasks.values()), aggregate), footer)
+
+        with Live(render(), console=self.console, auto_refresh=False) as live:
+            while True:
+                new_version = await task_loop.wait_for_change(version)
+                if task_loop.tasks is not tasks:
+                    # tasks.json が読み直された
+                    tasks = task_loop.tasks
+                    aggregate = tracker.aggregate(list(tasks.values()))
+                else:
+                    for task_id in task_loop.changed_since(version):
+                        if task_id in tasks:
+                            aggregate.update(tasks[task_id])
+                version = new_version
+                live.update(render(), refresh=True)
+                await asyncio.sleep(frame_interval)
 
     def show_progress_bar(self, tracker: ProgressTracker, tasks: List[Task]) -> None:
         """プログレスバーを表示"""
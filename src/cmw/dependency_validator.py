@@ -4,7 +4,9 @@ Dependency Validator - 依存関係の検証と修正
 循環依存の検出、分析、修正提案を行うモジュール
 """
 
-from typing import List, Optional, Dict, Any, Tuple
+from typing import List, Optional, Dict, Any, FrozenSet, Set, Tuple
+import heapq
+import math
 import networkx as nx
 import re
 
@@ -14,46 +16,123 @@ from cmw.models import Task
 class DependencyValidator:
     """タスク依存関係の検証と修正を行うクラス"""
 
-    def detect_cycles(self, tasks: List[Task]) -> List[List[Tuple[str, str]]]:
+    # この依存関係数以下の強連結成分は分枝限定法で厳密に解く
+    EXACT_FAS_MAX_EDGES = 30
+    # 分枝限定法の探索ノード数の上限
+    EXACT_FAS_MAX_EXPANSIONS = 5000
+    # Eades–Lin–Smyth で削除不可の依存関係に与える重み
+    UNREMOVABLE_WEIGHT = 1000.0
+
+    def detect_cycles(
+        self, tasks: List[Task], max_cycles_per_component: int = 10
+    ) -> List[List[Tuple[str, str]]]:
         """
         循環依存を検出
 
+        強連結成分（SCC）に分解してから、成分ごとに上限付きで循環を列挙します。
+        全ての循環成分から少なくとも1つの循環を返すため、循環の見落としはありません。
+
         Args:
             tasks: タスクリスト
+            max_cycles_per_component: 1つの強連結成分から列挙する循環の上限
 
         Returns:
             循環依存のリスト（各要素はエッジのリスト）
             例: [[('TASK-004', 'TASK-005'), ('TASK-005', 'TASK-004')],
                  [('TASK-024', 'TASK-025'), ('TASK-025', 'TASK-024')]]
         """
+        cycles: List[List[Tuple[str, str]]] = []
+        for component in self.summarize_cycles(tasks, max_cycles_per_component):
+            cycles.extend(component["cycles"])
+        return cycles
+
+    def summarize_cycles(
+        self, tasks: List[Task], max_cycles_per_component: int = 10
+    ) -> List[Dict[str, Any]]:
+        """
+        循環を含む強連結成分のサマリーを取得
+
+        Args:
+            tasks: タスクリスト
+            max_cycles_per_component: 1つの強連結成分から列挙する循環の上限
+
+        Returns:
+            循環成分のリスト（タスク数の多い順）
+            [
+                {
+                    'tasks': ['TASK-004', 'TASK-005'],  # 成分に含まれるタスク
+                    'edge_count': 2,                    # 成分内の依存関係数
+                    'cycles': [[('TASK-004', 'TASK-005'), ('TASK-005', 'TASK-004')]],
+                    'truncated': False                  # 上限により列挙を打ち切ったか
+                }
+            ]
+        """
         G = self._build_dependency_graph(tasks)
+        limit = max(1, max_cycles_per_component)
+        summaries: List[Dict[str, Any]] = []
+
+        # networkxのSCC分解（Tarjan法）で循環成分を1パスで抽出
+        for component in nx.strongly_connected_components(G):
+            if len(component) == 1:
+                node = next(iter(component))
+                if not G.has_edge(node, node):
+                    continue
+
+            cycles, truncated = self._enumerate_component_cycles(G, component, limit)
+            summaries.append(
+                {
+                    "tasks": sorted(component),
+                    "edge_count": G.subgraph(component).number_of_edges(),
+                    "cycles": cycles,
+                    "truncated": truncated,
+                }
+            )
+
+        summaries.sort(key=lambda s: (-len(s["tasks"]), s["tasks"][0]))
+        return summaries
+
+    def _enumerate_component_cycles(
+        self, G: nx.DiGraph, component: Set[str], limit: int
+    ) -> Tuple[List[List[Tuple[str, str]]], bool]:
+        """
+        強連結成分内の循環を上限付きで列挙
 
-        try:
-            # simple_cyclesは大規模グラフでハングする可能性があるため、
-            # find_cycleを繰り返し実行して循環を検出（最大10個まで）
-            cycles = []
-            temp_graph = G.copy()
-            max_cycles = 10
-
-            for _ in range(max_cycles):
-                try:
-                    # find_cycleは最初の循環を見つける（高速）
-                    cycle_edges = nx.find_cycle(temp_graph, orientation='original')
-                    # cycle_edgesは[(from, to, key), ...]の形式
-                    # エッジ情報を保持したまま格納
-                    cycle = [(edge[0], edge[1]) for edge in cycle_edges]
-                    cycles.append(cycle)
-
-                    # 見つけた循環の最初のエッジを削除して次の循環を探す
-                    if cycle_edges:
-                        temp_graph.remove_edge(cycle_edges[0][0], cycle_edges[0][1])
-                except nx.NetworkXNoCycle:
-                    # これ以上循環がない
-                    break
-
-            return cycles
-        except Exception:
-            return []
+        成分内を1回だけ深さ優先探索し、後退辺ごとにスタック上のパスから循環を構成します。
+
+        Returns:
+            (循環のリスト, 上限により打ち切ったか)
+        """
+        cycles: List[List[Tuple[str, str]]] = []
+        start = min(component)
+        path = [start]
+        stack_index = {start: 0}
+        visited = {start}
+        iterators = [iter(sorted(n for n in G.successors(start) if n in component))]
+
+        while iterators:
+            try:
+                successor = next(iterators[-1])
+            except StopIteration:
+                del stack_index[path.pop()]
+                iterators.pop()
+                continue
+
+            if successor in stack_index:
+                # 後退辺: スタック上の successor から現在ノードまでが循環
+                if len(cycles) >= limit:
+                    return cycles, True
+                nodes = path[stack_index[successor] :]
+                cycle = list(zip(nodes, nodes[1:])) + [(path[-1], successor)]
+                cycles.append(cycle)
+            elif successor not in visited:
+                visited.add(successor)
+                stack_index[successor] = len(path)
+                path.append(successor)
+                iterators.append(
+                    iter(sorted(n for n in G.successors(successor) if n in component))
+                )
+
+        return cycles, False
 
     def _build_dependency_graph(self, tasks: List[Task]) -> nx.DiGraph:
         """
@@ -233,6 +312,283 @@ class DependencyValidator:
 
         return min(confidence, 1.0)
 
+    def find_feedback_arc_set(self, tasks: List[Task], auto_apply: bool = True) -> List[Dict]:
+        """
+        循環を解消するために削除する依存関係（フィードバックアークセット）を求める
+
+        強連結成分ごとに1回だけ解き、削除する依存関係の重み合計を最小化します。
+        重みは「2.0 - 信頼度」で、削除数を最優先に少なくし、同数なら信頼度の
+        高い依存関係を削除します。セマンティック分析で削除理由がない依存関係は
+        削除しません。小さな成分は分枝限定法で厳密解を、大きな成分は
+        Eades–Lin–Smyth ヒューリスティックで近似解を求めます。
+
+        Args:
+            tasks: タスクリスト
+            auto_apply: Falseの場合は信頼度0.7以上の依存関係のみ削除対象
+
+        Returns:
+            削除する依存関係のリスト
+            [
+                {
+                    'from_task': 'TASK-004',
+                    'to_task': 'TASK-005',
+                    'reason': 'モデル定義はDB初期化の前に必要',
+                    'confidence': 0.9
+                }
+            ]
+        """
+        G = self._build_dependency_graph(tasks)
+        task_map = {t.id: t for t in tasks}
+        removals: List[Dict] = []
+
+        for component in nx.strongly_connected_components(G):
+            if len(component) == 1:
+                node = next(iter(component))
+                if G.has_edge(node, node):
+                    removals.append(
+                        {
+                            "from_task": node,
+                            "to_task": node,
+                            "reason": "自己依存",
+                            "confidence": 1.0,
+                        }
+                    )
+                continue
+
+            # 成分内の各依存関係の削除コストと理由
+            weights: Dict[Tuple[str, str], float] = {}
+            details: Dict[Tuple[str, str], Tuple[str, float]] = {}
+            for from_id, to_id in G.subgraph(component).edges():
+                edge = (from_id, to_id)
+                if from_id == to_id:
+                    weights[edge] = 0.0
+                    details[edge] = ("自己依存", 1.0)
+                    continue
+
+                from_task = task_map.get(from_id)
+                to_task = task_map.get(to_id)
+                reason = (
+                    self._should_remove_edge(from_task, to_task) if from_task and to_task else None
+                )
+                confidence = (
+                    self._calculate_confidence(from_task, to_task)
+                    if reason and from_task and to_task
+                    else 0.0
+                )
+
+                if reason and (auto_apply or confidence >= 0.7):
+                    weights[edge] = 2.0 - confidence
+                    details[edge] = (reason, confidence)
+                else:
+                    weights[edge] = math.inf
+
+            feedback_arcs = self._solve_feedback_arc_set(sorted(component), weights)
+
+            for edge in sorted(feedback_arcs):
+                reason, confidence = details[edge]
+                removals.append(
+                    {
+                        "from_task": edge[0],
+                        "to_task": edge[1],
+                        "reason": reason,
+                        "confidence": confidence,
+                    }
+                )
+
+        return removals
+
+    def _solve_feedback_arc_set(
+        self, nodes: List[str], weights: Dict[Tuple[str, str], float]
+    ) -> Set[Tuple[str, str]]:
+        """
+        1つの強連結成分の重み付きフィードバックアークセットを解く
+
+        Args:
+            nodes: 成分のノード
+            weights: 依存関係 -> 削除コスト（削除不可はinf）
+
+        Returns:
+            削除する依存関係のセット（削除不可の依存関係は含まない）
+        """
+        order = self._eades_lin_smyth_order(nodes, weights)
+        position = {node: i for i, node in enumerate(order)}
+        heuristic = {
+            edge
+            for edge in weights
+            if position[edge[0]] >= position[edge[1]] and weights[edge] != math.inf
+        }
+        heuristic = self._reinsert_redundant_arcs(weights, heuristic)
+
+        if len(weights) > self.EXACT_FAS_MAX_EDGES:
+            return heuristic
+
+        return self._branch_and_bound_fas(weights, heuristic)
+
+    def _eades_lin_smyth_order(
+        self, nodes: List[str], weights: Dict[Tuple[str, str], float]
+    ) -> List[str]:
+        """
+        Eades–Lin–Smyth ヒューリスティックでノードの並び順を求める
+
+        シンク・ソースを順に取り除き、残りは（出次数重み - 入次数重み）が最大の
+        ノードを先頭側に置きます。並び順に逆行する依存関係がフィードバックアークになります。
+        """
+        out_edges: Dict[str, Dict[str, float]] = {node: {} for node in nodes}
+        in_edges: Dict[str, Dict[str, float]] = {node: {} for node in nodes}
+        for (from_id, to_id), weight in weights.items():
+            if from_id == to_id:
+                continue
+            # 削除不可の依存関係は大きな重みで逆行しにくくする
+            w = weight if weight != math.inf else self.UNREMOVABLE_WEIGHT
+            out_edges[from_id][to_id] = w
+            in_edges[to_id][from_id] = w
+
+        out_weight = {node: sum(out_edges[node].values()) for node in nodes}
+        in_weight = {node: sum(in_edges[node].values()) for node in nodes}
+        version = {node: 0 for node in nodes}
+        heap = [(-(out_weight[node] - in_weight[node]), node, 0) for node in nodes]
+        heapq.heapify(heap)
+        sinks = [node for node in nodes if not out_edges[node]]
+        sources = [node for node in nodes if not in_edges[node] and out_edges[node]]
+
+        remaining = set(nodes)
+        head: List[str] = []
+        tail: List[str] = []
+
+        def remove(node: str) -> None:
+            remaining.discard(node)
+            for succ, w in out_edges[node].items():
+                del in_edges[succ][node]
+                in_weight[succ] -= w
+                version[succ] += 1
+                heapq.heappush(heap, (-(out_weight[succ] - in_weight[succ]), succ, version[succ]))
+                if not in_edges[succ] and out_edges[succ]:
+                    sources.append(succ)
+            for pred, w in in_edges[node].items():
+                del out_edges[pred][node]
+                out_weight[pred] -= w
+                version[pred] += 1
+                heapq.heappush(heap, (-(out_weight[pred] - in_weight[pred]), pred, version[pred]))
+                if not out_edges[pred]:
+                    sinks.append(pred)
+
+        while remaining:
+            if sinks:
+                node = sinks.pop()
+                if node in remaining:
+                    tail.append(node)
+                    remove(node)
+                continue
+            if sources:
+                node = sources.pop()
+                if node in remaining:
+                    head.append(node)
+                    remove(node)
+                continue
+
+            _, node, node_version = heapq.heappop(heap)
+            if node in remaining and node_version == version[node]:
+                head.append(node)
+                remove(node)
+
+        return head + tail[::-1]
+
+    def _reinsert_redundant_arcs(
+        self, weights: Dict[Tuple[str, str], float], removed: Set[Tuple[str, str]]
+    ) -> Set[Tuple[str, str]]:
+        """循環を作らない依存関係は削除対象から戻す（コストの高い順）"""
+        G: nx.DiGraph = nx.DiGraph()
+        G.add_edges_from(edge for edge in weights if edge not in removed)
+
+        kept_removed = set(removed)
+        for edge in sorted(removed, key=lambda e: (-weights[e], e)):
+            from_id, to_id = edge
+            if from_id == to_id:
+                continue
+            if G.has_node(to_id) and G.has_node(from_id) and nx.has_path(G, to_id, from_id):
+                continue
+            G.add_edge(from_id, to_id)
+            kept_removed.discard(edge)
+
+        return kept_removed
+
+    def _branch_and_bound_fas(
+        self, weights: Dict[Tuple[str, str], float], incumbent: Set[Tuple[str, str]]
+    ) -> Set[Tuple[str, str]]:
+        """
+        分枝限定法で最小重みのフィードバックアークセットを求める
+
+        残った循環の1本を選び、その中の依存関係を1つずつ削除する分岐を作ります
+        （先に試した依存関係は後続の分岐では残す）。ヒューリスティック解を初期上界とし、
+        探索数の上限に達した場合はその時点の最良解を返します。
+        """
+        def residual_cycle(removed: FrozenSet[Tuple[str, str]]) -> Optional[List[Tuple[str, str]]]:
+            G: nx.DiGraph = nx.DiGraph()
+            G.add_edges_from(edge for edge in weights if edge not in removed)
+            try:
+                return [(edge[0], edge[1]) for edge in nx.find_cycle(G)]
+            except nx.NetworkXNoCycle:
+                return None
+
+        best = set(incumbent)
+        # 解が循環を残す（削除不可の依存関係がある）場合は上界なし
+        best_cost = (
+            sum(weights[edge] for edge in best)
+            if residual_cycle(frozenset(best)) is None
+            else math.inf
+        )
+
+        stack: List[Tuple[FrozenSet[Tuple[str, str]], FrozenSet[Tuple[str, str]], float]] = [
+            (frozenset(), frozenset(), 0.0)
+        ]
+        expansions = 0
+
+        while stack and expansions < self.EXACT_FAS_MAX_EXPANSIONS:
+            removed, kept, cost = stack.pop()
+            expansions += 1
+
+            cycle = residual_cycle(removed)
+            if cycle is None:
+                if cost < best_cost:
+                    best, best_cost = set(removed), cost
+                continue
+
+            candidates = sorted(
+                (edge for edge in cycle if edge not in kept and weights[edge] != math.inf),
+                key=lambda e: (weights[e], e),
+                reverse=True,
+            )
+            newly_kept = set(kept)
+            branches = []
+            for edge in reversed(candidates):
+                if cost + weights[edge] < best_cost:
+                    branches.append(
+                        (removed | {edge}, frozenset(newly_kept), cost + weights[edge])
+                    )
+                newly_kept.add(edge)
+            # 低コストの分岐から探索
+            stack.extend(reversed(branches))
+
+        return best
+
+    def remove_dependencies(self, tasks: List[Task], removals: List[Dict]) -> List[Task]:
+        """
+        依存関係を削除
+
+        Args:
+            tasks: タスクリスト
+            removals: find_feedback_arc_set の戻り値
+
+        Returns:
+            修正後のタスクリスト
+        """
+        task_map = {t.id: t for t in tasks}
+        for removal in removals:
+            from_task = task_map.get(removal["from_task"])
+            if from_task and removal["to_task"] in from_task.dependencies:
+                from_task.dependencies.remove(removal["to_task"])
+        return list(task_map.values())
+
     def auto_fix_cycles(
         self,
         tasks: List[Task],
@@ -244,11 +600,13 @@ class DependencyValidator:
         """
         循環依存を自動修正
 
+        強連結成分ごとにフィードバックアークセットを1回求めて適用します。
+
         Args:
             tasks: タスクリスト
-            cycles: 検出された循環依存
+            cycles: 検出された循環依存（空の場合は何もしない）
             auto_apply: Trueの場合は自動適用、Falseの場合は高信頼度のみ
-            max_iterations: 最大反復回数（無限ループ防止）
+            max_iterations: 最大反復回数（互換性のため）
             _iteration: 現在の反復回数（内部使用）
 
         Returns:
@@ -259,51 +617,78 @@ class DependencyValidator:
             print(f"\n⚠️  最大反復回数({max_iterations})に達しました。これ以上の自動修正を中止します。")
             return tasks
 
-        suggestions = self.suggest_fixes(cycles, tasks)
-        task_map = {t.id: t for t in tasks}
-        modifications = []
-
-        for suggestion in suggestions:
-            fixes = suggestion["suggestions"]
-
-            if not fixes:
-                continue
-
-            # 最も信頼度の高い修正を適用
-            best_fix = fixes[0]
-
-            # 信頼度が低い場合はスキップ
-            if not auto_apply and best_fix["confidence"] < 0.7:
-                continue
-
-            # 依存関係を削除
-            from_task = task_map.get(best_fix["from_task"])
-            to_task_id = best_fix["to_task"]
+        if not cycles:
+            return tasks
 
-            if from_task and to_task_id in from_task.dependencies:
-                from_task.dependencies.remove(to_task_id)
-                modifications.append(
-                    {
-                        "from": best_fix["from_task"],
-                        "to": to_task_id,
-                        "reason": best_fix["reason"],
-                        "confidence": best_fix["confidence"],
-                    }
-                )
+        modifications = self.find_feedback_arc_set(tasks, auto_apply=auto_apply)
 
         # 修正内容を表示
         if modifications:
+            tasks = self.remove_dependencies(tasks, modifications)
             print("\n✅ 以下の依存関係を削除しました:")
             for mod in modifications:
-                print(f"  - {mod['from']} → {mod['to']} (信頼度: {mod['confidence']:.0%})")
+                print(
+                    f"  - {mod['from_task']} → {mod['to_task']} (信頼度: {mod['confidence']:.0%})"
+                )
                 print(f"    理由: {mod['reason']}")
         else:
             # 進捗がない場合は中止（無限ループ防止）
             print("\n⚠️  これ以上の自動修正ができません。")
             print("     残りの循環は手動で確認してください。")
-            return tasks
 
-        return list(task_map.values())
+        return tasks
+
+    def transitive_reduction(self, tasks: List[Task]) -> List[Tuple[str, str]]:
+        """
+        推移的に冗長な依存関係を削除
+
+        A → B → C のとき A → C は到達可能性に影響しないため削除します。
+        循環がある場合は強連結成分を縮約して成分間の依存関係のみ削減し、
+        成分内の依存関係と存在しないタスクへの依存関係は保持します。
+
+        Args:
+            tasks: タスクリスト（dependenciesを直接更新）
+
+        Returns:
+            削除した依存関係のリスト [(タスクID, 依存先タスクID), ...]
+        """
+        task_ids = {t.id for t in tasks}
+        G: nx.DiGraph = nx.DiGraph()
+        for task in tasks:
+            G.add_node(task.id)
+            for dep_id in task.dependencies:
+                if dep_id in task_ids:
+                    G.add_edge(task.id, dep_id)
+
+        condensed = nx.condensation(G)
+        mapping = condensed.graph["mapping"]
+        reduced = nx.transitive_reduction(condensed)
+
+        removed: List[Tuple[str, str]] = []
+        represented: Set[Tuple[int, int]] = set()
+        for task in tasks:
+            kept: List[str] = []
+            for dep_id in task.dependencies:
+                if dep_id not in task_ids:
+                    kept.append(dep_id)
+                    continue
+
+                from_scc, to_scc = mapping[task.id], mapping[dep_id]
+                if from_scc == to_scc:
+                    kept.append(dep_id)
+                    continue
+
+                # 成分間は縮約グラフの削減後の依存関係ごとに1本だけ残す
+                pair = (from_scc, to_scc)
+                if reduced.has_edge(from_scc, to_scc) and pair not in represented:
+                    represented.add(pair)
+                    kept.append(dep_id)
+                else:
+                    removed.append((task.id, dep_id))
+
+            task.dependencies = kept
+
+        return removed
 
     def validate_dependencies(self, tasks: List[Task]) -> Dict:
         """
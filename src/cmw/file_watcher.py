@@ -0,0 +1,197 @@
+"""
+ファイル変更の監視
+
+coordination ディレクトリのファイル（tasks.json / progress.json など）の変更を待ちます。
+Linux では inotify を使用し、利用できない環境ではファイルの状態をポーリングします。
+"""
+
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import sys
+import time
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+# inotify の定数（<sys/inotify.h>）
+IN_MODIFY = 0x00000002
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+
+# 監視するイベント（os.replace による置き換えは IN_MOVED_TO として届く）
+WATCH_MASK = IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE | IN_DELETE
+
+# inotify_event 構造体のヘッダ（wd, mask, cookie, len）
+EVENT_HEADER = struct.Struct("iIII")
+
+# ファイルの状態（変更検出用）
+Signature = Optional[Tuple[int, int, int]]
+
+
+def _signature(path: Path) -> Signature:
+    """ファイルの変更検出用の状態（存在しない場合はNone）"""
+    try:
+        stat = path.stat()
+    except OSError:
+        return None
+    return (stat.st_mtime_ns, stat.st_size, stat.st_ino)
+
+
+class FileWatcher:
+    """
+    ファイルの変更を監視
+
+    ファイルは原子的に置き換えられることがあるため、inotify では親ディレクトリを
+    監視して対象のファイル名に一致するイベントのみを扱います。
+
+    Attributes:
+        paths: 監視するファイル
+        backend: "inotify" または "polling"
+    """
+
+    def __init__(
+        self, paths: Iterable[Path], poll_interval: float = 1.0, use_inotify: bool = True
+    ) -> None:
+        """
+        初期化
+
+        Args:
+            paths: 監視するファイル
+            poll_interval: ポーリング時の確認間隔（秒）
+            use_inotify: inotify を使用するか（False の場合は常にポーリング）
+        """
+        self.paths: List[Path] = [Path(p) for p in paths]
+        self.poll_interval = poll_interval
+        self._signatures: Dict[Path, Signature] = {p: _signature(p) for p in self.paths}
+        self._fd: Optional[int] = None
+        # 監視ディスクリプタ -> {ファイル名: パス}
+        self._watches: Dict[int, Dict[str, Path]] = {}
+
+        if use_inotify:
+            self._start_inotify()
+        self.backend = "inotify" if self._fd is not None else "polling"
+
+    def _start_inotify(self) -> None:
+        """inotify を初期化（利用できない場合はポーリングのまま）"""
+        if not sys.platform.startswith("linux"):
+            return
+        try:
+            libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+            fd = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        except (OSError, AttributeError):
+            return
+        if fd < 0:
+            return
+
+        directories: Dict[Path, Dict[str, Path]] = {}
+        for path in self.paths:
+            directories.setdefault(path.parent, {})[path.name] = path
+
+        for directory, names in directories.items():
+            wd = libc.inotify_add_watch(fd, os.fsencode(str(directory)), WATCH_MASK)
+            if wd < 0:
+                # ディレクトリがない等
+                os.close(fd)
+                self._watches.clear()
+                return
+            self._watches[wd] = names
+        self._fd = fd
+
+    def wait(self, timeout: Optional[float] = None) -> Set[Path]:
+        """
+        監視しているファイルのいずれかが変更されるまで待つ
+
+        Args:
+            timeout: 最大待ち時間（秒、None の場合は変更まで待ち続ける）
+
+        Returns:
+            変更されたファイル（タイムアウトした場合は空）
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+
+        while True:
+            remaining = None if deadline is None else max(0.0, deadline - time.monotonic())
+            if self._fd is not None:
+                changed = self._wait_inotify(remaining)
+            else:
+                changed = self._poll(remaining)
+
+            # 内容が変わっていないイベント（同じ内容での上書き等）は無視
+            changed = {path for path in changed if self._refresh(path)}
+            if changed or (deadline is not None and time.monotonic() >= deadline):
+                return changed
+
+    def _wait_inotify(self, timeout: Optional[float]) -> Set[Path]:
+        """inotify のイベントを待って読み出す"""
+        assert self._fd is not None
+        readable, _, _ = select.select([self._fd], [], [], timeout)
+        if not readable:
+            return set()
+
+        changed: Set[Path] = set()
+        try:
+            data = os.read(self._fd, 64 * 1024)
+        except BlockingIOError:
+            return changed
+
+        offset = 0
+        while offset + EVENT_HEADER.size <= len(data):
+            wd, _mask, _cookie, length = EVENT_HEADER.unpack_from(data, offset)
+            offset += EVENT_HEADER.size
+            name = data[offset : offset + length].rstrip(b"\0").decode("utf-8", "replace")
+            offset += length
+            path = self._watches.get(wd, {}).get(name)
+            if path is not None:
+                changed.add(path)
+        return changed
+
+    def _poll(self, timeout: Optional[float]) -> Set[Path]:
+        """ファイルの状態を定期的に確認"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            changed = {p for p in self.paths if _signature(p) != self._signatures[p]}
+            if changed:
+                return changed
+            if deadline is not None:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return set()
+                time.sleep(min(self.poll_interval, remaining))
+            else:
+                time.sleep(self.poll_interval)
+
+    def _refresh(self, path: Path) -> bool:
+        """記録した状態を更新し、変化があったかを返す"""
+        signature = _signature(path)
+        if signature == self._signatures.get(path):
+            return False
+        self._signatures[path] = signature
+        return True
+
+    def fileno(self) -> Optional[int]:
+        """
+        inotify のファイルディスクリプタ（ポーリングの場合はNone）
+
+        イベントループ（asyncio の add_reader など）で読み込み可能を待ち、
+        wait(0) で変更されたファイルを取り出すために使います。
+        """
+        return self._fd
+
+    def close(self) -> None:
+        """inotify を終了"""
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
+            self._watches.clear()
+
+    def __enter__(self) -> "FileWatcher":
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
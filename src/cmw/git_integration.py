@@ -4,37 +4,85 @@ Git Integration - Git連携による進捗自動更新
 Gitコミットメッセージからタスク完了を自動検出し、進捗を同期します。
 """
 
+import json
+import os
 import re
 import subprocess
+import time
 from pathlib import Path
-from typing import List, Set, Dict, Optional, Any
+from typing import List, Set, Dict, Optional, Any, Iterable, Iterator, Tuple
 
 from .coordinator import Coordinator
 from .models import TaskStatus
+from .task_id import DEFAULT_TASK_ID_SCHEME, TaskIdScheme
+
+
+# 処理済みコミット（ウォーターマーク）とタスクごとの最新の参照を保存するファイル
+# （coordinationディレクトリ内）
+SYNC_STATE_FILE = "git_sync.json"
+
+# git log の出力フォーマット（ハッシュ、コミット日時、件名）
+LOG_FORMAT = "%H|||%ct|||%s"
+
+# git log --name-only でコミット行と変更ファイル行を区別するための先頭文字
+COMMIT_MARKER = "\x1e"
+FILES_LOG_FORMAT = "%x1e%H|||%ct"
+
+# 変更ファイルの照合を反映したコミット（ウォーターマーク）のキー接尾辞
+FILES_STATE_SUFFIX = "#files"
 
 
 class GitIntegration:
     """Git連携機能を提供するクラス"""
 
-    def __init__(self) -> None:
-        """GitIntegrationを初期化"""
-        self.task_pattern = re.compile(r"TASK-\d{3}")
+    def __init__(self, id_scheme: Optional[TaskIdScheme] = None) -> None:
+        """
+        GitIntegrationを初期化
+
+        Args:
+            id_scheme: タスクIDの形式（デフォルト: TASK-001 形式）
+        """
+        self.id_scheme = id_scheme or DEFAULT_TASK_ID_SCHEME
+        self.task_pattern = self.id_scheme.pattern
+        # (プロジェクトパス, ブランチ) -> タスクID -> 参照コミットのリスト（新しい順）
+        self._indexes: Dict[Tuple[str, str], Dict[str, List[Dict[str, Any]]]] = {}
+        # (プロジェクトパス, ブランチ) -> タスクID -> 最新の参照（_refresh_index の結果）
+        self._references: Dict[Tuple[str, str], Dict[str, Dict[str, Any]]] = {}
 
     def sync_progress_from_git(
-        self, project_path: Path, since: Optional[str] = None, branch: str = "HEAD"
+        self,
+        project_path: Path,
+        since: Optional[str] = None,
+        branch: str = "HEAD",
+        full: bool = False,
+        match_files: bool = False,
+        dry_run: bool = False,
+        mark_files: bool = False,
     ) -> Dict[str, Any]:
         """
         Gitコミット履歴から進捗を同期
 
+        前回処理したコミットを記録し、2回目以降は新しいコミット（last..branch）のみを
+        読み込みます。リベース等で前回のコミットが履歴から外れた場合は全件を再スキャンします。
+        dry_run の場合は検出のみ行い、git_sync.json と progress.json は更新しません。
+
         Args:
             project_path: プロジェクトパス
             since: コミット検索の開始時点（例: "1.day.ago", "1.week.ago", "2025-01-01"）
                    Noneの場合は全履歴を検索
             branch: ブランチ名（デフォルト: HEAD）
+            full: Trueの場合は前回の記録を無視して全件をスキャン
+            match_files: Trueの場合、変更ファイルと target_files を照合して結果を報告
+                （ステータスは変更しない）
+            dry_run: Trueの場合は検出のみ（updated_count は更新対象の件数）
+            mark_files: Trueの場合、変更ファイルの照合結果で完了・作業中をマーク
+                （match_files を含む）
 
         Returns:
             {
                 'completed_tasks': ['TASK-001', 'TASK-002'],
+                'file_completed_tasks': ['TASK-004'],  # 全ての target_files が変更済み
+                'partial_tasks': ['TASK-003'],  # 一部の target_files のみ変更済み
                 'updated_count': 2,
                 'skipped_count': 0,
                 'commits_analyzed': 10
@@ -44,78 +92,480 @@ class GitIntegration:
         if not self._is_git_repo(project_path):
             raise ValueError(f"{project_path} はGitリポジトリではありません")
 
-        # コミットログを取得
-        commits = self._get_commit_log(project_path, since, branch)
-
-        # コミットメッセージからタスクIDを抽出
-        completed_tasks = self._extract_task_ids(commits)
+        # 前回以降のコミットのみ読み込んで、期間内に参照されているタスクIDを抽出
+        commits_analyzed, completed_tasks = self._scan_completed_tasks(
+            project_path, since, branch, full, persist=not dry_run
+        )
+
+        # 変更ファイルから進捗を検出（mark_files の場合のみステータスに反映）
+        file_progress: Dict[str, Dict[str, Any]] = {}
+        file_head: Optional[str] = None
+        if match_files or mark_files:
+            detected = self.detect_file_progress(project_path, since, branch, full)
+            file_progress = detected["tasks"]
+            file_head = detected["head"]
+        file_completed = {
+            task_id
+            for task_id, progress in file_progress.items()
+            if len(progress["touched"]) == progress["total"]
+        }
+        if mark_files:
+            completed_tasks |= file_completed
+        partial_tasks = set(file_progress) - file_completed - completed_tasks
 
-        # 進捗を更新
+        # 進捗を更新（progress.json の保存は1回）
         coordinator = Coordinator(project_path)
-        updated_count = 0
-        skipped_count = 0
-
-        for task_id in completed_tasks:
-            if task_id in coordinator.tasks:
-                task = coordinator.tasks[task_id]
-                if task.status != TaskStatus.COMPLETED:
-                    coordinator.update_task_status(task_id, TaskStatus.COMPLETED)
-                    updated_count += 1
-                else:
-                    skipped_count += 1
+        known_tasks = [task_id for task_id in completed_tasks if task_id in coordinator.tasks]
+        pending_tasks = [
+            task_id
+            for task_id in known_tasks
+            if coordinator.tasks[task_id].status != TaskStatus.COMPLETED
+        ]
+        if not dry_run:
+            marked_files = file_progress if mark_files else {}
+            with coordinator.batch():
+                coordinator.update_many(
+                    [task_id for task_id in pending_tasks if task_id not in marked_files],
+                    TaskStatus.COMPLETED,
+                )
+                # 変更ファイルで完了を検出したタスクは変更ファイルを成果物として記録
+                for task_id in pending_tasks:
+                    if task_id in marked_files:
+                        coordinator.update_task_status(
+                            task_id,
+                            TaskStatus.COMPLETED,
+                            artifacts=marked_files[task_id]["touched"],
+                        )
+
+                # 一部のファイルのみ変更されたタスクは作業中として成果物を記録
+                for task_id in sorted(partial_tasks if mark_files else ()):
+                    task = coordinator.tasks.get(task_id)
+                    if task and task.status in (TaskStatus.PENDING, TaskStatus.IN_PROGRESS):
+                        coordinator.update_task_status(
+                            task_id,
+                            TaskStatus.IN_PROGRESS,
+                            artifacts=marked_files[task_id]["touched"],
+                        )
+            if mark_files and file_head:
+                self._save_file_watermark(project_path, branch, file_head)
+        updated_count = len(pending_tasks)
+        skipped_count = len(known_tasks) - len(pending_tasks)
 
         return {
             "completed_tasks": sorted(completed_tasks),
+            "file_completed_tasks": sorted(file_completed),
+            "partial_tasks": sorted(partial_tasks),
             "updated_count": updated_count,
             "skipped_count": skipped_count,
-            "commits_analyzed": len(commits),
+            "commits_analyzed": commits_analyzed,
         }
 
+    def find_completed_tasks(
+        self,
+        project_path: Path,
+        since: Optional[str] = None,
+        branch: str = "HEAD",
+        full: bool = False,
+    ) -> Set[str]:
+        """
+        コミットで参照されているタスクIDを取得（progress.json は更新しない）
+
+        sync_progress_from_git と同じく、2回目以降は新しいコミットのみを読み込みます。
+        進捗を別の場所で管理している場合（TaskLoop など）に使います。
+
+        Args:
+            project_path: プロジェクトパス
+            since: コミット検索の開始時点（Noneの場合は全履歴）
+            branch: ブランチ名
+            full: Trueの場合は前回の記録を無視して全件をスキャン
+
+        Returns:
+            タスクIDの集合
+        """
+        if not self._is_git_repo(project_path):
+            raise ValueError(f"{project_path} はGitリポジトリではありません")
+        return self._scan_completed_tasks(project_path, since, branch, full)[1]
+
+    def _scan_completed_tasks(
+        self,
+        project_path: Path,
+        since: Optional[str],
+        branch: str,
+        full: bool,
+        persist: bool = True,
+    ) -> Tuple[int, Set[str]]:
+        """
+        ウォーターマーク以降を読み込み、期間内に参照されたタスクIDを求める
+
+        Returns:
+            (読み込んだコミット数, 期間内に参照されたタスクID)
+        """
+        commits_analyzed, latest = self._refresh_index(project_path, branch, full, persist)
+
+        cutoff = self._resolve_since(project_path, since) if since else None
+        task_ids = {
+            task_id
+            for task_id, reference in latest.items()
+            if cutoff is None or reference["timestamp"] >= cutoff
+        }
+        return commits_analyzed, task_ids
+
     def _is_git_repo(self, path: Path) -> bool:
         """ディレクトリがGitリポジトリかチェック"""
         git_dir = path / ".git"
         return git_dir.exists() and git_dir.is_dir()
 
-    def _get_commit_log(
-        self, project_path: Path, since: Optional[str], branch: str
-    ) -> List[Dict[str, str]]:
+    def clear_cache(self) -> None:
+        """メモリ上のタスク参照インデックスをクリア"""
+        self._indexes.clear()
+        self._references.clear()
+
+    def _get_index(self, project_path: Path, branch: str) -> Dict[str, List[Dict[str, Any]]]:
         """
-        Gitコミットログを取得
+        タスクID -> 参照コミットのインデックスを取得（クエリ用、ファイルには保存しない）
+
+        同じインスタンスでは一度構築したインデックスを再利用します。
+        """
+        key = (str(project_path), branch)
+        if key not in self._indexes:
+            commits = self._iter_commit_log(project_path, None, branch)
+            self._indexes[key] = self._build_index(commits)
+        return self._indexes[key]
+
+    def _build_index(
+        self, commits: Iterable[Dict[str, Any]]
+    ) -> Dict[str, List[Dict[str, Any]]]:
+        """コミット（新しい順）からタスクID -> 参照コミットのリストを構築"""
+        index: Dict[str, List[Dict[str, Any]]] = {}
+        for commit in commits:
+            for task_id in sorted(set(self.task_pattern.findall(commit["message"]))):
+                index.setdefault(task_id, []).append(commit)
+        return index
+
+    def _refresh_index(
+        self, project_path: Path, branch: str, full: bool = False, persist: bool = True
+    ) -> Tuple[int, Dict[str, Dict[str, Any]]]:
+        """
+        前回のウォーターマーク以降のコミットを読み込み、タスクごとの最新の参照を更新
+
+        ブランチごとにウォーターマークと、タスクID -> 最新の参照コミット（ハッシュ・日時）のみを
+        coordination/git_sync.json に保存します（コミットメッセージは保存しません）。
+
+        Args:
+            project_path: プロジェクトパス
+            branch: ブランチ名
+            full: Trueの場合は全件を再スキャン
+            persist: Falseの場合は git_sync.json を更新しない（dry-run）
 
         Returns:
-            [
-                {'hash': 'abc123', 'message': 'feat: TASK-001 実装完了'},
-                {'hash': 'def456', 'message': 'fix: TASK-002 バグ修正'},
-            ]
+            (新しく読み込んだコミット数, タスクID -> {'hash', 'timestamp'}（最新の参照）)
         """
-        # git log コマンドを構築
-        cmd = ["git", "log", "--pretty=format:%H|||%s", branch]
+        state_path = project_path / "shared" / "coordination" / SYNC_STATE_FILE
+        state = self._load_sync_state(state_path)
+        entry = state.get(branch, {})
+        if "tasks" not in entry:
+            # 旧形式（コミットメッセージを含むインデックス）は全件を再スキャンして置き換える
+            entry = {}
+
+        rev, incremental = self._scan_range(project_path, entry, branch, full)
+        last_commit = entry.get("last_commit") if incremental else None
+        latest: Dict[str, Dict[str, Any]] = dict(entry.get("tasks", {})) if incremental else {}
+
+        commits: List[Dict[str, Any]] = []
+        for commit in self._iter_commit_log(project_path, None, rev):
+            commits.append(commit)
+        if commits:
+            last_commit = commits[0]["hash"]
+
+        new_index = self._build_index(commits)
+        for task_id, task_commits in new_index.items():
+            # 新しい順に読むため、先頭が最新の参照
+            latest[task_id] = {
+                "hash": task_commits[0]["hash"],
+                "timestamp": task_commits[0]["timestamp"],
+            }
 
-        if since:
-            cmd.insert(2, f"--since={since}")
+        key = (str(project_path), branch)
+        if not incremental:
+            # 全件を読み込んだ場合はクエリ用のインデックスとして再利用（ファイルには保存しない）
+            self._indexes[key] = new_index
+        self._references[key] = latest
+        if persist and (commits or not incremental):
+            state[branch] = {"last_commit": last_commit, "tasks": latest}
+            self._save_sync_state(state_path, state)
+
+        return len(commits), latest
+
+    def _save_file_watermark(self, project_path: Path, branch: str, head: str) -> None:
+        """変更ファイルの照合を反映したコミットを記録"""
+        state_path = project_path / "shared" / "coordination" / SYNC_STATE_FILE
+        state = self._load_sync_state(state_path)
+        state[branch + FILES_STATE_SUFFIX] = {"last_commit": head}
+        self._save_sync_state(state_path, state)
+
+    def _rev_parse(self, project_path: Path, rev: str) -> str:
+        """リビジョンをコミットハッシュに解決"""
+        result = subprocess.run(
+            ["git", "rev-parse", "--verify", f"{rev}^{{commit}}"],
+            cwd=project_path,
+            capture_output=True,
+            text=True,
+        )
+        if result.returncode != 0:
+            raise RuntimeError(f"リビジョンの解決エラー: {result.stderr.strip()}")
+        return result.stdout.strip()
+
+    def _scan_range(
+        self, project_path: Path, entry: Dict[str, Any], branch: str, full: bool
+    ) -> Tuple[str, bool]:
+        """
+        ウォーターマークから読み込む範囲を決定
 
+        Returns:
+            (git log に渡すリビジョン範囲, 差分読み込みかどうか)
+        """
+        last_commit = None if full else entry.get("last_commit")
+        if last_commit and self._is_ancestor(project_path, last_commit, branch):
+            return f"{last_commit}..{branch}", True
+        # 初回・リベース後・強制時は全件スキャン
+        return branch, False
+
+    def _is_ancestor(self, project_path: Path, commit: str, branch: str) -> bool:
+        """commitがbranchの祖先か（リベースで履歴から外れていないか）をチェック"""
+        result = subprocess.run(
+            ["git", "merge-base", "--is-ancestor", commit, branch],
+            cwd=project_path,
+            capture_output=True,
+            text=True,
+        )
+        return result.returncode == 0
+
+    def _resolve_since(self, project_path: Path, since: str) -> int:
+        """
+        --since 形式の日時指定をUNIX時刻に変換
+
+        "1.week.ago" 等のgit独自の表記を解釈するため git rev-parse を使用します
+        （履歴は走査しません）。
+        """
         try:
             result = subprocess.run(
-                cmd, cwd=project_path, capture_output=True, text=True, check=True
+                ["git", "rev-parse", f"--since={since}"],
+                cwd=project_path,
+                capture_output=True,
+                text=True,
+                check=True,
             )
         except subprocess.CalledProcessError as e:
-            raise RuntimeError(f"Git log取得エラー: {e.stderr}")
+            raise RuntimeError(f"日時指定の解釈エラー: {e.stderr}")
+
+        # 出力例: --max-age=1700000000
+        match = re.search(r"--max-age=(\d+)", result.stdout)
+        if not match:
+            raise ValueError(f"日時指定を解釈できません: {since}")
+        return int(match.group(1))
+
+    def _load_sync_state(self, state_path: Path) -> Dict[str, Any]:
+        """ウォーターマークを読み込む（破損時は空として扱う）"""
+        if not state_path.exists():
+            return {}
+        try:
+            data = json.loads(state_path.read_text(encoding="utf-8"))
+        except (json.JSONDecodeError, OSError):
+            return {}
+        return data if isinstance(data, dict) else {}
+
+    def _save_sync_state(self, state_path: Path, state: Dict[str, Any]) -> None:
+        """ウォーターマークを保存（一時ファイルへの書き込み後に置き換え）"""
+        state_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = state_path.with_name(f".{state_path.name}.{os.getpid()}.tmp")
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(state, f, ensure_ascii=False, indent=2)
+            os.replace(tmp_path, state_path)
+        except BaseException:
+            if tmp_path.exists():
+                tmp_path.unlink()
+            raise
+
+    def _iter_commit_log(
+        self, project_path: Path, since: Optional[str], branch: str
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Gitコミットログを1行ずつ読み込む
+
+        Yields:
+            {'hash': 'abc123', 'timestamp': 1700000000, 'message': 'feat: TASK-001 実装完了'}
+        """
+        # git log コマンドを構築
+        cmd = ["git", "log", f"--pretty=format:{LOG_FORMAT}", branch]
+
+        if since:
+            cmd.insert(2, f"--since={since}")
 
-        commits = []
-        for line in result.stdout.strip().split("\n"):
+        return self._parse_commit_log(project_path, cmd)
+
+    def _iter_commits(self, project_path: Path, hashes: List[str]) -> Iterator[Dict[str, Any]]:
+        """指定したコミットのみを読み込む（履歴は走査しない）"""
+        cmd = ["git", "log", "--no-walk=unsorted", f"--pretty=format:{LOG_FORMAT}", *hashes]
+        return self._parse_commit_log(project_path, cmd)
+
+    def _parse_commit_log(self, project_path: Path, cmd: List[str]) -> Iterator[Dict[str, Any]]:
+        """LOG_FORMAT 形式の git log の出力をコミットごとに返す"""
+        for line in self._stream_git_lines(project_path, cmd):
             if not line:
                 continue
 
             try:
-                commit_hash, message = line.split("|||", 1)
-                commits.append({"hash": commit_hash, "message": message})
+                commit_hash, timestamp, message = line.split("|||", 2)
+                yield {"hash": commit_hash, "timestamp": int(timestamp), "message": message}
             except ValueError:
                 # パースエラーは無視
                 continue
 
-        return commits
+    def _iter_changed_files(
+        self, project_path: Path, rev: str, since: Optional[str] = None
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        コミットごとの追加・変更されたファイルを1行ずつ読み込む（削除は含めない）
+
+        Yields:
+            {'hash': 'abc123', 'timestamp': 1700000000, 'files': ['backend/models.py']}
+        """
+        cmd = [
+            "git", "log", "--name-only", "--diff-filter=d", f"--pretty=format:{FILES_LOG_FORMAT}",
+            rev,
+        ]
+        if since:
+            cmd.insert(2, f"--since={since}")
+
+        commit: Optional[Dict[str, Any]] = None
+        for line in self._stream_git_lines(project_path, cmd):
+            if line.startswith(COMMIT_MARKER):
+                if commit:
+                    yield commit
+                try:
+                    commit_hash, timestamp = line[len(COMMIT_MARKER):].split("|||", 1)
+                    commit = {"hash": commit_hash, "timestamp": int(timestamp), "files": []}
+                except ValueError:
+                    # パースエラーは無視
+                    commit = None
+            elif line and commit is not None:
+                commit["files"].append(line)
+
+        if commit:
+            yield commit
+
+    def _stream_git_lines(self, project_path: Path, cmd: List[str]) -> Iterator[str]:
+        """
+        gitコマンドの標準出力を1行ずつ返す
+
+        標準出力をバッファせずに逐次読み込むため、履歴が大きくてもメモリ使用量は一定です。
+        """
+        with subprocess.Popen(
+            cmd,
+            cwd=project_path,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            text=True,
+            encoding="utf-8",
+            errors="replace",
+        ) as process:
+            assert process.stdout is not None
+            for line in process.stdout:
+                yield line.rstrip("\n")
+
+            stderr = process.stderr.read() if process.stderr else ""
+            if process.wait() != 0:
+                raise RuntimeError(f"Git log取得エラー: {stderr}")
 
-    def _extract_task_ids(self, commits: List[Dict[str, str]]) -> Set[str]:
+    def _get_commit_log(
+        self, project_path: Path, since: Optional[str], branch: str
+    ) -> List[Dict[str, Any]]:
+        """
+        Gitコミットログを取得
+
+        Returns:
+            [
+                {'hash': 'abc123', 'timestamp': 1700000000, 'message': 'feat: TASK-001 実装完了'},
+                {'hash': 'def456', 'timestamp': 1700000000, 'message': 'fix: TASK-002 バグ修正'},
+            ]
+        """
+        return list(self._iter_commit_log(project_path, since, branch))
+
+    def detect_file_progress(
+        self,
+        project_path: Path,
+        since: Optional[str] = None,
+        branch: str = "HEAD",
+        full: bool = False,
+    ) -> Dict[str, Any]:
+        """
+        変更されたファイルと各タスクの target_files を照合して進捗を検出（読み取りのみ）
+
+        since を指定した場合はその期間、指定しない場合は前回 mark_files で反映したコミット
+        以降（初回は全履歴）の追加・変更されたファイルのみを照合します。削除は変更として
+        扱いません。既に成果物として記録済みの target_files は変更済みとみなします。
+
+        Args:
+            project_path: プロジェクトパス
+            since: コミット検索の開始時点（Noneの場合は前回の反映以降）
+            branch: ブランチ名
+            full: Trueの場合は前回の記録を無視して全件をスキャン
+
+        Returns:
+            {
+                'commits_analyzed': 10,
+                'head': 'abc123...',  # 照合したコミット範囲の先頭
+                'tasks': {
+                    'TASK-001': {'touched': ['backend/models.py'], 'total': 1},
+                }
+            }
+        """
+        from .static_analyzer import split_symbol_target
+
+        head = self._rev_parse(project_path, branch)
+        if since:
+            rev = head
+        else:
+            state = self._load_sync_state(
+                project_path / "shared" / "coordination" / SYNC_STATE_FILE
+            )
+            rev, _ = self._scan_range(
+                project_path, state.get(branch + FILES_STATE_SUFFIX, {}), head, full
+            )
+
+        commits_analyzed = 0
+        changed: Set[str] = set()
+        for commit in self._iter_changed_files(project_path, rev, since):
+            commits_analyzed += 1
+            changed.update(commit["files"])
+
+        coordinator = Coordinator(project_path)
+        tasks: Dict[str, Dict[str, Any]] = {}
+        for task in coordinator.tasks.values():
+            targets = sorted(
+                {split_symbol_target(t)[0].removeprefix("./") for t in task.target_files}
+            )
+            if not targets:
+                continue
+
+            touched = []
+            for target in targets:
+                if target.endswith("/"):
+                    # ディレクトリ指定は配下のいずれかの変更で一致
+                    if any(path.startswith(target) for path in changed):
+                        touched.append(target)
+                elif target in changed:
+                    touched.append(target)
+
+            if touched:
+                recorded = {path.removeprefix("./") for path in task.artifacts}
+                touched = [t for t in targets if t in touched or t in recorded]
+                tasks[task.id] = {"touched": touched, "total": len(targets)}
+
+        return {"commits_analyzed": commits_analyzed, "head": head, "tasks": tasks}
+
+    def _extract_task_ids(self, commits: List[Dict[str, Any]]) -> Set[str]:
         """
         コミットメッセージからタスクIDを抽出
 
@@ -129,7 +579,7 @@ class GitIntegration:
 
         for commit in commits:
             message = commit["message"]
-            # TASK-XXX パターンを検索
+            # タスクIDパターンを検索
             matches = self.task_pattern.findall(message)
             task_ids.update(matches)
 
@@ -137,7 +587,7 @@ class GitIntegration:
 
     def get_task_commits(
         self, project_path: Path, task_id: str, branch: str = "HEAD"
-    ) -> List[Dict[str, str]]:
+    ) -> List[Dict[str, Any]]:
         """
         特定のタスクに関連するコミットを取得
 
@@ -147,15 +597,9 @@ class GitIntegration:
             branch: ブランチ名
 
         Returns:
-            コミット情報のリスト
+            コミット情報のリスト（新しい順）
         """
-        # 全コミットを取得
-        commits = self._get_commit_log(project_path, since=None, branch=branch)
-
-        # task_idを含むコミットのみフィルタ
-        task_commits = [commit for commit in commits if task_id in commit["message"]]
-
-        return task_commits
+        return list(self._get_index(project_path, branch).get(task_id, []))
 
     def get_recent_activity(self, project_path: Path, days: int = 7) -> Dict[str, List[str]]:
         """
@@ -171,41 +615,41 @@ class GitIntegration:
                 'TASK-002': ['ghi789']
             }
         """
-        since = f"{days}.days.ago"
-        commits = self._get_commit_log(project_path, since, "HEAD")
+        cutoff = time.time() - days * 24 * 60 * 60
+        index = self._get_index(project_path, "HEAD")
 
         # タスクIDごとにコミットハッシュを集める
         activity: Dict[str, List[str]] = {}
 
-        for commit in commits:
-            task_ids = self.task_pattern.findall(commit["message"])
-            for task_id in task_ids:
-                if task_id not in activity:
-                    activity[task_id] = []
-                activity[task_id].append(commit["hash"])
+        for task_id, commits in index.items():
+            hashes = [commit["hash"] for commit in commits if commit["timestamp"] >= cutoff]
+            if hashes:
+                activity[task_id] = hashes
 
         return activity
 
-    def validate_task_references(self, project_path: Path) -> Dict[str, Any]:
+    def validate_task_references(self, project_path: Path, branch: str = "HEAD") -> Dict[str, Any]:
         """
         コミットメッセージ内のタスク参照を検証
 
-        存在しないタスクIDを参照しているコミットを検出
+        存在しないタスクIDを参照しているコミットを検出します。git_sync.json のタスクごとの
+        最新の参照に、前回のウォーターマーク以降のコミットのみを加えて検証するため、
+        全履歴は読み込みません（git_sync.json は更新しません）。
 
         Returns:
             {
                 'valid': ['TASK-001', 'TASK-002'],
                 'invalid': ['TASK-999'],
-                'invalid_commits': [
+                'invalid_commits': [  # 不正なタスクIDごとの最新の参照コミット
                     {'hash': 'abc123', 'message': 'fix: TASK-999', 'task_id': 'TASK-999'}
                 ]
             }
         """
-        # 全コミットを取得
-        commits = self._get_commit_log(project_path, since=None, branch="HEAD")
-
-        # コミットメッセージから全タスクIDを抽出
-        referenced_tasks = self._extract_task_ids(commits)
+        # タスクごとの最新の参照を取得（同期済みなら再利用）
+        references = self._references.get((str(project_path), branch))
+        if references is None:
+            references = self._refresh_index(project_path, branch, persist=False)[1]
+        referenced_tasks = set(references)
 
         # 存在するタスクIDを取得
         coordinator = Coordinator(project_path)
@@ -215,13 +659,22 @@ class GitIntegration:
         valid = referenced_tasks & valid_task_ids
         invalid = referenced_tasks - valid_task_ids
 
-        # 不正なタスクIDを含むコミットを特定
+        # 不正なタスクIDを含むコミットのメッセージのみを読み込む
         invalid_commits = []
-        for commit in commits:
-            commit_task_ids = set(self.task_pattern.findall(commit["message"]))
-            for task_id in commit_task_ids & invalid:
+        if invalid:
+            hashes = list(dict.fromkeys(references[task_id]["hash"] for task_id in sorted(invalid)))
+            messages = {
+                commit["hash"]: commit["message"]
+                for commit in self._iter_commits(project_path, hashes)
+            }
+            for task_id in sorted(invalid):
+                commit_hash = references[task_id]["hash"]
                 invalid_commits.append(
-                    {"hash": commit["hash"][:7], "message": commit["message"], "task_id": task_id}
+                    {
+                        "hash": commit_hash[:7],
+                        "message": messages.get(commit_hash, ""),
+                        "task_id": task_id,
+                    }
                 )
 
         return {
@@ -233,7 +233,7 @@ class GraphVisualizer:
         try:
             # トポロジカルソート順でタスクを取得
             topo_order = list(nx.topological_sort(self.graph))
-        except nx.NetworkXError:
+        except (nx.NetworkXError, nx.NetworkXUnfeasible):
             # サイクルがある場合は空リストを返す
             return []
 
@@ -0,0 +1,295 @@
+"""
+タスクのリース - 複数セッションでの安全なタスクの確保
+
+タスクの確保を期限付きのリース（所有者・トークン・期限）として
+shared/coordination/leases.json に記録します。
+
+- acquire(): 他のセッションが有効なリースを持っていなければ確保
+- renew(): ハートビートで期限を延長（期限切れで奪われていれば LeaseError）
+- reclaim_expired(): 期限の切れたリースを回収（クラッシュしたセッションのタスクを解放）
+- check(): 完了・失敗の記録を受け付けられるかを確認（リースは変更しない）
+- finish(): 完了・失敗の記録をトークンで1回だけ受け付ける（再送は False を返して無視）
+
+leases.json の読み書きは専用のロックファイル（.leases.lock）で直列化します。
+"""
+
+import json
+import os
+import socket
+import time
+import uuid
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, TypedDict
+
+from .state_manager import StateManager
+
+# リースの有効期間（秒）
+DEFAULT_LEASE_TTL = 600.0
+
+# 完了・失敗を記録したトークンを覚えておく数
+MAX_FINISHED = 1000
+
+
+class LeaseError(RuntimeError):
+    """リースが無効（期限切れで回収された・他のセッションが保持している）"""
+
+
+def default_owner() -> str:
+    """このプロセスを表す所有者ID（ホスト名:PID）"""
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+@dataclass
+class Lease:
+    """タスクのリース"""
+
+    task_id: str
+    owner: str
+    token: str
+    acquired_at: float
+    expires_at: float
+
+    def is_expired(self, now: Optional[float] = None) -> bool:
+        return (time.time() if now is None else now) >= self.expires_at
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "Lease":
+        return cls(
+            task_id=data["task_id"],
+            owner=data["owner"],
+            token=data["token"],
+            acquired_at=float(data["acquired_at"]),
+            expires_at=float(data["expires_at"]),
+        )
+
+
+class LeaseState(TypedDict):
+    """leases.json の内容（有効なリースと記録済みのトークン）"""
+
+    leases: Dict[str, Lease]
+    finished: Dict[str, Dict[str, str]]
+
+
+class LeaseManager:
+    """leases.json でタスクのリースを管理"""
+
+    def __init__(self, project_path: Path, ttl: float = DEFAULT_LEASE_TTL) -> None:
+        """
+        Args:
+            project_path: プロジェクトのルートパス
+            ttl: リースの有効期間（秒）
+        """
+        if ttl <= 0:
+            raise ValueError("ttl は0より大きい値を指定してください")
+
+        self.project_path = Path(project_path)
+        self.ttl = ttl
+        self.leases_file = self.project_path / "shared" / "coordination" / "leases.json"
+        self._lock = StateManager(self.project_path, lock_name=".leases.lock")
+
+    def acquire(self, task_id: str, owner: str, ttl: Optional[float] = None) -> Optional[Lease]:
+        """
+        タスクのリースを取得
+
+        同じ所有者が既に有効なリースを持っている場合は期限を延長して返します。
+
+        Args:
+            task_id: タスクID
+            owner: 所有者ID（セッション・ワーカー）
+            ttl: 有効期間（秒、None の場合は既定値）
+
+        Returns:
+            取得したリース（他の所有者が有効なリースを持っている場合は None）
+        """
+        now = time.time()
+        with self._locked() as state:
+            current = state["leases"].get(task_id)
+            if current is not None and not current.is_expired(now):
+                if current.owner != owner:
+                    return None
+                current.expires_at = now + (ttl or self.ttl)
+                return current
+
+            lease = Lease(
+                task_id=task_id,
+                owner=owner,
+                token=uuid.uuid4().hex,
+                acquired_at=now,
+                expires_at=now + (ttl or self.ttl),
+            )
+            state["leases"][task_id] = lease
+            return lease
+
+    def renew(self, token: str, ttl: Optional[float] = None) -> Lease:
+        """
+        ハートビート: リースの期限を延長
+
+        期限が切れていても、他のセッションに回収・取得されていなければ延長できます。
+
+        Raises:
+            LeaseError: リースが回収された・他のセッションが取得した場合
+        """
+        with self._locked() as state:
+            lease = self._find(state, token)
+            if lease is None:
+                raise LeaseError("リースが見つかりません（期限切れで回収された可能性があります）")
+            lease.expires_at = time.time() + (ttl or self.ttl)
+            return lease
+
+    def release(self, token: str) -> bool:
+        """
+        リースを解放（タスクは実行待ちに戻す側で扱う）
+
+        Returns:
+            解放したか（既に存在しない場合は False）
+        """
+        with self._locked() as state:
+            lease = self._find(state, token)
+            if lease is None:
+                return False
+            del state["leases"][lease.task_id]
+            return True
+
+    def check(self, token: str, task_id: Optional[str] = None) -> bool:
+        """
+        完了・失敗の記録を受け付けられるかを確認（リースは変更しない）
+
+        記録を保存する前に確認し、保存に成功してから finish() を呼びます。
+
+        Args:
+            token: リースのトークン
+            task_id: 対象のタスクID（指定した場合はリースのタスクと一致するか確認）
+
+        Returns:
+            記録すべきか（同じトークンで記録済みの場合は False）
+
+        Raises:
+            LeaseError: リースが回収された・他のタスクのリースの場合
+        """
+        state = self._read()
+        if token in state["finished"]:
+            return False
+        lease = self._find(state, token)
+        if lease is None:
+            raise LeaseError("リースが見つかりません（期限切れで回収された可能性があります）")
+        if task_id is not None and lease.task_id != task_id:
+            raise LeaseError(f"トークンは {lease.task_id} のリースです")
+        return True
+
+    def finish(self, token: str, outcome: str) -> bool:
+        """
+        完了・失敗の記録をトークンで1回だけ受け付け、リースを解放
+
+        Args:
+            token: リースのトークン
+            outcome: 結果（"completed" / "failed"）
+
+        Returns:
+            記録すべきか（同じトークンで記録済みの場合は False）
+
+        Raises:
+            LeaseError: リースが回収され、他のセッションが取得した場合
+        """
+        with self._locked() as state:
+            if token in state["finished"]:
+                return False
+            lease = self._find(state, token)
+            if lease is None:
+                raise LeaseError("リースが見つかりません（期限切れで回収された可能性があります）")
+
+            del state["leases"][lease.task_id]
+            state["finished"][token] = {"task_id": lease.task_id, "outcome": outcome}
+            return True
+
+    def get(self, task_id: str) -> Optional[Lease]:
+        """タスクの有効なリース（なければ None）"""
+        lease = self._read()["leases"].get(task_id)
+        if lease is None or lease.is_expired():
+            return None
+        return lease
+
+    def active(self) -> Dict[str, Lease]:
+        """有効なリース（タスクID -> リース）"""
+        now = time.time()
+        return {
+            task_id: lease
+            for task_id, lease in self._read()["leases"].items()
+            if not lease.is_expired(now)
+        }
+
+    def reclaim_expired(self) -> List[Lease]:
+        """
+        期限の切れたリースを回収
+
+        Returns:
+            回収したリース（タスクは呼び出し側で実行待ちに戻す）
+        """
+        now = time.time()
+        with self._locked() as state:
+            expired = [lease for lease in state["leases"].values() if lease.is_expired(now)]
+            for lease in expired:
+                del state["leases"][lease.task_id]
+            return expired
+
+    # === プライベートメソッド ===
+
+    @staticmethod
+    def _find(state: LeaseState, token: str) -> Optional[Lease]:
+        for lease in state["leases"].values():
+            if lease.token == token:
+                return lease
+        return None
+
+    def _read(self) -> LeaseState:
+        """leases.json を読み込む（存在しない・壊れている場合は空）"""
+        try:
+            with open(self.leases_file, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            data = {}
+        return {
+            "leases": {
+                task_id: Lease.from_dict(entry)
+                for task_id, entry in data.get("leases", {}).items()
+            },
+            "finished": dict(data.get("finished", {})),
+        }
+
+    def _write(self, state: LeaseState) -> None:
+        """leases.json を保存（一時ファイルへの書き込み後に置き換え）"""
+        finished = state["finished"]
+        # 古い記録から捨てる（dict は挿入順）
+        for token in list(finished)[: max(0, len(finished) - MAX_FINISHED)]:
+            del finished[token]
+
+        data = {
+            "leases": {task_id: lease.to_dict() for task_id, lease in state["leases"].items()},
+            "finished": finished,
+        }
+        self.leases_file.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.leases_file.with_name(f".{self.leases_file.name}.{os.getpid()}.tmp")
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(data, f, indent=2, ensure_ascii=False)
+            os.replace(tmp_path, self.leases_file)
+        except BaseException:
+            if tmp_path.exists():
+                tmp_path.unlink()
+            raise
+
+    @contextmanager
+    def _locked(self) -> Iterator[LeaseState]:
+        """ロックを取得して leases.json を読み込み、ブロックの終了時に保存"""
+        if not self._lock.acquire_lock():
+            raise LeaseError("leases.json のロックを取得できません")
+        try:
+            state = self._read()
+            yield state
+            self._write(state)
+        finally:
+            self._lock.release_lock()
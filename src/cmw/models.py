@@ -9,6 +9,8 @@ from enum import Enum
 from typing import Optional, List
 from datetime import datetime
 
+from .task_id import parse_task_ordinal
+
 
 class TaskStatus(str, Enum):
     """タスクの実行ステータス"""
@@ -49,9 +51,13 @@ class Task:
     artifacts: List[str] = field(default_factory=list)  # 生成されたファイルのパス
     error_message: Optional[str] = None
     error: Optional[str] = None  # エラー詳細（error_messageと互換性のため）
+    # IDの連番（順序比較用、IDから自動設定・シリアライズしない）
+    ordinal: Optional[int] = field(default=None, compare=False, repr=False)
 
     def __post_init__(self) -> None:
         """初期化後の処理"""
+        if self.ordinal is None:
+            self.ordinal = parse_task_ordinal(self.id)
         if self.created_at is None:
             self.created_at = datetime.now()
         if self.updated_at is None:
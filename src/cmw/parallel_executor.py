@@ -10,6 +10,7 @@ ParallelExecutor - 並列実行の制御
 from pathlib import Path
 from typing import List, Set
 from .models import Task, TaskStatus
+from .static_analyzer import split_symbol_target
 from .task_provider import TaskProvider
 
 
@@ -128,9 +129,9 @@ class ParallelExecutor:
         """
         タスクが扱うファイルの集合を取得
 
-        target_files と related_files の両方を含む
+        target_files（"path::Symbol" 指定はファイルパス）と依存タスクの成果物を含む
         """
-        files = set(task.target_files)
+        files = {split_symbol_target(target)[0] for target in task.target_files}
 
         # 依存タスクの成果物も含める（読み取り専用だが念のため）
         for dep_id in task.dependencies:
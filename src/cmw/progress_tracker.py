@@ -5,13 +5,168 @@
 ターミナル上に見やすいダッシュボードを表示します。
 """
 
-from typing import List, Dict, Optional
+from typing import Any, Iterator, List, Dict, Optional, Tuple, cast
 from datetime import datetime, timedelta
 from pathlib import Path
 import json
+import os
 
 from .models import Task, TaskStatus
 
+# 集計するステータス（表示順）
+STATUS_KEYS = ["completed", "in_progress", "failed", "blocked", "pending"]
+
+# 優先度別の集計で常に表示する優先度
+PRIORITY_KEYS = ["high", "medium", "low"]
+
+
+def _empty_counts() -> Dict[str, int]:
+    """ステータス別カウントの初期値"""
+    return {"total": 0, **{key: 0 for key in STATUS_KEYS}}
+
+
+def _value(field_value: Any) -> str:
+    """Enum / 文字列のどちらでも値の文字列を返す"""
+    return str(getattr(field_value, "value", field_value))
+
+
+class ProgressAggregate:
+    """
+    タスク集合の集計値
+
+    タスクリストを1回走査して構築し、以降はタスク単位の差分（update / remove）で
+    更新できます。ステータス別・優先度別・担当者別のカウントと、完了タスクの
+    所要時間の合計を保持します。
+    """
+
+    def __init__(self) -> None:
+        # task_id -> (ステータス, 優先度, 担当者, 所要時間秒)
+        self._entries: Dict[str, Tuple[str, str, str, Optional[float]]] = {}
+        self.counts: Dict[str, int] = _empty_counts()
+        self.priorities: Dict[str, Dict[str, int]] = {key: _empty_counts() for key in PRIORITY_KEYS}
+        self.workers: Dict[str, Dict[str, int]] = {}
+        self.duration_sum = 0.0
+        self.duration_count = 0
+
+    @classmethod
+    def from_tasks(cls, tasks: List[Task]) -> "ProgressAggregate":
+        """タスクリストを1回走査して集計"""
+        aggregate = cls()
+        for task in tasks:
+            aggregate.update(task)
+        return aggregate
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def update(self, task: Task) -> None:
+        """タスクを追加、または変更前の集計を差し引いて置き換え"""
+        duration = None
+        completed = _value(task.status) == TaskStatus.COMPLETED.value
+        if completed and task.started_at and task.completed_at:
+            duration = (task.completed_at - task.started_at).total_seconds()
+        entry = (_value(task.status), _value(task.priority), task.assigned_to, duration)
+
+        previous = self._entries.get(task.id)
+        if previous == entry:
+            return
+        if previous is not None:
+            self._apply(previous, -1)
+        self._entries[task.id] = entry
+        self._apply(entry, 1)
+
+    def remove(self, task_id: str) -> None:
+        """タスクを集計から除外"""
+        previous = self._entries.pop(task_id, None)
+        if previous is not None:
+            self._apply(previous, -1)
+
+    def _apply(self, entry: Tuple[str, str, str, Optional[float]], sign: int) -> None:
+        status, priority, worker, duration = entry
+
+        targets = [self.counts]
+        if priority in self.priorities:
+            targets.append(self.priorities[priority])
+        targets.append(self.workers.setdefault(worker, _empty_counts()))
+
+        for counts in targets:
+            counts["total"] += sign
+            if status in counts:
+                counts[status] += sign
+
+        if self.workers[worker]["total"] == 0:
+            del self.workers[worker]
+
+        if duration is not None:
+            self.duration_sum += sign * duration
+            self.duration_count += sign
+
+    def summary(self) -> Dict[str, Any]:
+        """get_progress_summary 形式のサマリー"""
+        total = self.counts["total"]
+        status_counts = {key: self.counts[key] for key in STATUS_KEYS}
+        if total == 0:
+            return {"total": 0, **status_counts, "completion_rate": 0.0, "success_rate": 0.0}
+
+        completion_rate = (status_counts["completed"] / total) * 100
+
+        # 成功率 = 完了 / (完了 + 失敗)
+        attempted = status_counts["completed"] + status_counts["failed"]
+        success_rate = (status_counts["completed"] / attempted * 100) if attempted > 0 else 100.0
+
+        return {
+            "total": total,
+            "completion_rate": completion_rate,
+            "success_rate": success_rate,
+            **status_counts,
+        }
+
+    def average_duration(self) -> Optional[float]:
+        """完了タスクの平均所要時間（秒）、データ不足の場合はNone"""
+        if self.duration_count == 0:
+            return None
+        return self.duration_sum / self.duration_count
+
+    def velocity(self) -> Dict[str, float]:
+        """get_velocity_metrics 形式のベロシティ"""
+        avg_duration = self.average_duration()
+        if avg_duration is None:
+            return {"tasks_per_hour": 0.0, "avg_task_duration": 0.0, "total_working_time": 0.0}
+
+        # 1時間あたりのタスク数
+        tasks_per_hour = (3600 / avg_duration) if avg_duration > 0 else 0
+
+        return {
+            "tasks_per_hour": tasks_per_hour,
+            "avg_task_duration": avg_duration,
+            "total_working_time": self.duration_sum,
+        }
+
+    def estimate_remaining(self) -> Optional[timedelta]:
+        """平均所要時間 ×（実行中 + 待機中）で残り時間を推定"""
+        avg_duration = self.average_duration()
+        if avg_duration is None:
+            return None
+        remaining_count = self.counts["pending"] + self.counts["in_progress"]
+        return timedelta(seconds=avg_duration) * remaining_count
+
+    def priority_breakdown(self) -> Dict[str, Dict[str, int]]:
+        """get_priority_breakdown 形式の優先度別カウント"""
+        return {key: dict(counts) for key, counts in self.priorities.items()}
+
+    def worker_breakdown(self) -> Dict[str, Dict[str, int]]:
+        """get_worker_breakdown 形式の担当者別カウント"""
+        return {key: dict(counts) for key, counts in self.workers.items()}
+
+    def snapshot(self, timestamp: Optional[datetime] = None) -> Dict[str, Any]:
+        """時系列ファイルに追記するスナップショット"""
+        return {
+            "timestamp": (timestamp or datetime.now()).isoformat(),
+            **{key: self.counts[key] for key in ["total", *STATUS_KEYS]},
+            "duration_sum": round(self.duration_sum, 3),
+            "duration_count": self.duration_count,
+        }
+
 
 class ProgressTracker:
     """進捗追跡とメトリクス計算"""
@@ -20,6 +175,11 @@ class ProgressTracker:
         self.project_path = project_path
         self.progress_file = project_path / "shared" / "coordination" / "progress.json"
         self.metrics_file = project_path / "shared" / "coordination" / "metrics.json"
+        self.history_file = project_path / "shared" / "coordination" / "metrics_history.jsonl"
+
+    def aggregate(self, tasks: List[Task]) -> ProgressAggregate:
+        """タスクリストを1回走査して集計"""
+        return ProgressAggregate.from_tasks(tasks)
 
     def get_progress_summary(self, tasks: List[Task]) -> Dict:
         """
@@ -37,39 +197,7 @@ class ProgressTracker:
                 'success_rate': 成功率(0-100)
             }
         """
-        total = len(tasks)
-        if total == 0:
-            return {
-                "total": 0,
-                "completed": 0,
-                "in_progress": 0,
-                "failed": 0,
-                "blocked": 0,
-                "pending": 0,
-                "completion_rate": 0.0,
-                "success_rate": 0.0,
-            }
-
-        status_counts = {
-            "completed": sum(1 for t in tasks if t.status == TaskStatus.COMPLETED),
-            "in_progress": sum(1 for t in tasks if t.status == TaskStatus.IN_PROGRESS),
-            "failed": sum(1 for t in tasks if t.status == TaskStatus.FAILED),
-            "blocked": sum(1 for t in tasks if t.status == TaskStatus.BLOCKED),
-            "pending": sum(1 for t in tasks if t.status == TaskStatus.PENDING),
-        }
-
-        completion_rate = (status_counts["completed"] / total) * 100
-
-        # 成功率 = 完了 / (完了 + 失敗)
-        attempted = status_counts["completed"] + status_counts["failed"]
-        success_rate = (status_counts["completed"] / attempted * 100) if attempted > 0 else 100.0
-
-        return {
-            "total": total,
-            "completion_rate": completion_rate,
-            "success_rate": success_rate,
-            **status_counts,
-        }
+        return self.aggregate(tasks).summary()
 
     def estimate_remaining_time(self, tasks: List[Task]) -> Optional[timedelta]:
         """
@@ -80,32 +208,7 @@ class ProgressTracker:
         Returns:
             推定残り時間（timedelta）、データ不足の場合はNone
         """
-        completed_tasks = [t for t in tasks if t.status == TaskStatus.COMPLETED]
-
-        if not completed_tasks:
-            return None
-
-        # 完了タスクの平均所要時間を計算
-        total_duration = timedelta()
-        valid_count = 0
-
-        for task in completed_tasks:
-            if task.started_at and task.completed_at:
-                duration = task.completed_at - task.started_at
-                total_duration += duration
-                valid_count += 1
-
-        if valid_count == 0:
-            return None
-
-        avg_duration = total_duration / valid_count
-
-        # 残りタスク数（実行中 + 待機中）
-        remaining_count = sum(
-            1 for t in tasks if t.status in [TaskStatus.PENDING, TaskStatus.IN_PROGRESS]
-        )
-
-        return avg_duration * remaining_count
+        return self.aggregate(tasks).estimate_remaining()
 
     def get_task_timeline(self, tasks: List[Task]) -> List[Dict]:
         """
@@ -155,8 +258,6 @@ class ProgressTracker:
                 )
 
         # タイムスタンプでソート
-        from typing import Any
-
         def get_timestamp(event: Dict[str, Any]) -> datetime:
             ts = event["timestamp"]
             return ts if isinstance(ts, datetime) else datetime.min
@@ -176,32 +277,7 @@ class ProgressTracker:
                 'total_working_time': 総作業時間（秒）
             }
         """
-        completed_tasks = [t for t in tasks if t.status == TaskStatus.COMPLETED]
-
-        if not completed_tasks:
-            return {"tasks_per_hour": 0.0, "avg_task_duration": 0.0, "total_working_time": 0.0}
-
-        # タスク所要時間を計算
-        durations = []
-        for task in completed_tasks:
-            if task.started_at and task.completed_at:
-                duration = (task.completed_at - task.started_at).total_seconds()
-                durations.append(duration)
-
-        if not durations:
-            return {"tasks_per_hour": 0.0, "avg_task_duration": 0.0, "total_working_time": 0.0}
-
-        avg_duration = sum(durations) / len(durations)
-        total_time = sum(durations)
-
-        # 1時間あたりのタスク数
-        tasks_per_hour = (3600 / avg_duration) if avg_duration > 0 else 0
-
-        return {
-            "tasks_per_hour": tasks_per_hour,
-            "avg_task_duration": avg_duration,
-            "total_working_time": total_time,
-        }
+        return self.aggregate(tasks).velocity()
 
     def get_priority_breakdown(self, tasks: List[Task]) -> Dict[str, Dict]:
         """
@@ -214,52 +290,7 @@ class ProgressTracker:
                 'low': {...}
             }
         """
-        breakdown = {
-            "high": {
-                "total": 0,
-                "completed": 0,
-                "in_progress": 0,
-                "failed": 0,
-                "blocked": 0,
-                "pending": 0,
-            },
-            "medium": {
-                "total": 0,
-                "completed": 0,
-                "in_progress": 0,
-                "failed": 0,
-                "blocked": 0,
-                "pending": 0,
-            },
-            "low": {
-                "total": 0,
-                "completed": 0,
-                "in_progress": 0,
-                "failed": 0,
-                "blocked": 0,
-                "pending": 0,
-            },
-        }
-
-        for task in tasks:
-            priority = task.priority
-            if priority not in breakdown:
-                continue
-
-            breakdown[priority]["total"] += 1
-
-            if task.status == TaskStatus.COMPLETED:
-                breakdown[priority]["completed"] += 1
-            elif task.status == TaskStatus.IN_PROGRESS:
-                breakdown[priority]["in_progress"] += 1
-            elif task.status == TaskStatus.FAILED:
-                breakdown[priority]["failed"] += 1
-            elif task.status == TaskStatus.BLOCKED:
-                breakdown[priority]["blocked"] += 1
-            elif task.status == TaskStatus.PENDING:
-                breakdown[priority]["pending"] += 1
-
-        return breakdown
+        return self.aggregate(tasks).priority_breakdown()
 
     def get_worker_breakdown(self, tasks: List[Task]) -> Dict[str, Dict]:
         """
@@ -272,54 +303,37 @@ class ProgressTracker:
                 ...
             }
         """
-        workers = {}
-
-        for task in tasks:
-            worker = task.assigned_to
-            if worker not in workers:
-                workers[worker] = {
-                    "total": 0,
-                    "completed": 0,
-                    "in_progress": 0,
-                    "failed": 0,
-                    "blocked": 0,
-                    "pending": 0,
-                }
+        return self.aggregate(tasks).worker_breakdown()
 
-            workers[worker]["total"] += 1
-
-            if task.status == TaskStatus.COMPLETED:
-                workers[worker]["completed"] += 1
-            elif task.status == TaskStatus.IN_PROGRESS:
-                workers[worker]["in_progress"] += 1
-            elif task.status == TaskStatus.FAILED:
-                workers[worker]["failed"] += 1
-            elif task.status == TaskStatus.BLOCKED:
-                workers[worker]["blocked"] += 1
-            elif task.status == TaskStatus.PENDING:
-                workers[worker]["pending"] += 1
-
-        return workers
-
-    def save_metrics(self, tasks: List[Task]) -> None:
+    def save_metrics(
+        self, tasks: List[Task], aggregate: Optional[ProgressAggregate] = None
+    ) -> bool:
         """
-        メトリクスをファイルに保存
+        メトリクスをファイルに保存し、スナップショットを時系列ファイルに追記
+
+        metrics.json は最新の値で上書きし、metrics_history.jsonl には前回の
+        スナップショットから変化があった場合のみ1行追記します。
 
         Args:
             tasks: タスクリスト
+            aggregate: 集計済みの値（省略時はタスクリストから集計）
+
+        Returns:
+            スナップショットを追記したかどうか
         """
-        from typing import Any
+        aggregate = aggregate or self.aggregate(tasks)
+        now = datetime.now()
 
         metrics: Dict[str, Any] = {
-            "timestamp": datetime.now().isoformat(),
-            "summary": self.get_progress_summary(tasks),
-            "velocity": self.get_velocity_metrics(tasks),
-            "priority_breakdown": self.get_priority_breakdown(tasks),
-            "worker_breakdown": self.get_worker_breakdown(tasks),
+            "timestamp": now.isoformat(),
+            "summary": aggregate.summary(),
+            "velocity": aggregate.velocity(),
+            "priority_breakdown": aggregate.priority_breakdown(),
+            "worker_breakdown": aggregate.worker_breakdown(),
         }
 
         # 残り時間推定
-        remaining_time = self.estimate_remaining_time(tasks)
+        remaining_time = aggregate.estimate_remaining()
         if remaining_time:
             metrics["estimated_remaining_seconds"] = remaining_time.total_seconds()
 
@@ -328,6 +342,120 @@ class ProgressTracker:
             json.dumps(metrics, ensure_ascii=False, indent=2), encoding="utf-8"
         )
 
+        return self.append_snapshot(aggregate, now)
+
+    def append_snapshot(
+        self, aggregate: ProgressAggregate, timestamp: Optional[datetime] = None
+    ) -> bool:
+        """
+        集計値のスナップショットを時系列ファイルに1行追記（変化がない場合は追記しない）
+
+        Returns:
+            追記したかどうか
+        """
+        snapshot = aggregate.snapshot(timestamp)
+        # 他のプロセスも追記するため、比較対象は常にファイルの最終行
+        last = self._read_last_snapshot()
+        if last is not None and _without_timestamp(last) == _without_timestamp(snapshot):
+            return False
+
+        self.history_file.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.history_file, "a", encoding="utf-8") as f:
+            f.write(json.dumps(snapshot, ensure_ascii=False, separators=(",", ":")) + "\n")
+        return True
+
+    def _read_last_snapshot(self) -> Optional[Dict[str, Any]]:
+        """時系列ファイルの最終行だけを末尾から読み込む"""
+        if not self.history_file.exists():
+            return None
+        try:
+            with open(self.history_file, "rb") as f:
+                f.seek(0, os.SEEK_END)
+                position = f.tell()
+                data = b""
+                # 改行が2つ見つかる（最終行が完全に含まれる）まで末尾から読み進める
+                while position > 0 and data.count(b"\n") < 2:
+                    step = min(4096, position)
+                    position -= step
+                    f.seek(position)
+                    data = f.read(step) + data
+            for line in reversed(data.splitlines()):
+                if line.strip():
+                    return cast(Dict[str, Any], json.loads(line))
+        except (json.JSONDecodeError, OSError, UnicodeDecodeError):
+            return None
+        return None
+
+    def iter_history(self, since: Optional[datetime] = None) -> Iterator[Dict[str, Any]]:
+        """
+        時系列ファイルのスナップショットを古い順に読み出す
+
+        Args:
+            since: この時刻以降のスナップショットのみ
+
+        Yields:
+            スナップショット（timestamp は datetime に変換済み）
+        """
+        if not self.history_file.exists():
+            return
+        with open(self.history_file, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    snapshot = json.loads(line)
+                    snapshot["timestamp"] = datetime.fromisoformat(snapshot["timestamp"])
+                except (json.JSONDecodeError, KeyError, TypeError, ValueError):
+                    # 書き込み途中の行などは読み飛ばす
+                    continue
+                if since is None or snapshot["timestamp"] >= since:
+                    yield snapshot
+
+    def get_burndown(self, since: Optional[datetime] = None) -> List[Dict[str, Any]]:
+        """
+        時系列ファイルからバーンダウン（残りタスク数の推移）を取得
+
+        Returns:
+            [{'timestamp': datetime, 'remaining': 未完了数, 'completed': 完了数}, ...]
+        """
+        return [
+            {
+                "timestamp": snapshot["timestamp"],
+                "remaining": snapshot["total"] - snapshot["completed"],
+                "completed": snapshot["completed"],
+            }
+            for snapshot in self.iter_history(since)
+        ]
+
+    def get_velocity_trend(self, window: timedelta = timedelta(hours=24)) -> Dict[str, Any]:
+        """
+        時系列ファイルから直近の完了ペースを取得
+
+        Args:
+            window: 集計する期間
+
+        Returns:
+            {
+                'completed': 期間内に増えた完了数,
+                'hours': 期間内の最初と最後のスナップショットの間隔（時間）,
+                'tasks_per_hour': 1時間あたりの完了数
+            }
+        """
+        first = last = None
+        for snapshot in self.iter_history(datetime.now() - window):
+            if first is None:
+                first = snapshot
+            last = snapshot
+
+        if first is None or last is None:
+            return {"completed": 0, "hours": 0.0, "tasks_per_hour": 0.0}
+
+        completed = last["completed"] - first["completed"]
+        hours = (last["timestamp"] - first["timestamp"]).total_seconds() / 3600
+        return {
+            "completed": completed,
+            "hours": hours,
+            "tasks_per_hour": completed / hours if hours > 0 else 0.0,
+        }
+
     def load_metrics(self) -> Optional[Dict]:
         """
         保存されたメトリクスを読み込み
@@ -339,9 +467,12 @@ class ProgressTracker:
             return None
 
         try:
-            from typing import Any, cast
-
             result: Any = json.loads(self.metrics_file.read_text(encoding="utf-8"))
             return cast(Dict, result)
         except (json.JSONDecodeError, IOError):
             return None
+
+
+def _without_timestamp(snapshot: Dict[str, Any]) -> Dict[str, Any]:
+    """スナップショットの比較用（時刻を除く）"""
+    return {key: value for key, value in snapshot.items() if key != "timestamp"}
@@ -0,0 +1,310 @@
+"""
+プロンプトのレイアウト（テンプレート）
+
+プロンプトの構成をセクションごとのテンプレートとして定義し、1回だけコンパイルして
+再利用します。テンプレートはパッケージの prompts/ にあり、プロジェクトの
+shared/prompts/ に同名のファイルを置くとコードを変更せずに差し替えられます。
+
+構文:
+    {% section 名前 %} ... {% endsection %}   セクション（ファイル内の順に出力）
+    {{ task.id }}                            値の埋め込み（辞書のキー・属性をドットでたどる）
+    {% if 名前 %} ... {% elif 名前 %} ... {% else %} ... {% endif %}
+                                             条件（`not 名前` で否定）
+    {% for x in 名前 %} ... {% endfor %}     繰り返し（loop.index / loop.first / loop.last）
+    {# ... #}                                コメント
+
+タグだけの行は行ごと取り除かれます。描画したセクションは入力の値のハッシュを
+キーにキャッシュされ、内容の変わらないタスクは再描画しません。
+"""
+
+import hashlib
+import json
+import re
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+# パッケージに同梱されたテンプレート
+BUILTIN_DIR = Path(__file__).parent / "prompts"
+
+# プロジェクトで差し替えるテンプレート（プロジェクトルートからの相対パス）
+CUSTOM_DIR = Path("shared") / "prompts"
+
+# 描画済みセクションのキャッシュ件数
+FRAGMENT_CACHE_SIZE = 4096
+
+COMMENT_PATTERN = re.compile(r"^[ \t]*\{#.*?#\}[ \t]*\n|\{#.*?#\}", re.DOTALL | re.MULTILINE)
+# タグだけの行はタグ以外（インデントと改行）を取り除く
+TAG_LINE_PATTERN = re.compile(r"^[ \t]*(\{%.*?%\})[ \t]*\n", re.MULTILINE)
+TOKEN_PATTERN = re.compile(r"(\{\{.*?\}\}|\{%.*?%\})", re.DOTALL)
+NAME_PATTERN = re.compile(r"^[A-Za-z_]\w*(?:\.\w+)*$")
+
+# コンパイル済みのノード（コンテキスト, 出力先）
+Node = Callable[[Dict[str, Any], List[str]], None]
+
+
+class TemplateError(ValueError):
+    """テンプレートの構文エラー"""
+
+
+def _resolve(context: Dict[str, Any], name: str) -> Any:
+    """ドット区切りの名前をコンテキストからたどる（見つからない場合はNone）"""
+    value: Any = context
+    for part in name.split("."):
+        if isinstance(value, dict):
+            value = value.get(part)
+        else:
+            value = getattr(value, part, None)
+        if value is None:
+            return None
+    return value
+
+
+def _check_name(name: str, source: str) -> str:
+    if not NAME_PATTERN.match(name):
+        raise TemplateError(f"{source}: 不正な名前です: {name!r}")
+    return name
+
+
+class _Compiler:
+    """テンプレートのトークン列をノードに変換"""
+
+    def __init__(self, tokens: List[str], source: str) -> None:
+        self.tokens = tokens
+        self.source = source
+        self.pos = 0
+
+    def sections(self) -> "OrderedDict[str, Node]":
+        """トップレベルのセクションを読み込む（セクション外のテキストは無視）"""
+        sections: "OrderedDict[str, Node]" = OrderedDict()
+        while self.pos < len(self.tokens):
+            token = self.tokens[self.pos]
+            self.pos += 1
+            if not token.startswith("{%"):
+                continue
+            words = token[2:-2].split()
+            if len(words) != 2 or words[0] != "section":
+                raise TemplateError(f"{self.source}: セクションの外にタグがあります: {token}")
+            name = _check_name(words[1], self.source)
+            if name in sections:
+                raise TemplateError(f"{self.source}: セクションが重複しています: {name}")
+            sections[name], _ = self.block({"endsection"})
+        return sections
+
+    def block(self, terminators: set) -> Tuple[Node, List[str]]:
+        """終了タグまでを読み込む（終了タグの単語列も返す）"""
+        nodes: List[Node] = []
+        while self.pos < len(self.tokens):
+            token = self.tokens[self.pos]
+            self.pos += 1
+
+            if token.startswith("{{"):
+                nodes.append(self._var(_check_name(token[2:-2].strip(), self.source)))
+            elif token.startswith("{%"):
+                words = token[2:-2].split()
+                keyword = words[0] if words else ""
+                if keyword in terminators:
+                    return self._sequence(nodes), words
+                if keyword == "if":
+                    nodes.append(self._if(words[1:]))
+                elif keyword == "for":
+                    nodes.append(self._for(words[1:]))
+                else:
+                    raise TemplateError(f"{self.source}: 不明なタグです: {token}")
+            elif token:
+                nodes.append(self._text(token))
+
+        raise TemplateError(f"{self.source}: {' / '.join(sorted(terminators))} がありません")
+
+    def _if(self, words: List[str]) -> Node:
+        negate = bool(words) and words[0] == "not"
+        names = words[1:] if negate else words
+        if len(names) != 1:
+            raise TemplateError(f"{self.source}: if の条件は1つの名前です: {' '.join(words)}")
+        name = _check_name(names[0], self.source)
+
+        then_node, end = self.block({"elif", "else", "endif"})
+        else_node: Optional[Node] = None
+        if end[0] == "elif":
+            else_node = self._if(end[1:])
+        elif end[0] == "else":
+            else_node, _ = self.block({"endif"})
+
+        def render(context: Dict[str, Any], out: List[str]) -> None:
+            if bool(_resolve(context, name)) != negate:
+                then_node(context, out)
+            elif else_node is not None:
+                else_node(context, out)
+
+        return render
+
+    def _for(self, words: List[str]) -> Node:
+        if len(words) != 3 or words[1] != "in":
+            raise TemplateError(f"{self.source}: for の構文は 'for x in 名前' です")
+        var = _check_name(words[0], self.source)
+        name = _check_name(words[2], self.source)
+        body, _ = self.block({"endfor"})
+
+        def render(context: Dict[str, Any], out: List[str]) -> None:
+            items = list(_resolve(context, name) or [])
+            scope = dict(context)
+            for i, item in enumerate(items):
+                scope[var] = item
+                scope["loop"] = {"index": i + 1, "first": i == 0, "last": i == len(items) - 1}
+                body(scope, out)
+
+        return render
+
+    @staticmethod
+    def _var(name: str) -> Node:
+        def render(context: Dict[str, Any], out: List[str]) -> None:
+            value = _resolve(context, name)
+            if value is not None:
+                out.append(str(value))
+
+        return render
+
+    @staticmethod
+    def _text(text: str) -> Node:
+        def render(context: Dict[str, Any], out: List[str]) -> None:
+            out.append(text)
+
+        return render
+
+    @staticmethod
+    def _sequence(nodes: List[Node]) -> Node:
+        def render(context: Dict[str, Any], out: List[str]) -> None:
+            for node in nodes:
+                node(context, out)
+
+        return render
+
+
+def compile_sections(text: str, source: str = "<template>") -> "OrderedDict[str, Node]":
+    """
+    テンプレートをセクションごとにコンパイル
+
+    Args:
+        text: テンプレート
+        source: エラーメッセージに表示する名前
+
+    Returns:
+        セクション名 -> コンパイル済みノード（ファイル内の順）
+    """
+    text = COMMENT_PATTERN.sub("", text)
+    text = TAG_LINE_PATTERN.sub(r"\1", text)
+    return _Compiler(TOKEN_PATTERN.split(text), source).sections()
+
+
+class PromptLayout:
+    """
+    コンパイル済みのプロンプトレイアウト
+
+    Attributes:
+        name: レイアウト名（テンプレートのファイル名から拡張子を除いたもの）
+        path: 読み込んだテンプレートのパス
+        digest: テンプレートの内容のハッシュ
+        sections: セクション名のリスト（出力順）
+    """
+
+    # (パス, mtime_ns, サイズ) -> レイアウト
+    _loaded: Dict[Tuple[str, int, int], "PromptLayout"] = {}
+    _lock = threading.Lock()
+
+    def __init__(self, name: str, path: Path, text: str) -> None:
+        self.name = name
+        self.path = path
+        self.digest = hashlib.sha256(text.encode("utf-8")).hexdigest()
+        self._sections = compile_sections(text, str(path))
+        self.sections = list(self._sections)
+        self._fragments: "OrderedDict[str, str]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    @classmethod
+    def load(cls, name: str, project_root: Optional[Path] = None) -> "PromptLayout":
+        """
+        レイアウトを取得（プロジェクトの shared/prompts/ を優先、変更がなければ再利用）
+
+        Args:
+            name: レイアウト名（例: "task_prompt"）
+            project_root: プロジェクトのルートディレクトリ
+
+        Returns:
+            PromptLayout
+        """
+        path = BUILTIN_DIR / f"{name}.md"
+        if project_root is not None:
+            custom = Path(project_root) / CUSTOM_DIR / f"{name}.md"
+            if custom.is_file():
+                path = custom
+
+        stat = path.stat()
+        key = (str(path.resolve()), stat.st_mtime_ns, stat.st_size)
+        with cls._lock:
+            layout = cls._loaded.get(key)
+            if layout is None:
+                layout = cls(name, path, path.read_text(encoding="utf-8"))
+                cls._loaded[key] = layout
+        return layout
+
+    def render_section(self, section: str, context: Dict[str, Any]) -> str:
+        """
+        セクションを描画（同じ入力の描画結果は再利用）
+
+        Args:
+            section: セクション名
+            context: テンプレートに渡す値（JSONに変換できる値）
+
+        Returns:
+            描画結果（空白のみの場合、セクションがレイアウトにない場合は空文字）
+        """
+        node = self._sections.get(section)
+        if node is None:
+            return ""
+
+        key = hashlib.sha256(
+            json.dumps([section, context], ensure_ascii=False, sort_keys=True, default=str).encode(
+                "utf-8"
+            )
+        ).hexdigest()
+        with self._lock:
+            cached = self._fragments.get(key)
+            if cached is not None:
+                self._fragments.move_to_end(key)
+                self.hits += 1
+                return cached
+
+        out: List[str] = []
+        node(context, out)
+        rendered = "".join(out)
+        # {% endsection %} の前の改行は含めない
+        if rendered.endswith("\n"):
+            rendered = rendered[:-1]
+        if not rendered.strip():
+            rendered = ""
+
+        with self._lock:
+            self.misses += 1
+            self._fragments[key] = rendered
+            if len(self._fragments) > FRAGMENT_CACHE_SIZE:
+                self._fragments.popitem(last=False)
+        return rendered
+
+    def render(self, contexts: Dict[str, Dict[str, Any]]) -> str:
+        """
+        全セクションをレイアウトの順に描画して連結（空のセクションは省略）
+
+        Args:
+            contexts: セクション名 -> テンプレートに渡す値
+
+        Returns:
+            プロンプト
+        """
+        rendered = (
+            self.render_section(section, contexts[section])
+            for section in self.sections
+            if section in contexts
+        )
+        return "\n\n".join(filter(None, rendered))
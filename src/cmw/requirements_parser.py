@@ -12,22 +12,29 @@ import re
 from .models import Task, Priority
 from .dependency_validator import DependencyValidator
 from .task_filter import TaskFilter
+from .task_id import DEFAULT_TASK_ID_SCHEME, TaskIdScheme, parse_task_ordinal
 
 
 class RequirementsParser:
     """requirements.mdを解析してタスクを自動生成"""
 
-    def __init__(self) -> None:
+    def __init__(self, id_scheme: Optional[TaskIdScheme] = None) -> None:
+        """
+        Args:
+            id_scheme: 生成するタスクIDの形式（デフォルト: TASK-001 形式）
+        """
+        self.id_scheme = id_scheme or DEFAULT_TASK_ID_SCHEME
         self.task_counter = 0
         self.validator = DependencyValidator()
         self.task_filter = TaskFilter()
 
-    def parse(self, requirements_path: Path) -> List[Task]:
+    def parse(self, requirements_path: Path, reduce_dependencies: bool = False) -> List[Task]:
         """
         Markdownファイルを解析してタスクリストを生成
 
         Args:
             requirements_path: requirements.mdのパス
+            reduce_dependencies: Trueの場合、推移的に冗長な依存関係を削除
 
         Returns:
             生成されたタスクのリスト
@@ -38,6 +45,8 @@ class RequirementsParser:
         tasks = self._filter_non_tasks(tasks)
         tasks = self._infer_dependencies(tasks)
         tasks = self._detect_and_fix_cycles(tasks)
+        if reduce_dependencies:
+            tasks = self._reduce_dependencies(tasks)
         return tasks
 
     def _load_requirements(self, requirements_path: Path) -> str:
@@ -99,6 +108,14 @@ class RequirementsParser:
         self._verify_cycles_fixed(tasks)
         return tasks
 
+    def _reduce_dependencies(self, tasks: List[Task]) -> List[Task]:
+        """推移的に冗長な依存関係を削除"""
+        total = sum(len(t.dependencies) for t in tasks)
+        removed = self.validator.transitive_reduction(tasks)
+        if removed:
+            print(f"\n✂️  推移的に冗長な依存関係を{len(removed)}/{total}件削除しました")
+        return tasks
+
     def _print_cycles_report(self, cycles: List[List[Tuple[str, str]]]) -> None:
         """循環依存のレポートを表示"""
         print(f"\n⚠️  {len(cycles)}件の循環依存を検出しました:")
@@ -192,7 +209,7 @@ class RequirementsParser:
         """セクションをTaskオブジェクトに変換"""
         # タスクIDを生成
         self.task_counter += 1
-        task_id = f"TASK-{self.task_counter:03d}"
+        task_id = self.id_scheme.format(self.task_counter)
 
         # target_filesを推論
         target_files = self._infer_target_files(section["title"], section["criteria"])
@@ -221,7 +238,7 @@ class RequirementsParser:
     def _subsection_to_task(self, subsection: Dict, parent_section: Dict) -> Optional[Task]:
         """サブセクションをTaskオブジェクトに変換"""
         self.task_counter += 1
-        task_id = f"TASK-{self.task_counter:03d}"
+        task_id = self.id_scheme.format(self.task_counter)
 
         # サブセクションのコンテキストを考慮
         combined_title = f"{parent_section['title']} - {subsection['title']}"
@@ -388,8 +405,8 @@ class RequirementsParser:
         2. レイヤー依存: models → schemas → routers の順序
         3. 機能依存: 認証 → 認証が必要な機能
         """
-        # タスクをIDでマッピング
-        {task.id: task for task in tasks}
+        # タスクIDの連番（順序比較は整数で行う）
+        ordinals = {task.id: task.ordinal for task in tasks if task.ordinal is not None}
 
         # ファイルごとのタスクをグルーピング
         file_to_tasks: Dict[str, List[str]] = {}
@@ -436,7 +453,10 @@ class RequirementsParser:
                     earlier_tasks = [
                         tid
                         for tid in file_to_tasks[file]
-                        if tid != task.id and self._is_earlier_task(tid, task.id)
+                        if tid != task.id
+                        and tid in ordinals
+                        and task.id in ordinals
+                        and ordinals[tid] < ordinals[task.id]
                     ]
                     for earlier_id in earlier_tasks:
                         if earlier_id not in task.dependencies:
@@ -489,10 +509,8 @@ class RequirementsParser:
 
     def _is_earlier_task(self, task_id1: str, task_id2: str) -> bool:
         """タスクID1がタスクID2より前かどうか"""
-        # TASK-001, TASK-002などのID形式を想定
-        try:
-            num1 = int(task_id1.split("-")[1])
-            num2 = int(task_id2.split("-")[1])
-            return num1 < num2
-        except (IndexError, ValueError):
+        num1 = parse_task_ordinal(task_id1)
+        num2 = parse_task_ordinal(task_id2)
+        if num1 is None or num2 is None:
             return False
+        return num1 < num2
@@ -6,32 +6,237 @@ Claude Codeの応答テキストを解析して、タスク完了を自動検出
 
 import re
 import json
-from typing import List, Optional, Dict, Any
+import time
+import codecs
+import hashlib
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import (
+    Any,
+    BinaryIO,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Match,
+    Optional,
+    Pattern,
+    Set,
+    Tuple,
+    Union,
+)
 from pathlib import Path
 
+from .task_id import DEFAULT_TASK_ID_SCHEME, TaskIdScheme
+
+# 逐次解析で一度に読み込むバイト数
+STREAM_CHUNK_SIZE = 64 * 1024
+
+# 窓の境界をまたぐ一致を待つ最大文字数（これより長いパスやエラー行は手元のテキストで判定）
+STREAM_OVERLAP = 4096
+
+# ファイルを書き込むツールと、パスを持つ入力キー
+FILE_WRITE_TOOLS = {
+    "Write": "file_path",
+    "Edit": "file_path",
+    "MultiEdit": "file_path",
+    "NotebookEdit": "notebook_path",
+}
+
+# トランスクリプト形式
+TRANSCRIPT_FORMATS = ["auto", "text", "jsonl"]
+
+
+@dataclass
+class ResponseEvent:
+    """
+    応答の逐次解析で検出されたイベント
+
+    Attributes:
+        kind: イベント種別（"artifact" / "task_id" / "completion" / "error"）
+        value: ファイルパス、タスクID、完了キーワード、またはエラーメッセージ
+        position: ストリーム先頭からの文字位置
+        error_type: エラーの種別（kind が "error" の場合のみ）
+    """
+
+    kind: str
+    value: str
+    position: int
+    error_type: Optional[str] = None
+
+
+@dataclass
+class _ScanState:
+    """走査の途中経過（逐次解析では窓をまたいで引き継ぐ）"""
+
+    artifacts: Set[str] = field(default_factory=set)
+    task_ids: Set[str] = field(default_factory=set)
+    is_completed: bool = False
+    # (マーカー順, 位置, 種別, メッセージ)
+    errors: List[Tuple[int, int, str, str]] = field(default_factory=list)
+    # 成果物を示す動詞の直後にあるバッククォートの位置
+    verb_ticks: Set[int] = field(default_factory=set)
+    # 成果物として消費したバッククォートの終端と、マーカーごとのエラーメッセージ終端
+    path_resume: int = 0
+    error_resume: Dict[int, int] = field(default_factory=dict)
+    # 本文中のファイル言及を成果物とするか（ツール呼び出しから成果物が分かる場合は False）
+    text_artifacts: bool = True
+
+    def complete(self, keyword: str, position: int, events: List[ResponseEvent]) -> None:
+        """完了キーワードを記録（イベントは最初の1回のみ）"""
+        if not self.is_completed:
+            self.is_completed = True
+            events.append(ResponseEvent("completion", keyword, position))
+
+    def result(self, id_scheme: TaskIdScheme) -> Dict[str, Any]:
+        """parse_response 形式の結果（エラーはマーカー順）"""
+        return {
+            "artifacts": tuple(sorted(self.artifacts)),
+            "task_ids": tuple(sorted(self.task_ids, key=id_scheme.sort_key)),
+            "is_completed": self.is_completed,
+            "errors": tuple(
+                (error_type, message) for _, _, error_type, message in sorted(self.errors)
+            ),
+        }
+
+
+def read_chunks(stream: BinaryIO, chunk_size: int = STREAM_CHUNK_SIZE) -> Iterator[str]:
+    """
+    バイナリストリーム（標準入力など）を届いた分ずつUTF-8テキストとして読み出す
+
+    Args:
+        stream: 読み込むストリーム
+        chunk_size: 一度に読み込む最大バイト数
+
+    Yields:
+        デコード済みのテキスト（マルチバイト文字の途中では分割しない）
+    """
+    decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+    # パイプでは届いた分だけ返す read1 を優先
+    read = getattr(stream, "read1", stream.read)
+    while True:
+        data = read(chunk_size)
+        if not data:
+            break
+        text = decoder.decode(data)
+        if text:
+            yield text
+    rest = decoder.decode(b"", final=True)
+    if rest:
+        yield rest
+
+
+def follow_file(
+    path: Union[str, Path],
+    chunk_size: int = STREAM_CHUNK_SIZE,
+    poll_interval: float = 0.5,
+    idle_timeout: Optional[float] = None,
+) -> Iterator[str]:
+    """
+    追記されるファイルを tail -f のように読み続ける
+
+    Args:
+        path: 読み込むファイル
+        chunk_size: 一度に読み込む最大バイト数
+        poll_interval: 追記を確認する間隔（秒）
+        idle_timeout: 追記がないまま経過したら終了する秒数（None の場合は終了しない）
+
+    Yields:
+        追記されたテキスト
+    """
+    decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+    with open(path, "rb") as f:
+        last_data = time.monotonic()
+        while True:
+            data = f.read(chunk_size)
+            if data:
+                last_data = time.monotonic()
+                text = decoder.decode(data)
+                if text:
+                    yield text
+                continue
+            if idle_timeout is not None and time.monotonic() - last_data >= idle_timeout:
+                break
+            time.sleep(poll_interval)
+    rest = decoder.decode(b"", final=True)
+    if rest:
+        yield rest
+
+
+def _chain(head: List[str], rest: Iterator[str]) -> Iterator[str]:
+    """先読みしたチャンクと残りのチャンクを連結"""
+    yield from head
+    yield from rest
+
+
+def _tool_result_text(content: Any) -> str:
+    """tool_result の content（文字列またはブロックのリスト）をテキストにする"""
+    if isinstance(content, str):
+        return content
+    if isinstance(content, list):
+        return "\n".join(
+            block.get("text", "") for block in content if isinstance(block, dict)
+        )
+    return ""
+
+
+def _iter_content(record: Dict[str, Any]) -> Iterator[Tuple[str, Any]]:
+    """
+    トランスクリプトの1レコードから解析対象の要素を取り出す
+
+    Yields:
+        ("text", 本文) / ("tool_use", ブロック) / ("tool_result", ブロック) /
+        ("result_error", メッセージ)
+    """
+    record_type = record.get("type")
+
+    if record_type == "result":
+        # セッションの最終結果
+        result = record.get("result")
+        if record.get("is_error"):
+            if not (isinstance(result, str) and result):
+                result = record.get("subtype", "error")
+            yield "result_error", result
+        elif isinstance(result, str):
+            yield "text", result
+        return
+
+    message = record.get("message")
+    if not isinstance(message, dict):
+        return
+    content = message.get("content")
+    if isinstance(content, str):
+        if record_type == "assistant":
+            yield "text", content
+        return
+    if not isinstance(content, list):
+        return
+
+    for block in content:
+        if not isinstance(block, dict):
+            continue
+        block_type = block.get("type")
+        is_text = block_type == "text" and isinstance(block.get("text"), str)
+        if is_text and record_type == "assistant":
+            yield "text", block["text"]
+        elif block_type in ("tool_use", "tool_result"):
+            yield block_type, block
+
 
 class ResponseParser:
     """Claude Codeの応答を解析してタスク完了を検出"""
 
-    # ファイル作成/編集を示すパターン
-    FILE_PATTERNS = [
-        # 日本語パターン
-        r"`([^`]+\.[a-zA-Z0-9]+)`\s*を作成",
-        r"`([^`]+\.[a-zA-Z0-9]+)`\s*に.*を追加",
-        r"`([^`]+\.[a-zA-Z0-9]+)`\s*を.*更新",
-        r"`([^`]+\.[a-zA-Z0-9]+)`\s*を編集",
-        r"`([^`]+\.[a-zA-Z0-9]+)`\s*を修正",
-        r"`([^`]+\.[a-zA-Z0-9]+)`\s*に.*実装",
-        # 英語パターン
-        r"[Cc]reated\s+`([^`]+\.[a-zA-Z0-9]+)`",
-        r"[Uu]pdated\s+`([^`]+\.[a-zA-Z0-9]+)`",
-        r"[Mm]odified\s+`([^`]+\.[a-zA-Z0-9]+)`",
-        r"[Ee]dited\s+`([^`]+\.[a-zA-Z0-9]+)`",
-        r"[Aa]dded\s+`([^`]+\.[a-zA-Z0-9]+)`",
-        r"[Ii]mplemented\s+`([^`]+\.[a-zA-Z0-9]+)`",
-        # ファイルパス単独（より緩いパターン）
-        r"`([a-zA-Z0-9_/.-]+\.[a-zA-Z0-9]+)`",
-    ]
+    # ファイル作成/編集を示す英語の動詞（直後のバッククォート内のファイル）
+    ARTIFACT_VERBS = ["created", "updated", "modified", "edited", "added", "implemented"]
+
+    # ファイル作成/編集を示す日本語の文脈（バッククォート内のファイルの直後）
+    ARTIFACT_CONTEXT_PATTERN = r"\s*(?:を作成|に.*を追加|を.*更新|を編集|を修正|に.*実装)"
+
+    # 文脈付きで言及されたファイルパス（拡張子付き）
+    ARTIFACT_PATH_PATTERN = r"[^`]+\.[a-zA-Z0-9]+"
+
+    # ファイルパス単独（より緩いパターン、文脈なしでも成果物とみなす）
+    LOOSE_PATH_PATTERN = r"[a-zA-Z0-9_/.-]+\.[a-zA-Z0-9]+"
 
     # タスク完了を示すキーワード
     COMPLETION_KEYWORDS = [
@@ -51,13 +256,229 @@ class ResponseParser:
         "added",
     ]
 
-    # タスクIDパターン
-    TASK_ID_PATTERN = r"TASK-\d{3}"
+    # エラーを示すマーカー（マーカー, 種別）。結果はこの順に並べる
+    ERROR_MARKERS = [
+        ("Error:", "error"),
+        ("Exception:", "exception"),
+        ("Failed:", "failure"),
+        ("エラー:", "error"),
+        ("失敗:", "failure"),
+    ]
+
+    # タスクIDパターン（デフォルトのID形式）
+    TASK_ID_PATTERN = DEFAULT_TASK_ID_SCHEME.pattern.pattern
+
+    # 解析結果をキャッシュする応答数
+    SCAN_CACHE_SIZE = 32
+
+    def __init__(self, id_scheme: Optional[TaskIdScheme] = None) -> None:
+        """
+        初期化
+
+        Args:
+            id_scheme: タスクIDの形式（デフォルト: TASK-001 形式）
+        """
+        self.id_scheme = id_scheme or DEFAULT_TASK_ID_SCHEME
+        self.task_id_regex = self.id_scheme.pattern
+        self.scan_regex = self._compile_scan_regex()
+        self.context_regex = re.compile(self.ARTIFACT_CONTEXT_PATTERN)
+        self.artifact_path_regex = re.compile(self.ARTIFACT_PATH_PATTERN)
+        self.loose_path_regex = re.compile(self.LOOSE_PATH_PATTERN)
+        self.error_message_regex = re.compile(r"\s*(.+)")
+        self.line_end_regex = re.compile(r"\s*\S[^\n]*\n")
+        self._completion_keywords = {kw.lower() for kw in self.COMPLETION_KEYWORDS}
+        self._error_markers = {
+            marker[:-1].lower(): (index, error_type)
+            for index, (marker, error_type) in enumerate(self.ERROR_MARKERS)
+        }
+        self._scan_cache: "OrderedDict[bytes, Dict[str, Any]]" = OrderedDict()
+        # 逐次解析で窓の末尾に残す文字数（キーワードやタスクIDの途中で切れないように）
+        literals = (
+            self.COMPLETION_KEYWORDS + self.ARTIFACT_VERBS + [m for m, _ in self.ERROR_MARKERS]
+        )
+        self._stream_tail = max(
+            max(len(w) for w in literals), len(self.id_scheme.prefix) + 1 + self.id_scheme.width
+        )
+
+    def _compile_scan_regex(self) -> Pattern[str]:
+        """
+        成果物・タスクID・完了キーワード・エラーを1回の走査で検出する正規表現を構築
+
+        各選択肢は検出に必要な最小限の文字だけを消費し、バッククォート内の
+        パスやエラーメッセージは先読みで取得します。これにより、パスの中の
+        タスクIDやエラーメッセージ中のキーワードも同じ走査で検出されます。
+        """
+
+        def alternation(words: List[str]) -> str:
+            # 長い語を先に試し、接頭辞が同じ語を取りこぼさない
+            return "|".join(re.escape(w) for w in sorted(words, key=len, reverse=True))
+
+        markers = alternation([marker[:-1] for marker, _ in self.ERROR_MARKERS])
+        return re.compile(
+            "|".join(
+                [
+                    rf"(?P<task_id>{self.id_scheme.pattern.pattern})",
+                    rf"(?P<verb>(?i:{alternation(self.ARTIFACT_VERBS)}))(?:(?=\s+(?P<verb_tick>`))|(?=\s*\Z))",
+                    r"`(?:(?=(?P<path>[^`]+)`))?",
+                    rf"(?P<error>(?i:{markers})):",
+                    rf"(?P<keyword>(?i:{alternation(self.COMPLETION_KEYWORDS)}))",
+                ]
+            )
+        )
+
+    def _scan(self, text: str) -> Dict[str, Any]:
+        """
+        応答を1回だけ走査し、成果物・タスクID・完了判定・エラーをまとめて抽出
+
+        結果は応答テキストのハッシュをキーにキャッシュするため、同じ応答に対する
+        parse_response / detect_errors / suggest_completion は再走査しません。
 
-    def __init__(self) -> None:
-        """初期化"""
-        self.file_regex = [re.compile(p, re.IGNORECASE | re.MULTILINE) for p in self.FILE_PATTERNS]
-        self.task_id_regex = re.compile(self.TASK_ID_PATTERN)
+        Args:
+            text: 解析するテキスト
+
+        Returns:
+            {'artifacts', 'task_ids', 'is_completed', 'errors'} の辞書
+            （キャッシュ共有のためタプルで保持）
+        """
+        key = hashlib.blake2b(text.encode("utf-8", "surrogatepass"), digest_size=16).digest()
+        cached = self._scan_cache.get(key)
+        if cached is not None:
+            self._scan_cache.move_to_end(key)
+            return cached
+
+        state = _ScanState()
+        self._scan_window(state, text, 0, 0, final=True, overlap=len(text))
+        result = state.result(self.id_scheme)
+
+        self._scan_cache[key] = result
+        if len(self._scan_cache) > self.SCAN_CACHE_SIZE:
+            self._scan_cache.popitem(last=False)
+        return result
+
+    def _scan_window(
+        self, state: "_ScanState", window: str, base: int, start: int, final: bool, overlap: int
+    ) -> Tuple[List["ResponseEvent"], int]:
+        """
+        テキストの窓を走査し、判定が確定した一致だけを処理
+
+        窓の末尾で続きのテキスト次第で結果が変わる一致（閉じていないバッククォート、
+        行末が未着のエラーメッセージ等）は、窓の末尾から overlap 文字以内であれば
+        次の窓に持ち越します。位置はすべてストリーム先頭からの絶対位置です。
+
+        Args:
+            state: 走査状態（窓をまたいで引き継ぐ）
+            window: 走査するテキスト
+            base: window[0] の絶対位置
+            start: 走査を開始する絶対位置
+            final: ストリームの終端か（True の場合は持ち越さない）
+            overlap: 持ち越す一致の最大長（文字数）
+
+        Returns:
+            (新たに検出したイベント, 次の窓の開始位置)
+        """
+        events: List[ResponseEvent] = []
+        size = len(window)
+        cursor = start - base
+        pending = size
+
+        for match in self.scan_regex.finditer(window, cursor):
+            if self._handle_match(state, match, window, base, final, overlap, events):
+                pending = match.start()
+                break
+            cursor = match.end()
+
+        # キーワード等の途中で窓が切れている可能性があるため、末尾は常に持ち越す
+        if not final:
+            pending = min(pending, size - self._stream_tail)
+        return events, base + max(cursor, pending)
+
+    def _handle_match(
+        self,
+        state: "_ScanState",
+        match: Match[str],
+        window: str,
+        base: int,
+        final: bool,
+        overlap: int,
+        events: List["ResponseEvent"],
+    ) -> bool:
+        """
+        1つの一致を処理して状態とイベントを更新
+
+        Returns:
+            続きのテキストが必要で、次の窓に持ち越す場合は True
+        """
+        kind = match.lastgroup
+        position = base + match.start()
+        size = len(window)
+        # 窓の末尾に近い一致だけを持ち越す（長すぎる一致は手元のテキストで判定）
+        can_wait = not final and size - match.start() <= overlap
+
+        if kind == "task_id":
+            if can_wait and match.end() == size:
+                return True
+            task_id = match.group("task_id")
+            if task_id not in state.task_ids:
+                state.task_ids.add(task_id)
+                events.append(ResponseEvent("task_id", task_id, position))
+
+        elif kind in ("verb_tick", "verb"):
+            # 動詞の後に空白しかない場合はバッククォートの到着を待つ
+            if kind == "verb":
+                if can_wait:
+                    return True
+            else:
+                state.verb_ticks.add(base + match.start("verb_tick"))
+            verb = match.group("verb")
+            if verb.lower() in self._completion_keywords:
+                state.complete(verb, position, events)
+
+        elif kind == "path":
+            if position < state.path_resume:
+                return False
+            path = match.group("path")
+            if not self.artifact_path_regex.fullmatch(path):
+                return False
+            close = match.end("path") + 1
+            if not (
+                self.loose_path_regex.fullmatch(path)
+                or position in state.verb_ticks
+                or self.context_regex.match(window, close)
+            ):
+                # 日本語の文脈は行末まで届いてから判定する
+                return can_wait and self.line_end_regex.match(window, close) is None
+            state.path_resume = base + close
+            cleaned = path.strip()
+            # 有効なファイルパスかチェック（__pycache__や.pyc等は除外）
+            if not state.text_artifacts:
+                return False
+            if "." in cleaned and len(cleaned) < 200 and cleaned not in state.artifacts:
+                if not any(x in cleaned for x in ["__pycache__", ".pyc", ".pyo"]):
+                    state.artifacts.add(cleaned)
+                    events.append(ResponseEvent("artifact", cleaned, position))
+
+        elif kind == "error":
+            index, error_type = self._error_markers[match.group("error").lower()]
+            if position < state.error_resume.get(index, 0):
+                return False
+            message = self.error_message_regex.match(window, match.end())
+            if can_wait and (message is None or message.end() == size):
+                return True
+            if message is None:
+                return False
+            state.error_resume[index] = base + message.end()
+            text = message.group(1).strip()
+            state.errors.append((index, position, error_type, text))
+            events.append(ResponseEvent("error", text, position, error_type))
+
+        elif kind == "keyword":
+            state.complete(match.group("keyword"), position, events)
+
+        else:
+            # 閉じていないバッククォート
+            return can_wait
+
+        return False
 
     def parse_response(self, response_text: str) -> Dict[str, Any]:
         """
@@ -74,11 +495,215 @@ class ResponseParser:
                 'is_completed': bool # 完了を示すキーワードがあるか
             }
         """
-        artifacts = self._extract_artifacts(response_text)
-        task_ids = self._extract_task_ids(response_text)
-        is_completed = self._detect_completion(response_text)
+        scan = self._scan(response_text)
+        return {
+            "artifacts": list(scan["artifacts"]),
+            "task_ids": list(scan["task_ids"]),
+            "is_completed": scan["is_completed"],
+        }
+
+    def iter_events(
+        self, chunks: Iterable[str], overlap: int = STREAM_OVERLAP
+    ) -> Iterator[ResponseEvent]:
+        """
+        応答を逐次解析し、検出したイベントを出現順に返す
+
+        応答全体をメモリに保持せず、チャンクの境界をまたぐパターンは末尾の
+        overlap 文字を次のチャンクと結合して検出します。成果物・タスクID・完了は
+        初出時に1回だけ、エラーは検出のたびに返します。
+
+        Args:
+            chunks: 応答テキストのチャンク（read_chunks / follow_file など）
+            overlap: 境界をまたぐ一致を待つ最大文字数
+
+        Yields:
+            ResponseEvent
+        """
+        state = _ScanState()
+        window = ""
+        base = 0
+        start = 0
+
+        for chunk in chunks:
+            if not chunk:
+                continue
+            window += chunk
+            events, start = self._scan_window(
+                state, window, base, start, final=False, overlap=overlap
+            )
+            yield from events
+
+            # 判定済みの部分を破棄
+            if start > base:
+                window = window[start - base :]
+                base = start
+                state.verb_ticks = {tick for tick in state.verb_ticks if tick >= base}
+
+        events, _ = self._scan_window(state, window, base, start, final=True, overlap=overlap)
+        yield from events
+
+    def iter_transcript_events(
+        self,
+        chunks: Iterable[str],
+        format: str = "auto",
+        root: Optional[Path] = None,
+        overlap: int = STREAM_OVERLAP,
+    ) -> Iterator[ResponseEvent]:
+        """
+        トランスクリプトを形式に応じて逐次解析
+
+        Args:
+            chunks: トランスクリプトのチャンク
+            format: "text"（テキスト出力）、"jsonl"（JSON出力）、"auto"（先頭が "{" なら jsonl）
+            root: jsonl の場合、ツール呼び出しの絶対パスをこのディレクトリからの相対パスにする
+            overlap: text の場合の境界をまたぐ一致を待つ最大文字数
+
+        Yields:
+            ResponseEvent
+        """
+        if format not in TRANSCRIPT_FORMATS:
+            raise ValueError(f"不明なトランスクリプト形式です: {format}")
+
+        chunks = iter(chunks)
+        if format == "auto":
+            # 空白以外の文字が届くまで読み、先頭の文字で判定
+            head: List[str] = []
+            for chunk in chunks:
+                head.append(chunk)
+                stripped = chunk.lstrip()
+                if stripped:
+                    format = "jsonl" if stripped.startswith("{") else "text"
+                    break
+            chunks = _chain(head, chunks)
+
+        if format == "jsonl":
+            yield from self.iter_jsonl_events(chunks, root=root)
+        else:
+            yield from self.iter_events(chunks, overlap=overlap)
+
+    def iter_jsonl_events(
+        self, chunks: Iterable[str], root: Optional[Path] = None
+    ) -> Iterator[ResponseEvent]:
+        """
+        JSON Lines 形式のトランスクリプト（stream-json 出力）を逐次解析
+
+        1行ずつJSONとしてデコードし、Write/Edit 等のツール呼び出しから書き込まれた
+        ファイルを正確に取得します。正規表現による走査はアシスタントの本文と
+        最終結果のテキストのみに使い、本文中のファイル言及は成果物にしません。
+        JSONとして読めない行は通常のテキストとして走査します。
 
-        return {"artifacts": artifacts, "task_ids": task_ids, "is_completed": is_completed}
+        ツール呼び出しの成果物は、対応する結果が成功した時点で返します
+        （結果が記録されていない呼び出しは終端で返します）。
+
+        Args:
+            chunks: トランスクリプトのチャンク
+            root: ツール呼び出しの絶対パスをこのディレクトリからの相対パスにする
+
+        Yields:
+            ResponseEvent
+        """
+        decoder = json.JSONDecoder()
+        state = _ScanState()
+        # tool_use_id -> (ファイルパス, 位置)
+        pending_writes: Dict[str, Tuple[str, int]] = {}
+        text_base = 0
+        buffer = ""
+        line_position = 0
+
+        def scan_text(text: str, position: int, text_artifacts: bool) -> Iterator[ResponseEvent]:
+            nonlocal text_base
+            state.text_artifacts = text_artifacts
+            events, _ = self._scan_window(
+                state, text, text_base, text_base, final=True, overlap=len(text)
+            )
+            # 本文ごとの位置は区切って管理し、イベントには行の位置を付ける
+            text_base += len(text) + 1
+            for event in events:
+                yield ResponseEvent(event.kind, event.value, position, event.error_type)
+
+        def artifact(path: str, position: int) -> Iterator[ResponseEvent]:
+            path = self._relative_artifact(path, root)
+            if path not in state.artifacts:
+                state.artifacts.add(path)
+                yield ResponseEvent("artifact", path, position)
+
+        def handle_line(line: str, position: int) -> Iterator[ResponseEvent]:
+            index = 0
+            records = []
+            try:
+                while True:
+                    while index < len(line) and line[index].isspace():
+                        index += 1
+                    if index >= len(line):
+                        break
+                    record, index = decoder.raw_decode(line, index)
+                    records.append(record)
+            except ValueError:
+                records = []
+            if not records or not all(isinstance(r, dict) for r in records):
+                # JSONでない行は通常のテキストとして走査
+                if line.strip():
+                    yield from scan_text(line, position, text_artifacts=True)
+                return
+
+            for record in records:
+                for item_type, item in _iter_content(record):
+                    if item_type == "text":
+                        yield from scan_text(item, position, text_artifacts=False)
+                    elif item_type == "tool_use":
+                        tool = FILE_WRITE_TOOLS.get(item.get("name", ""))
+                        tool_input = item.get("input") or {}
+                        path = (
+                            tool_input.get(tool)
+                            if tool and isinstance(tool_input, dict)
+                            else None
+                        )
+                        if isinstance(path, str) and path:
+                            tool_id = item.get("id")
+                            if isinstance(tool_id, str):
+                                pending_writes[tool_id] = (path, position)
+                            else:
+                                yield from artifact(path, position)
+                    elif item_type == "tool_result":
+                        write = pending_writes.pop(item.get("tool_use_id", ""), None)
+                        if item.get("is_error"):
+                            message = _tool_result_text(item.get("content")).strip()
+                            first_line = message.splitlines()[0] if message else "tool error"
+                            yield ResponseEvent("error", first_line, position, "tool_error")
+                        elif write:
+                            yield from artifact(write[0], position)
+                    elif item_type == "result_error":
+                        yield ResponseEvent("error", str(item), position, "error")
+
+        for chunk in chunks:
+            buffer += chunk
+            start = 0
+            while True:
+                newline = buffer.find("\n", start)
+                if newline == -1:
+                    break
+                yield from handle_line(buffer[start:newline], line_position + start)
+                start = newline + 1
+            if start:
+                buffer = buffer[start:]
+                line_position += start
+
+        if buffer:
+            yield from handle_line(buffer, line_position)
+
+        # 結果が記録されていないツール呼び出し
+        for path, position in pending_writes.values():
+            yield from artifact(path, position)
+
+    @staticmethod
+    def _relative_artifact(path: str, root: Optional[Path]) -> str:
+        """ツール呼び出しのパスをプロジェクトからの相対パスに変換（外側のパスはそのまま）"""
+        if root is not None:
+            try:
+                return Path(path).resolve().relative_to(Path(root).resolve()).as_posix()
+            except (ValueError, OSError):
+                pass
+        return path
 
     def _extract_artifacts(self, text: str) -> List[str]:
         """
@@ -90,26 +715,7 @@ class ResponseParser:
         Returns:
             ファイルパスのリスト
         """
-        artifacts = set()
-
-        for regex in self.file_regex:
-            matches = regex.findall(text)
-            # ファイルパスのみを抽出（余分な文字を除去）
-            for match in matches:
-                # タプルの場合は最初の要素を取得
-                if isinstance(match, tuple):
-                    match = match[0]
-
-                # ファイルパスのクリーンアップ
-                cleaned = match.strip()
-
-                # 有効なファイルパスかチェック
-                if "." in cleaned and len(cleaned) < 200:
-                    # __pycache__や.pyc等は除外
-                    if not any(x in cleaned for x in ["__pycache__", ".pyc", ".pyo"]):
-                        artifacts.add(cleaned)
-
-        return sorted(artifacts)
+        return list(self._scan(text)["artifacts"])
 
     def _extract_task_ids(self, text: str) -> List[str]:
         """
@@ -121,8 +727,7 @@ class ResponseParser:
         Returns:
             タスクIDのリスト
         """
-        matches = self.task_id_regex.findall(text)
-        return sorted(set(matches))
+        return list(self._scan(text)["task_ids"])
 
     def _detect_completion(self, text: str) -> bool:
         """
@@ -134,8 +739,7 @@ class ResponseParser:
         Returns:
             完了キーワードが含まれるか
         """
-        text_lower = text.lower()
-        return any(kw.lower() in text_lower for kw in self.COMPLETION_KEYWORDS)
+        return bool(self._scan(text)["is_completed"])
 
     def suggest_completion(self, response_text: str, task_id: str) -> Optional[str]:
         """
@@ -177,25 +781,81 @@ class ResponseParser:
         Returns:
             タスク完了をマークしたかどうか
         """
-        from .task_provider import TaskProvider
+        return bool(self.auto_mark_completed_many(response_text, [task_id], project_path))
 
-        result = self.parse_response(response_text)
+    def auto_mark_completed_many(
+        self, response_text: str, task_ids: List[str], project_path: Path
+    ) -> List[str]:
+        """
+        応答から複数タスクの完了をまとめて自動マーク（progress.json の保存は1回）
 
-        # 完了判定
-        if not result["is_completed"]:
-            return False
+        タスクIDが言及されているタスクを完了にします。対象が1件の場合は
+        アーティファクトの言及だけでも完了とみなします。複数の場合、
+        アーティファクトは target_files に含まれるものだけを各タスクに記録します。
 
-        # タスクIDまたはアーティファクトが言及されているか
-        if task_id not in result["task_ids"] and not result["artifacts"]:
-            return False
+        Args:
+            response_text: Claude Codeの出力
+            task_ids: 対象タスクIDのリスト
+            project_path: プロジェクトパス
+
+        Returns:
+            完了をマークしたタスクIDのリスト
+        """
+        return self.mark_completed_from_result(
+            self.parse_response(response_text), task_ids, project_path
+        )
+
+    def mark_completed_from_result(
+        self, result: Dict[str, Any], task_ids: List[str], project_path: Path
+    ) -> List[str]:
+        """
+        解析結果（parse_response 形式）から複数タスクの完了をまとめて自動マーク
 
-        # タスク完了をマーク
-        try:
-            provider = TaskProvider(project_path)
-            provider.mark_completed(task_id, result["artifacts"])
-            return True
-        except Exception:
-            return False
+        逐次解析（iter_events）で集めた結果にも使用します。
+
+        Args:
+            result: 'artifacts' / 'task_ids' / 'is_completed' を持つ解析結果
+            task_ids: 対象タスクIDのリスト
+            project_path: プロジェクトパス
+
+        Returns:
+            完了をマークしたタスクIDのリスト
+
+        Raises:
+            OSError: tasks.json / progress.json の読み書きに失敗した場合
+            ValueError, KeyError: tasks.json / progress.json の内容が不正な場合
+        """
+        from .coordinator import Coordinator
+        from .models import TaskStatus
+
+        # 完了判定
+        if not result["is_completed"]:
+            return []
+
+        # progress.json は Coordinator の形式で保存する（cmw task complete / status と共通）
+        coordinator = Coordinator(project_path)
+        marked: List[str] = []
+        with coordinator.batch():
+            for task_id in task_ids:
+                task = coordinator.get_task(task_id)
+                if not task:
+                    continue
+
+                # タスクIDまたはアーティファクトが言及されているか
+                if len(task_ids) == 1:
+                    if task_id not in result["task_ids"] and not result["artifacts"]:
+                        continue
+                    artifacts = list(result["artifacts"])
+                else:
+                    if task_id not in result["task_ids"]:
+                        continue
+                    artifacts = [a for a in result["artifacts"] if a in task.target_files]
+
+                # タスク完了をマーク
+                coordinator.update_task_status(task_id, TaskStatus.COMPLETED, artifacts=artifacts)
+                marked.append(task_id)
+
+        return marked
 
     def extract_summary(self, response_text: str, max_length: int = 200) -> str:
         """
@@ -237,24 +897,11 @@ class ResponseParser:
         Returns:
             エラー情報のリスト
         """
-        errors = []
-
-        # エラーパターン
-        error_patterns = [
-            (r"Error:\s*(.+)", "error"),
-            (r"Exception:\s*(.+)", "exception"),
-            (r"Failed:\s*(.+)", "failure"),
-            (r"エラー:\s*(.+)", "error"),
-            (r"失敗:\s*(.+)", "failure"),
+        return [
+            {"type": error_type, "message": message}
+            for error_type, message in self._scan(response_text)["errors"]
         ]
 
-        for pattern, error_type in error_patterns:
-            matches = re.finditer(pattern, response_text, re.IGNORECASE)
-            for match in matches:
-                errors.append({"type": error_type, "message": match.group(1).strip()})
-
-        return errors
-
     def is_asking_question(self, response_text: str) -> bool:
         """
         応答が質問を含んでいるか判定
@@ -0,0 +1,209 @@
+"""
+ワークスティーリング・スケジューラ
+
+担当（Task.assigned_to）ごとの実行待ちキューを持ち、各ワーカーは自分の担当
+（Worker.id / Worker.skills）のキューからタスクを取ります。自分のキューが空の
+ワーカーは、最も詰まっている他のキューから担当できるタスクを奪います。
+
+同じ優先度のタスクの中では、そのワーカーが最近触れたファイル（実行したタスクの
+対象ファイル・成果物）を含むタスク、最近完了した依存タスクを持つタスクを優先し、
+セッションのコンテキストを再利用しやすくします。
+"""
+
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Optional, Set
+
+from .models import Task, Worker
+from .task_loop import PRIORITY_ORDER, TaskLoop, task_files
+
+# ワーカーごとに覚えておくファイル・タスクの数
+DEFAULT_HISTORY = 32
+
+
+def worker_homes(worker: Worker) -> Set[str]:
+    """ワーカーが自分のキューとして扱う担当（ワーカーID とスキル）"""
+    return {worker.id, *worker.skills}
+
+
+def can_steal(worker: Worker, task: Task, workers: Dict[str, Worker]) -> bool:
+    """
+    他の担当のタスクをワーカーが実行できるか
+
+    担当が登録されたワーカーでない・スキルを持たない場合、または担当のワーカーと
+    スキルが1つ以上重なる場合に実行できます。
+
+    Args:
+        worker: タスクを取るワーカー
+        task: タスク
+        workers: 登録されているワーカー（Coordinator.workers）
+    """
+    owner = workers.get(task.assigned_to)
+    if owner is None or not owner.skills:
+        return True
+    return bool(set(owner.skills) & set(worker.skills))
+
+
+class WorkerContext:
+    """
+    スケジューラから見たワーカー（担当と最近触れたファイル）
+
+    Attributes:
+        worker: ワーカー定義
+        homes: 自分のキューとして扱う担当（ワーカーID とスキル）
+    """
+
+    def __init__(self, worker: Worker, history: int = DEFAULT_HISTORY) -> None:
+        """
+        Args:
+            worker: ワーカー定義
+            history: 覚えておくファイル・タスクの数
+        """
+        self.worker = worker
+        self.homes = worker_homes(worker)
+        self.history = history
+        self._recent_files: "OrderedDict[str, None]" = OrderedDict()
+        self._recent_tasks: "OrderedDict[str, None]" = OrderedDict()
+
+    @property
+    def id(self) -> str:
+        return self.worker.id
+
+    @property
+    def recent_files(self) -> List[str]:
+        """最近触れたファイル（新しい順）"""
+        return list(reversed(self._recent_files))
+
+    def touch(self, task: Task, artifacts: Iterable[str] = ()) -> None:
+        """実行したタスクの対象ファイルと成果物を記録"""
+        self._remember(self._recent_tasks, [task.id])
+        self._remember(self._recent_files, [*task_files(task), *artifacts])
+
+    def locality(self, task: Task) -> int:
+        """最近触れたファイル・完了させた依存タスクとの重なり"""
+        files = sum(1 for path in task_files(task) if path in self._recent_files)
+        deps = sum(1 for dep_id in task.dependencies if dep_id in self._recent_tasks)
+        return files + deps
+
+    def _remember(self, recent: "OrderedDict[str, None]", keys: Iterable[str]) -> None:
+        for key in keys:
+            recent[key] = None
+            recent.move_to_end(key)
+        while len(recent) > self.history:
+            recent.popitem(last=False)
+
+
+class WorkStealingScheduler:
+    """
+    担当ごとのキューとワークスティーリングでタスクを割り当てるスケジューラ
+
+    Attributes:
+        task_loop: タスクの状態を所有する TaskLoop
+        steal: 自分のキューが空のときに他のキューから奪うか
+        contexts: 登録中のワーカー
+        steals: 奪ったタスクの数（ワーカーID -> 件数）
+    """
+
+    def __init__(self, task_loop: TaskLoop, steal: bool = True) -> None:
+        """
+        Args:
+            task_loop: タスクの状態を所有する TaskLoop
+            steal: 自分のキューが空のときに他のキューから奪うか
+        """
+        self.task_loop = task_loop
+        self.steal = steal
+        self.contexts: List[WorkerContext] = []
+        self.steals: Dict[str, int] = {}
+        self._queues: Dict[str, List[Task]] = {}
+        self._queues_version = -1
+
+    def register(self, worker: Worker, history: int = DEFAULT_HISTORY) -> WorkerContext:
+        """ワーカーを登録"""
+        context = WorkerContext(worker, history)
+        self.contexts.append(context)
+        return context
+
+    def retire(self, context: WorkerContext) -> None:
+        """終了したワーカーの登録を解除（残りのワーカーが待ち続けないように通知）"""
+        if context in self.contexts:
+            self.contexts.remove(context)
+            self.task_loop.wake()
+
+    def queues(self) -> Dict[str, List[Task]]:
+        """担当 -> 実行待ちのタスク（優先順、状態が変わったときのみ作り直す）"""
+        if self._queues_version != self.task_loop.version:
+            queues: Dict[str, List[Task]] = {}
+            for task in self.task_loop.ready_tasks():
+                queues.setdefault(task.assigned_to, []).append(task)
+            self._queues = queues
+            self._queues_version = self.task_loop.version
+        return self._queues
+
+    def can_take(self, context: WorkerContext, task: Task) -> bool:
+        """ワーカーがタスクを担当できるか（自分の担当、または奪えるタスク）"""
+        if task.assigned_to in context.homes:
+            return True
+        return self.steal and can_steal(context.worker, task, self.task_loop.coordinator.workers)
+
+    def choose(self, context: WorkerContext, candidates: List[Task]) -> Optional[Task]:
+        """
+        確保できるタスク（優先順）からワーカーが取るタスクを選ぶ
+
+        1. 自分の担当のタスク
+        2. 担当できるタスクのうち、実行待ちが最も多い担当のもの（奪う）
+
+        それぞれ優先度 → 最近触れたファイルとの重なり → ID順で選びます。
+        """
+        home = [task for task in candidates if task.assigned_to in context.homes]
+        if home:
+            return self._best(context, home)
+        if not self.steal:
+            return None
+
+        by_queue: Dict[str, List[Task]] = {}
+        for task in candidates:
+            if self.can_take(context, task):
+                by_queue.setdefault(task.assigned_to, []).append(task)
+        if not by_queue:
+            return None
+
+        # 最も詰まっているキューから奪う
+        queues = self.queues()
+        victim = max(by_queue, key=lambda name: (len(queues.get(name, [])), name))
+        self.steals[context.id] = self.steals.get(context.id, 0) + 1
+        return self._best(context, by_queue[victim])
+
+    async def next_task(self, context: WorkerContext) -> Optional[Task]:
+        """
+        ワーカーが次に実行するタスクを確保（現れるまで待つ）
+
+        Returns:
+            確保したタスク。待っても担当できるタスクが現れない場合は None
+        """
+        while True:
+            task = await self.task_loop.next_ready(
+                lambda task: self.can_take(context, task),
+                lambda candidates: self.choose(context, candidates),
+            )
+            if task is not None or not self._others_can_take(context):
+                return task
+            # 他のワーカーが実行すると担当できるタスクが現れる可能性がある
+            await self.task_loop.wait_for_change(self.task_loop.version)
+
+    def _others_can_take(self, context: WorkerContext) -> bool:
+        """他の登録中のワーカーが担当できる実行待ちのタスクがあるか"""
+        others = [other for other in self.contexts if other is not context]
+        return any(
+            self.can_take(other, task) for task in self.task_loop.ready_tasks() for other in others
+        )
+
+    @staticmethod
+    def _best(context: WorkerContext, tasks: List[Task]) -> Task:
+        return min(
+            tasks,
+            key=lambda task: (
+                PRIORITY_ORDER.get(task.priority, 1),
+                -context.locality(task),
+                task.ordinal or 0,
+                task.id,
+            ),
+        )
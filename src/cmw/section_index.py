@@ -0,0 +1,278 @@
+"""
+Markdown の見出しインデックス
+
+requirements.md / api-spec.md の見出しとバイト範囲を1回だけ索引化し、
+タスクに対応するセクションだけをファイルから読み出します。
+"""
+
+import json
+import os
+import re
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from .models import Task
+
+# 永続化するインデックスの形式（変更時は既存のキャッシュを作り直す）
+INDEX_VERSION = 1
+
+# 見出し行（# 〜 ######）
+HEADING_PATTERN = re.compile(rb"^(#{1,6})[ \t]+(.+?)[ \t#]*$")
+
+# API仕様から対応するセクションを探すためのエンドポイント表記（例: POST /users）
+ENDPOINT_PATTERN = re.compile(r"\b(GET|POST|PUT|PATCH|DELETE)\s+(/[\w/{}:.-]*)", re.IGNORECASE)
+
+# ルーターファイルからリソース名を取り出す（例: backend/routers/users.py -> users）
+ROUTER_PATTERN = re.compile(r"routers/(\w+)\.py$")
+
+# プロセス内で共有するインデックス（パス -> (mtime_ns, size, インデックス)）
+_loaded: Dict[Path, Tuple[int, int, "SectionIndex"]] = {}
+
+
+def _normalize(title: str) -> str:
+    """見出しの比較用に空白と大文字小文字の違いを除く"""
+    return re.sub(r"\s+", " ", title).strip().lower()
+
+
+@dataclass(frozen=True)
+class Section:
+    """
+    Markdown のセクション
+
+    Attributes:
+        level: 見出しレベル（1〜6）
+        title: 見出しテキスト
+        start: 見出し行の先頭のバイト位置
+        end: 次の同レベル以上の見出しの先頭（ファイル末尾）のバイト位置
+        parents: 上位の見出しテキスト（外側から順）
+    """
+
+    level: int
+    title: str
+    start: int
+    end: int
+    parents: Tuple[str, ...] = ()
+
+    def contains(self, other: "Section") -> bool:
+        """other がこのセクションの内側にあるか"""
+        return self.start <= other.start and other.end <= self.end and self != other
+
+
+class SectionIndex:
+    """
+    Markdown ファイルの見出しとバイト範囲のインデックス
+
+    インデックスはファイルの mtime とサイズをキーに保存され、ファイルが
+    変わるまで再構築しません。本文は必要なセクションの範囲だけを読み込みます。
+    """
+
+    def __init__(self, path: Path, sections: List[Section]) -> None:
+        """
+        Args:
+            path: インデックスの対象ファイル
+            sections: 出現順のセクション
+        """
+        self.path = Path(path)
+        self.sections = sections
+        # 読み込んだセクションの本文（インデックスはファイルが変わると作り直される）
+        self._texts: Dict[Section, str] = {}
+
+    @classmethod
+    def build(cls, path: Path) -> "SectionIndex":
+        """
+        ファイルを1回走査してインデックスを構築（コードブロック内の # は無視）
+
+        Args:
+            path: Markdown ファイル
+
+        Returns:
+            SectionIndex
+        """
+        # (レベル, 見出し, 開始位置, 上位の見出し)
+        headings: List[Tuple[int, str, int, Tuple[str, ...]]] = []
+        stack: List[Tuple[int, str]] = []
+        offset = 0
+        in_code_block = False
+
+        with open(path, "rb") as f:
+            for line in f:
+                stripped = line.strip()
+                if stripped.startswith(b"```"):
+                    in_code_block = not in_code_block
+                elif not in_code_block:
+                    match = HEADING_PATTERN.match(line.rstrip(b"\r\n"))
+                    if match:
+                        level = len(match.group(1))
+                        title = match.group(2).decode("utf-8", "replace").strip()
+                        while stack and stack[-1][0] >= level:
+                            stack.pop()
+                        headings.append((level, title, offset, tuple(t for _, t in stack)))
+                        stack.append((level, title))
+                offset += len(line)
+
+        sections = []
+        for i, (level, title, start, parents) in enumerate(headings):
+            end = offset
+            for next_level, _, next_start, _ in headings[i + 1 :]:
+                if next_level <= level:
+                    end = next_start
+                    break
+            sections.append(Section(level, title, start, end, parents))
+
+        return cls(path, sections)
+
+    @classmethod
+    def load(cls, path: Path, cache_file: Optional[Path] = None) -> "SectionIndex":
+        """
+        インデックスを取得（ファイルが変わっていなければ保存済みのものを使用）
+
+        Args:
+            path: Markdown ファイル
+            cache_file: インデックスを保存するJSONファイル（None の場合はプロセス内のみ）
+
+        Returns:
+            SectionIndex
+        """
+        path = Path(path)
+        stat = path.stat()
+        key = path.resolve()
+
+        loaded = _loaded.get(key)
+        if loaded and loaded[:2] == (stat.st_mtime_ns, stat.st_size):
+            return loaded[2]
+
+        index = None
+        entries: Dict[str, Dict] = {}
+        if cache_file is not None:
+            entries = _read_cache(cache_file)
+            entry = entries.get(str(key))
+            if (
+                entry
+                and entry.get("version") == INDEX_VERSION
+                and entry.get("mtime_ns") == stat.st_mtime_ns
+                and entry.get("size") == stat.st_size
+            ):
+                index = cls(
+                    path,
+                    [
+                        Section(level, title, start, end, tuple(parents))
+                        for level, title, start, end, parents in entry["sections"]
+                    ],
+                )
+
+        if index is None:
+            index = cls.build(path)
+            if cache_file is not None:
+                entries[str(key)] = {
+                    "version": INDEX_VERSION,
+                    "mtime_ns": stat.st_mtime_ns,
+                    "size": stat.st_size,
+                    "sections": [
+                        [s.level, s.title, s.start, s.end, list(s.parents)] for s in index.sections
+                    ],
+                }
+                _write_cache(cache_file, entries)
+
+        _loaded[key] = (stat.st_mtime_ns, stat.st_size, index)
+        return index
+
+    def read(self, section: Section) -> str:
+        """セクションの範囲だけをファイルから読み込む（同じセクションは1回のみ）"""
+        text = self._texts.get(section)
+        if text is None:
+            with open(self.path, "rb") as f:
+                f.seek(section.start)
+                text = f.read(section.end - section.start).decode("utf-8", "replace").rstrip()
+            self._texts[section] = text
+        return text
+
+    def read_all(self, sections: Iterable[Section]) -> str:
+        """複数のセクションを読み込んで連結"""
+        return "\n\n".join(self.read(section) for section in sections)
+
+    def find_for_task(self, task: Task) -> Optional[Section]:
+        """
+        タスクの元になったセクションを探す
+
+        RequirementsParser はセクション（## / ###）の見出しをタスクのタイトルにするため、
+        まず見出しとタイトルの一致を探します。同じ見出しが複数ある場合は、
+        上位の見出しがタスクの説明に含まれるものを優先します。
+
+        Returns:
+            対応するセクション（見つからない場合はNone）
+        """
+        title = _normalize(task.title)
+        if not title:
+            return None
+
+        exact = [s for s in self.sections if _normalize(s.title) == title]
+        if exact:
+            description = task.description or ""
+            for section in exact:
+                if section.parents and section.parents[-1] in description:
+                    return section
+            return exact[0]
+
+        # 部分一致（文書タイトルの # 見出しは対象外）、より具体的な見出しを優先
+        partial = []
+        for s in self.sections:
+            normalized = _normalize(s.title)
+            if s.level >= 2 and normalized and (normalized in title or title in normalized):
+                partial.append(s)
+        if partial:
+            return max(partial, key=lambda s: (len(s.title), s.level))
+        return None
+
+    def find_for_api(self, task: Task) -> List[Section]:
+        """
+        API仕様からタスクに関係するセクションを探す
+
+        タスクのタイトル・説明・受け入れ基準に書かれたエンドポイント（POST /users など）と、
+        target_files のルーター名（routers/users.py）を見出しと照合します。
+
+        Returns:
+            関係するセクション（内側のセクションは外側に含めて重複させない）
+        """
+        text = "\n".join([task.title, task.description or "", *task.acceptance_criteria])
+        keywords = {_normalize(path.rstrip("/")) for _, path in ENDPOINT_PATTERN.findall(text)}
+        keywords.update(
+            match.group(1).lower()
+            for match in (ROUTER_PATTERN.search(target) for target in task.target_files)
+            if match
+        )
+        keywords.discard("")
+        if not keywords:
+            return []
+
+        matched = [
+            s
+            for s in self.sections
+            if s.level >= 2 and any(k in _normalize(s.title) for k in keywords)
+        ]
+        return [s for s in matched if not any(other.contains(s) for other in matched)]
+
+
+def _read_cache(cache_file: Path) -> Dict[str, Dict]:
+    """保存済みのインデックスを読み込む（壊れている場合は空）"""
+    try:
+        data = json.loads(Path(cache_file).read_text(encoding="utf-8"))
+    except (OSError, json.JSONDecodeError):
+        return {}
+    return data if isinstance(data, dict) else {}
+
+
+def _write_cache(cache_file: Path, entries: Dict[str, Dict]) -> None:
+    """インデックスを保存（一時ファイルへの書き込み後に置き換え、失敗しても処理は続行）"""
+    cache_file = Path(cache_file)
+    tmp_path = cache_file.with_name(
+        f".{cache_file.name}.{os.getpid()}.{threading.get_ident()}.tmp"
+    )
+    try:
+        cache_file.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path.write_text(json.dumps(entries, ensure_ascii=False), encoding="utf-8")
+        os.replace(tmp_path, cache_file)
+    except OSError:
+        if tmp_path.exists():
+            tmp_path.unlink()
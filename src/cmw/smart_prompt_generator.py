@@ -5,12 +5,20 @@
 統合して、より文脈豊かなプロンプトを自動生成します。
 """
 
-from typing import List, Optional
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
 from pathlib import Path
 
-from .models import Task, TaskStatus
+import networkx as nx
+
+from .models import Priority, Task, TaskStatus
 from .dependency_analyzer import DependencyAnalyzer
-from .prompt_template import PromptTemplate
+from .prompt_layout import PromptLayout
+from .prompt_template import PromptTemplate, task_values
+from .section_index import SectionIndex
+
+# 優先度の表示
+PRIORITY_LABELS = {Priority.HIGH: "🔴 高", Priority.MEDIUM: "🟡 中", Priority.LOW: "🟢 低"}
 
 
 class SmartPromptGenerator:
@@ -28,6 +36,88 @@ class SmartPromptGenerator:
         self.analyzer = DependencyAnalyzer(tasks)
         self.base_generator = PromptTemplate(project_root)
 
+        # タスクごとのグラフ情報は構築時に1回だけ計算し、プロンプト生成時はO(1)で参照
+        self.critical_path: List[str] = self.analyzer.visualizer.get_critical_path()
+        self._critical_index = {task_id: i for i, task_id in enumerate(self.critical_path)}
+        self._dependents: Dict[str, List[Task]] = {task.id: [] for task in tasks}
+        for other in tasks:
+            for dep_id in dict.fromkeys(other.dependencies):
+                if dep_id in self._dependents:
+                    self._dependents[dep_id].append(other)
+        self._order, self._reach = self._compute_reachability()
+
+    def _compute_reachability(self) -> Tuple[List[str], Dict[str, int]]:
+        """
+        各タスクに（直接・間接的に）依存するタスクをビット集合で求める
+
+        循環を含む場合も強連結成分に縮約してから逆トポロジカル順に1回ずつ合成するため、
+        全タスクでグラフの辺を1回たどるだけで済みます。
+
+        Returns:
+            (ビット位置 -> タスクID, タスクID -> 依存するタスクのビット集合)
+        """
+        graph = self.analyzer.graph
+        order = list(graph.nodes())
+        bit = {task_id: 1 << i for i, task_id in enumerate(order)}
+
+        condensed = nx.condensation(graph)
+        members = {c: condensed.nodes[c]["members"] for c in condensed.nodes()}
+        component_bits = {c: sum(bit[m] for m in nodes) for c, nodes in members.items()}
+
+        reach_by_component: Dict[int, int] = {}
+        for c in reversed(list(nx.topological_sort(condensed))):
+            reach = 0
+            for successor in condensed.successors(c):
+                reach |= component_bits[successor] | reach_by_component[successor]
+            if len(members[c]) > 1:
+                # 循環内の他のタスクも互いに依存する
+                reach |= component_bits[c]
+            reach_by_component[c] = reach
+
+        mapping = condensed.graph["mapping"]
+        reach_by_task = {
+            task_id: reach_by_component[mapping[task_id]] & ~bit[task_id] for task_id in order
+        }
+        return order, reach_by_task
+
+    def is_on_critical_path(self, task_id: str) -> bool:
+        """タスクがクリティカルパス上にあるか"""
+        return task_id in self._critical_index
+
+    def get_blocking_count(self, task_id: str) -> int:
+        """このタスクに（直接・間接的に）依存するタスク数"""
+        return bin(self._reach.get(task_id, 0)).count("1")
+
+    def get_dependent_ids(self, task_id: str, limit: Optional[int] = None) -> List[str]:
+        """
+        このタスクに（直接・間接的に）依存するタスクID
+
+        Args:
+            task_id: タスクID
+            limit: 取得する最大件数（None の場合は全件）
+
+        Returns:
+            タスクIDのリスト（タスクの定義順）
+        """
+        reach = self._reach.get(task_id, 0)
+        result: List[str] = []
+        while reach and (limit is None or len(result) < limit):
+            low = reach & -reach
+            result.append(self._order[low.bit_length() - 1])
+            reach ^= low
+        return result
+
+    def get_direct_dependents(self, task_id: str) -> List[Task]:
+        """このタスクに直接依存するタスク（タスクの定義順）"""
+        return self._dependents.get(task_id, [])
+
+    def get_next_critical_task(self, task_id: str) -> Optional[Task]:
+        """クリティカルパス上で次のタスク（パス上にない・末尾の場合はNone）"""
+        index = self._critical_index.get(task_id)
+        if index is None or index + 1 >= len(self.critical_path):
+            return None
+        return self.tasks.get(self.critical_path[index + 1])
+
     def generate(self, task_id: str) -> str:
         """
         スマートプロンプトを生成
@@ -42,317 +132,154 @@ class SmartPromptGenerator:
         if not task:
             return f"エラー: タスク {task_id} が見つかりません"
 
-        sections = []
-
-        # 1. タスク概要（重要度を強調）
-        sections.append(self._build_enhanced_overview(task))
-
-        # 2. 依存関係（前後のタスク）
-        sections.append(self._build_enhanced_dependencies(task))
-
-        # 3. 関連ファイル（推測含む）
-        sections.append(self._build_file_section(task))
-
-        # 4. requirements.md から該当部分を抽出
-        sections.append(self._build_requirements_section(task))
-
-        # 5. 実装ガイド
-        sections.append(self._build_implementation_guide(task))
-
-        # 6. 完了条件チェックリスト
-        sections.append(self._build_checklist(task))
+        values = {"task": task_values(task)}
+        sections = {
+            # 1. タスク概要（重要度を強調）
+            "overview": self._overview_values(task),
+            # 2. 依存関係（前後のタスク）
+            "dependencies": self._dependency_values(task),
+            # 3. 関連ファイル（推測含む）
+            "files": self._file_values(task),
+            # 4. requirements.md から該当部分を抽出
+            "requirements": self._requirements_values(task),
+            # 5. 実装ガイド
+            "implementation_guide": self._implementation_guide_values(task),
+            # 6. 完了条件チェックリスト
+            "checklist": values,
+            # 7. テストコマンド
+            "test_commands": {"test_files": [f for f in task.target_files if "test" in f.lower()]},
+            # 8. 次のステップ
+            "next_steps": self._next_step_values(task),
+            # 9. 完了方法
+            "completion": {"first_task_id": next(iter(self.tasks))},
+        }
 
-        # 7. テストコマンド
-        sections.append(self._build_test_commands(task))
+        return PromptLayout.load("smart_prompt", self.project_root).render(sections)
 
-        # 8. 次のステップ
-        sections.append(self._build_next_steps(task))
+    def generate_many(
+        self, task_ids: List[str], max_workers: Optional[int] = None
+    ) -> Dict[str, str]:
+        """
+        複数タスクのプロンプトをスレッドで並列に生成
 
-        # 9. 完了方法
-        sections.append(self._build_completion_instructions())
+        タスクの読み込みと依存関係グラフの構築はこのインスタンスで1回だけ行い、
+        各タスクのプロンプトで共有します。
 
-        return "\n\n".join(filter(None, sections))
+        Args:
+            task_ids: タスクIDのリスト
+            max_workers: スレッド数（None の場合は ThreadPoolExecutor の既定値）
 
-    def _build_enhanced_overview(self, task: Task) -> str:
-        """強化されたタスク概要"""
-        is_critical = self.analyzer.is_on_critical_path(task.id)
-        blocking_count = self.analyzer.get_blocking_count(task.id)
+        Returns:
+            タスクID -> プロンプト（task_ids の順）
+        """
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            prompts = list(executor.map(self.generate, task_ids))
+        return dict(zip(task_ids, prompts))
+
+    def _overview_values(self, task: Task) -> Dict[str, Any]:
+        """強化されたタスク概要の値"""
+        return {
+            "task": task_values(task),
+            "priority_label": PRIORITY_LABELS.get(task.priority, "🟢 低"),
+            "is_critical": self.is_on_critical_path(task.id),
+            "blocking_count": self.get_blocking_count(task.id),
+        }
 
-        lines = [
-            "╭" + "─" * 50 + "╮",
-            f"│ 📋 タスク: {task.id} - {task.title}",
-            "╰" + "─" * 50 + "╯",
-            "",
-            "┌─ 🎯 タスク概要 " + "─" * 30 + "┐",
-            f"│ 優先度: {'🔴 高' if task.priority.value == 'high' else '🟡 中' if task.priority.value == 'medium' else '🟢 低'}",
-            f"│ 担当: {task.assigned_to}",
+    def _dependency_values(self, task: Task) -> Dict[str, Any]:
+        """前提タスクと、このタスクの完了を待つタスクの値"""
+        upstream = [
+            {
+                "icon": self._get_status_icon(self.tasks[dep_id].status),
+                "id": dep_id,
+                "title": self.tasks[dep_id].title,
+            }
+            for dep_id in task.dependencies
+            if dep_id in self.tasks
         ]
 
-        if is_critical:
-            lines.append("│")
-            lines.append("│ ⚠️  このタスクはクリティカルパス上にあります")
-            lines.append("│     優先的に完了させてください")
-
-        if blocking_count > 0:
-            lines.append("│")
-            lines.append(f"│ 🚧 このタスクは {blocking_count}個のタスク をブロック中")
-            lines.append("│     他のタスクがこのタスクの完了を待っています")
-
-        lines.append("└" + "─" * 48 + "┘")
-
-        return "\n".join(lines)
-
-    def _build_enhanced_dependencies(self, task: Task) -> str:
-        """強化された依存関係セクション"""
-        lines = [
-            "┌─ 🔗 依存関係 " + "─" * 33 + "┐",
+        downstream_count = self.get_blocking_count(task.id)
+        downstream = [
+            {"id": dep_id, "title": self.tasks[dep_id].title}
+            for dep_id in self.get_dependent_ids(task.id, limit=3)  # 最大3件表示
+            if dep_id in self.tasks
         ]
+        next_critical = self.get_next_critical_task(task.id) if downstream_count else None
+
+        return {
+            "upstream": upstream,
+            "downstream_count": downstream_count,
+            "downstream": downstream,
+            "downstream_more": max(0, downstream_count - 3),
+            "next_critical": next_critical.id if next_critical else None,
+        }
 
-        # 前提タスク
-        upstream = [self.tasks[dep_id] for dep_id in task.dependencies if dep_id in self.tasks]
-        if upstream:
-            lines.append("│ 前提タスク:")
-            for dep_task in upstream:
-                status_icon = self._get_status_icon(dep_task.status)
-                lines.append(f"│   {status_icon} {dep_task.id}: {dep_task.title}")
-        else:
-            lines.append("│ 前提タスク: なし (すぐ開始可能)")
-
-        lines.append("│")
-
-        # このタスクの完了を待つタスク
-        downstream_ids = self.analyzer.visualizer.get_dependent_tasks(task.id)
-        if downstream_ids:
-            lines.append("│ このタスクの完了を待つタスク:")
-            for dep_id in list(downstream_ids)[:3]:  # 最大3件表示
-                downstream_task: Optional[Task] = self.tasks.get(dep_id)
-                if downstream_task:
-                    lines.append(f"│   ├─ {downstream_task.id}: {downstream_task.title}")
-            if len(downstream_ids) > 3:
-                lines.append(f"│   └─ 他 {len(downstream_ids) - 3}件")
-
-            # 次のクリティカルパスタスク
-            critical_path = self.analyzer.visualizer.get_critical_path()
-            try:
-                current_idx = critical_path.index(task.id)
-                if current_idx + 1 < len(critical_path):
-                    next_critical = self.tasks[critical_path[current_idx + 1]]
-                    lines.append("│")
-                    lines.append(f"│ 💡 次のクリティカルパスタスク: {next_critical.id}")
-            except (ValueError, IndexError):
-                pass
-        else:
-            lines.append("│ 待機中のタスク: なし")
-
-        lines.append("└" + "─" * 48 + "┘")
-
-        return "\n".join(lines)
-
-    def _build_file_section(self, task: Task) -> str:
-        """ファイル関連セクション"""
-        lines = [
-            "┌─ 📁 関連ファイル " + "─" * 29 + "┐",
+    def _file_values(self, task: Task) -> Dict[str, Any]:
+        """対象ファイル（既存は📝、新規は🆕）の値"""
+        files = [
+            {"icon": "📝" if (self.project_root / path).exists() else "🆕", "path": path}
+            for path in task.target_files
         ]
+        return {"files": files, "has_requirements": self._requirements_path().exists()}
 
-        if task.target_files:
-            # 新規作成と既存修正を分類
-            lines.append("│ 作成・編集が必要:")
-            for file_path in task.target_files:
-                full_path = self.project_root / file_path
-                exists = full_path.exists()
-                icon = "📝" if exists else "🆕"
-                lines.append(f"│   {icon} {file_path}")
-        else:
-            lines.append("│ 対象ファイル: 指定なし")
-
-        # requirements.md を参照ファイルとして追加
-        req_path = self.project_root / "shared" / "docs" / "requirements.md"
-        if req_path.exists():
-            lines.append("│")
-            lines.append("│ 参照ファイル:")
-            lines.append("│   📖 shared/docs/requirements.md (仕様)")
-
-        lines.append("└" + "─" * 48 + "┘")
-
-        return "\n".join(lines)
-
-    def _build_requirements_section(self, task: Task) -> str:
-        """requirements.mdから関連部分を抽出"""
-        req_path = self.project_root / "shared" / "docs" / "requirements.md"
-
+    def _requirements_values(self, task: Task) -> Dict[str, Any]:
+        """requirements.md のタスクに対応するセクションの値"""
+        req_path = self._requirements_path()
         if not req_path.exists():
-            return ""
+            return {"has_requirements": False}
 
         try:
-            # requirements.mdの内容を読み込み
-            req_path.read_text(encoding="utf-8")
-
-            # タスクタイトルに関連する行を抽出（簡易実装）
-            lines = [
-                "┌─ 📝 実装ガイド (requirements.mdより) " + "─" * 5 + "┐",
-                "│",
-            ]
-
-            # タスク説明を表示
-            if task.description:
-                for line in task.description.split("\n"):
-                    lines.append(f"│ {line}")
-
-            lines.append("│")
-            lines.append("│ 詳細は requirements.md を参照してください")
-            lines.append("└" + "─" * 48 + "┘")
-
-            return "\n".join(lines)
-
+            # タスクに対応するセクションだけを読み込み
+            index = SectionIndex.load(
+                req_path, self.project_root / "shared" / "coordination" / "section_index.json"
+            )
+            section = index.find_for_task(task)
+            # 該当セクションがなければタスク説明を表示
+            body = index.read(section) if section else task.description
         except Exception:
-            return ""
-
-    def _build_implementation_guide(self, task: Task) -> str:
-        """実装ガイドセクション"""
-        lines = [
-            "┌─ 🛠️  実装手順 (推奨) " + "─" * 24 + "┐",
-        ]
-
-        # タスクのタグや種類から推奨手順を生成
-        if "model" in task.assigned_to.lower() or "model" in task.title.lower():
-            lines.extend([
-                "│ 1. データモデルクラスを定義",
-                "│ 2. バリデーションロジックを実装",
-                "│ 3. ユニットテストを作成",
-                "│ 4. マイグレーション生成（必要に応じて）",
-            ])
-        elif "api" in task.assigned_to.lower() or "api" in task.title.lower():
-            lines.extend([
-                "│ 1. APIエンドポイントを定義",
-                "│ 2. リクエスト/レスポンススキーマを作成",
-                "│ 3. ビジネスロジックを実装",
-                "│ 4. エラーハンドリングを追加",
-                "│ 5. APIテストを作成",
-            ])
-        elif "test" in task.assigned_to.lower():
-            lines.extend([
-                "│ 1. テストケースを洗い出し",
-                "│ 2. テストフィクスチャを準備",
-                "│ 3. 正常系テストを実装",
-                "│ 4. 異常系テストを実装",
-                "│ 5. カバレッジを確認",
-            ])
-        else:
-            lines.extend([
-                "│ 1. タスクの要件を確認",
-                "│ 2. 必要なファイルを作成",
-                "│ 3. 実装",
-                "│ 4. テスト",
-                "│ 5. 動作確認",
-            ])
-
-        lines.append("└" + "─" * 48 + "┘")
-
-        return "\n".join(lines)
-
-    def _build_checklist(self, task: Task) -> str:
-        """完了条件チェックリスト"""
-        lines = [
-            "┌─ ✅ 完了条件チェックリスト " + "─" * 18 + "┐",
-        ]
-
-        if task.acceptance_criteria:
-            for criterion in task.acceptance_criteria:
-                lines.append(f"│ [ ] {criterion}")
-        else:
-            # デフォルトのチェックリスト
-            lines.extend([
-                "│ [ ] 対象ファイルを作成・編集",
-                "│ [ ] コードが正しく動作",
-                "│ [ ] テストが全てパス",
-                "│ [ ] エラーハンドリングを実装",
-            ])
-
-        lines.append("└" + "─" * 48 + "┘")
-
-        return "\n".join(lines)
-
-    def _build_test_commands(self, task: Task) -> str:
-        """テストコマンドセクション"""
-        lines = [
-            "┌─ 🧪 テストコマンド " + "─" * 26 + "┐",
-        ]
-
-        # テストファイルがあればそのパスを表示
-        test_files = [f for f in task.target_files if "test" in f.lower()]
-
-        if test_files:
-            lines.append("│ # 該当テストのみ実行")
-            for test_file in test_files:
-                lines.append(f"│ pytest {test_file} -v")
-            lines.append("│")
-
-        lines.extend([
-            "│ # 全テスト実行",
-            "│ pytest -v",
-            "│",
-            "│ # カバレッジ確認",
-            "│ pytest --cov=src --cov-report=term",
-        ])
-
-        lines.append("└" + "─" * 48 + "┘")
-
-        return "\n".join(lines)
-
-    def _build_next_steps(self, task: Task) -> str:
-        """次のステップセクション"""
-        # 次に実行可能になるタスクを取得
-        downstream_ids = self.analyzer.visualizer.get_dependent_tasks(task.id)
-
-        if not downstream_ids:
-            return ""
-
-        lines = [
-            "┌─ 🔄 完了後の次ステップ " + "─" * 22 + "┐",
-            "│ このタスク完了後、以下が実行可能になります:",
-            "│",
-        ]
+            return {"has_requirements": False}
+
+        lines = [f"│ {line}".rstrip() for line in body.split("\n")] if body else []
+        return {"has_requirements": True, "body": lines}
+
+    def _implementation_guide_values(self, task: Task) -> Dict[str, Any]:
+        """タスクの種類（担当・タイトルから判定）"""
+        assigned_to = task.assigned_to.lower()
+        title = task.title.lower()
+        return {
+            "kind": {
+                "model": "model" in assigned_to or "model" in title,
+                "api": "api" in assigned_to or "api" in title,
+                "test": "test" in assigned_to,
+            }
+        }
 
-        # 直接依存しているタスクのみ表示
-        direct_deps = []
-        for other_task in self.task_list:
-            if task.id in other_task.dependencies:
-                direct_deps.append(other_task)
-
-        if direct_deps:
-            # クリティカルパス上のタスクを優先表示
-            critical_path = self.analyzer.visualizer.get_critical_path()
-            critical_next = [t for t in direct_deps if t.id in critical_path]
-
-            if critical_next:
-                next_task = critical_next[0]
-                lines.append(f"│ 1. [推奨] {next_task.id}: {next_task.title}")
-                lines.append("│    → クリティカルパス上のタスク")
-                lines.append(f"│    → cmw task prompt {next_task.id}")
-                lines.append("│")
-
-            # その他のタスク
-            other_next = [t for t in direct_deps if t not in critical_next][:2]
-            for i, next_task in enumerate(other_next, 2 if critical_next else 1):
-                lines.append(f"│ {i}. {next_task.id}: {next_task.title}")
-
-        lines.append("└" + "─" * 48 + "┘")
-
-        return "\n".join(lines)
-
-    def _build_completion_instructions(self) -> str:
-        """完了方法の説明"""
-        lines = [
-            "┌─ 💾 作業を終えたら " + "─" * 25 + "┐",
-            "│ # タスクを完了としてマーク",
-            "│ cmw task complete " + self.tasks[list(self.tasks.keys())[0]].id,
-            "│",
-            "│ # 生成ファイルも記録する場合",
-            "│ cmw task complete <TASK-ID> --artifacts '[\"file1.py\", \"file2.py\"]'",
-            "└" + "─" * 48 + "┘",
-        ]
+    def _next_step_values(self, task: Task) -> Dict[str, Any]:
+        """完了後に実行可能になるタスクの値"""
+        blocking_count = self.get_blocking_count(task.id)
+        if not blocking_count:
+            return {"blocking_count": 0}
+
+        # 直接依存しているタスクのみ表示（クリティカルパス上のタスクを優先）
+        direct_deps = self.get_direct_dependents(task.id)
+        critical_next = [t for t in direct_deps if self.is_on_critical_path(t.id)]
+        other_next = [t for t in direct_deps if t not in critical_next][:2]
+        first_number = 2 if critical_next else 1
+
+        return {
+            "blocking_count": blocking_count,
+            "critical_next": (
+                {"id": critical_next[0].id, "title": critical_next[0].title}
+                if critical_next
+                else None
+            ),
+            "other_next": [
+                {"number": number, "id": t.id, "title": t.title}
+                for number, t in enumerate(other_next, first_number)
+            ],
+        }
 
-        return "\n".join(lines)
+    def _requirements_path(self) -> Path:
+        return self.project_root / "shared" / "docs" / "requirements.md"
 
     def _get_status_icon(self, status: TaskStatus) -> str:
         """ステータスアイコンを取得"""
@@ -19,10 +19,15 @@ class StateManager:
 
     LOCK_TIMEOUT = 300  # 5分
 
-    def __init__(self, project_path: Path):
+    def __init__(self, project_path: Path, lock_name: str = ".lock"):
+        """
+        Args:
+            project_path: プロジェクトのルートパス
+            lock_name: ロックファイル名（用途ごとに別のロックを使う場合に指定）
+        """
         self.project_path = Path(project_path)
         self.progress_file = project_path / "shared/coordination/progress.json"
-        self.lock_file = project_path / "shared/coordination/.lock"
+        self.lock_file = project_path / "shared/coordination" / lock_name
 
     def acquire_lock(self, timeout: int = 10) -> bool:
         """
@@ -57,11 +62,17 @@ class StateManager:
             return False
 
         lock_data = self._read_lock()
-        if not lock_data:
-            return False
+        if lock_data:
+            timestamp = lock_data["timestamp"]
+        else:
+            # 書き込み途中・壊れたロックは更新時刻で判定
+            try:
+                timestamp = self.lock_file.stat().st_mtime
+            except FileNotFoundError:
+                return False
 
         # タイムアウトチェック
-        if time.time() - lock_data["timestamp"] > self.LOCK_TIMEOUT:
+        if time.time() - timestamp > self.LOCK_TIMEOUT:
             # 古いロックは無効
             self.release_lock()
             return False
@@ -89,7 +100,13 @@ class StateManager:
         }
 
         self.lock_file.parent.mkdir(parents=True, exist_ok=True)
-        self.lock_file.write_text(json.dumps(lock_data, indent=2), encoding="utf-8")
+        try:
+            # 作成と存在確認をアトミックに行う（同時に取得した場合は一方のみ成功）
+            fd = os.open(self.lock_file, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+        except FileExistsError:
+            return False
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(json.dumps(lock_data, indent=2))
 
         return True
 
@@ -1,19 +1,61 @@
 """
-Pythonコードの静的解析機能
+ソースコードの静的解析機能
 
-ASTを使用してファイルの依存関係を解析し、タスク間の依存関係を推論します。
+ASTや軽量パーサーでファイルの依存関係を解析し、タスク間の依存関係を推論します。
+Python, JavaScript/TypeScript, Go, Rust に対応しています。
 """
 
 import ast
-from typing import List, Dict, Set, Optional, Any
+from typing import Callable, List, Dict, Set, Optional, Any, Tuple
 from pathlib import Path
 import re
 
 from .models import Task
 
+# (ソースコード, ファイルパス) -> 依存ファイルのセット
+DependencyExtractor = Callable[[str, str], Set[str]]
+
+JS_SUFFIXES = [".ts", ".tsx", ".js", ".jsx", ".mjs", ".cjs"]
+
+# import x from './x' / import './x' / export * from './x' / require('./x') / import('./x')
+JS_IMPORT_PATTERN = re.compile(
+    r"""(?:^|[^\w$.])(?:import|export)\s[^'"`;]*?\sfrom\s*['"]([^'"]+)['"]"""
+    r"""|(?:^|[^\w$.])import\s*['"]([^'"]+)['"]"""
+    r"""|(?:^|[^\w$.])(?:require|import)\s*\(\s*['"]([^'"]+)['"]\s*\)""",
+    re.MULTILINE,
+)
+
+GO_SINGLE_IMPORT_PATTERN = re.compile(r'^\s*import\s+(?:[\w.]+\s+)?"([^"]+)"', re.MULTILINE)
+GO_IMPORT_BLOCK_PATTERN = re.compile(r"^\s*import\s*\((.*?)\)", re.MULTILINE | re.DOTALL)
+GO_BLOCK_ENTRY_PATTERN = re.compile(r'^\s*(?:[\w.]+\s+)?"([^"]+)"', re.MULTILINE)
+
+# シンボル単位のターゲット指定（例: "backend/models.py::User"）
+SYMBOL_SEPARATOR = "::"
+
+RUST_MOD_PATTERN = re.compile(r"^\s*(?:pub(?:\([^)]*\))?\s+)?mod\s+(\w+)\s*;", re.MULTILINE)
+RUST_USE_PATTERN = re.compile(
+    r"^\s*(?:pub(?:\([^)]*\))?\s+)?use\s+((?:crate|self|super)(?:::\w+)*)", re.MULTILINE
+)
+
+
+def split_symbol_target(target: str) -> Tuple[str, Optional[str]]:
+    """ターゲット指定をファイルパスとシンボル名に分割
+
+    Args:
+        target: "backend/models.py" または "backend/models.py::User"
+
+    Returns:
+        (ファイルパス, シンボル名) シンボル指定がなければシンボル名はNone
+    """
+    if SYMBOL_SEPARATOR in target:
+        file_path, symbol = target.split(SYMBOL_SEPARATOR, 1)
+        if file_path and symbol:
+            return file_path, symbol
+    return target, None
+
 
 class StaticAnalyzer:
-    """Pythonコードの静的解析機能"""
+    """ソースコードの静的解析機能"""
 
     def __init__(self, project_root: Optional[Path] = None):
         """
@@ -22,8 +64,26 @@ class StaticAnalyzer:
         """
         self.project_root = project_root or Path.cwd()
 
+        # 拡張子 -> 依存関係エクストラクタ
+        self.extractors: Dict[str, DependencyExtractor] = {".py": self._extract_python_dependencies}
+        for suffix in JS_SUFFIXES:
+            self.extractors[suffix] = self._extract_js_dependencies
+        self.extractors[".go"] = self._extract_go_dependencies
+        self.extractors[".rs"] = self._extract_rust_dependencies
+
+        # ファイルパス -> (mtime, 依存ファイル) の解析キャッシュ（全言語共通）
+        self._dependency_cache: Dict[str, Tuple[int, Set[str]]] = {}
+        # ファイルパス -> (mtime, 定義シンボル, 依存ファイルごとの使用シンボル)
+        self._symbol_cache: Dict[str, Tuple[int, Set[str], Dict[str, Optional[Set[str]]]]] = {}
+        # パス解決インデックス（存在確認のメモ化）
+        self._exists_index: Dict[str, bool] = {}
+        self._go_module: Optional[str] = None
+
     def analyze_file_dependencies(self, file_path: str) -> Set[str]:
-        """ファイルの依存関係を解析（AST使用）
+        """ファイルの依存関係を解析
+
+        拡張子に対応するエクストラクタ（Python, JS/TS, Go, Rust）で
+        インポートを抽出し、プロジェクト内のファイルに解決します。
 
         Args:
             file_path: 解析するファイルのパス（プロジェクトルートからの相対パス）
@@ -36,54 +96,358 @@ class StaticAnalyzer:
         if not full_path.exists():
             return set()
 
-        if not full_path.suffix == ".py":
+        extractor = self.extractors.get(full_path.suffix)
+        if extractor is None:
             return set()
 
+        # 変更がなければキャッシュを再利用
+        mtime = full_path.stat().st_mtime_ns
+        cached = self._dependency_cache.get(file_path)
+        if cached and cached[0] == mtime:
+            return set(cached[1])
+
         try:
             with open(full_path, "r", encoding="utf-8") as f:
                 source = f.read()
 
-            tree = ast.parse(source, filename=str(full_path))
+            dependencies = extractor(source, file_path)
+        except (SyntaxError, UnicodeDecodeError):
+            # 構文エラーやエンコーディングエラーは無視
             dependencies = set()
 
-            # sys.pathの変更を検出
-            extra_paths = self._detect_sys_path_changes(tree, file_path)
+        self._dependency_cache[file_path] = (mtime, set(dependencies))
+        return dependencies
 
-            # Import文を検出
-            for node in ast.walk(tree):
-                if isinstance(node, ast.Import):
+    def register_extractor(self, suffixes: List[str], extractor: DependencyExtractor) -> None:
+        """依存関係エクストラクタを登録
+
+        Args:
+            suffixes: 対象の拡張子リスト（例: [".vue"]）
+            extractor: (ソースコード, ファイルパス) を受け取り依存ファイルのセットを返す関数
+        """
+        for suffix in suffixes:
+            self.extractors[suffix] = extractor
+        self.clear_cache()
+
+    def clear_cache(self) -> None:
+        """解析キャッシュとパス解決インデックスをクリア"""
+        self._dependency_cache.clear()
+        self._symbol_cache.clear()
+        self._exists_index.clear()
+        self._go_module = None
+
+    def _exists(self, path: Path) -> bool:
+        """パスの存在確認（解決インデックスでメモ化）"""
+        key = str(path)
+        if key not in self._exists_index:
+            self._exists_index[key] = path.is_file()
+        return self._exists_index[key]
+
+    def _relative(self, path: Path) -> Optional[str]:
+        """プロジェクトルートからの相対パスに変換（ルート外ならNone）"""
+        try:
+            return str(path.resolve().relative_to(self.project_root.resolve()))
+        except ValueError:
+            return None
+
+    def _extract_python_dependencies(self, source: str, file_path: str) -> Set[str]:
+        """Pythonのimport文から依存ファイルを抽出（AST使用）"""
+        full_path = self.project_root / file_path
+        tree = ast.parse(source, filename=str(full_path))
+        dependencies = set()
+
+        # sys.pathの変更を検出
+        extra_paths = self._detect_sys_path_changes(tree, file_path)
+
+        # Import文を検出
+        for node in ast.walk(tree):
+            if isinstance(node, ast.Import):
+                for alias in node.names:
+                    dep_files = self._module_to_file(alias.name, file_path, extra_paths)
+                    dependencies.update(dep_files)
+
+            elif isinstance(node, ast.ImportFrom):
+                if node.module:
+                    # from X import Y の場合、XとX.Yの両方を試す
+                    dep_files = self._module_to_file(node.module, file_path, extra_paths)
+                    dependencies.update(dep_files)
+
+                    # Yがモジュールである場合も考慮（from routers import auth など）
+                    for alias in node.names:
+                        submodule = f"{node.module}.{alias.name}"
+                        sub_dep_files = self._module_to_file(submodule, file_path, extra_paths)
+                        # 自分自身を除外
+                        sub_dep_files.discard(file_path)
+                        dependencies.update(sub_dep_files)
+                else:
+                    # from . import Y の場合
                     for alias in node.names:
-                        dep_files = self._module_to_file(alias.name, file_path, extra_paths)
+                        dep_files = self._module_to_file(
+                            f".{alias.name}", file_path, extra_paths
+                        )
+                        # 自分自身を除外
+                        dep_files.discard(file_path)
                         dependencies.update(dep_files)
 
-                elif isinstance(node, ast.ImportFrom):
-                    if node.module:
-                        # from X import Y の場合、XとX.Yの両方を試す
-                        dep_files = self._module_to_file(node.module, file_path, extra_paths)
-                        dependencies.update(dep_files)
+        return dependencies
 
-                        # Yがモジュールである場合も考慮（from routers import auth など）
-                        for alias in node.names:
-                            submodule = f"{node.module}.{alias.name}"
-                            sub_dep_files = self._module_to_file(submodule, file_path, extra_paths)
-                            # 自分自身を除外
-                            sub_dep_files.discard(file_path)
-                            dependencies.update(sub_dep_files)
-                    else:
-                        # from . import Y の場合
-                        for alias in node.names:
-                            dep_files = self._module_to_file(
-                                f".{alias.name}", file_path, extra_paths
-                            )
-                            # 自分自身を除外
-                            dep_files.discard(file_path)
-                            dependencies.update(dep_files)
+    def _extract_js_dependencies(self, source: str, file_path: str) -> Set[str]:
+        """JavaScript/TypeScriptの import / require から依存ファイルを抽出"""
+        dependencies = set()
+        current_dir = (self.project_root / file_path).parent
+
+        for match in JS_IMPORT_PATTERN.finditer(source):
+            specifier = next(g for g in match.groups() if g is not None)
+
+            if specifier.startswith("."):
+                bases = [current_dir / specifier]
+            elif specifier.startswith("/"):
+                bases = [self.project_root / specifier.lstrip("/")]
+            else:
+                # パッケージ名はプロジェクトルート基準（baseUrl: "."相当）でのみ解決
+                bases = [self.project_root / specifier]
+
+            for base in bases:
+                resolved = self._resolve_js_path(base)
+                if resolved and resolved != file_path:
+                    dependencies.add(resolved)
+
+        return dependencies
+
+    def _resolve_js_path(self, base: Path) -> Optional[str]:
+        """JS/TSのモジュール指定子をファイルに解決"""
+        candidates = [base]
+        candidates += [Path(f"{base}{ext}") for ext in JS_SUFFIXES]
+        candidates += [base / f"index{ext}" for ext in JS_SUFFIXES]
+
+        for candidate in candidates:
+            if self._exists(candidate):
+                return self._relative(candidate)
+        return None
+
+    def _extract_go_dependencies(self, source: str, file_path: str) -> Set[str]:
+        """Goのimport宣言から依存ファイルを抽出（go.modのモジュールパス基準）"""
+        dependencies: Set[str] = set()
+        module_path = self._get_go_module()
+
+        import_paths = GO_SINGLE_IMPORT_PATTERN.findall(source)
+        for block in GO_IMPORT_BLOCK_PATTERN.findall(source):
+            import_paths += GO_BLOCK_ENTRY_PATTERN.findall(block)
+
+        current_dir = str(Path(file_path).parent)
 
-            return dependencies
+        for import_path in import_paths:
+            if module_path and (
+                import_path == module_path or import_path.startswith(module_path + "/")
+            ):
+                package_dir = import_path[len(module_path) :].lstrip("/")
+            elif import_path.startswith("."):
+                package_dir = str(Path(current_dir) / import_path)
+            else:
+                # 標準ライブラリや外部モジュール
+                continue
+
+            package_path = self.project_root / package_dir
+            if not package_path.is_dir():
+                continue
+
+            for go_file in sorted(package_path.glob("*.go")):
+                if go_file.name.endswith("_test.go"):
+                    continue
+                relative = self._relative(go_file)
+                if relative and relative != file_path:
+                    dependencies.add(relative)
+
+        return dependencies
+
+    def _get_go_module(self) -> Optional[str]:
+        """go.mod からモジュールパスを取得（キャッシュ）"""
+        if self._go_module is None:
+            self._go_module = ""
+            go_mod = self.project_root / "go.mod"
+            if self._exists(go_mod):
+                match = re.search(r"^module\s+(\S+)", go_mod.read_text(encoding="utf-8"), re.M)
+                if match:
+                    self._go_module = match.group(1)
+        return self._go_module or None
+
+    def _extract_rust_dependencies(self, source: str, file_path: str) -> Set[str]:
+        """Rustの mod / use 宣言から依存ファイルを抽出"""
+        dependencies = set()
+        current = Path(file_path)
+
+        # mod foo; の解決先ディレクトリ（main.rs, lib.rs, mod.rs は自身のディレクトリ）
+        if current.name in ("main.rs", "lib.rs", "mod.rs"):
+            module_dir = current.parent
+        else:
+            module_dir = current.parent / current.stem
+
+        for name in RUST_MOD_PATTERN.findall(source):
+            resolved = self._resolve_rust_module(module_dir, [name])
+            if resolved:
+                dependencies.add(resolved)
+
+        crate_root = self._find_rust_crate_root(current)
+
+        for use_path in RUST_USE_PATTERN.findall(source):
+            segments = [s.strip() for s in use_path.split("::") if s.strip()]
+            if not segments:
+                continue
+
+            head, rest = segments[0], segments[1:]
+            if head == "crate":
+                if crate_root is None:
+                    continue
+                base_dir = crate_root
+            elif head == "self":
+                base_dir = module_dir
+            else:
+                # super::super::x は階層を遡る
+                base_dir = module_dir.parent
+                while rest and rest[0] == "super":
+                    base_dir = base_dir.parent
+                    rest = rest[1:]
+
+            resolved = self._resolve_rust_module(base_dir, rest)
+            if resolved and resolved != file_path:
+                dependencies.add(resolved)
+
+        return dependencies
+
+    def _resolve_rust_module(self, base_dir: Path, segments: List[str]) -> Optional[str]:
+        """Rustのモジュールパスを最長一致でファイルに解決"""
+        # use crate::a::b::Item は a/b.rs → a.rs の順に試す
+        for length in range(len(segments), 0, -1):
+            module_path = self.project_root / base_dir / "/".join(segments[:length])
+            for candidate in (Path(f"{module_path}.rs"), module_path / "mod.rs"):
+                if self._exists(candidate):
+                    return self._relative(candidate)
+        return None
+
+    def _find_rust_crate_root(self, current: Path) -> Optional[Path]:
+        """lib.rs または main.rs を含むクレートルートを探す"""
+        for directory in current.parents:
+            for root_file in ("lib.rs", "main.rs"):
+                if self._exists(self.project_root / directory / root_file):
+                    return directory
+        return None
+
+    def get_defined_symbols(self, file_path: str) -> Set[str]:
+        """ファイルがトップレベルで定義するクラス・関数・変数を取得
+
+        Args:
+            file_path: 解析するファイルのパス（プロジェクトルートからの相対パス）
+
+        Returns:
+            シンボル名のセット（Python以外は空）
+        """
+        return set(self._analyze_symbols(file_path)[0])
+
+    def analyze_symbol_dependencies(self, file_path: str) -> Dict[str, Optional[Set[str]]]:
+        """シンボル単位の依存関係を解析
+
+        `from X import Y` で実際に使用しているシンボル名を依存ファイルごとに記録します。
+        `import X` や `from X import *`、Python以外の言語のように
+        どのシンボルを使うか特定できない場合はファイル全体（None）への依存とします。
+
+        Args:
+            file_path: 解析するファイルのパス（プロジェクトルートからの相対パス）
+
+        Returns:
+            依存ファイル -> 使用シンボルのセット（ファイル全体への依存はNone）
+        """
+        usage = self._analyze_symbols(file_path)[1]
+        return {dep: (set(names) if names is not None else None) for dep, names in usage.items()}
 
+    def _analyze_symbols(
+        self, file_path: str
+    ) -> Tuple[Set[str], Dict[str, Optional[Set[str]]]]:
+        """定義シンボルと使用シンボルを解析（キャッシュ付き）"""
+        full_path = self.project_root / file_path
+
+        if not full_path.exists():
+            return set(), {}
+
+        if full_path.suffix != ".py":
+            # シンボル解析非対応の言語はファイル単位の依存として扱う
+            return set(), {dep: None for dep in self.analyze_file_dependencies(file_path)}
+
+        mtime = full_path.stat().st_mtime_ns
+        cached = self._symbol_cache.get(file_path)
+        if cached and cached[0] == mtime:
+            return cached[1], cached[2]
+
+        defined: Set[str] = set()
+        usage: Dict[str, Optional[Set[str]]] = {}
+
+        try:
+            with open(full_path, "r", encoding="utf-8") as f:
+                source = f.read()
+            tree = ast.parse(source, filename=str(full_path))
         except (SyntaxError, UnicodeDecodeError):
-            # 構文エラーやエンコーディングエラーは無視
-            return set()
+            self._symbol_cache[file_path] = (mtime, defined, usage)
+            return defined, usage
+
+        # トップレベルの定義
+        for node in tree.body:
+            if isinstance(node, (ast.ClassDef, ast.FunctionDef, ast.AsyncFunctionDef)):
+                defined.add(node.name)
+            elif isinstance(node, ast.Assign):
+                for target in node.targets:
+                    if isinstance(target, ast.Name):
+                        defined.add(target.id)
+            elif isinstance(node, ast.AnnAssign) and isinstance(node.target, ast.Name):
+                defined.add(node.target.id)
+
+        extra_paths = self._detect_sys_path_changes(tree, file_path)
+
+        def add_usage(dep_file: str, names: Optional[Set[str]]) -> None:
+            if dep_file == file_path:
+                return
+            if names is None or (dep_file in usage and usage[dep_file] is None):
+                usage[dep_file] = None
+            else:
+                current = usage.setdefault(dep_file, set())
+                if current is not None:
+                    current.update(names)
+
+        for ast_node in ast.walk(tree):
+            if isinstance(ast_node, ast.Import):
+                for alias in ast_node.names:
+                    for dep in self._module_to_file(alias.name, file_path, extra_paths):
+                        add_usage(dep, None)
+
+            elif isinstance(ast_node, ast.ImportFrom):
+                if not ast_node.module:
+                    # from . import Y はモジュール全体
+                    for alias in ast_node.names:
+                        for dep in self._module_to_file(f".{alias.name}", file_path, extra_paths):
+                            add_usage(dep, None)
+                    continue
+
+                base_files = self._module_to_file(ast_node.module, file_path, extra_paths)
+                for base in base_files:
+                    add_usage(base, set())
+
+                for alias in ast_node.names:
+                    if alias.name == "*":
+                        for base in base_files:
+                            add_usage(base, None)
+                        continue
+
+                    # Yがサブモジュールならモジュール全体への依存
+                    submodule = f"{ast_node.module}.{alias.name}"
+                    sub_files = self._module_to_file(submodule, file_path, extra_paths)
+                    sub_files.discard(file_path)
+                    if sub_files:
+                        for sub in sub_files:
+                            add_usage(sub, None)
+                    else:
+                        for base in base_files:
+                            add_usage(base, {alias.name})
+
+        self._symbol_cache[file_path] = (mtime, defined, usage)
+        return defined, usage
 
     def _detect_sys_path_changes(self, tree: ast.AST, current_file: str) -> List[Path]:
         """sys.pathの変更を検出
@@ -202,7 +566,7 @@ class StaticAnalyzer:
             # __init__.py または .py を試す
             for suffix in ["__init__.py", ".py"]:
                 candidate = self.project_root / f"{module_path}{suffix}"
-                if candidate.exists():
+                if self._exists(candidate):
                     results.add(str(candidate.relative_to(self.project_root)))
 
             return results
@@ -219,38 +583,47 @@ class StaticAnalyzer:
         for base in search_bases:
             # __init__.py を試す
             candidate = base / module_path_str / "__init__.py"
-            if candidate.exists() and candidate.is_relative_to(self.project_root):
+            if self._exists(candidate) and candidate.is_relative_to(self.project_root):
                 results.add(str(candidate.relative_to(self.project_root)))
 
             # .py を試す
             candidate = base / f"{module_path_str}.py"
-            if candidate.exists() and candidate.is_relative_to(self.project_root):
+            if self._exists(candidate) and candidate.is_relative_to(self.project_root):
                 results.add(str(candidate.relative_to(self.project_root)))
 
         return results
 
     def infer_task_dependencies(
-        self, tasks: List[Task], existing_dependencies: bool = True
+        self, tasks: List[Task], existing_dependencies: bool = True, granularity: str = "file"
     ) -> List[Task]:
         """タスク間の依存関係を静的解析で推論
 
         Args:
             tasks: タスクのリスト
             existing_dependencies: 既存の依存関係を保持するか
+            granularity: "file"（ファイル単位）または "symbol"（シンボル単位）
+                シンボル単位では target_files に "backend/models.py::User" のように
+                シンボルを指定したタスク同士は、実際に使用されるシンボルにのみ依存します
 
         Returns:
             依存関係が更新されたタスクのリスト
         """
-        # タスクIDとtarget_filesのマッピングを作成
-        task_files: Dict[str, Set[str]] = {}
+        if granularity not in ("file", "symbol"):
+            raise ValueError(f"Unknown granularity: {granularity}")
+
+        # ファイル全体を担当するタスクと、シンボル単位で担当するタスクのマッピング
         file_to_task: Dict[str, List[str]] = {}
+        symbol_to_task: Dict[Tuple[str, str], List[str]] = {}
+        file_to_symbol_tasks: Dict[str, List[str]] = {}
 
         for task in tasks:
-            task_files[task.id] = set(task.target_files)
-            for file in task.target_files:
-                if file not in file_to_task:
-                    file_to_task[file] = []
-                file_to_task[file].append(task.id)
+            for target in task.target_files:
+                file, symbol = split_symbol_target(target)
+                if symbol and granularity == "symbol":
+                    symbol_to_task.setdefault((file, symbol), []).append(task.id)
+                    file_to_symbol_tasks.setdefault(file, []).append(task.id)
+                else:
+                    file_to_task.setdefault(file, []).append(task.id)
 
         # 各タスクの依存関係を推論
         updated_tasks = []
@@ -262,16 +635,28 @@ class StaticAnalyzer:
             else:
                 inferred_deps = set()
 
+            target_files = {split_symbol_target(target)[0] for target in task.target_files}
+
             # 各target_fileの依存関係を解析
-            for target_file in task.target_files:
-                file_deps = self.analyze_file_dependencies(target_file)
+            for target_file in sorted(target_files):
+                dep_usage: Dict[str, Optional[Set[str]]]
+                if granularity == "symbol":
+                    dep_usage = self.analyze_symbol_dependencies(target_file)
+                else:
+                    dep_usage = {dep: None for dep in self.analyze_file_dependencies(target_file)}
+
+                # 依存ファイル（シンボル）がどのタスクに属するか確認
+                for dep_file, names in dep_usage.items():
+                    candidates = list(file_to_task.get(dep_file, []))
+                    if names is None:
+                        candidates += file_to_symbol_tasks.get(dep_file, [])
+                    else:
+                        for name in names:
+                            candidates += symbol_to_task.get((dep_file, name), [])
 
-                # 依存ファイルがどのタスクに属するか確認
-                for dep_file in file_deps:
-                    if dep_file in file_to_task:
-                        for dep_task_id in file_to_task[dep_file]:
-                            if dep_task_id != task.id:
-                                inferred_deps.add(dep_task_id)
+                    for dep_task_id in candidates:
+                        if dep_task_id != task.id:
+                            inferred_deps.add(dep_task_id)
 
             # 依存関係を更新
             updated_task = Task(
@@ -302,7 +687,7 @@ class StaticAnalyzer:
         all_files = set()
         for task in tasks:
             for file in task.target_files:
-                all_files.add(file)
+                all_files.add(split_symbol_target(file)[0])
 
         # ファイル間の依存関係グラフを構築
         file_graph: Dict[str, Set[str]] = {}
@@ -360,9 +745,9 @@ class StaticAnalyzer:
         import_counts: Dict[str, int] = {}  # ファイル -> インポートしているファイル数
         imported_counts: Dict[str, int] = {}  # ファイル -> インポートされている回数
 
-        all_files = []
+        all_files: List[str] = []
         for task in tasks:
-            all_files.extend(task.target_files)
+            all_files.extend(split_symbol_target(file)[0] for file in task.target_files)
 
         stats["total_files"] = len(all_files)
 
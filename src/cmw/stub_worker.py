@@ -0,0 +1,57 @@
+"""
+スタブワーカー
+
+`cmw run` のデフォルトのワーカーコマンドです。標準入力からプロンプトを受け取り、
+Claude Code のセッションの代わりに完了報告だけを出力して終了します。
+ワーカープールの動作確認やテストに使用します。
+
+Usage:
+    python -m cmw.stub_worker [TASK_ID] [--delay 秒] [--exit-code N]
+"""
+
+import argparse
+import re
+import sys
+import time
+from typing import List, Optional
+
+# プロンプトの見出しからタスクIDを取り出す（TASK_ID を省略した場合）
+TASK_HEADING_PATTERN = re.compile(r"タスク:\s*(\S+)")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """
+    スタブワーカーを実行
+
+    Args:
+        argv: コマンドライン引数（None の場合は sys.argv）
+
+    Returns:
+        終了コード
+    """
+    parser = argparse.ArgumentParser(prog="python -m cmw.stub_worker")
+    parser.add_argument("task_id", nargs="?", help="タスクID（省略時はプロンプトから取得）")
+    parser.add_argument("--delay", type=float, default=0.0, help="完了までの待ち時間（秒）")
+    parser.add_argument("--exit-code", type=int, default=0, help="終了コード（0以外で失敗を再現）")
+    args = parser.parse_args(argv)
+
+    prompt = sys.stdin.read()
+    task_id = args.task_id
+    if task_id is None:
+        match = TASK_HEADING_PATTERN.search(prompt)
+        task_id = match.group(1) if match else "UNKNOWN"
+
+    print(f"{task_id} の作業を開始します（スタブ、プロンプト {len(prompt)} 文字）", flush=True)
+    if args.delay > 0:
+        time.sleep(args.delay)
+
+    if args.exit_code:
+        print(f"Error: {task_id} はスタブの指定により失敗しました", flush=True)
+        return int(args.exit_code)
+
+    print(f"{task_id} 完了", flush=True)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,124 @@
+"""
+タスクID体系
+
+タスクIDの形式（接頭辞・桁数）を一元管理し、生成・解析・テキストからの検出を提供します。
+"""
+
+import json
+import re
+import sys
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Pattern, Tuple
+
+# 連番として扱う最大桁数（極端に長いIDは連番なしとして扱う）
+MAX_ORDINAL_DIGITS = 18
+
+# 任意の形式のタスクID末尾の連番
+ORDINAL_PATTERN = re.compile(rf"(?<!\d)(\d{{1,{MAX_ORDINAL_DIGITS}}})$")
+
+
+def parse_task_ordinal(task_id: str) -> Optional[int]:
+    """
+    タスクIDから連番を取得（接頭辞に依存しない）
+
+    Args:
+        task_id: タスクID（例: "TASK-001", "API-12345"）
+
+    Returns:
+        連番（末尾が数字でない場合はNone）
+    """
+    match = ORDINAL_PATTERN.search(task_id)
+    return int(match.group(1)) if match else None
+
+
+@dataclass(frozen=True)
+class TaskIdScheme:
+    """
+    タスクIDの形式
+
+    IDは「接頭辞-連番」で、連番は width 桁以上にゼロ埋めされます。
+    width 桁を超える連番（TASK-1000 など）もそのまま生成・検出できます。
+
+    Attributes:
+        prefix: 接頭辞（デフォルト: "TASK"）
+        width: 連番の最小桁数（デフォルト: 3）
+    """
+
+    prefix: str = "TASK"
+    width: int = 3
+    pattern: Pattern[str] = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        if not self.prefix:
+            raise ValueError("タスクIDの接頭辞を指定してください")
+        if self.width < 1:
+            raise ValueError(f"タスクIDの桁数は1以上で指定してください: {self.width}")
+
+        # テキスト中のIDを検出する正規表現（一度だけコンパイル、findall がIDを返すようグループなし）
+        compiled = re.compile(rf"{re.escape(self.prefix)}-\d{{{self.width},}}")
+        object.__setattr__(self, "pattern", compiled)
+
+    def format(self, ordinal: int) -> str:
+        """連番からタスクIDを生成（例: 1 -> "TASK-001"）"""
+        return f"{self.prefix}-{ordinal:0{self.width}d}"
+
+    def parse(self, task_id: str) -> Optional[int]:
+        """この形式のタスクIDから連番を取得（形式が異なる場合はNone）"""
+        if self.pattern.fullmatch(task_id) is None:
+            return None
+        digits = task_id[len(self.prefix) + 1 :]
+        return int(digits) if len(digits) <= MAX_ORDINAL_DIGITS else None
+
+    def is_valid(self, task_id: str) -> bool:
+        """この形式のタスクIDかどうか"""
+        return self.pattern.fullmatch(task_id) is not None
+
+    def findall(self, text: str) -> List[str]:
+        """テキスト中のタスクIDを出現順に抽出"""
+        return self.pattern.findall(text)
+
+    def sort_key(self, task_id: str) -> Tuple[int, str]:
+        """連番順に並べるためのソートキー（連番のないIDは末尾）"""
+        ordinal = parse_task_ordinal(task_id)
+        return (ordinal if ordinal is not None else sys.maxsize, task_id)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """tasks.json の "task_id" 設定として保存する形式"""
+        return {"prefix": self.prefix, "width": self.width}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "TaskIdScheme":
+        """tasks.json の "task_id" 設定から生成（省略した項目はデフォルト）"""
+        if not isinstance(data, dict):
+            raise ValueError(f"task_id の設定はオブジェクトで指定してください: {data!r}")
+        return cls(prefix=str(data.get("prefix", "TASK")), width=int(data.get("width", 3)))
+
+
+DEFAULT_TASK_ID_SCHEME = TaskIdScheme()
+
+
+def load_task_id_scheme(tasks_file: Path) -> TaskIdScheme:
+    """
+    tasks.json の "task_id" 設定からプロジェクトのタスクID形式を読み込む
+
+    例: {"task_id": {"prefix": "API", "width": 4}, "tasks": [...]}
+
+    Args:
+        tasks_file: tasks.json のパス
+
+    Returns:
+        タスクIDの形式（ファイル・設定がない場合はデフォルト）
+
+    Raises:
+        ValueError: 設定が不正な場合
+    """
+    try:
+        with open(tasks_file, "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return DEFAULT_TASK_ID_SCHEME
+    config = data.get("task_id") if isinstance(data, dict) else None
+    if config is None:
+        return DEFAULT_TASK_ID_SCHEME
+    return TaskIdScheme.from_dict(config)
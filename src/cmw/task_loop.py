@@ -0,0 +1,451 @@
+"""
+タスク実行のイベントループ
+
+asyncio のイベントループ上でタスクの状態を1か所で所有し、ワーカー・Git同期・
+ダッシュボードの更新を1つのプロセス内で並行に動かすための中核です。
+
+- next_ready(): 実行可能でファイル競合のないタスクが現れるまで待って確保
+- complete() / complete_many() / fail() / release(): 結果を記録し、待っている側に通知
+- watch(): progress.json / tasks.json の変更（他のプロセスによる更新）を取り込む
+- sync_git(): コミットで参照されたタスクを定期的に完了にする
+
+状態の変化はイベントで通知するため、ロック待ちのスリープやポーリングによる
+状態の再読み込みは行いません。
+"""
+
+import asyncio
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Set
+
+from .coordinator import Coordinator
+from .file_watcher import FileWatcher
+from .models import Priority, Task, TaskStatus
+from .static_analyzer import split_symbol_target
+
+# 優先度の並び順
+PRIORITY_ORDER = {Priority.HIGH: 0, Priority.MEDIUM: 1, Priority.LOW: 2}
+
+# タスクの選択条件（ワーカーが担当できるタスクか）
+TaskPredicate = Callable[[Task], bool]
+
+# 確保できるタスク（優先順）から1つを選ぶ関数（WorkStealingScheduler など）
+TaskChooser = Callable[[List[Task]], Optional[Task]]
+
+
+def task_files(task: Task) -> Set[str]:
+    """競合判定に使うファイル（シンボル指定は取り除く）"""
+    return {split_symbol_target(target)[0] for target in task.target_files}
+
+
+def task_order(task: Task) -> tuple:
+    """実行の優先順（優先度 → ID順）"""
+    return (PRIORITY_ORDER.get(task.priority, 1), task.ordinal or 0, task.id)
+
+
+class TaskLoop:
+    """
+    タスクの状態を所有するイベントループの中核
+
+    全ての操作は同じイベントループ上で呼び出してください（スレッドセーフではありません）。
+    状態の変更は Coordinator を通じて progress.json に保存されます。
+
+    Attributes:
+        coordinator: タスクの状態を保持する Coordinator
+        version: 状態が変わるたびに増える番号（wait_for_change 用）
+    """
+
+    def __init__(self, coordinator: Coordinator) -> None:
+        """
+        Args:
+            coordinator: タスクを読み込んだ Coordinator
+        """
+        self.coordinator = coordinator
+        self.version = 0
+        # 確保中のタスク -> 使用するファイル
+        self._claimed: Dict[str, Set[str]] = {}
+        # タスク -> 最後に変わったときの version
+        self._touched: Dict[str, int] = {}
+        # 待機中のコルーチンを起こすイベント（変化のたびに新しいものに置き換える）
+        self._changed: Optional[asyncio.Event] = None
+        self._rebuild()
+
+    @property
+    def tasks(self) -> Dict[str, Task]:
+        return self.coordinator.tasks
+
+    @property
+    def claimed(self) -> List[str]:
+        """確保中のタスクID"""
+        return list(self._claimed)
+
+    # === 状態の参照 ===
+
+    def ready_tasks(self) -> List[Task]:
+        """依存タスクが全て完了した実行待ちのタスク（優先順）"""
+        return sorted((self.tasks[task_id] for task_id in self._ready), key=task_order)
+
+    def candidates(self, predicate: Optional[TaskPredicate] = None) -> List[Task]:
+        """
+        今確保できるタスク（優先順）
+
+        Args:
+            predicate: タスクの選択条件（None の場合は全て）
+
+        Returns:
+            実行可能で確保中のタスクとファイルが重複しないタスク
+        """
+        used: Set[str] = set()
+        for files in self._claimed.values():
+            used |= files
+
+        return [
+            task
+            for task in self.ready_tasks()
+            if not task_files(task) & used and (predicate is None or predicate(task))
+        ]
+
+    def peek(
+        self, predicate: Optional[TaskPredicate] = None, choose: Optional[TaskChooser] = None
+    ) -> Optional[Task]:
+        """
+        次に確保されるタスクを取得（確保はしない）
+
+        Args:
+            predicate: タスクの選択条件（None の場合は全て）
+            choose: 確保できるタスクから1つを選ぶ関数（None の場合は先頭）
+
+        Returns:
+            実行可能で確保中のタスクとファイルが重複しないタスク（なければNone）
+        """
+        candidates = self.candidates(predicate)
+        if choose is not None:
+            return choose(candidates) if candidates else None
+        return candidates[0] if candidates else None
+
+    def changed_since(self, version: int) -> List[str]:
+        """指定した version より後に変わったタスクID"""
+        return [task_id for task_id, v in self._touched.items() if v > version]
+
+    # === 操作 ===
+
+    async def next_ready(
+        self, predicate: Optional[TaskPredicate] = None, choose: Optional[TaskChooser] = None
+    ) -> Optional[Task]:
+        """
+        実行可能なタスクを確保（現れるまで待つ）
+
+        確保したタスクは実行中になり、complete / fail / release を呼ぶまで
+        他の呼び出し元には返しません。
+
+        Args:
+            predicate: タスクの選択条件（None の場合は全て）
+            choose: 確保できるタスクから1つを選ぶ関数（None を返した場合は待つ）
+
+        Returns:
+            確保したタスク。確保中のタスクがなく、待っても実行可能なタスクが
+            現れない場合は None
+        """
+        while True:
+            task = self.peek(predicate, choose)
+            if task is not None:
+                self._claim(task)
+                return task
+            if not self._claimed:
+                return None
+            await self._wait()
+
+    async def complete(self, task_id: str, artifacts: Optional[List[str]] = None) -> bool:
+        """
+        タスクを完了にし、依存するタスクを実行可能にする
+
+        Args:
+            task_id: タスクID
+            artifacts: 生成されたファイル
+
+        Returns:
+            状態を変更したか（既に完了している・存在しない場合は False）
+        """
+        self._claimed.pop(task_id, None)
+        changed = self._mark_completed(task_id, artifacts)
+        self._notify(changed)
+        return bool(changed)
+
+    async def fail(self, task_id: str, error: Optional[str] = None) -> bool:
+        """
+        タスクを失敗にする（依存するタスクは実行可能にならない）
+
+        Returns:
+            状態を変更したか（既に完了・失敗している、存在しない場合は False）
+        """
+        self._claimed.pop(task_id, None)
+        task = self.tasks.get(task_id)
+        if task is None or task.status in (TaskStatus.COMPLETED, TaskStatus.FAILED):
+            self._notify([])
+            return False
+
+        task.failed_at = datetime.now()
+        self.coordinator.update_task_status(task_id, TaskStatus.FAILED, error_message=error)
+        self._ready.discard(task_id)
+        self._notify([task_id])
+        return True
+
+    async def release(self, task_id: str, requeue: bool = True) -> bool:
+        """
+        確保したタスクを実行待ちに戻す（中断時など）
+
+        Args:
+            task_id: タスクID
+            requeue: False の場合は実行中のまま手放す（他のセッションが実行している場合）
+
+        Returns:
+            状態を変更したか（確保していない場合は False）
+        """
+        if self._claimed.pop(task_id, None) is None:
+            return False
+
+        task = self.tasks.get(task_id)
+        if requeue and task is not None and task.status == TaskStatus.IN_PROGRESS:
+            task.started_at = None
+            self.coordinator.update_task_status(task_id, TaskStatus.PENDING)
+            if self._is_ready(task_id):
+                self._ready.add(task_id)
+        self._notify([task_id])
+        return True
+
+    async def wait_for_change(self, version: int) -> int:
+        """
+        状態が指定した version から変わるまで待つ
+
+        Returns:
+            新しい version
+        """
+        while self.version == version:
+            await self._wait()
+        return self.version
+
+    def requeue(self, task_ids: Iterable[str]) -> List[str]:
+        """
+        確保していない実行中のタスクを実行待ちに戻す（期限切れのリースの回収など）
+
+        Returns:
+            実行待ちに戻したタスクIDのリスト
+        """
+        requeued = [
+            task_id
+            for task_id in task_ids
+            if task_id in self.tasks
+            and task_id not in self._claimed
+            and self.tasks[task_id].status == TaskStatus.IN_PROGRESS
+        ]
+        if not requeued:
+            return []
+
+        with self.coordinator.batch():
+            for task_id in requeued:
+                self.tasks[task_id].started_at = None
+                self.coordinator.update_task_status(task_id, TaskStatus.PENDING)
+        self._rebuild()
+        self._notify(requeued)
+        return requeued
+
+    def complete_many(self, task_ids: Iterable[str]) -> List[str]:
+        """
+        確保していないタスクをまとめて完了にする（コミットから検出した完了など）
+
+        progress.json の保存と待機中のコルーチンへの通知はそれぞれ1回です。
+
+        Returns:
+            完了にしたタスクIDのリスト（確保中・完了済み・存在しないタスクは除外）
+        """
+        completed: List[str] = []
+        changed: List[str] = []
+        with self.coordinator.batch():
+            for task_id in task_ids:
+                if task_id in self._claimed:
+                    continue
+                marked = self._mark_completed(task_id)
+                if marked:
+                    completed.append(task_id)
+                    changed.extend(marked)
+        if completed:
+            self._notify(changed)
+        return completed
+
+    def wake(self) -> None:
+        """状態を変えずに待機中のコルーチンを起こす（条件を見直させる）"""
+        self._notify([])
+
+    # === 並行して動かす処理 ===
+
+    async def watch(self, poll_interval: float = 1.0, use_inotify: bool = True) -> None:
+        """
+        progress.json / tasks.json の変更を監視し、他のプロセスによる更新を取り込む
+
+        inotify が使える場合はファイルディスクリプタをイベントループで待つため、
+        スレッドもポーリングも使いません。キャンセルされるまで続きます。
+
+        Args:
+            poll_interval: inotify が使えない場合のポーリング間隔（秒）
+            use_inotify: inotify を使用するか
+        """
+        coordinator = self.coordinator
+        watcher = FileWatcher(
+            [coordinator.tasks_file, coordinator.progress_file],
+            poll_interval=poll_interval,
+            use_inotify=use_inotify,
+        )
+        with watcher:
+            while True:
+                changed = await self._wait_files(watcher, poll_interval)
+                if coordinator.tasks_file in changed:
+                    self.reload()
+                elif coordinator.progress_file in changed:
+                    self.apply_external(coordinator.reload_progress())
+
+    async def sync_git(
+        self, interval: float = 60.0, since: Optional[str] = None, branch: str = "HEAD"
+    ) -> None:
+        """
+        コミットで参照されたタスクを定期的に完了にする
+
+        Git の読み込みはスレッドで行い、イベントループを止めません。
+        確保中のタスクはワーカーの報告を待つため変更しません。キャンセルされるまで続きます。
+
+        Args:
+            interval: 同期の間隔（秒）
+            since: コミット検索の開始時点（Noneの場合は全履歴）
+            branch: 対象ブランチ
+        """
+        from .git_integration import GitIntegration
+
+        git = GitIntegration(self.coordinator.id_scheme)
+        project_path = Path(self.coordinator.project_path)
+        while True:
+            task_ids = await asyncio.get_running_loop().run_in_executor(
+                None, git.find_completed_tasks, project_path, since, branch
+            )
+            self.complete_many(sorted(task_ids))
+            await asyncio.sleep(interval)
+
+    # === 外部の変更の取り込み ===
+
+    def reload(self) -> None:
+        """tasks.json を読み直して状態を作り直す（確保中のタスクは実行中のまま）"""
+        self.coordinator.reload()
+        for task_id in list(self._claimed):
+            task = self.tasks.get(task_id)
+            if task is None:
+                del self._claimed[task_id]
+            elif task.status == TaskStatus.PENDING:
+                task.status = TaskStatus.IN_PROGRESS
+        self._rebuild()
+        self._notify(self.tasks)
+
+    def apply_external(self, task_ids: Iterable[str]) -> None:
+        """
+        他のプロセスが変更したタスクを反映（Coordinator.reload_progress の結果）
+
+        確保中のタスクが実行待ちに戻されていた場合は実行中のままにします。
+        """
+        task_ids = list(task_ids)
+        if not task_ids:
+            return
+        for task_id in task_ids:
+            task = self.tasks[task_id]
+            if task_id in self._claimed and task.status == TaskStatus.PENDING:
+                task.status = TaskStatus.IN_PROGRESS
+        self._rebuild()
+        self._notify(task_ids)
+
+    # === プライベートメソッド ===
+
+    def _rebuild(self) -> None:
+        """未完了の依存数と実行可能なタスクを全タスクから求め直す"""
+        tasks = self.tasks
+        self._dependents: Dict[str, List[str]] = {task_id: [] for task_id in tasks}
+        self._remaining: Dict[str, int] = {}
+        for task in tasks.values():
+            remaining = 0
+            for dep_id in dict.fromkeys(task.dependencies):
+                dep_task = tasks.get(dep_id)
+                # 存在しない依存タスクは満たされない
+                if dep_task is None or dep_task.status != TaskStatus.COMPLETED:
+                    remaining += 1
+                if dep_task is not None:
+                    self._dependents[dep_id].append(task.id)
+            self._remaining[task.id] = remaining
+        self._ready: Set[str] = {task_id for task_id in tasks if self._is_ready(task_id)}
+
+    def _mark_completed(self, task_id: str, artifacts: Optional[List[str]] = None) -> List[str]:
+        """
+        タスクを完了にして依存数を減らす（通知はしない）
+
+        Returns:
+            状態が変わったタスクID（完了にしたタスクと実行可能になったタスク）。
+            既に完了している・存在しない場合は空
+        """
+        task = self.tasks.get(task_id)
+        if task is None or task.status == TaskStatus.COMPLETED:
+            return []
+
+        self.coordinator.update_task_status(task_id, TaskStatus.COMPLETED, artifacts=artifacts)
+        self._ready.discard(task_id)
+
+        changed = [task_id]
+        for dependent_id in self._dependents.get(task_id, []):
+            self._remaining[dependent_id] -= 1
+            if self._is_ready(dependent_id):
+                self._ready.add(dependent_id)
+                changed.append(dependent_id)
+        return changed
+
+    def _is_ready(self, task_id: str) -> bool:
+        return (
+            self.tasks[task_id].status == TaskStatus.PENDING
+            and self._remaining[task_id] == 0
+            and task_id not in self._claimed
+        )
+
+    def _claim(self, task: Task) -> None:
+        self._claimed[task.id] = task_files(task)
+        self._ready.discard(task.id)
+        task.started_at = datetime.now()
+        self.coordinator.update_task_status(task.id, TaskStatus.IN_PROGRESS)
+        self._notify([task.id])
+
+    def _notify(self, task_ids: Iterable[str]) -> None:
+        """状態の変化を記録し、待機中のコルーチンを起こす"""
+        self.version += 1
+        for task_id in task_ids:
+            self._touched[task_id] = self.version
+        if self._changed is not None:
+            self._changed.set()
+            self._changed = None
+
+    async def _wait(self) -> None:
+        """次の状態の変化まで待つ"""
+        if self._changed is None:
+            # イベントループ内で作成する（Python 3.9 ではループに結び付くため）
+            self._changed = asyncio.Event()
+        await self._changed.wait()
+
+    @staticmethod
+    async def _wait_files(watcher: FileWatcher, poll_interval: float) -> Set[Path]:
+        """監視しているファイルの変更を待つ"""
+        while True:
+            fd = watcher.fileno()
+            if fd is not None:
+                loop = asyncio.get_running_loop()
+                readable = asyncio.Event()
+                loop.add_reader(fd, readable.set)
+                try:
+                    await readable.wait()
+                finally:
+                    loop.remove_reader(fd)
+            else:
+                await asyncio.sleep(poll_interval)
+
+            changed = watcher.wait(0)
+            if changed:
+                return changed
@@ -5,44 +5,83 @@ TaskProvider - Claude Codeにタスク情報を提供
 - 次に実行すべきタスクを選択
 - タスク実行に必要な全情報を提供
 - タスク完了/失敗の記録
+- 期限付きリースによるタスクの確保（クラッシュしたセッションのタスクを回収）
 """
 
+from contextlib import contextmanager, suppress
 from pathlib import Path
-from typing import Optional, Dict, List
+from typing import Optional, Dict, Iterator, List, Tuple
 from datetime import datetime
 import json
+import os
 
-from .models import Task, TaskStatus
+from .models import Task, TaskStatus, Worker
+from .context_builder import DEFAULT_MAX_TOKENS, ContextBuilder
 from .coordinator import Coordinator
+from .lease import DEFAULT_LEASE_TTL, Lease, LeaseError, LeaseManager, default_owner
+from .scheduler import can_steal, worker_homes
+from .section_index import SectionIndex
 
 
 class TaskProvider:
     """Claude Codeへのタスク情報提供"""
 
-    def __init__(self, project_path: Path):
+    def __init__(
+        self,
+        project_path: Path,
+        context_tokens: int = DEFAULT_MAX_TOKENS,
+        owner: Optional[str] = None,
+        lease_ttl: float = DEFAULT_LEASE_TTL,
+    ):
         """
         Args:
             project_path: プロジェクトのルートパス
+            context_tokens: 関連ファイルと依存タスクの成果物に使うコンテキストの予算（トークン）
+            owner: リースの所有者ID（None の場合はホスト名:PID）
+            lease_ttl: リースの有効期間（秒、heartbeat で延長）
         """
         self.project_path = Path(project_path)
+        self.owner = owner or default_owner()
+        self.leases = LeaseManager(self.project_path, ttl=lease_ttl)
         self.coordinator = Coordinator(project_path)
         self.progress_file = project_path / "shared/coordination/progress.json"
+        self.section_index_file = project_path / "shared/coordination/section_index.json"
+        self.context_builder = ContextBuilder(
+            self.project_path / "shared/artifacts",
+            max_tokens=context_tokens,
+            cache_dir=self.project_path / "shared/coordination/cache",
+        )
+
+        # バッチ更新中は保存を遅延（ネスト可）
+        self._batch_depth = 0
+        self._dirty = False
+        # 保存後に解放するリース（タスクID, トークン, 結果）
+        self._pending_finishes: List[Tuple[str, Optional[str], str]] = []
 
         # 進捗情報を読み込み
         self._load_progress()
 
-    def get_next_task(self) -> Optional[Task]:
+    def get_next_task(self, worker_id: Optional[str] = None) -> Optional[Task]:
         """
         次に実行すべきタスクを取得
 
         依存関係を考慮し、実行可能なタスクの中から
-        優先度の高いものを返す
+        優先度の高いものを返す。他のセッションがリースを持つタスクは除外する
+        （状態は変更しない。期限切れのリースの回収は reclaim_expired で明示的に行う）
+
+        Args:
+            worker_id: 問い合わせたワーカー（指定した場合は担当のタスクを優先し、
+                なければ担当できる他のタスクを返す）
 
         Returns:
             実行可能なタスク、なければNone
         """
         # 実行可能なタスクを取得（依存関係チェック済み）
-        ready_tasks = self._get_ready_tasks()
+        leased = self.leases.active()
+        ready_tasks = [task for task in self._get_ready_tasks() if task.id not in leased]
+
+        if worker_id is not None:
+            ready_tasks = self._filter_for_worker(ready_tasks, worker_id)
 
         if not ready_tasks:
             return None
@@ -73,6 +112,9 @@ class TaskProvider:
         if not task:
             raise ValueError(f"Task {task_id} not found")
 
+        # 関連ファイルと依存タスクの成果物は予算内で優先度順に読み込む
+        files = self.context_builder.build(task, self.coordinator.tasks)
+
         return {
             "task": {
                 "id": task.id,
@@ -83,71 +125,220 @@ class TaskProvider:
             },
             "requirements": self._load_requirements_section(task),
             "api_spec": self._load_api_spec(task),
-            "related_files": self._get_related_files(task),
-            "dependencies_artifacts": self._get_dependency_artifacts(task),
+            "related_files": files["related_files"],
+            "dependencies_artifacts": files["dependencies_artifacts"],
+            "context_budget": files["budget"],
             "project_structure": self._get_project_structure(),
         }
 
-    def mark_started(self, task_id: str) -> None:
+    def mark_started(self, task_id: str, ttl: Optional[float] = None) -> Lease:
         """
-        タスク開始を記録
+        タスク開始を記録し、リースを取得
+
+        リースは heartbeat で延長しない限り有効期間の経過後に回収され、
+        タスクは他のセッションが実行できる状態に戻ります。
+        （バッチ更新中もリースは即座に記録されます）
 
         Args:
             task_id: タスクID
+            ttl: リースの有効期間（秒、None の場合は既定値）
+
+        Returns:
+            取得したリース（完了・失敗の記録にトークンを渡す）
+
+        Raises:
+            LeaseError: 他のセッションが有効なリースを持っている場合
         """
         task = self.coordinator.get_task(task_id)
         if not task:
             raise ValueError(f"Task {task_id} not found")
 
+        lease = self.leases.acquire(task_id, self.owner, ttl)
+        if lease is None:
+            holder = self.leases.get(task_id)
+            raise LeaseError(
+                f"Task {task_id} is leased by {holder.owner if holder else 'another session'}"
+            )
+
         task.status = TaskStatus.IN_PROGRESS
         task.started_at = datetime.now()
 
-        self._save_progress()
+        self._save_or_defer()
+        return lease
+
+    def heartbeat(self, token: str, ttl: Optional[float] = None) -> Lease:
+        """
+        リースの期限を延長（実行中は有効期間より短い間隔で呼び出す）
+
+        Raises:
+            LeaseError: リースが期限切れで回収された場合
+        """
+        return self.leases.renew(token, ttl)
+
+    def reclaim_expired(self) -> List[str]:
+        """
+        期限の切れたリースを回収し、実行中のままのタスクを実行待ちに戻す
 
-    def mark_completed(self, task_id: str, artifacts: List[str]) -> None:
+        Returns:
+            実行待ちに戻したタスクIDのリスト
+        """
+        reclaimed = []
+        for lease in self.leases.reclaim_expired():
+            task = self.coordinator.get_task(lease.task_id)
+            if task and task.status == TaskStatus.IN_PROGRESS:
+                task.status = TaskStatus.PENDING
+                task.started_at = None
+                reclaimed.append(task.id)
+
+        if reclaimed:
+            self._save_or_defer()
+        return reclaimed
+
+    def mark_completed(
+        self, task_id: str, artifacts: List[str], token: Optional[str] = None
+    ) -> bool:
         """
         タスク完了を記録
 
         Args:
             task_id: タスクID
             artifacts: 生成されたファイルのリスト
+            token: mark_started で取得したリースのトークン（指定した場合、
+                同じトークンでの2回目以降の呼び出しは何もしない）
+
+        Returns:
+            記録したか（同じトークンで記録済みの場合は False）
+
+        Raises:
+            LeaseError: リースが期限切れで回収された場合
         """
         task = self.coordinator.get_task(task_id)
         if not task:
             raise ValueError(f"Task {task_id} not found")
+        if not self._check_lease(task_id, token):
+            return False
 
         task.status = TaskStatus.COMPLETED
         task.completed_at = datetime.now()
         task.artifacts = artifacts
 
-        self._save_progress()
-
         # 依存タスクのブロックを解除
         self._unblock_dependent_tasks(task_id)
 
-    def mark_failed(self, task_id: str, error: str) -> None:
+        self._save_or_defer()
+        self._finish_lease(task_id, token, "completed")
+        return True
+
+    def mark_failed(self, task_id: str, error: str, token: Optional[str] = None) -> bool:
         """
         タスク失敗を記録
 
         Args:
             task_id: タスクID
             error: エラーメッセージ
+            token: mark_started で取得したリースのトークン（mark_completed と同様）
+
+        Returns:
+            記録したか（同じトークンで記録済みの場合は False）
+
+        Raises:
+            LeaseError: リースが期限切れで回収された場合
         """
         task = self.coordinator.get_task(task_id)
         if not task:
             raise ValueError(f"Task {task_id} not found")
+        if not self._check_lease(task_id, token):
+            return False
 
         task.status = TaskStatus.FAILED
         task.error = error
         task.failed_at = datetime.now()
 
-        self._save_progress()
-
         # 依存タスクをブロック状態に
         self._block_dependent_tasks(task_id)
 
+        self._save_or_defer()
+        self._finish_lease(task_id, token, "failed")
+        return True
+
+    @contextmanager
+    def batch(self) -> Iterator["TaskProvider"]:
+        """
+        複数の記録を1回の保存にまとめる
+
+        ブロック内の mark_started / mark_completed / mark_failed は保存を遅延し、
+        終了時に progress.json を1回だけ書き込みます。リースのトークンは保存に
+        成功してから消費します。例外が発生した場合は Coordinator.batch がタスクの
+        変更を元に戻し、保存もトークンの消費もしません。
+        """
+        if self._batch_depth == 0:
+            self._dirty = False
+            self._pending_finishes = []
+
+        self._batch_depth += 1
+        try:
+            with self.coordinator.batch():
+                yield self
+        except BaseException:
+            if self._batch_depth == 1:
+                self._dirty = False
+                self._pending_finishes = []
+            raise
+        finally:
+            self._batch_depth -= 1
+
+        if self._batch_depth == 0:
+            pending, self._pending_finishes = self._pending_finishes, []
+            if self._dirty:
+                self._dirty = False
+                self._save_progress()
+            for task_id, token, outcome in pending:
+                self._finish_lease(task_id, token, outcome)
+
     # === プライベートメソッド ===
 
+    def _check_lease(self, task_id: str, token: Optional[str]) -> bool:
+        """結果の記録を受け付けられるかを確認（トークンなしは常に受け付ける）"""
+        if token is None:
+            return True
+        if any(pending == token for _, pending, _ in self._pending_finishes):
+            # 同じバッチ内で記録済み
+            return False
+
+        lease = self.leases.get(task_id)
+        if lease is not None and lease.token != token:
+            # 期限切れの後に他のセッションが取得している
+            raise LeaseError(f"Task {task_id} is leased by {lease.owner}")
+        return self.leases.check(token, task_id)
+
+    def _finish_lease(self, task_id: str, token: Optional[str], outcome: str) -> None:
+        """保存した記録のリースを解放（バッチ更新中は保存の後まで遅延）"""
+        if self._batch_depth:
+            self._pending_finishes.append((task_id, token, outcome))
+            return
+
+        if token is None:
+            # トークンなしの記録（従来の呼び出し）でも自身のリースは解放する
+            lease = self.leases.get(task_id)
+            if lease is not None and lease.owner == self.owner:
+                self.leases.release(lease.token)
+            return
+
+        # 記録は保存済み（確認の後にリースが回収された場合も記録は残す）
+        with suppress(LeaseError):
+            self.leases.finish(token, outcome)
+
+    def _filter_for_worker(self, tasks: List[Task], worker_id: str) -> List[Task]:
+        """ワーカーの担当のタスク、なければ担当できる他のタスク"""
+        workers = self.coordinator.workers
+        worker = workers.get(worker_id) or Worker(id=worker_id, name=worker_id, description="")
+        homes = worker_homes(worker)
+
+        home = [task for task in tasks if task.assigned_to in homes]
+        if home:
+            return home
+        return [task for task in tasks if can_steal(worker, task, workers)]
+
     def _get_ready_tasks(self) -> List[Task]:
         """依存関係を満たした実行可能なタスクを取得"""
         ready = []
@@ -180,57 +371,25 @@ class TaskProvider:
         return True
 
     def _load_requirements_section(self, task: Task) -> str:
-        """requirements.mdから関連セクションを読み込み"""
+        """requirements.mdからタスクに対応するセクションを読み込み"""
         req_file = self.project_path / "shared/docs/requirements.md"
         if not req_file.exists():
             return ""
 
-        content = req_file.read_text(encoding="utf-8")
-
-        # タスクに関連するセクションを抽出
-        # （簡易実装: 将来的にはセクションマッピングを使用）
-        return content
+        index = SectionIndex.load(req_file, self.section_index_file)
+        section = index.find_for_task(task)
+        if section is None:
+            return ""
+        return index.read(section)
 
     def _load_api_spec(self, task: Task) -> str:
-        """API仕様から関連部分を読み込み"""
+        """API仕様からタスクのエンドポイントに関係するセクションを読み込み"""
         api_file = self.project_path / "shared/docs/api-spec.md"
         if not api_file.exists():
             return ""
 
-        return api_file.read_text(encoding="utf-8")
-
-    def _get_related_files(self, task: Task) -> List[Dict]:
-        """タスクに関連する既存ファイルを取得"""
-        related = []
-        artifacts_dir = self.project_path / "shared/artifacts"
-
-        # target_filesに関連するファイルを探す
-        for target in task.target_files:
-            target_path = artifacts_dir / target
-            if target_path.exists():
-                related.append({"path": target, "content": target_path.read_text(encoding="utf-8")})
-
-        return related
-
-    def _get_dependency_artifacts(self, task: Task) -> List[Dict]:
-        """依存タスクの成果物を取得"""
-        artifacts = []
-
-        for dep_id in task.dependencies:
-            dep_task = self.coordinator.get_task(dep_id)
-            if dep_task and dep_task.status == TaskStatus.COMPLETED:
-                for artifact_path in dep_task.artifacts:
-                    full_path = self.project_path / "shared/artifacts" / artifact_path
-                    if full_path.exists():
-                        artifacts.append(
-                            {
-                                "task_id": dep_id,
-                                "path": artifact_path,
-                                "content": full_path.read_text(encoding="utf-8"),
-                            }
-                        )
-
-        return artifacts
+        index = SectionIndex.load(api_file, self.section_index_file)
+        return index.read_all(index.find_for_api(task))
 
     def _get_project_structure(self) -> Dict:
         """プロジェクト構造の情報を取得"""
@@ -276,8 +435,15 @@ class TaskProvider:
                 task.artifacts = task_data.get("artifacts", [])
                 task.error = task_data.get("error")
 
+    def _save_or_defer(self) -> None:
+        """バッチ更新中でなければ進捗情報を保存"""
+        if self._batch_depth:
+            self._dirty = True
+        else:
+            self._save_progress()
+
     def _save_progress(self) -> None:
-        """進捗情報を保存"""
+        """進捗情報を保存（一時ファイルへの書き込み後に置き換え）"""
         progress: Dict = {"updated_at": datetime.now().isoformat(), "tasks": {}}
 
         for task_id, task in self.coordinator.tasks.items():
@@ -291,9 +457,9 @@ class TaskProvider:
             }
 
         self.progress_file.parent.mkdir(parents=True, exist_ok=True)
-        self.progress_file.write_text(
-            json.dumps(progress, indent=2, ensure_ascii=False), encoding="utf-8"
-        )
+        tmp_path = self.progress_file.with_name(f".{self.progress_file.name}.{os.getpid()}.tmp")
+        tmp_path.write_text(json.dumps(progress, indent=2, ensure_ascii=False), encoding="utf-8")
+        os.replace(tmp_path, self.progress_file)
 
     def _init_progress(self) -> None:
         """進捗情報を初期化"""
@@ -0,0 +1,384 @@
+"""
+ワーカープール - Claude Code セッションの並列実行
+
+ParallelExecutor / ConflictDetector が判定した並列実行可能なタスクを、
+ワーカーのサブプロセスとして実際に起動します。
+
+役割:
+- 実行可能でファイル競合のないタスクを空きスロットの数だけ起動
+- 生成したプロンプトを標準入力に渡し、出力をトランスクリプトに保存
+- 終了コードとトランスクリプトからタスクを完了・失敗としてマーク
+- 完了したスロットに次のタスクを割り当て
+
+タスクの状態は TaskLoop が所有し、ワーカーは WorkStealingScheduler を通じて
+担当（tasks.json の workers）のキューから次のタスクを待ちます。
+実行中のタスクは期限付きのリース（leases.json）で確保し、他のセッション
+（別の cmw run や TaskProvider）と同じタスクを実行しないようにします。
+"""
+
+import asyncio
+import shlex
+import sys
+import time
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Sequence, Set
+
+from .coordinator import Coordinator
+from .lease import DEFAULT_LEASE_TTL, Lease, LeaseError, LeaseManager, default_owner
+from .models import ExecutionResult, Task, Worker
+from .response_parser import ResponseParser, read_chunks
+from .scheduler import WorkerContext, WorkStealingScheduler
+from .smart_prompt_generator import SmartPromptGenerator
+from .task_loop import TaskLoop
+
+# デフォルトのワーカーコマンド（Claude Code の代わりに完了報告のみを出力するスタブ）
+DEFAULT_WORKER_COMMAND = [sys.executable, "-m", "cmw.stub_worker", "{task_id}"]
+
+# トランスクリプトとプロンプトの保存先（プロジェクトルートからの相対パス）
+RUNS_DIR = Path("shared") / "coordination" / "runs"
+
+# トランスクリプトを読み込む単位
+READ_CHUNK_SIZE = 64 * 1024
+
+# 進捗の通知（イベント種別 "started" / "completed" / "failed", タスク, 実行結果）
+Reporter = Callable[[str, Task, Optional[ExecutionResult]], None]
+
+# ワーカーと並行して動かす処理（例: lambda loop: loop.watch()）
+BackgroundJob = Callable[[TaskLoop], Awaitable[None]]
+
+
+def parse_command(command: str) -> List[str]:
+    """
+    ワーカーコマンドの文字列を引数のリストに分割
+
+    `{task_id}` / `{prompt_file}` はタスクごとに置き換えられます。
+
+    Example:
+        parse_command('claude -p --output-format stream-json --verbose')
+    """
+    args = shlex.split(command)
+    if not args:
+        raise ValueError("ワーカーコマンドが空です")
+    return args
+
+
+class WorkerPool:
+    """ワーカーのサブプロセスを並列に実行するプール"""
+
+    def __init__(
+        self,
+        project_path: Path,
+        workers: int = 3,
+        command: Optional[Sequence[str]] = None,
+        timeout: Optional[float] = None,
+        require_completion: bool = False,
+        reporter: Optional[Reporter] = None,
+        profiles: Optional[Sequence[Worker]] = None,
+        steal: bool = True,
+        lease_ttl: float = DEFAULT_LEASE_TTL,
+    ) -> None:
+        """
+        Args:
+            project_path: プロジェクトのルートパス
+            workers: 同時に実行するワーカー数
+            command: ワーカーコマンド（None の場合はスタブ）。プロンプトは標準入力に渡し、
+                `{task_id}` / `{prompt_file}` はタスクごとに置き換える
+            timeout: 1タスクあたりの制限時間（秒、超過したら停止して失敗とする）
+            require_completion: トランスクリプトに完了の報告がない場合も失敗とするか
+            reporter: タスクの開始・完了・失敗の通知先
+            profiles: 各ワーカーの担当（None の場合は tasks.json の workers、なければ
+                担当なし）。ワーカー数より少ない場合は順に繰り返して割り当てる
+            steal: 自分の担当のタスクがないワーカーが他の担当のタスクを実行するか
+            lease_ttl: リースの有効期間（秒）。実行中は1/3の間隔で延長し、
+                期限の切れた他のセッションのリースは同じ間隔で回収する
+        """
+        if workers < 1:
+            raise ValueError("workers は1以上を指定してください")
+
+        self.project_path = Path(project_path)
+        self.workers = workers
+        self.command = list(command) if command else list(DEFAULT_WORKER_COMMAND)
+        self.timeout = timeout
+        self.require_completion = require_completion
+        self.reporter = reporter
+        self.runs_dir = self.project_path / RUNS_DIR
+        self.coordinator = Coordinator(self.project_path)
+        self.task_loop = TaskLoop(self.coordinator)
+        self.scheduler = WorkStealingScheduler(self.task_loop, steal=steal)
+        if profiles is None:
+            profiles = list(self.coordinator.workers.values())
+        self.profiles = list(profiles) or [
+            Worker(id=f"worker-{i + 1}", name=f"worker-{i + 1}", description="")
+            for i in range(workers)
+        ]
+        self.leases = LeaseManager(self.project_path, ttl=lease_ttl)
+        self.owner = default_owner()
+        # 実行中のタスク -> リース、期限切れで失ったリースのトークン
+        self._leases: Dict[str, Lease] = {}
+        self._lost: Set[str] = set()
+        self.parser = ResponseParser(self.coordinator.id_scheme)
+        self._generator: Optional[SmartPromptGenerator] = None
+
+    def run(
+        self, max_tasks: Optional[int] = None, background: Sequence[BackgroundJob] = ()
+    ) -> List[ExecutionResult]:
+        """
+        実行可能なタスクがなくなるまでワーカーを実行
+
+        Args:
+            max_tasks: 起動するタスク数の上限（None の場合は無制限）
+            background: ワーカーと並行して動かす処理（TaskLoop.watch、ダッシュボードなど）。
+                ワーカーが全て終了したらキャンセルされる
+
+        Returns:
+            終了したタスクの実行結果（終了順）
+        """
+        return asyncio.run(self.run_async(max_tasks, background))
+
+    async def run_async(
+        self, max_tasks: Optional[int] = None, background: Sequence[BackgroundJob] = ()
+    ) -> List[ExecutionResult]:
+        """
+        run の非同期版
+
+        ワーカーの数だけコルーチンを起動し、それぞれが WorkStealingScheduler で
+        タスクを確保して実行します。中断（Ctrl+C・キャンセル）された場合は
+        実行中のワーカーを停止し、そのタスクを実行待ちに戻します。
+        """
+        results: List[ExecutionResult] = []
+        started = 0
+
+        async def worker(context: WorkerContext) -> None:
+            nonlocal started
+            try:
+                while max_tasks is None or started < max_tasks:
+                    started += 1
+                    task = await self.scheduler.next_task(context)
+                    if task is None:
+                        started -= 1
+                        return
+
+                    lease = await self._in_thread(self.leases.acquire, task.id, self.owner)
+                    if lease is None:
+                        # 他のセッションが実行中（完了は watch などで取り込む）
+                        started -= 1
+                        await self.task_loop.release(task.id, requeue=False)
+                        continue
+                    self._leases[task.id] = lease
+
+                    self._report("started", task, None)
+                    try:
+                        result = await self._run_task(task)
+                    except BaseException:
+                        # 中断したタスクは実行待ちに戻す
+                        self._leases.pop(task.id, None)
+                        await self._in_thread(self.leases.release, lease.token)
+                        await self.task_loop.release(task.id)
+                        raise
+                    context.touch(task, result.generated_files)
+                    await self._record(task, result)
+                    results.append(result)
+            finally:
+                self.scheduler.retire(context)
+
+        contexts = [
+            self.scheduler.register(self.profiles[i % len(self.profiles)])
+            for i in range(self.workers)
+        ]
+        # 前回クラッシュしたセッションのタスクを回収してから開始
+        await self._reclaim()
+        jobs = [asyncio.ensure_future(job(self.task_loop)) for job in background]
+        jobs.append(asyncio.ensure_future(self._keep_leases()))
+        try:
+            await asyncio.gather(*(worker(context) for context in contexts))
+        finally:
+            for job in jobs:
+                job.cancel()
+            await asyncio.gather(*jobs, return_exceptions=True)
+
+        return results
+
+    def build_prompt(self, task: Task) -> str:
+        """タスクのスマートプロンプトを生成（依存関係グラフの構築は初回のみ）"""
+        if self._generator is None:
+            self._generator = SmartPromptGenerator(
+                list(self.coordinator.tasks.values()), self.project_path
+            )
+        return self._generator.generate(task.id)
+
+    async def _run_task(self, task: Task) -> ExecutionResult:
+        """ワーカーを起動し、終了まで出力をトランスクリプトに保存"""
+        self.runs_dir.mkdir(parents=True, exist_ok=True)
+        prompt = self.build_prompt(task)
+        prompt_file = self.runs_dir / f"{task.id}.prompt.md"
+        prompt_file.write_text(prompt, encoding="utf-8")
+        transcript = self.runs_dir / f"{task.id}.log"
+
+        args = [
+            arg.replace("{task_id}", task.id).replace("{prompt_file}", str(prompt_file))
+            for arg in self.command
+        ]
+        start = time.monotonic()
+
+        try:
+            process = await asyncio.create_subprocess_exec(
+                *args,
+                stdin=asyncio.subprocess.PIPE,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.STDOUT,
+                cwd=str(self.project_path),
+            )
+        except OSError as e:
+            return ExecutionResult(
+                success=False,
+                task_id=task.id,
+                error=f"ワーカーを起動できません: {e}",
+                execution_time=time.monotonic() - start,
+            )
+
+        try:
+            returncode = await asyncio.wait_for(
+                self._communicate(process, prompt, transcript), self.timeout
+            )
+        except asyncio.TimeoutError:
+            await self._kill(process)
+            return ExecutionResult(
+                success=False,
+                task_id=task.id,
+                output=str(transcript),
+                error=f"制限時間（{self.timeout:g}秒）を超えたため停止しました",
+                execution_time=time.monotonic() - start,
+            )
+        except asyncio.CancelledError:
+            await self._kill(process)
+            raise
+
+        return self._evaluate(task, returncode, transcript, time.monotonic() - start)
+
+    async def _communicate(
+        self, process: "asyncio.subprocess.Process", prompt: str, transcript: Path
+    ) -> int:
+        """プロンプトを標準入力に渡し、出力を届いた分ずつトランスクリプトに書き込む"""
+        stdin, stdout = process.stdin, process.stdout
+        assert stdin is not None and stdout is not None
+
+        async def feed() -> None:
+            # 出力の読み込みと並行して渡す（パイプが詰まってもデッドロックしない）
+            try:
+                stdin.write(prompt.encode("utf-8"))
+                await stdin.drain()
+            except (BrokenPipeError, ConnectionResetError):
+                # プロンプトを読まずに終了したワーカー
+                pass
+            finally:
+                stdin.close()
+
+        async def pump() -> None:
+            with open(transcript, "wb") as f:
+                while True:
+                    data = await stdout.read(READ_CHUNK_SIZE)
+                    if not data:
+                        break
+                    f.write(data)
+                    f.flush()
+
+        await asyncio.gather(feed(), pump())
+        return await process.wait()
+
+    @staticmethod
+    async def _kill(process: "asyncio.subprocess.Process") -> None:
+        """ワーカーを停止して終了を待つ"""
+        if process.returncode is None:
+            try:
+                process.kill()
+            except ProcessLookupError:
+                pass
+            await process.wait()
+
+    def _evaluate(
+        self, task: Task, returncode: int, transcript: Path, elapsed: float
+    ) -> ExecutionResult:
+        """終了コードとトランスクリプトの解析結果から実行結果を判定"""
+        artifacts: List[str] = []
+        completed = False
+        last_error: Optional[str] = None
+
+        with open(transcript, "rb") as f:
+            chunks = read_chunks(f)
+            for event in self.parser.iter_transcript_events(chunks, root=self.project_path):
+                if event.kind == "artifact":
+                    artifacts.append(event.value)
+                elif event.kind == "completion":
+                    completed = True
+                elif event.kind == "error":
+                    last_error = event.value
+
+        error: Optional[str] = None
+        if returncode != 0:
+            error = f"終了コード {returncode}" + (f": {last_error}" if last_error else "")
+        elif self.require_completion and not completed:
+            error = "トランスクリプトに完了の報告がありません"
+
+        return ExecutionResult(
+            success=error is None,
+            task_id=task.id,
+            generated_files=sorted(set(artifacts)),
+            output=str(transcript),
+            error=error,
+            execution_time=elapsed,
+        )
+
+    async def _keep_leases(self) -> None:
+        """実行中のタスクのリースを延長し、期限の切れたリースを回収し続ける"""
+        interval = self.leases.ttl / 3
+        while True:
+            await asyncio.sleep(interval)
+            for lease in list(self._leases.values()):
+                try:
+                    await self._in_thread(self.leases.renew, lease.token)
+                except LeaseError:
+                    self._lost.add(lease.token)
+            await self._reclaim()
+
+    async def _reclaim(self) -> None:
+        """期限の切れたリースを回収し、そのタスクを実行待ちに戻す"""
+        expired = await self._in_thread(self.leases.reclaim_expired)
+        self.task_loop.requeue(lease.task_id for lease in expired)
+
+    @staticmethod
+    async def _in_thread(func: Callable[..., Any], *args: Any) -> Any:
+        """ファイルロックを伴うリースの操作をスレッドで実行（イベントループを止めない）"""
+        return await asyncio.get_running_loop().run_in_executor(None, func, *args)
+
+    async def _record(self, task: Task, result: ExecutionResult) -> None:
+        """実行結果を TaskLoop に記録（progress.json に保存され、待機中のワーカーに通知）"""
+        lease = self._leases.pop(task.id)
+        outcome = "completed" if result.success else "failed"
+        try:
+            if lease.token in self._lost:
+                raise LeaseError(lease.token)
+            # トークンは progress.json への保存に成功してから消費する
+            await self._in_thread(self.leases.check, lease.token, task.id)
+        except LeaseError:
+            # 期限切れで回収され、他のセッションが実行している可能性がある
+            result.success = False
+            result.error = "リースの期限が切れたため結果を記録しませんでした"
+            await self.task_loop.release(task.id, requeue=False)
+            self._report("failed", task, result)
+            return
+
+        if result.success:
+            await self.task_loop.complete(task.id, result.generated_files)
+        else:
+            await self.task_loop.fail(task.id, result.error)
+
+        try:
+            await self._in_thread(self.leases.finish, lease.token, outcome)
+        except LeaseError:
+            # 結果は記録済み（確認の後にリースが回収された場合）
+            pass
+        self._report(outcome, task, result)
+
+    def _report(self, event: str, task: Task, result: Optional[ExecutionResult]) -> None:
+        if self.reporter is not None:
+            self.reporter(event, task, result)
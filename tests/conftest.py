@@ -0,0 +1,46 @@
+"""
+テスト共通のフィクスチャ
+"""
+import json
+
+import pytest
+from cmw.models import Priority, Task
+
+
+@pytest.fixture
+def project(tmp_path):
+    """テスト用のプロジェクト（shared/coordination を作成済み）"""
+    (tmp_path / "shared" / "coordination").mkdir(parents=True)
+    return tmp_path
+
+
+@pytest.fixture
+def make_task():
+    """タスクを作成する関数（target_files の省略時は "<task_id>.py"）"""
+
+    def factory(
+        task_id, files=None, dependencies=None, priority=Priority.MEDIUM, assigned_to="backend"
+    ):
+        return Task(
+            id=task_id,
+            title=f"Task {task_id}",
+            description="",
+            assigned_to=assigned_to,
+            priority=priority,
+            target_files=files or [f"{task_id.lower()}.py"],
+            dependencies=dependencies or [],
+        )
+
+    return factory
+
+
+@pytest.fixture
+def write_tasks():
+    """プロジェクトの tasks.json にタスクとワーカーを書き込む関数"""
+
+    def write(project, tasks, workers=()):
+        tasks_file = project / "shared" / "coordination" / "tasks.json"
+        data = {"tasks": [t.to_dict() for t in tasks], "workers": [w.to_dict() for w in workers]}
+        tasks_file.write_text(json.dumps(data, ensure_ascii=False), encoding="utf-8")
+
+    return write
@@ -0,0 +1,145 @@
+"""
+ArtifactCache のユニットテスト
+"""
+import json
+import os
+
+from cmw.artifact_cache import ArtifactCache, extract_fragment
+from cmw.context_builder import ContextBuilder
+from cmw.models import Task, TaskStatus
+
+
+def write(path, content):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    if isinstance(content, bytes):
+        path.write_bytes(content)
+    else:
+        path.write_text(content, encoding="utf-8")
+    return path
+
+
+def get(cache, path, key=None):
+    stat = path.stat()
+    return cache.get(key or path.name, path, stat.st_mtime_ns, stat.st_size)
+
+
+class TestExtractFragment:
+    """1回の走査での断片抽出"""
+
+    def test_small_file(self, tmp_path):
+        path = write(tmp_path / "a.py", "import os\n\nclass A:\n    def run(self):\n        pass\n")
+
+        fragment = extract_fragment(path, max_bytes=1000)
+
+        assert not fragment.binary
+        assert fragment.text == path.read_text(encoding="utf-8")
+        assert fragment.outline == "class A:\n    def run(self):\n"
+
+    def test_large_file_across_chunks(self, tmp_path):
+        body = "".join(f"def func_{i}():\n    return '{'あ' * 20}'\n" for i in range(100))
+        path = write(tmp_path / "large.py", body)
+
+        fragment = extract_fragment(path, max_bytes=200, chunk_size=7)
+
+        assert fragment.text is None
+        assert fragment.outline.startswith("def func_0():\ndef func_1():\n")
+        assert len(fragment.outline.encode()) <= 200
+        assert body.encode().startswith(fragment.head.encode())
+        assert len(fragment.head.encode()) <= 200
+
+    def test_long_line_is_not_kept(self, tmp_path):
+        path = write(tmp_path / "min.js", "function a(){" + "x" * 100_000 + "}\nfunction b(){}\n")
+
+        fragment = extract_fragment(path, max_bytes=100_000, chunk_size=1024)
+
+        assert fragment.outline.startswith("function a(){xxx")
+        assert fragment.outline.endswith("\nfunction b(){}\n")
+        assert len(fragment.outline) < 5000
+
+    def test_binary(self, tmp_path):
+        assert extract_fragment(write(tmp_path / "a.bin", b"abc\0def"), 100).binary
+        assert extract_fragment(write(tmp_path / "b.txt", "caf\xe9".encode("latin-1")), 100).binary
+
+
+class TestArtifactCache:
+    """キャッシュの再利用と無効化"""
+
+    def test_reads_each_file_once(self, tmp_path):
+        path = write(tmp_path / "a.py", "def a(): pass\n")
+        cache = ArtifactCache(tmp_path / "cache", max_bytes=1000)
+
+        first = get(cache, path)
+        assert get(cache, path) is first
+        assert cache.reads == 1
+
+    def test_invalidated_by_change(self, tmp_path):
+        path = write(tmp_path / "a.py", "def a(): pass\n")
+        cache = ArtifactCache(None, max_bytes=1000)
+        get(cache, path)
+
+        write(path, "def b(): pass\n")
+        os.utime(path, ns=(path.stat().st_atime_ns, path.stat().st_mtime_ns + 1_000_000))
+
+        assert get(cache, path).text == "def b(): pass\n"
+        assert cache.reads == 2
+
+    def test_persisted_across_instances(self, tmp_path):
+        path = write(tmp_path / "a.py", "def a(): pass\n")
+        cache = ArtifactCache(tmp_path / "cache", max_bytes=1000)
+        fragment = get(cache, path)
+        cache.save()
+
+        index = json.loads((tmp_path / "cache" / "index.json").read_text(encoding="utf-8"))
+        assert index["paths"]["a.py"][2] == fragment.digest
+
+        reloaded = ArtifactCache(tmp_path / "cache", max_bytes=1000)
+        assert get(reloaded, path) == fragment
+        assert reloaded.reads == 0
+
+        # 上限が異なる場合は作り直す
+        other = ArtifactCache(tmp_path / "cache", max_bytes=10)
+        assert get(other, path).text is None
+        assert other.reads == 1
+
+    def test_same_content_shares_fragment(self, tmp_path):
+        a = write(tmp_path / "a.py", "def same(): pass\n")
+        b = write(tmp_path / "b.py", "def same(): pass\n")
+        cache = ArtifactCache(tmp_path / "cache", max_bytes=1000)
+
+        assert get(cache, a) is get(cache, b)
+        fragment_files = [p for p in (tmp_path / "cache").rglob("*.json") if p.name != "index.json"]
+        assert len(fragment_files) == 1
+
+
+def test_wave_reads_shared_artifacts_once(tmp_path):
+    """同じ依存タスクを持つ多数のタスクのコンテキストで成果物を1回だけ読み込む"""
+    artifacts = tmp_path / "shared" / "artifacts"
+    write(artifacts / "backend" / "models.py", "class User:\n    pass\n")
+    write(artifacts / "backend" / "db.py", "def connect():\n    pass\n")
+
+    tasks = {
+        "TASK-001": Task(
+            id="TASK-001",
+            title="基盤",
+            description="",
+            assigned_to="backend",
+            status=TaskStatus.COMPLETED,
+            artifacts=["backend/models.py", "backend/db.py"],
+        )
+    }
+    for i in range(2, 52):
+        task_id = f"TASK-{i:03d}"
+        tasks[task_id] = Task(
+            id=task_id,
+            title=task_id,
+            description="",
+            assigned_to="backend",
+            dependencies=["TASK-001"],
+        )
+
+    builder = ContextBuilder(artifacts, cache_dir=tmp_path / "shared" / "coordination" / "cache")
+    contexts = [builder.build(task, tasks) for task in tasks.values() if task.dependencies]
+
+    assert len(contexts) == 50
+    assert all(len(c["dependencies_artifacts"]) == 2 for c in contexts)
+    assert builder.cache.reads == 2
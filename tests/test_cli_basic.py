@@ -104,6 +104,18 @@ class TestCLITasksGenerate:
         finally:
             os.chdir(original_dir)
 
+    def test_tasks_generate_static_deps(self, temp_project, monkeypatch):
+        """--static-deps で既存コードの静的解析による依存関係を追加"""
+        monkeypatch.chdir(temp_project)
+
+        result = CliRunner().invoke(
+            cli, ['task', 'generate', '--static-deps', 'symbol'], catch_exceptions=False
+        )
+
+        assert result.exit_code == 0
+        assert '静的解析（symbol単位）' in result.output
+        assert Path('shared/coordination/tasks.json').exists()
+
     def test_tasks_generate_no_requirements_file(self, tmp_path):
         """requirements.mdが存在しない場合"""
         runner = CliRunner()
@@ -341,6 +353,113 @@ class TestCLITaskPrompt:
         finally:
             os.chdir(original_dir)
 
+    @pytest.fixture
+    def temp_project_with_wave(self, tmp_path):
+        """並列実行可能なタスクを含むプロジェクトを作成"""
+        (tmp_path / 'shared' / 'coordination').mkdir(parents=True, exist_ok=True)
+
+        def make(task_id, deps, files, status="pending"):
+            return {
+                "id": task_id,
+                "title": f"Task {task_id}",
+                "description": "",
+                "status": status,
+                "priority": "medium",
+                "dependencies": deps,
+                "target_files": files,
+                "acceptance_criteria": [],
+                "assigned_to": "backend",
+            }
+
+        tasks_data = {
+            "tasks": [
+                make("TASK-001", [], ["base.py"], status="completed"),
+                make("TASK-002", ["TASK-001"], ["a.py"]),
+                make("TASK-003", ["TASK-001"], ["b.py"]),
+                make("TASK-004", ["TASK-001"], ["a.py"]),  # TASK-002 と競合
+                make("TASK-005", ["TASK-002"], ["c.py"]),  # 依存が未完了
+            ]
+        }
+        (tmp_path / 'shared' / 'coordination' / 'tasks.json').write_text(
+            json.dumps(tasks_data, indent=2, ensure_ascii=False), encoding='utf-8'
+        )
+        return tmp_path
+
+    def test_task_prompt_wave(self, temp_project_with_wave, monkeypatch):
+        """次のウェーブのプロンプトを一括生成"""
+        monkeypatch.chdir(temp_project_with_wave)
+
+        result = CliRunner().invoke(cli, ['task', 'prompt', '--wave'], catch_exceptions=False)
+
+        assert result.exit_code == 0
+        out_dir = temp_project_with_wave / '.cmw_prompts'
+        assert sorted(p.name for p in out_dir.iterdir()) == ['TASK-002.md', 'TASK-003.md']
+        assert 'TASK-002' in (out_dir / 'TASK-002.md').read_text(encoding='utf-8')
+        assert '2件のプロンプト' in result.output
+
+    def test_task_prompt_ids(self, temp_project_with_wave, monkeypatch):
+        """指定したタスクのプロンプトを一括生成"""
+        monkeypatch.chdir(temp_project_with_wave)
+
+        result = CliRunner().invoke(
+            cli,
+            [
+                'task', 'prompt', '--ids', 'TASK-004, TASK-005',
+                '--out-dir', 'prompts', '--threads', '2',
+            ],
+            catch_exceptions=False,
+        )
+
+        assert result.exit_code == 0
+        out_dir = temp_project_with_wave / 'prompts'
+        assert sorted(p.name for p in out_dir.iterdir()) == ['TASK-004.md', 'TASK-005.md']
+
+        result = CliRunner().invoke(cli, ['task', 'prompt', '--ids', 'TASK-999'])
+        assert 'TASK-999' in result.output
+
+    def test_task_prompt_wave_symbol_granularity(self, temp_project_with_wave, monkeypatch):
+        """シンボル単位では同じファイルの別シンボルを担当するタスクを同じウェーブに含める"""
+        monkeypatch.chdir(temp_project_with_wave)
+        tasks_file = temp_project_with_wave / 'shared' / 'coordination' / 'tasks.json'
+        data = json.loads(tasks_file.read_text(encoding='utf-8'))
+        data['tasks'][1]['target_files'] = ['a.py::User']
+        data['tasks'][3]['target_files'] = ['a.py::Post']
+        tasks_file.write_text(json.dumps(data, ensure_ascii=False), encoding='utf-8')
+
+        result = CliRunner().invoke(
+            cli, ['task', 'prompt', '--wave', '--granularity', 'symbol'], catch_exceptions=False
+        )
+
+        assert result.exit_code == 0
+        out_dir = temp_project_with_wave / '.cmw_prompts'
+        assert sorted(p.name for p in out_dir.iterdir()) == [
+            'TASK-002.md', 'TASK-003.md', 'TASK-004.md'
+        ]
+
+    def test_task_prompt_requires_one_target(self, temp_project_with_wave, monkeypatch):
+        """TASK_ID / --wave / --ids のいずれか1つが必要"""
+        monkeypatch.chdir(temp_project_with_wave)
+
+        result = CliRunner().invoke(cli, ['task', 'prompt'])
+        assert 'いずれか1つ' in result.output
+
+        result = CliRunner().invoke(cli, ['task', 'prompt', 'TASK-002', '--wave'])
+        assert 'いずれか1つ' in result.output
+        assert not (temp_project_with_wave / '.cmw_prompts').exists()
+
+    def test_task_prompt_rejects_invalid_batch_options(self, temp_project_with_wave, monkeypatch):
+        """一括生成と --output / --review の併用や --threads 0 は使用エラー"""
+        monkeypatch.chdir(temp_project_with_wave)
+
+        for args in (
+            ['--wave', '--output', 'prompt.md'],
+            ['--ids', 'TASK-004', '--review'],
+            ['--wave', '--threads', '0'],
+        ):
+            result = CliRunner().invoke(cli, ['task', 'prompt', *args])
+            assert result.exit_code == 2
+        assert not (temp_project_with_wave / '.cmw_prompts').exists()
+
 
 class TestCLITasksAnalyze:
     """tasks analyzeコマンドのテスト"""
@@ -416,3 +535,108 @@ class TestCLIInit:
             assert result.exit_code == 0 or Path('tasks.json').exists()
         finally:
             os.chdir(original_dir)
+
+
+class TestCLIRun:
+    """runコマンドのテスト"""
+
+    @pytest.fixture
+    def temp_project_for_run(self, tmp_path):
+        """依存関係のあるタスクを含むプロジェクトを作成"""
+        (tmp_path / 'shared' / 'coordination').mkdir(parents=True, exist_ok=True)
+        tasks_file = tmp_path / 'shared' / 'coordination' / 'tasks.json'
+        tasks_data = {
+            "tasks": [
+                {
+                    "id": "TASK-001",
+                    "title": "Task A",
+                    "description": "",
+                    "priority": "high",
+                    "dependencies": [],
+                    "target_files": ["a.py"],
+                    "acceptance_criteria": [],
+                    "assigned_to": "backend"
+                },
+                {
+                    "id": "TASK-002",
+                    "title": "Task B",
+                    "description": "",
+                    "priority": "medium",
+                    "dependencies": ["TASK-001"],
+                    "target_files": ["b.py"],
+                    "acceptance_criteria": [],
+                    "assigned_to": "backend"
+                }
+            ]
+        }
+        tasks_file.write_text(
+            json.dumps(tasks_data, indent=2, ensure_ascii=False), encoding='utf-8'
+        )
+
+        return tmp_path
+
+    def test_run_with_stub_workers(self, temp_project_for_run):
+        """デフォルトのスタブで全タスクを実行"""
+        runner = CliRunner()
+        import os
+        original_dir = os.getcwd()
+        try:
+            os.chdir(temp_project_for_run)
+            result = runner.invoke(cli, ['run', '--workers', '2'], catch_exceptions=False)
+
+            assert result.exit_code == 0
+            assert "✅ TASK-001 完了" in result.output
+            assert "✅ TASK-002 完了" in result.output
+            assert "完了: 2件 / 失敗: 0件 / 未実行: 0件" in result.output
+
+            progress_file = temp_project_for_run / 'shared' / 'coordination' / 'progress.json'
+            progress = json.loads(progress_file.read_text(encoding='utf-8'))
+            assert {t["status"] for t in progress["tasks"]} == {"completed"}
+        finally:
+            os.chdir(original_dir)
+
+    def test_run_with_failing_command(self, temp_project_for_run):
+        """ワーカーが失敗した場合は依存タスクを実行しない"""
+        import os
+        import sys
+        runner = CliRunner()
+        original_dir = os.getcwd()
+        try:
+            os.chdir(temp_project_for_run)
+            command = f'"{sys.executable}" -m cmw.stub_worker {{task_id}} --exit-code 1'
+            result = runner.invoke(cli, ['run', '--command', command], catch_exceptions=False)
+
+            assert result.exit_code == 0
+            assert "❌ TASK-001 失敗: 終了コード 1" in result.output
+            assert "完了: 0件 / 失敗: 1件 / 未実行: 1件" in result.output
+        finally:
+            os.chdir(original_dir)
+
+    def test_run_with_watch_and_dashboard(self, temp_project_for_run):
+        """監視とダッシュボードを並行して動かしても全タスクを実行して終了する"""
+        import os
+        runner = CliRunner()
+        original_dir = os.getcwd()
+        try:
+            os.chdir(temp_project_for_run)
+            result = runner.invoke(cli, ['run', '--watch', '--dashboard'], catch_exceptions=False)
+
+            assert result.exit_code == 0
+            assert "▶ TASK-001" not in result.output
+            assert "完了: 2件 / 失敗: 0件 / 未実行: 0件" in result.output
+        finally:
+            os.chdir(original_dir)
+
+    def test_run_git_sync_requires_repository(self, temp_project_for_run):
+        """Gitリポジトリでない場合は --git-sync を拒否"""
+        import os
+        runner = CliRunner()
+        original_dir = os.getcwd()
+        try:
+            os.chdir(temp_project_for_run)
+            result = runner.invoke(cli, ['run', '--git-sync', '10'])
+
+            assert "Gitリポジトリが必要です" in result.output
+            assert not (temp_project_for_run / 'shared' / 'coordination' / 'progress.json').exists()
+        finally:
+            os.chdir(original_dir)
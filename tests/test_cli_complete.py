@@ -2,6 +2,8 @@
 cmw task complete コマンドのユニットテスト
 """
 import json
+import time
+
 import pytest
 from click.testing import CliRunner
 from cmw.cli import cli
@@ -233,3 +235,124 @@ class TestCompleteCommandHelp:
         assert "--artifacts" in result.output
         assert "--message" in result.output
         assert "examples:" in result.output
+
+
+class TestCompleteMultipleTasks:
+    """複数タスクの一括完了のテスト"""
+
+    def test_complete_multiple_tasks(self, temp_project, tasks_json, monkeypatch):
+        """複数のタスクIDをまとめて完了マーク"""
+        runner = CliRunner()
+        monkeypatch.chdir(temp_project)
+
+        result = runner.invoke(
+            cli, ['task', 'complete', 'TASK-001', 'TASK-002', 'TASK-999'], catch_exceptions=False
+        )
+
+        assert result.exit_code == 0
+        assert "TASK-999 が見つかりません" in result.output
+        assert "タスク TASK-001 を完了としてマークしました" in result.output
+        assert "タスク TASK-002 を完了としてマークしました" in result.output
+
+        progress_path = temp_project / "shared" / "coordination" / "progress.json"
+        progress_data = json.loads(progress_path.read_text(encoding='utf-8'))
+        statuses = {t["id"]: t["status"] for t in progress_data["tasks"]}
+        assert statuses == {"TASK-001": "completed", "TASK-002": "completed"}
+
+
+class TestLeaseCommands:
+    """cmw task exec / heartbeat / complete --token のリース"""
+
+    def test_exec_heartbeat_and_complete_with_token(self, temp_project, tasks_json, monkeypatch):
+        """exec でリースを取得し、トークンで1回だけ完了を記録"""
+        from cmw.lease import LeaseManager
+
+        runner = CliRunner()
+        monkeypatch.chdir(temp_project)
+
+        result = runner.invoke(
+            cli, ['task', 'exec', 'TASK-001', '--owner', 'session-a'], catch_exceptions=False
+        )
+        assert result.exit_code == 0
+        lease = LeaseManager(temp_project).get("TASK-001")
+        assert lease.owner == "session-a"
+        assert lease.token in result.output
+
+        # 他のセッションは同じタスクを実行できない
+        other = runner.invoke(
+            cli, ['task', 'exec', 'TASK-001', '--owner', 'session-b'], catch_exceptions=False
+        )
+        assert "他のセッションが実行中です" in other.output
+
+        heartbeat = runner.invoke(cli, ['task', 'heartbeat', lease.token], catch_exceptions=False)
+        assert "リースを" in heartbeat.output and "延長しました" in heartbeat.output
+
+        args = ['task', 'complete', 'TASK-001', '--token', lease.token]
+        first = runner.invoke(cli, args, catch_exceptions=False)
+        second = runner.invoke(cli, args, catch_exceptions=False)
+
+        assert "完了としてマークしました" in first.output
+        assert "記録済みです" in second.output
+        assert LeaseManager(temp_project).get("TASK-001") is None
+
+    def test_complete_with_wrong_token(self, temp_project, tasks_json, monkeypatch):
+        """他のセッションのリースがある場合はトークンを拒否"""
+        from cmw.lease import LeaseManager
+
+        runner = CliRunner()
+        monkeypatch.chdir(temp_project)
+        LeaseManager(temp_project).acquire("TASK-001", "session-a")
+
+        result = runner.invoke(
+            cli, ['task', 'complete', 'TASK-001', '--token', 'stale'], catch_exceptions=False
+        )
+
+        assert "リースが無効です" in result.output
+        assert not (temp_project / "shared" / "coordination" / "progress.json").exists()
+
+    def test_invalid_artifacts_do_not_consume_token(self, temp_project, tasks_json, monkeypatch):
+        """完了を記録できなかった場合はトークンを消費せず、再送を受け付ける"""
+        from cmw.lease import LeaseManager
+
+        runner = CliRunner()
+        monkeypatch.chdir(temp_project)
+        lease = LeaseManager(temp_project).acquire("TASK-001", "session-a")
+        args = ['task', 'complete', 'TASK-001', '--token', lease.token]
+
+        result = runner.invoke(cli, args + ['--artifacts', 'not-json'], catch_exceptions=False)
+        assert "JSON 配列形式" in result.output
+        assert LeaseManager(temp_project).get("TASK-001").token == lease.token
+
+        result = runner.invoke(cli, args + ['--artifacts', '["a.py"]'], catch_exceptions=False)
+        assert "完了としてマークしました" in result.output
+        assert LeaseManager(temp_project).get("TASK-001") is None
+
+    def test_reclaim_expired_leases(self, temp_project, tasks_json, monkeypatch):
+        """cmw task reclaim で期限切れのリースのタスクを実行待ちに戻す"""
+        from cmw.coordinator import Coordinator
+        from cmw.lease import LeaseManager
+        from cmw.models import TaskStatus
+
+        runner = CliRunner()
+        monkeypatch.chdir(temp_project)
+        Coordinator(temp_project).update_task_status("TASK-001", TaskStatus.IN_PROGRESS)
+        manager = LeaseManager(temp_project, ttl=0.01)
+        manager.acquire("TASK-001", "crashed")
+        manager.acquire("TASK-002", "session-a", ttl=600)
+        time.sleep(0.02)
+
+        result = runner.invoke(cli, ['task', 'reclaim'], catch_exceptions=False)
+
+        assert "TASK-001: 実行待ちに戻しました" in result.output
+        assert Coordinator(temp_project).tasks["TASK-001"].status == TaskStatus.PENDING
+        assert list(manager.active()) == ["TASK-002"]
+        again = runner.invoke(cli, ['task', 'reclaim'], catch_exceptions=False)
+        assert "期限の切れたリースはありません" in again.output
+
+    def test_heartbeat_unknown_token(self, temp_project, tasks_json, monkeypatch):
+        runner = CliRunner()
+        monkeypatch.chdir(temp_project)
+
+        result = runner.invoke(cli, ['task', 'heartbeat', 'unknown'])
+
+        assert "リースが見つかりません" in result.output
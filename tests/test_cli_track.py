@@ -0,0 +1,184 @@
+"""
+cmw task track コマンドのユニットテスト
+"""
+import json
+import pytest
+from click.testing import CliRunner
+from cmw.cli import cli
+
+
+@pytest.fixture
+def temp_project(tmp_path):
+    """テスト用のプロジェクトディレクトリを作成"""
+    coordination_dir = tmp_path / "shared" / "coordination"
+    coordination_dir.mkdir(parents=True)
+    tasks_data = {
+        "tasks": [
+            {
+                "id": "TASK-001",
+                "title": "データベース設計",
+                "description": "ユーザーテーブルを設計する",
+                "assigned_to": "backend",
+                "dependencies": [],
+                "target_files": ["backend/models.py"],
+                "acceptance_criteria": ["Userモデルを作成"],
+                "priority": "high"
+            }
+        ],
+        "workers": []
+    }
+    (coordination_dir / "tasks.json").write_text(
+        json.dumps(tasks_data, ensure_ascii=False, indent=2), encoding='utf-8'
+    )
+    return tmp_path
+
+
+def load_progress(project):
+    """progress.json を読み込む"""
+    path = project / "shared" / "coordination" / "progress.json"
+    return json.loads(path.read_text(encoding='utf-8'))
+
+
+def load_task_progress(project, task_id):
+    """progress.json から指定タスクの進捗を取得"""
+    return next(t for t in load_progress(project)["tasks"] if t["id"] == task_id)
+
+
+class TestTrackCommand:
+    """cmw task track コマンドのテスト"""
+
+    def test_track_from_stdin(self, temp_project, monkeypatch):
+        """標準入力の出力を解析して完了マーク"""
+        runner = CliRunner()
+        monkeypatch.chdir(temp_project)
+
+        transcript = "`backend/models.py` を作成しました。\nTASK-001 を完了しました。\n"
+        result = runner.invoke(cli, ['task', 'track', '-t', 'TASK-001'], input=transcript)
+
+        assert result.exit_code == 0
+        assert "backend/models.py" in result.output
+        assert "TASK-001 を完了としてマークしました" in result.output
+        task = load_task_progress(temp_project, "TASK-001")
+        assert task["status"] == "completed"
+        assert task["artifacts"] == ["backend/models.py"]
+
+    def test_track_from_file(self, temp_project, monkeypatch):
+        """ファイルの出力を解析して完了マーク"""
+        runner = CliRunner()
+        monkeypatch.chdir(temp_project)
+        log = temp_project / "session.log"
+        log.write_text("TASK-001 を完了しました。\n", encoding='utf-8')
+
+        result = runner.invoke(cli, ['task', 'track', str(log), '-t', 'TASK-001'])
+
+        assert result.exit_code == 0
+        assert load_task_progress(temp_project, "TASK-001")["status"] == "completed"
+
+    def test_track_dry_run(self, temp_project, monkeypatch):
+        """--dry-run では完了マークしない"""
+        runner = CliRunner()
+        monkeypatch.chdir(temp_project)
+
+        result = runner.invoke(
+            cli, ['task', 'track', '-t', 'TASK-001', '--dry-run'],
+            input="TASK-001 done\nError: flaky test\n"
+        )
+
+        assert result.exit_code == 0
+        assert "flaky test" in result.output
+        assert "完了マークは行いません" in result.output
+        progress = temp_project / "shared" / "coordination" / "progress.json"
+        assert (
+            not progress.exists()
+            or load_task_progress(temp_project, "TASK-001")["status"] == "pending"
+        )
+
+    def test_track_without_completion(self, temp_project, monkeypatch):
+        """完了が検出されない場合"""
+        runner = CliRunner()
+        monkeypatch.chdir(temp_project)
+
+        result = runner.invoke(
+            cli, ['task', 'track', '-t', 'TASK-001'], input="TASK-001 に着手します\n"
+        )
+
+        assert result.exit_code == 0
+        assert "完了は検出されませんでした" in result.output
+
+    def test_track_missing_file(self, temp_project, monkeypatch):
+        """存在しないファイル"""
+        runner = CliRunner()
+        monkeypatch.chdir(temp_project)
+
+        result = runner.invoke(cli, ['task', 'track', 'missing.log', '-t', 'TASK-001'])
+
+        assert "見つかりません" in result.output
+
+    def test_track_jsonl(self, temp_project, monkeypatch):
+        """JSON Lines 形式はツール呼び出しから成果物を記録"""
+        runner = CliRunner()
+        monkeypatch.chdir(temp_project)
+
+        records = [
+            {"type": "assistant", "message": {"content": [
+                {"type": "text", "text": "`docs/notes.md` を参照して実装します"},
+                {"type": "tool_use", "id": "t1", "name": "Write",
+                 "input": {"file_path": str(temp_project / "backend" / "models.py")}},
+            ]}},
+            {"type": "user", "message": {"content": [
+                {"type": "tool_result", "tool_use_id": "t1", "content": "ok"},
+            ]}},
+            {"type": "result", "subtype": "success", "result": "TASK-001 を完了しました。"},
+        ]
+        transcript = "\n".join(json.dumps(r, ensure_ascii=False) for r in records)
+
+        result = runner.invoke(cli, ['task', 'track', '-t', 'TASK-001'], input=transcript)
+
+        assert result.exit_code == 0
+        task = load_task_progress(temp_project, "TASK-001")
+        assert task["status"] == "completed"
+        assert task["artifacts"] == ["backend/models.py"]
+
+    def test_track_after_complete(self, temp_project, monkeypatch):
+        """cmw task complete と同じ形式の progress.json に追記する"""
+        tasks_file = temp_project / "shared" / "coordination" / "tasks.json"
+        tasks_data = json.loads(tasks_file.read_text(encoding='utf-8'))
+        tasks_data["tasks"].append(
+            dict(tasks_data["tasks"][0], id="TASK-002", target_files=["backend/api.py"])
+        )
+        tasks_file.write_text(json.dumps(tasks_data, ensure_ascii=False), encoding='utf-8')
+        runner = CliRunner()
+        monkeypatch.chdir(temp_project)
+
+        result = runner.invoke(cli, ['task', 'complete', 'TASK-001'])
+        assert result.exit_code == 0
+
+        result = runner.invoke(
+            cli, ['task', 'track', '-t', 'TASK-002'], input="TASK-002 を完了しました。\n"
+        )
+
+        assert result.exit_code == 0
+        assert "TASK-002 を完了としてマークしました" in result.output
+        assert isinstance(load_progress(temp_project)["tasks"], list)
+        assert load_task_progress(temp_project, "TASK-001")["status"] == "completed"
+        assert load_task_progress(temp_project, "TASK-002")["status"] == "completed"
+
+        from cmw.coordinator import Coordinator
+
+        tasks = Coordinator(temp_project).tasks
+        assert all(task.status.value == "completed" for task in tasks.values())
+
+    def test_track_reports_mark_error(self, temp_project, monkeypatch):
+        """progress.json が壊れている場合はエラーを表示して失敗"""
+        progress = temp_project / "shared" / "coordination" / "progress.json"
+        progress.write_text("{broken", encoding='utf-8')
+        runner = CliRunner()
+        monkeypatch.chdir(temp_project)
+
+        result = runner.invoke(
+            cli, ['task', 'track', '-t', 'TASK-001'], input="TASK-001 を完了しました。\n"
+        )
+
+        assert result.exit_code == 1
+        assert "完了マークに失敗しました" in result.output
+        assert progress.read_text(encoding='utf-8') == "{broken"
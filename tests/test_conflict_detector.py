@@ -439,3 +439,46 @@ class TestRealWorldScenario:
 
         # TASK-001が最初
         assert "TASK-001" in order[0]
+
+
+class TestSymbolGranularityConflicts:
+    """シンボル単位の競合判定テスト"""
+
+    def _tasks(self):
+        return [
+            Task(id="TASK-001", title="User", description="", assigned_to="backend",
+                 target_files=["backend/models.py::User"]),
+            Task(id="TASK-002", title="Post", description="", assigned_to="backend",
+                 target_files=["backend/models.py::Post"]),
+        ]
+
+    def test_different_symbols_do_not_conflict(self):
+        """別シンボルを編集するタスクは競合しない"""
+        detector = ConflictDetector(granularity="symbol")
+        tasks = self._tasks()
+
+        assert detector.detect_conflicts(tasks) == []
+        assert detector.get_safe_parallel_tasks(tasks) == ["TASK-001", "TASK-002"]
+
+    def test_file_granularity_treats_symbols_as_file(self):
+        """ファイル単位では同じファイルとして競合"""
+        detector = ConflictDetector()
+        conflicts = detector.detect_conflicts(self._tasks())
+
+        assert len(conflicts) == 1
+        assert conflicts[0].file == "backend/models.py"
+
+    def test_whole_file_conflicts_with_symbol(self):
+        """ファイル全体の編集はシンボル単位の編集と競合"""
+        tasks = self._tasks() + [
+            Task(id="TASK-003", title="全体", description="", assigned_to="backend",
+                 target_files=["backend/models.py"]),
+        ]
+        detector = ConflictDetector(granularity="symbol")
+        conflicts = detector.detect_conflicts(tasks)
+
+        conflicting = {conflict.file: conflict.tasks for conflict in conflicts}
+        assert conflicting == {
+            "backend/models.py::Post": ["TASK-002", "TASK-003"],
+            "backend/models.py::User": ["TASK-001", "TASK-003"],
+        }
@@ -0,0 +1,165 @@
+"""
+ContextBuilder のユニットテスト
+"""
+import os
+
+import pytest
+from cmw.context_builder import BYTES_PER_TOKEN, ContextBuilder
+from cmw.models import Task, TaskStatus
+
+
+@pytest.fixture
+def artifacts(tmp_path):
+    """テスト用の成果物ディレクトリ"""
+    directory = tmp_path / "shared" / "artifacts"
+    (directory / "backend").mkdir(parents=True)
+    return directory
+
+
+def write(directory, path, content, mtime=None):
+    full_path = directory / path
+    full_path.parent.mkdir(parents=True, exist_ok=True)
+    if isinstance(content, bytes):
+        full_path.write_bytes(content)
+    else:
+        full_path.write_text(content, encoding="utf-8")
+    if mtime is not None:
+        os.utime(full_path, (mtime, mtime))
+    return full_path
+
+
+def artifact_task(task_id, dependencies=None, target_files=None, artifacts=None, completed=True):
+    """成果物を持つ（既定では完了済みの）タスク"""
+    return Task(
+        id=task_id,
+        title=task_id,
+        description="",
+        assigned_to="backend",
+        status=TaskStatus.COMPLETED if completed else TaskStatus.PENDING,
+        dependencies=dependencies or [],
+        target_files=target_files or [],
+        artifacts=artifacts or [],
+    )
+
+
+class TestRanking:
+    """候補の並び順"""
+
+    def test_targets_then_direct_then_transitive(self, artifacts):
+        write(artifacts, "backend/api.py", "from backend import models\n")
+        write(artifacts, "backend/models.py", "class User: pass\n", mtime=1000)
+        write(artifacts, "backend/util.py", "def helper(): pass\n", mtime=3000)
+        write(artifacts, "backend/db.py", "def connect(): pass\n", mtime=2000)
+
+        tasks = {
+            "TASK-001": artifact_task("TASK-001", artifacts=["backend/db.py"]),
+            "TASK-002": artifact_task(
+                "TASK-002", ["TASK-001"], artifacts=["backend/models.py", "backend/util.py"]
+            ),
+            "TASK-003": artifact_task(
+                "TASK-003", ["TASK-002"], target_files=["backend/api.py"], completed=False
+            ),
+        }
+
+        sources = ContextBuilder(artifacts).collect(tasks["TASK-003"], tasks)
+
+        # 直接の依存のうち、インポートされている models.py が新しい util.py より先
+        assert [(s.path, s.depth) for s in sources] == [
+            ("backend/api.py", 0),
+            ("backend/models.py", 1),
+            ("backend/util.py", 1),
+            ("backend/db.py", 2),
+        ]
+        assert sources[1].import_distance == 1
+
+    def test_skips_incomplete_and_missing(self, artifacts):
+        write(artifacts, "backend/a.py", "x = 1\n")
+        tasks = {
+            "TASK-001": artifact_task("TASK-001", artifacts=["backend/a.py", "backend/missing.py"]),
+            "TASK-002": artifact_task("TASK-002", artifacts=["backend/a.py"], completed=False),
+            "TASK-003": artifact_task("TASK-003", ["TASK-001", "TASK-002"], completed=False),
+        }
+
+        sources = ContextBuilder(artifacts).collect(tasks["TASK-003"], tasks)
+
+        assert [(s.path, s.task_id) for s in sources] == [("backend/a.py", "TASK-001")]
+
+
+class TestBudget:
+    """予算の適用"""
+
+    def test_full_outline_and_budget_skip(self, artifacts):
+        write(artifacts, "backend/small.py", "def small():\n    return 1\n")
+        body = "".join(f"def func_{i}(x):\n    return x + {i}\n" for i in range(200))
+        write(artifacts, "backend/large.py", body)
+        write(artifacts, "backend/late.py", "def late(): pass\n")
+        tasks = {
+            "TASK-001": artifact_task(
+                "TASK-001", artifacts=["backend/large.py", "backend/late.py"]
+            ),
+            "TASK-002": artifact_task(
+                "TASK-002", ["TASK-001"], target_files=["backend/small.py"], completed=False
+            ),
+        }
+        builder = ContextBuilder(artifacts, max_tokens=800, max_file_tokens=500)
+
+        context = builder.build(tasks["TASK-002"], tasks)
+
+        assert context["related_files"][0]["mode"] == "full"
+        assert context["related_files"][0]["content"] == "def small():\n    return 1\n"
+
+        artifacts_by_path = {a["path"]: a for a in context["dependencies_artifacts"]}
+        large = artifacts_by_path["backend/large.py"]
+        assert large["mode"] == "outline"
+        assert large["content"].startswith("def func_0(x):\ndef func_1(x):\n")
+        assert "return" not in large["content"]
+        assert len(large["content"].encode()) <= 500 * BYTES_PER_TOKEN
+
+        budget = context["budget"]
+        assert budget["used_bytes"] <= 800 * BYTES_PER_TOKEN
+        assert budget["used_bytes"] == sum(
+            len(e["content"].encode())
+            for e in context["related_files"] + context["dependencies_artifacts"]
+        )
+
+    def test_truncates_files_without_signatures(self, artifacts):
+        write(artifacts, "backend/data.json", "".join(f'{{"id": {i}}}\n' for i in range(1000)))
+        task = artifact_task("TASK-001", target_files=["backend/data.json"], completed=False)
+
+        context = ContextBuilder(artifacts, max_file_tokens=25).build(task, {})
+
+        entry = context["related_files"][0]
+        assert entry["mode"] == "truncated"
+        assert entry["content"].endswith("\n")
+        assert len(entry["content"].encode()) <= 100
+
+    def test_skips_binary_and_exhausted_budget(self, artifacts):
+        write(artifacts, "backend/image.png", b"\x89PNG\r\n\x1a\n\0\0\0data")
+        write(artifacts, "backend/latin1.txt", "caf\xe9".encode("latin-1"))
+        write(artifacts, "backend/a.py", "a" * 40 + "\n")
+        write(artifacts, "backend/b.py", "b = 1\n")
+        task = artifact_task(
+            "TASK-001",
+            target_files=[
+                "backend/image.png", "backend/latin1.txt", "backend/a.py", "backend/b.py"
+            ],
+            completed=False,
+        )
+
+        context = ContextBuilder(artifacts, max_tokens=10).build(task, {})
+
+        assert [e["path"] for e in context["related_files"]] == ["backend/a.py"]
+        assert context["budget"]["skipped"] == [
+            {"path": "backend/image.png", "reason": "binary"},
+            {"path": "backend/latin1.txt", "reason": "binary"},
+            {"path": "backend/b.py", "reason": "budget"},
+        ]
+
+    def test_streams_in_chunks(self, artifacts):
+        content = "あいう\n" * 5000
+        write(artifacts, "backend/text.md", content)
+        task = artifact_task("TASK-001", target_files=["backend/text.md"], completed=False)
+
+        context = ContextBuilder(artifacts, max_file_tokens=100_000, chunk_size=7).build(task, {})
+
+        assert context["related_files"][0]["content"] == content
@@ -205,6 +205,94 @@ class TestCoordinatorProgressLoading:
         assert task_001_reloaded.error_message == "テストエラー"
 
 
+class TestCoordinatorReloadProgress:
+    """progress.json の差分再読み込みのテスト"""
+
+    def test_reload_returns_changed_tasks(self, temp_project, tasks_json, progress_json):
+        """他のインスタンスが更新したタスクだけを反映"""
+        viewer = Coordinator(temp_project)
+        assert viewer.reload_progress() == []
+
+        writer = Coordinator(temp_project)
+        writer.update_task_status("TASK-002", TaskStatus.FAILED, error_message="boom")
+
+        assert viewer.reload_progress() == ["TASK-002"]
+        assert viewer.tasks["TASK-002"].status == TaskStatus.FAILED
+        assert viewer.tasks["TASK-002"].error_message == "boom"
+        assert viewer.reload_progress() == []
+
+    def test_reload_ignores_unreadable_file(self, temp_project, tasks_json, progress_json):
+        """書き込み途中などで読めない場合は何も変更しない"""
+        coordinator = Coordinator(temp_project)
+        before = coordinator.tasks["TASK-001"].status
+        progress_json.write_text('{"tasks": [', encoding='utf-8')
+
+        assert coordinator.reload_progress() == []
+        assert coordinator.tasks["TASK-001"].status == before
+
+
+class TestCoordinatorBatchUpdate:
+    """Coordinatorのバッチ更新テスト"""
+
+    def test_batch_saves_once(self, temp_project, tasks_json, monkeypatch):
+        """batch内の更新はprogress.jsonへの保存が1回"""
+        coordinator = Coordinator(temp_project)
+        saves = []
+        original_save = coordinator._save_progress
+        monkeypatch.setattr(
+            coordinator, "_save_progress", lambda: saves.append(1) or original_save()
+        )
+
+        with coordinator.batch():
+            coordinator.update_task_status("TASK-001", TaskStatus.COMPLETED)
+            coordinator.update_task_status("TASK-002", TaskStatus.IN_PROGRESS)
+            assert saves == []
+
+        assert saves == [1]
+        coordinator2 = Coordinator(temp_project)
+        assert coordinator2.tasks["TASK-001"].status == TaskStatus.COMPLETED
+        assert coordinator2.tasks["TASK-002"].status == TaskStatus.IN_PROGRESS
+
+    def test_update_many(self, temp_project, tasks_json):
+        """update_manyは存在するタスクのみ更新して返す"""
+        coordinator = Coordinator(temp_project)
+
+        updated = coordinator.update_many(
+            ["TASK-001", "TASK-999", "TASK-002"], TaskStatus.COMPLETED
+        )
+
+        assert updated == ["TASK-001", "TASK-002"]
+        coordinator2 = Coordinator(temp_project)
+        assert all(t.status == TaskStatus.COMPLETED for t in coordinator2.tasks.values())
+
+    def test_batch_rolls_back_on_error(self, temp_project, tasks_json):
+        """例外発生時は変更を破棄し保存しない"""
+        coordinator = Coordinator(temp_project)
+
+        with pytest.raises(RuntimeError):
+            with coordinator.batch():
+                coordinator.update_task_status("TASK-001", TaskStatus.COMPLETED)
+                raise RuntimeError("中断")
+
+        assert coordinator.tasks["TASK-001"].status == TaskStatus.PENDING
+        assert coordinator.tasks["TASK-001"].completed_at is None
+        progress_path = temp_project / "shared" / "coordination" / "progress.json"
+        assert not progress_path.exists()
+
+    def test_nested_batch_saves_at_outermost(self, temp_project, tasks_json):
+        """ネストしたbatchは最も外側の終了時に保存"""
+        coordinator = Coordinator(temp_project)
+        progress_path = temp_project / "shared" / "coordination" / "progress.json"
+
+        with coordinator.batch():
+            with coordinator.batch():
+                coordinator.update_task_status("TASK-001", TaskStatus.COMPLETED)
+            assert not progress_path.exists()
+
+        assert progress_path.exists()
+        assert not list(progress_path.parent.glob("*.tmp"))
+
+
 class TestCoordinatorTaskRetrieval:
     """Coordinatorのタスク取得テスト"""
 
@@ -429,3 +429,116 @@ class TestDashboard:
         content = str(panel.renderable)
         # 完了タスクがない場合でもパネルは作成される
         assert "タスク/時間" in content
+
+
+class TestDashboardWatch:
+    """監視モードのテスト"""
+
+    @pytest.fixture
+    def project(self, tmp_path):
+        import json
+
+        coordination = tmp_path / "shared" / "coordination"
+        coordination.mkdir(parents=True)
+        tasks = {
+            "tasks": [
+                {"id": f"TASK-00{i}", "title": f"タスク{i}", "description": "",
+                 "assigned_to": "backend", "dependencies": [], "target_files": [],
+                 "acceptance_criteria": [], "priority": "high"}
+                for i in range(1, 3)
+            ],
+            "workers": []
+        }
+        (coordination / "tasks.json").write_text(json.dumps(tasks), encoding="utf-8")
+        return tmp_path
+
+    def test_render_dashboard(self, project):
+        """ダッシュボード全体を1つの描画対象として作成"""
+        from io import StringIO
+        from rich.console import Console
+        from src.cmw.coordinator import Coordinator
+
+        output = StringIO()
+        dashboard = Dashboard(console=Console(file=output, width=120))
+        tasks = list(Coordinator(project).tasks.values())
+        dashboard.console.print(dashboard.render_dashboard(ProgressTracker(project), tasks))
+
+        text = output.getvalue()
+        assert "プロジェクト概要" in text
+        assert "担当者別進捗" in text
+
+    @pytest.mark.parametrize("use_inotify", [False, True])
+    def test_watch_applies_progress_changes(self, project, use_inotify):
+        """progress.json の変更を検知して再描画"""
+        import threading
+        import time
+        from io import StringIO
+        from rich.console import Console
+        from src.cmw.coordinator import Coordinator
+
+        output = StringIO()
+        dashboard = Dashboard(console=Console(file=output, width=120))
+
+        def complete_later():
+            time.sleep(0.2)
+            Coordinator(project).update_task_status("TASK-001", TaskStatus.COMPLETED)
+
+        thread = threading.Thread(target=complete_later)
+        thread.start()
+        frames = dashboard.watch(
+            project, max_fps=20, poll_interval=0.02, duration=1.0, use_inotify=use_inotify
+        )
+        thread.join()
+
+        assert frames == 2
+        assert "✅ 完了: 1 (50.0%)" in output.getvalue()
+
+    def test_watch_bounds_frame_rate(self, project):
+        """連続した変更は1フレームにまとめる"""
+        import threading
+        import time
+        from io import StringIO
+        from rich.console import Console
+        from src.cmw.coordinator import Coordinator
+
+        dashboard = Dashboard(console=Console(file=StringIO(), width=120))
+
+        def update_repeatedly():
+            time.sleep(0.1)
+            coordinator = Coordinator(project)
+            for status in [TaskStatus.IN_PROGRESS, TaskStatus.FAILED, TaskStatus.COMPLETED] * 3:
+                coordinator.update_task_status("TASK-002", status)
+                time.sleep(0.01)
+
+        thread = threading.Thread(target=update_repeatedly)
+        thread.start()
+        frames = dashboard.watch(project, max_fps=2, poll_interval=0.01, duration=0.8)
+        thread.join()
+
+        # 初回 + 変更分（0.5秒間隔で最大2回）
+        assert 2 <= frames <= 3
+
+    def test_follow_task_loop(self, project):
+        """TaskLoop の状態の変化に合わせて再描画"""
+        import asyncio
+        from io import StringIO
+        from rich.console import Console
+        from src.cmw.coordinator import Coordinator
+        from src.cmw.task_loop import TaskLoop
+
+        output = StringIO()
+        dashboard = Dashboard(console=Console(file=output, width=120))
+        loop = TaskLoop(Coordinator(project))
+
+        async def main():
+            follower = asyncio.ensure_future(dashboard.follow(loop, max_fps=100))
+            await asyncio.sleep(0.05)
+            task = await loop.next_ready()
+            await loop.complete(task.id)
+            await asyncio.sleep(0.05)
+            follower.cancel()
+            await asyncio.gather(follower, return_exceptions=True)
+
+        asyncio.run(main())
+
+        assert "✅ 完了: 1 (50.0%)" in output.getvalue()
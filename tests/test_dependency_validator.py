@@ -114,6 +114,78 @@ class TestCycleDetection:
         assert len(cycles) == 2
 
 
+class TestCycleSummary:
+    """強連結成分ベースの循環サマリーのテスト"""
+
+    def _ring_tasks(self, prefix, size, start=0):
+        """size個のタスクが環状に依存するタスク群"""
+        return [
+            Task(
+                id=f"{prefix}-{i:03d}",
+                title=f"Task {i}",
+                description="テスト",
+                assigned_to="backend",
+                dependencies=[f"{prefix}-{(i + 1) % size:03d}"],
+            )
+            for i in range(start, size)
+        ]
+
+    def test_every_component_reported(self):
+        """上限を超える数の循環成分も全て報告される"""
+        tasks = []
+        for n in range(15):
+            tasks += self._ring_tasks(f"R{n:02d}", 2)
+
+        validator = DependencyValidator()
+        summary = validator.summarize_cycles(tasks)
+
+        assert len(summary) == 15
+        assert all(len(component["cycles"]) == 1 for component in summary)
+        assert len(validator.detect_cycles(tasks)) == 15
+
+    def test_component_cap(self):
+        """成分ごとの列挙上限"""
+        # 全タスクが相互依存する完全グラフ
+        ids = [f"TASK-{i:03d}" for i in range(6)]
+        tasks = [
+            Task(id=tid, title=tid, description="", assigned_to="backend",
+                 dependencies=[d for d in ids if d != tid])
+            for tid in ids
+        ]
+
+        validator = DependencyValidator()
+        summary = validator.summarize_cycles(tasks, max_cycles_per_component=3)
+
+        assert len(summary) == 1
+        assert summary[0]["tasks"] == ids
+        assert summary[0]["edge_count"] == 30
+        assert len(summary[0]["cycles"]) == 3
+        assert summary[0]["truncated"] is True
+
+    def test_cycles_are_closed_edge_lists(self):
+        """列挙された循環は閉じたエッジ列"""
+        tasks = self._ring_tasks("TASK", 5)
+        tasks[0].dependencies.append("TASK-002")
+
+        validator = DependencyValidator()
+        for cycle in validator.detect_cycles(tasks):
+            for (_, to_id), (from_id, _) in zip(cycle, cycle[1:] + cycle[:1]):
+                assert to_id == from_id
+
+    def test_acyclic_nodes_excluded(self):
+        """循環に含まれないタスクは成分に含まれない"""
+        tasks = self._ring_tasks("TASK", 3) + [
+            Task(id="TASK-100", title="末端", description="", assigned_to="backend",
+                 dependencies=["TASK-000"]),
+        ]
+
+        validator = DependencyValidator()
+        summary = validator.summarize_cycles(tasks)
+
+        assert summary[0]["tasks"] == ["TASK-000", "TASK-001", "TASK-002"]
+        assert summary[0]["truncated"] is False
+
+
 class TestFixSuggestions:
     """修正提案のテスト"""
 
@@ -334,6 +406,163 @@ class TestAutoFix:
         assert "最大反復回数" in output or "これ以上の自動修正ができません" in output or "削除しました" in output
 
 
+class TestFeedbackArcSet:
+    """最小フィードバックアークセットのテスト"""
+
+    def _section_tasks(self, n, deps):
+        return [
+            Task(
+                id=f"TASK-{i:03d}",
+                title=f"{i}.1 タスク{i}",
+                description="Test",
+                assigned_to="backend",
+                dependencies=[f"TASK-{d:03d}" for d in deps.get(i, [])],
+                priority=Priority.MEDIUM,
+            )
+            for i in range(1, n + 1)
+        ]
+
+    def test_removes_shared_edge_once(self):
+        """複数の循環に共通する依存関係を1本だけ削除する"""
+        # 循環 1 → 2 → 3 → 1 と 1 → 2 → 4 → 1 は依存 1 → 2 を共有
+        tasks = self._section_tasks(4, {1: [2], 2: [3, 4], 3: [1], 4: [1]})
+
+        validator = DependencyValidator()
+        removals = validator.find_feedback_arc_set(tasks)
+        fixed = validator.remove_dependencies(tasks, removals)
+
+        assert [(r["from_task"], r["to_task"]) for r in removals] == [("TASK-001", "TASK-002")]
+        assert validator.detect_cycles(fixed) == []
+
+    def test_prefers_higher_confidence(self):
+        """同じ削除数なら信頼度の高い依存関係を削除する"""
+        tasks = [
+            Task(id="TASK-001", title="2.1 モデル定義", description="モデル",
+                 assigned_to="backend", dependencies=["TASK-002"], priority=Priority.HIGH),
+            Task(id="TASK-002", title="2.2 データベース初期化", description="DB",
+                 assigned_to="backend", dependencies=["TASK-001"], priority=Priority.HIGH),
+        ]
+
+        validator = DependencyValidator()
+        removals = validator.find_feedback_arc_set(tasks)
+
+        assert len(removals) == 1
+        assert removals[0]["from_task"] == "TASK-001"
+        assert removals[0]["to_task"] == "TASK-002"
+
+    def test_keeps_edges_without_reason(self):
+        """削除理由のない依存関係は削除しない"""
+        tasks = [
+            Task(id="TASK-001", title="タスクA", description="A",
+                 assigned_to="backend", dependencies=["TASK-002"], priority=Priority.HIGH),
+            Task(id="TASK-002", title="タスクB", description="B",
+                 assigned_to="backend", dependencies=["TASK-001"], priority=Priority.HIGH),
+        ]
+
+        validator = DependencyValidator()
+        assert validator.find_feedback_arc_set(tasks) == []
+
+    def test_self_dependency_removed(self):
+        """自己依存は常に削除対象"""
+        tasks = self._section_tasks(1, {1: [1]})
+
+        validator = DependencyValidator()
+        removals = validator.find_feedback_arc_set(tasks)
+
+        assert removals == [
+            {
+                "from_task": "TASK-001",
+                "to_task": "TASK-001",
+                "reason": "自己依存",
+                "confidence": 1.0,
+            }
+        ]
+
+    def test_exact_solution_is_minimum(self):
+        """小さな成分では最小本数の依存関係を削除する"""
+        # 全てのタスクが互いに依存する完全グラフ（最小FASは n(n-1)/2 本）
+        n = 5
+        everyone = range(1, n + 1)
+        tasks = self._section_tasks(n, {i: [j for j in everyone if j != i] for i in everyone})
+
+        validator = DependencyValidator()
+        removals = validator.find_feedback_arc_set(tasks)
+        fixed = validator.remove_dependencies(tasks, removals)
+
+        assert len(removals) == n * (n - 1) // 2
+        assert validator.detect_cycles(fixed) == []
+
+    def test_large_component_uses_heuristic(self):
+        """大きな成分でもヒューリスティックで全循環を解消する"""
+        n = 60
+        deps = {i: [i + 1 if i < n else 1, (i + 6) % n + 1] for i in range(1, n + 1)}
+        tasks = self._section_tasks(n, deps)
+
+        validator = DependencyValidator()
+        removals = validator.find_feedback_arc_set(tasks)
+        fixed = validator.remove_dependencies(tasks, removals)
+
+        assert len(removals) < 2 * n
+        assert validator.detect_cycles(fixed) == []
+
+
+class TestTransitiveReduction:
+    """推移的簡約のテスト"""
+
+    def _task(self, task_id, deps):
+        return Task(id=task_id, title=task_id, description="Test",
+                    assigned_to="backend", dependencies=deps, priority=Priority.MEDIUM)
+
+    def test_removes_redundant_edges(self):
+        """A → B → C のとき A → C を削除"""
+        tasks = [
+            self._task("TASK-001", []),
+            self._task("TASK-002", ["TASK-001"]),
+            self._task("TASK-003", ["TASK-001", "TASK-002"]),
+        ]
+
+        validator = DependencyValidator()
+        removed = validator.transitive_reduction(tasks)
+
+        assert removed == [("TASK-003", "TASK-001")]
+        assert tasks[2].dependencies == ["TASK-002"]
+
+    def test_preserves_reachability(self):
+        """削減前後で到達可能性が変わらない"""
+        import networkx as nx
+
+        tasks = [
+            self._task(f"TASK-{i:03d}", [f"TASK-{j:03d}" for j in range(max(1, i - 5), i)])
+            for i in range(1, 40)
+        ]
+        validator = DependencyValidator()
+        before = nx.transitive_closure(validator._build_dependency_graph(tasks))
+
+        removed = validator.transitive_reduction(tasks)
+        after = nx.transitive_closure(validator._build_dependency_graph(tasks))
+
+        assert len(removed) > 0
+        assert set(before.edges()) == set(after.edges())
+        assert all(len(t.dependencies) <= 1 for t in tasks)
+
+    def test_keeps_cycles_and_missing_dependencies(self):
+        """循環内の依存関係と存在しない依存先は保持"""
+        tasks = [
+            self._task("TASK-001", ["TASK-002", "TASK-999"]),
+            self._task("TASK-002", ["TASK-001"]),
+            self._task("TASK-003", ["TASK-001", "TASK-002"]),
+        ]
+
+        validator = DependencyValidator()
+        removed = validator.transitive_reduction(tasks)
+
+        assert tasks[0].dependencies == ["TASK-002", "TASK-999"]
+        assert tasks[1].dependencies == ["TASK-001"]
+        # 循環成分への依存は1本に集約
+        assert tasks[2].dependencies == ["TASK-001"]
+        assert removed == [("TASK-003", "TASK-002")]
+
+
 class TestSectionNumberExtraction:
     """セクション番号抽出のテスト"""
 
@@ -0,0 +1,95 @@
+"""
+FileWatcher のユニットテスト
+"""
+import os
+import sys
+import threading
+import time
+
+import pytest
+from cmw.file_watcher import FileWatcher
+
+
+@pytest.fixture
+def coordination(tmp_path):
+    """監視対象のファイルを作成"""
+    directory = tmp_path / "shared" / "coordination"
+    directory.mkdir(parents=True)
+    (directory / "progress.json").write_text("{}", encoding="utf-8")
+    (directory / "tasks.json").write_text("{}", encoding="utf-8")
+    return directory
+
+
+def write_later(path, text, delay=0.05, replace=False):
+    """別スレッドで少し後にファイルを書き込む"""
+
+    def write():
+        time.sleep(delay)
+        if replace:
+            tmp = path.with_name(path.name + ".tmp")
+            tmp.write_text(text, encoding="utf-8")
+            os.replace(tmp, path)
+        else:
+            path.write_text(text, encoding="utf-8")
+
+    thread = threading.Thread(target=write)
+    thread.start()
+    return thread
+
+
+BACKENDS = [False]
+if sys.platform.startswith("linux"):
+    BACKENDS.append(True)
+
+
+class TestFileWatcher:
+    """ファイル監視のテスト"""
+
+    @pytest.mark.parametrize("use_inotify", BACKENDS)
+    def test_detects_write(self, coordination, use_inotify):
+        """書き込みを検知"""
+        progress = coordination / "progress.json"
+        with FileWatcher([progress], poll_interval=0.01, use_inotify=use_inotify) as watcher:
+            thread = write_later(progress, '{"tasks": []}')
+            changed = watcher.wait(timeout=5)
+            thread.join()
+
+        assert changed == {progress}
+
+    @pytest.mark.parametrize("use_inotify", BACKENDS)
+    def test_detects_atomic_replace(self, coordination, use_inotify):
+        """os.replace による置き換えを検知"""
+        progress = coordination / "progress.json"
+        tasks = coordination / "tasks.json"
+        with FileWatcher([progress, tasks], poll_interval=0.01, use_inotify=use_inotify) as watcher:
+            thread = write_later(progress, '{"tasks": [1]}', replace=True)
+            changed = watcher.wait(timeout=5)
+            thread.join()
+
+        assert changed == {progress}
+
+    @pytest.mark.parametrize("use_inotify", BACKENDS)
+    def test_timeout_without_change(self, coordination, use_inotify):
+        """変更がなければタイムアウトで空を返す"""
+        files = [coordination / "tasks.json"]
+        with FileWatcher(files, poll_interval=0.01, use_inotify=use_inotify) as watcher:
+            start = time.monotonic()
+            changed = watcher.wait(timeout=0.1)
+
+        assert changed == set()
+        assert time.monotonic() - start >= 0.1
+
+    def test_ignores_unrelated_files(self, coordination):
+        """同じディレクトリの他のファイルは無視"""
+        progress = coordination / "progress.json"
+        with FileWatcher([progress], poll_interval=0.01) as watcher:
+            thread = write_later(coordination / "other.json", "{}")
+            changed = watcher.wait(timeout=0.3)
+            thread.join()
+
+        assert changed == set()
+
+    def test_missing_directory_falls_back_to_polling(self, tmp_path):
+        """ディレクトリがない場合はポーリング"""
+        with FileWatcher([tmp_path / "missing" / "progress.json"]) as watcher:
+            assert watcher.backend == "polling"
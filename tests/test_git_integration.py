@@ -1,13 +1,38 @@
 """
 GitIntegration のユニットテスト
 """
+import io
 import json
+import shutil
+import subprocess
+import time
 import pytest
 from unittest.mock import Mock, patch, MagicMock
 from cmw.git_integration import GitIntegration
 from cmw.models import TaskStatus
 
 
+def mock_git_log(mock_popen, stdout, returncode=0, stderr=""):
+    """git log のプロセスをモック（stdoutは「ハッシュ|||件名」の行）"""
+    now = int(time.time())
+    lines = []
+    for line in stdout.split("\n"):
+        if line:
+            commit_hash, message = line.split("|||", 1)
+            lines.append(f"{commit_hash}|||{now}|||{message}")
+
+    def start(*args, **kwargs):
+        # 呼び出しごとに新しいプロセス（出力）を返す
+        process = MagicMock()
+        process.__enter__.return_value = process
+        process.stdout = io.StringIO("\n".join(lines))
+        process.stderr = io.StringIO(stderr)
+        process.wait.return_value = returncode
+        return process
+
+    mock_popen.side_effect = start
+
+
 @pytest.fixture
 def temp_git_repo(tmp_path):
     """テスト用のGitリポジトリを作成"""
@@ -107,13 +132,11 @@ class TestGitIntegration:
 
         assert len(task_ids) == 0
 
-    @patch('subprocess.run')
-    def test_get_commit_log_success(self, mock_run, temp_git_repo):
+    @patch('subprocess.Popen')
+    def test_get_commit_log_success(self, mock_popen, temp_git_repo):
         """コミットログの取得 - 成功"""
         # subprocessのモック設定
-        mock_result = Mock()
-        mock_result.stdout = "abc123|||feat: TASK-001 を実装\ndef456|||fix: TASK-002 バグ修正"
-        mock_run.return_value = mock_result
+        mock_git_log(mock_popen, "abc123|||feat: TASK-001 を実装\ndef456|||fix: TASK-002 バグ修正")
 
         git = GitIntegration()
         commits = git._get_commit_log(temp_git_repo, since="1.day.ago", branch="main")
@@ -125,18 +148,16 @@ class TestGitIntegration:
         assert commits[1]['message'] == 'fix: TASK-002 バグ修正'
 
         # git log が正しい引数で呼ばれたか確認
-        mock_run.assert_called_once()
-        call_args = mock_run.call_args
+        mock_popen.assert_called_once()
+        call_args = mock_popen.call_args
         assert 'git' in call_args[0][0]
         assert 'log' in call_args[0][0]
         assert '--since=1.day.ago' in call_args[0][0]
 
-    @patch('subprocess.run')
-    def test_get_commit_log_empty(self, mock_run, temp_git_repo):
+    @patch('subprocess.Popen')
+    def test_get_commit_log_empty(self, mock_popen, temp_git_repo):
         """コミットログの取得 - 空"""
-        mock_result = Mock()
-        mock_result.stdout = ""
-        mock_run.return_value = mock_result
+        mock_git_log(mock_popen, "")
 
         git = GitIntegration()
         commits = git._get_commit_log(temp_git_repo, since=None, branch="HEAD")
@@ -144,13 +165,13 @@ class TestGitIntegration:
         assert len(commits) == 0
 
     @patch('cmw.git_integration.Coordinator')
-    @patch('subprocess.run')
-    def test_sync_progress_from_git_success(self, mock_run, mock_coordinator_class, temp_git_repo):
+    @patch('subprocess.Popen')
+    def test_sync_progress_from_git_success(
+        self, mock_popen, mock_coordinator_class, temp_git_repo
+    ):
         """進捗同期 - 成功"""
         # subprocessのモック設定
-        mock_result = Mock()
-        mock_result.stdout = "abc123|||feat: TASK-001 を実装\ndef456|||fix: TASK-002 バグ修正"
-        mock_run.return_value = mock_result
+        mock_git_log(mock_popen, "abc123|||feat: TASK-001 を実装\ndef456|||fix: TASK-002 バグ修正")
 
         # Coordinatorのモック設定
         mock_coordinator = MagicMock()
@@ -163,11 +184,13 @@ class TestGitIntegration:
             'TASK-001': mock_task_001,
             'TASK-002': mock_task_002,
         }
+        mock_coordinator.update_many.side_effect = lambda task_ids, status: list(task_ids)
         mock_coordinator_class.return_value = mock_coordinator
 
         # 進捗を同期
         git = GitIntegration()
-        result = git.sync_progress_from_git(temp_git_repo, since="1.day.ago")
+        with patch.object(GitIntegration, '_resolve_since', return_value=int(time.time()) - 86400):
+            result = git.sync_progress_from_git(temp_git_repo, since="1.day.ago")
 
         # 結果を検証
         assert len(result['completed_tasks']) == 2
@@ -177,19 +200,20 @@ class TestGitIntegration:
         assert result['skipped_count'] == 0
         assert result['commits_analyzed'] == 2
 
-        # update_task_statusが呼ばれたか確認
-        assert mock_coordinator.update_task_status.call_count == 2
+        # update_manyで1回にまとめて更新されたか確認
+        assert mock_coordinator.update_many.call_count == 1
+        updated_ids, status = mock_coordinator.update_many.call_args[0]
+        assert sorted(updated_ids) == ['TASK-001', 'TASK-002']
+        assert status == TaskStatus.COMPLETED
         # COMPLETED ステータスで呼ばれたか確認
-        mock_coordinator.update_task_status.assert_any_call('TASK-001', TaskStatus.COMPLETED)
-        mock_coordinator.update_task_status.assert_any_call('TASK-002', TaskStatus.COMPLETED)
 
     @patch('cmw.git_integration.Coordinator')
-    @patch('subprocess.run')
-    def test_sync_progress_from_git_skip_completed(self, mock_run, mock_coordinator_class, temp_git_repo):
+    @patch('subprocess.Popen')
+    def test_sync_progress_from_git_skip_completed(
+        self, mock_popen, mock_coordinator_class, temp_git_repo
+    ):
         """進捗同期 - 既に完了しているタスクはスキップ"""
-        mock_result = Mock()
-        mock_result.stdout = "abc123|||feat: TASK-003 を実装"
-        mock_run.return_value = mock_result
+        mock_git_log(mock_popen, "abc123|||feat: TASK-003 を実装")
 
         # TASK-003は既に完了している
         mock_coordinator = MagicMock()
@@ -199,6 +223,7 @@ class TestGitIntegration:
         mock_coordinator.tasks = {
             'TASK-003': mock_task_003,
         }
+        mock_coordinator.update_many.side_effect = lambda task_ids, status: list(task_ids)
         mock_coordinator_class.return_value = mock_coordinator
 
         git = GitIntegration()
@@ -207,7 +232,7 @@ class TestGitIntegration:
         # 結果を検証
         assert result['updated_count'] == 0
         assert result['skipped_count'] == 1
-        assert mock_coordinator.update_task_status.call_count == 0
+        assert not mock_coordinator.update_many.call_args[0][0]
 
     def test_sync_progress_from_git_not_git_repo(self, tmp_path):
         """進捗同期 - Gitリポジトリではない"""
@@ -216,17 +241,15 @@ class TestGitIntegration:
         with pytest.raises(ValueError, match="Gitリポジトリではありません"):
             git.sync_progress_from_git(tmp_path)
 
-    @patch('subprocess.run')
-    def test_get_task_commits(self, mock_run, temp_git_repo):
+    @patch('subprocess.Popen')
+    def test_get_task_commits(self, mock_popen, temp_git_repo):
         """特定タスクのコミット取得"""
-        mock_result = Mock()
-        mock_result.stdout = (
+        mock_git_log(mock_popen, (
             "abc123|||feat: TASK-001 を実装\n"
             "def456|||fix: TASK-002 バグ修正\n"
             "ghi789|||test: TASK-001 テスト追加\n"
             "jkl012|||docs: README更新"
-        )
-        mock_run.return_value = mock_result
+        ))
 
         git = GitIntegration()
         commits = git.get_task_commits(temp_git_repo, "TASK-001")
@@ -234,16 +257,14 @@ class TestGitIntegration:
         assert len(commits) == 2
         assert all('TASK-001' in c['message'] for c in commits)
 
-    @patch('subprocess.run')
-    def test_get_recent_activity(self, mock_run, temp_git_repo):
+    @patch('subprocess.Popen')
+    def test_get_recent_activity(self, mock_popen, temp_git_repo):
         """最近のアクティビティ取得"""
-        mock_result = Mock()
-        mock_result.stdout = (
+        mock_git_log(mock_popen, (
             "abc123|||feat: TASK-001 を実装\n"
             "def456|||fix: TASK-002 バグ修正\n"
             "ghi789|||test: TASK-001 テスト追加"
-        )
-        mock_run.return_value = mock_result
+        ))
 
         git = GitIntegration()
         activity = git.get_recent_activity(temp_git_repo, days=7)
@@ -254,16 +275,14 @@ class TestGitIntegration:
         assert len(activity['TASK-002']) == 1  # 1回コミット
 
     @patch('cmw.git_integration.Coordinator')
-    @patch('subprocess.run')
-    def test_validate_task_references(self, mock_run, mock_coordinator_class, temp_git_repo):
+    @patch('subprocess.Popen')
+    def test_validate_task_references(self, mock_popen, mock_coordinator_class, temp_git_repo):
         """タスク参照の検証"""
-        mock_result = Mock()
-        mock_result.stdout = (
+        mock_git_log(mock_popen, (
             "abc123|||feat: TASK-001 を実装\n"
             "def456|||fix: TASK-999 バグ修正\n"  # 存在しないタスク
             "ghi789|||test: TASK-002 テスト追加"
-        )
-        mock_run.return_value = mock_result
+        ))
 
         # Coordinatorのモック
         mock_coordinator = MagicMock()
@@ -287,6 +306,304 @@ class TestGitIntegration:
         assert 'def456' in validation['invalid_commits'][0]['hash']
 
 
+@pytest.fixture
+def real_git_repo(temp_git_repo):
+    """実際のgitコマンドで初期化したリポジトリ"""
+    shutil.rmtree(temp_git_repo / ".git")
+
+    def git(*args):
+        subprocess.run(
+            ["git", "-c", "user.name=test", "-c", "user.email=test@example.com", *args],
+            cwd=temp_git_repo, check=True, capture_output=True,
+        )
+
+    git("init", "-q")
+    git("commit", "-q", "--allow-empty", "-m", "feat: TASK-001 を実装")
+    return temp_git_repo, git
+
+
+@pytest.mark.skipif(shutil.which("git") is None, reason="gitが必要")
+class TestIncrementalSync:
+    """ウォーターマークによる差分同期のテスト"""
+
+    def test_second_sync_reads_only_new_commits(self, real_git_repo):
+        """2回目の同期は前回以降のコミットのみ読み込む"""
+        repo, git = real_git_repo
+        integration = GitIntegration()
+
+        first = integration.sync_progress_from_git(repo)
+        assert first['completed_tasks'] == ['TASK-001']
+        assert first['commits_analyzed'] == 1
+        assert (repo / "shared" / "coordination" / "git_sync.json").exists()
+
+        git("commit", "-q", "--allow-empty", "-m", "fix: TASK-002 バグ修正")
+
+        second = integration.sync_progress_from_git(repo)
+        assert second['completed_tasks'] == ['TASK-001', 'TASK-002']
+        assert second['updated_count'] == 1
+        assert second['commits_analyzed'] == 1
+
+        third = integration.sync_progress_from_git(repo)
+        assert third['commits_analyzed'] == 0
+
+    def test_full_rescan_after_rebase(self, real_git_repo):
+        """前回のコミットが履歴から外れた場合は全件を再スキャン"""
+        repo, git = real_git_repo
+        integration = GitIntegration()
+
+        git("commit", "-q", "--allow-empty", "-m", "fix: TASK-002 バグ修正")
+        integration.sync_progress_from_git(repo)
+
+        # 直前のコミットを書き換え（リベース相当）
+        git("commit", "-q", "--amend", "--allow-empty", "-m", "fix: TASK-003 修正")
+
+        result = integration.sync_progress_from_git(repo)
+        assert result['commits_analyzed'] == 2
+        assert result['completed_tasks'] == ['TASK-001', 'TASK-003']
+
+    def test_full_option_ignores_watermark(self, real_git_repo):
+        """full=Trueでは前回の記録を無視"""
+        repo, _ = real_git_repo
+        integration = GitIntegration()
+
+        integration.sync_progress_from_git(repo)
+        result = integration.sync_progress_from_git(repo, full=True)
+
+        assert result['commits_analyzed'] == 1
+
+    def test_find_completed_tasks_does_not_write_progress(self, real_git_repo):
+        """find_completed_tasksはタスクIDのみを返し、progress.jsonは更新しない"""
+        repo, git = real_git_repo
+        integration = GitIntegration()
+
+        assert integration.find_completed_tasks(repo) == {'TASK-001'}
+        git("commit", "-q", "--allow-empty", "-m", "fix: TASK-002 バグ修正")
+        assert integration.find_completed_tasks(repo) == {'TASK-001', 'TASK-002'}
+        assert not (repo / "shared" / "coordination" / "progress.json").exists()
+
+    def test_sync_state_is_compact(self, real_git_repo):
+        """git_sync.json にはウォーターマークとタスクごとの最新の参照のみを保存"""
+        repo, git = real_git_repo
+        git("commit", "-q", "--allow-empty", "-m", "fix: TASK-001 再修正")
+
+        GitIntegration().sync_progress_from_git(repo)
+
+        state = json.loads((repo / "shared" / "coordination" / "git_sync.json").read_text())
+        head = state["HEAD"]
+        assert set(head) == {"last_commit", "tasks"}
+        assert head["tasks"]["TASK-001"]["hash"] == head["last_commit"]
+        assert set(head["tasks"]["TASK-001"]) == {"hash", "timestamp"}
+
+    def test_queries_and_dry_run_do_not_write_state(self, real_git_repo):
+        """クエリと dry-run は git_sync.json・progress.json を更新しない"""
+        repo, _ = real_git_repo
+        coordination = repo / "shared" / "coordination"
+        integration = GitIntegration()
+
+        integration.validate_task_references(repo)
+        integration.get_task_commits(repo, "TASK-001")
+        result = integration.sync_progress_from_git(repo, dry_run=True)
+
+        assert result["completed_tasks"] == ["TASK-001"]
+        assert result["updated_count"] == 1
+        assert not (coordination / "git_sync.json").exists()
+        assert not (coordination / "progress.json").exists()
+
+    def test_validate_references_accumulate(self, real_git_repo):
+        """タスク参照の検証は差分読み込みでも全履歴の参照を保持"""
+        repo, git = real_git_repo
+        integration = GitIntegration()
+
+        git("commit", "-q", "--allow-empty", "-m", "fix: TASK-999 存在しないタスク")
+        first = integration.validate_task_references(repo)
+
+        git("commit", "-q", "--allow-empty", "-m", "test: TASK-002 テスト追加")
+        second = GitIntegration().validate_task_references(repo)
+
+        assert first['invalid'] == ['TASK-999']
+        assert second['valid'] == ['TASK-001', 'TASK-002']
+        assert second['invalid'] == ['TASK-999']
+        assert len(second['invalid_commits']) == 1
+
+
+@pytest.mark.skipif(shutil.which("git") is None, reason="gitが必要")
+class TestCommitIndex:
+    """タスク参照インデックスの共有のテスト"""
+
+    def test_queries_share_single_log_read(self, real_git_repo):
+        """同じインスタンスの各クエリは git log を1回だけ実行"""
+        repo, git = real_git_repo
+        git("commit", "-q", "--allow-empty", "-m", "fix: TASK-001 TASK-002 修正")
+        integration = GitIntegration()
+
+        with patch('subprocess.Popen', wraps=subprocess.Popen) as popen:
+            integration.sync_progress_from_git(repo)
+            validation = integration.validate_task_references(repo)
+            commits = integration.get_task_commits(repo, "TASK-001")
+            activity = integration.get_recent_activity(repo, days=1)
+
+        assert popen.call_count == 1
+        assert validation['valid'] == ['TASK-001', 'TASK-002']
+        assert [c['message'] for c in commits] == [
+            "fix: TASK-001 TASK-002 修正",
+            "feat: TASK-001 を実装",
+        ]
+        assert len(activity['TASK-001']) == 2
+
+    def test_incremental_validate_does_not_read_full_history(self, real_git_repo):
+        """同期後の検証はウォーターマーク以降のコミットのみを読み込む"""
+        repo, git = real_git_repo
+        git("commit", "-q", "--allow-empty", "-m", "fix: TASK-999 存在しないタスク")
+        GitIntegration().sync_progress_from_git(repo)
+        git("commit", "-q", "--allow-empty", "-m", "test: TASK-002 テスト追加")
+
+        integration = GitIntegration()
+        with patch('subprocess.Popen', wraps=subprocess.Popen) as popen:
+            integration.sync_progress_from_git(repo)
+            validation = integration.validate_task_references(repo)
+
+        logs = [call.args[0] for call in popen.call_args_list if call.args[0][1] == "log"]
+        # 差分の読み込みと、不正な参照のコミットの読み込みのみ
+        assert len(logs) == 2
+        assert logs[0][-1].endswith("..HEAD")
+        assert "--no-walk=unsorted" in logs[1]
+        assert validation['valid'] == ['TASK-001', 'TASK-002']
+        assert validation['invalid_commits'] == [
+            {"hash": validation['invalid_commits'][0]['hash'],
+             "message": "fix: TASK-999 存在しないタスク", "task_id": "TASK-999"}
+        ]
+
+    def test_since_filters_by_commit_time(self, real_git_repo):
+        """--since 指定は記録したコミット日時で絞り込む"""
+        repo, _ = real_git_repo
+        integration = GitIntegration()
+
+        result = integration.sync_progress_from_git(repo, since="2099-01-01")
+
+        assert result['completed_tasks'] == []
+        assert result['commits_analyzed'] == 1
+
+    def test_log_error_raises_runtime_error(self, temp_git_repo):
+        """git log の失敗は RuntimeError"""
+        with patch('subprocess.Popen') as popen:
+            mock_git_log(popen, "", returncode=128, stderr="fatal: bad revision")
+            with pytest.raises(RuntimeError, match="bad revision"):
+                GitIntegration()._get_commit_log(temp_git_repo, None, "nope")
+
+
+@pytest.mark.skipif(shutil.which("git") is None, reason="gitが必要")
+class TestFileProgress:
+    """変更ファイルによる進捗検出のテスト"""
+
+    @pytest.fixture
+    def file_repo(self, real_git_repo):
+        repo, git = real_git_repo
+        tasks_path = repo / "shared" / "coordination" / "tasks.json"
+        data = json.loads(tasks_path.read_text(encoding='utf-8'))
+        data["tasks"][0]["target_files"] = ["backend/models.py", "backend/schemas.py"]
+        data["tasks"][1]["target_files"] = ["backend/api.py::create_user"]
+        tasks_path.write_text(json.dumps(data, ensure_ascii=False), encoding='utf-8')
+
+        (repo / "backend").mkdir()
+        (repo / "backend" / "models.py").write_text("x = 1\n")
+        (repo / "backend" / "api.py").write_text("y = 1\n")
+        git("add", "backend")
+        git("commit", "-q", "-m", "wip: モデルとAPI")
+        return repo, git
+
+    def test_detect_file_progress(self, file_repo):
+        """target_filesと変更ファイルを照合"""
+        repo, _ = file_repo
+
+        progress = GitIntegration().detect_file_progress(repo)
+
+        assert progress["tasks"]["TASK-001"] == {"touched": ["backend/models.py"], "total": 2}
+        assert progress["tasks"]["TASK-002"] == {"touched": ["backend/api.py"], "total": 1}
+
+    def test_sync_with_match_files(self, file_repo):
+        """match_files は照合結果の報告のみ、mark_files で完了・作業中をマーク"""
+        repo, git = file_repo
+        from cmw.coordinator import Coordinator
+
+        result = GitIntegration().sync_progress_from_git(repo, match_files=True)
+
+        assert result["file_completed_tasks"] == ["TASK-002"]
+        assert result["completed_tasks"] == ["TASK-001"]
+        assert Coordinator(repo).tasks["TASK-002"].status == TaskStatus.PENDING
+
+        result = GitIntegration().sync_progress_from_git(repo, mark_files=True)
+
+        assert result["partial_tasks"] == []
+        # TASK-001 はコミットメッセージで、TASK-002 は変更ファイルで完了
+        assert result["completed_tasks"] == ["TASK-001", "TASK-002"]
+        coordinator = Coordinator(repo)
+        assert coordinator.tasks["TASK-002"].status == TaskStatus.COMPLETED
+        assert coordinator.tasks["TASK-002"].artifacts == ["backend/api.py"]
+
+    def test_deletions_are_not_progress(self, file_repo):
+        """ファイルの削除は変更として扱わない"""
+        repo, git = file_repo
+        integration = GitIntegration()
+        integration.sync_progress_from_git(repo, mark_files=True)
+
+        tasks_path = repo / "shared" / "coordination" / "tasks.json"
+        data = json.loads(tasks_path.read_text(encoding='utf-8'))
+        data["tasks"].append(dict(data["tasks"][1], id="TASK-003", target_files=["old.py"]))
+        tasks_path.write_text(json.dumps(data, ensure_ascii=False), encoding='utf-8')
+        (repo / "old.py").write_text("a = 1\n")
+        git("add", "old.py")
+        git("commit", "-q", "-m", "chore: 追加")
+        integration.sync_progress_from_git(repo, since="2099-01-01", mark_files=True)
+        git("rm", "-q", "old.py")
+        git("commit", "-q", "-m", "chore: 削除")
+
+        progress = integration.detect_file_progress(repo)
+
+        assert "TASK-003" not in progress["tasks"]
+
+    def test_scan_is_limited_to_window(self, file_repo):
+        """mark_files で反映したコミット以降、または since の期間のみを照合"""
+        repo, git = file_repo
+        integration = GitIntegration()
+
+        integration.sync_progress_from_git(repo, mark_files=True)
+        assert integration.detect_file_progress(repo) == {
+            "commits_analyzed": 0,
+            "head": integration._rev_parse(repo, "HEAD"),
+            "tasks": {},
+        }
+        assert integration.detect_file_progress(repo, since="2099-01-01")["tasks"] == {}
+
+    def test_partial_progress_recorded(self, file_repo):
+        """一部のファイルのみ変更されたタスクは作業中"""
+        repo, git = file_repo
+        from cmw.coordinator import Coordinator
+
+        tasks_path = repo / "shared" / "coordination" / "tasks.json"
+        data = json.loads(tasks_path.read_text(encoding='utf-8'))
+        data["tasks"][1]["target_files"] = ["backend/api.py", "backend/auth/"]
+        tasks_path.write_text(json.dumps(data, ensure_ascii=False), encoding='utf-8')
+
+        result = GitIntegration().sync_progress_from_git(repo, mark_files=True)
+
+        assert result["partial_tasks"] == ["TASK-002"]
+        coordinator = Coordinator(repo)
+        assert coordinator.tasks["TASK-002"].status == TaskStatus.IN_PROGRESS
+        assert coordinator.tasks["TASK-002"].artifacts == ["backend/api.py"]
+
+        # ディレクトリ指定は配下の変更で一致
+        (repo / "backend" / "auth").mkdir()
+        (repo / "backend" / "auth" / "jwt.py").write_text("z = 1\n")
+        git("add", "backend")
+        git("commit", "-q", "-m", "feat: JWT")
+
+        # 前回の反映以降の変更と記録済みの成果物を合わせて完了を判定
+        result = GitIntegration().sync_progress_from_git(repo, mark_files=True)
+        assert result["commits_analyzed"] == 1
+        assert "TASK-002" in result["completed_tasks"]
+        assert Coordinator(repo).tasks["TASK-002"].status == TaskStatus.COMPLETED
+
+
 class TestTaskPatternMatching:
     """タスクIDパターンマッチングのテスト"""
 
@@ -300,7 +617,7 @@ class TestTaskPatternMatching:
             ("TASK-100", ["TASK-100"]),
             ("task-001", []),  # 小文字
             ("TASK-1", []),    # 2桁
-            ("TASK-1234", ["TASK-123"]), # 4桁は最初の3桁にマッチ
+            ("TASK-1234", ["TASK-1234"]), # 4桁以上もIDとしてマッチ
             ("TICKET-001", []),
         ]
 
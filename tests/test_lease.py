@@ -0,0 +1,242 @@
+"""
+LeaseManager とリースによるタスクの確保のユニットテスト
+"""
+import json
+import time
+
+import pytest
+from cmw.coordinator import Coordinator
+from cmw.lease import LeaseError, LeaseManager
+from cmw.models import TaskStatus
+from cmw.task_loop import TaskLoop
+from cmw.task_provider import TaskProvider
+from cmw.worker_pool import WorkerPool
+
+
+@pytest.fixture(autouse=True)
+def tasks(project, make_task, write_tasks):
+    """TASK-001 / TASK-002 を書き込む"""
+    write_tasks(project, [make_task("TASK-001"), make_task("TASK-002")])
+
+
+def expire(manager, task_id):
+    """リースの期限を過去にする"""
+    data = json.loads(manager.leases_file.read_text(encoding="utf-8"))
+    data["leases"][task_id]["expires_at"] = time.time() - 1
+    manager.leases_file.write_text(json.dumps(data), encoding="utf-8")
+
+
+class TestLeaseManager:
+    """リースの取得・延長・回収"""
+
+    def test_acquire_is_exclusive(self, project):
+        manager = LeaseManager(project)
+
+        lease = manager.acquire("TASK-001", "session-a")
+        assert lease is not None
+        assert manager.acquire("TASK-001", "session-b") is None
+
+        # 同じ所有者は期限を延長して同じリースを受け取る
+        again = manager.acquire("TASK-001", "session-a")
+        assert again.token == lease.token
+        assert manager.get("TASK-001").owner == "session-a"
+        assert list(manager.active()) == ["TASK-001"]
+
+    def test_renew_extends_expiry(self, project):
+        manager = LeaseManager(project, ttl=10)
+        lease = manager.acquire("TASK-001", "session-a")
+
+        renewed = manager.renew(lease.token, ttl=100)
+
+        assert renewed.expires_at > lease.expires_at + 50
+        with pytest.raises(LeaseError):
+            manager.renew("unknown")
+
+    def test_expired_lease_can_be_taken_over(self, project):
+        manager = LeaseManager(project)
+        old = manager.acquire("TASK-001", "session-a")
+        expire(manager, "TASK-001")
+
+        assert manager.get("TASK-001") is None
+        new = manager.acquire("TASK-001", "session-b")
+
+        assert new is not None and new.token != old.token
+        # 奪われたリースは延長・完了できない
+        with pytest.raises(LeaseError):
+            manager.renew(old.token)
+        with pytest.raises(LeaseError):
+            manager.finish(old.token, "completed")
+
+    def test_reclaim_expired(self, project):
+        manager = LeaseManager(project)
+        manager.acquire("TASK-001", "session-a")
+        manager.acquire("TASK-002", "session-a")
+        expire(manager, "TASK-001")
+
+        reclaimed = manager.reclaim_expired()
+
+        assert [lease.task_id for lease in reclaimed] == ["TASK-001"]
+        assert list(manager.active()) == ["TASK-002"]
+        assert manager.reclaim_expired() == []
+
+    def test_finish_is_idempotent(self, project):
+        manager = LeaseManager(project)
+        lease = manager.acquire("TASK-001", "session-a")
+
+        assert manager.finish(lease.token, "completed")
+        assert not manager.finish(lease.token, "completed")
+        assert manager.get("TASK-001") is None
+
+    def test_check_does_not_consume_token(self, project):
+        manager = LeaseManager(project)
+        lease = manager.acquire("TASK-001", "session-a")
+
+        assert manager.check(lease.token, "TASK-001")
+        assert manager.check(lease.token, "TASK-001")
+        with pytest.raises(LeaseError):
+            manager.check(lease.token, "TASK-002")
+        with pytest.raises(LeaseError):
+            manager.check("unknown")
+
+        assert manager.finish(lease.token, "completed")
+        assert not manager.check(lease.token, "TASK-001")
+
+    def test_invalid_ttl(self, project):
+        with pytest.raises(ValueError):
+            LeaseManager(project, ttl=0)
+
+
+class TestTaskProviderLeases:
+    """TaskProvider のリース"""
+
+    def test_other_session_cannot_start_leased_task(self, project):
+        provider_a = TaskProvider(project, owner="session-a")
+        provider_b = TaskProvider(project, owner="session-b")
+
+        provider_a.mark_started("TASK-001")
+
+        with pytest.raises(LeaseError):
+            provider_b.mark_started("TASK-001")
+        # 他のセッションがリースを持つタスクは返さない
+        assert provider_b.get_next_task().id == "TASK-002"
+
+    def test_crashed_session_task_is_reclaimed(self, project):
+        crashed = TaskProvider(project, owner="crashed")
+        crashed.mark_started("TASK-001")
+        expire(crashed.leases, "TASK-001")
+
+        provider = TaskProvider(project, owner="session-b")
+        provider.coordinator.tasks["TASK-001"].status = TaskStatus.IN_PROGRESS
+        leases = provider.leases.leases_file.read_text(encoding="utf-8")
+
+        # 問い合わせでは回収しない
+        assert provider.get_next_task().id == "TASK-002"
+        assert provider.leases.leases_file.read_text(encoding="utf-8") == leases
+
+        assert provider.reclaim_expired() == ["TASK-001"]
+        assert provider.coordinator.tasks["TASK-001"].status == TaskStatus.PENDING
+        assert provider.get_next_task().id == "TASK-001"
+        assert provider.mark_started("TASK-001").owner == "session-b"
+
+    def test_complete_with_token_is_idempotent(self, project):
+        provider = TaskProvider(project, owner="session-a")
+        lease = provider.mark_started("TASK-001")
+        provider.heartbeat(lease.token)
+
+        assert provider.mark_completed("TASK-001", ["file1.py"], token=lease.token)
+        # 再送（タイムアウト後の再試行など）は何もしない
+        provider.coordinator.tasks["TASK-001"].artifacts = ["changed.py"]
+        assert not provider.mark_completed("TASK-001", ["file1.py"], token=lease.token)
+        assert not provider.mark_failed("TASK-001", "エラー", token=lease.token)
+
+        task = provider.coordinator.tasks["TASK-001"]
+        assert task.status == TaskStatus.COMPLETED
+        assert task.artifacts == ["changed.py"]
+
+    def test_stale_token_is_rejected(self, project):
+        provider_a = TaskProvider(project, owner="session-a")
+        lease = provider_a.mark_started("TASK-001")
+        expire(provider_a.leases, "TASK-001")
+        TaskProvider(project, owner="session-b").mark_started("TASK-001")
+
+        with pytest.raises(LeaseError):
+            provider_a.mark_completed("TASK-001", [], token=lease.token)
+
+    def test_token_is_kept_when_save_fails(self, project, monkeypatch):
+        def fail():
+            raise OSError("full")
+
+        provider = TaskProvider(project, owner="session-a")
+        lease = provider.mark_started("TASK-001")
+
+        with monkeypatch.context() as m:
+            m.setattr(provider, "_save_progress", fail)
+            with pytest.raises(OSError):
+                provider.mark_completed("TASK-001", [], token=lease.token)
+
+        # 保存に失敗した記録はトークンを消費しないため再試行できる
+        assert provider.leases.check(lease.token, "TASK-001")
+        assert provider.mark_completed("TASK-001", [], token=lease.token)
+        assert not provider.leases.check(lease.token, "TASK-001")
+
+    def test_batch_finishes_leases_after_save(self, project):
+        provider = TaskProvider(project, owner="session-a")
+        lease = provider.mark_started("TASK-001")
+
+        with pytest.raises(RuntimeError), provider.batch():
+            provider.mark_completed("TASK-001", [], token=lease.token)
+            raise RuntimeError("中断")
+        assert provider.leases.check(lease.token, "TASK-001")
+
+        with provider.batch():
+            assert provider.mark_completed("TASK-001", [], token=lease.token)
+            assert not provider.mark_completed("TASK-001", [], token=lease.token)
+            # 保存するまではトークンを消費しない
+            assert provider.leases.check(lease.token, "TASK-001")
+        assert not provider.leases.check(lease.token, "TASK-001")
+        assert TaskProvider(project).coordinator.tasks["TASK-001"].status == TaskStatus.COMPLETED
+
+    def test_complete_without_token_releases_own_lease(self, project):
+        provider = TaskProvider(project, owner="session-a")
+        provider.mark_started("TASK-001")
+
+        assert provider.mark_completed("TASK-001", [])
+        assert provider.leases.get("TASK-001") is None
+
+
+class TestWorkerPoolLeases:
+    """WorkerPool のリース"""
+
+    def test_reclaims_tasks_of_crashed_run(self, project):
+        coordinator = Coordinator(project)
+        coordinator.update_task_status("TASK-001", TaskStatus.IN_PROGRESS)
+        manager = LeaseManager(project)
+        manager.acquire("TASK-001", "crashed")
+        expire(manager, "TASK-001")
+
+        results = WorkerPool(project).run()
+
+        assert sorted(r.task_id for r in results) == ["TASK-001", "TASK-002"]
+        assert manager.active() == {}
+
+    def test_skips_task_leased_by_other_session(self, project):
+        LeaseManager(project).acquire("TASK-001", "other-session")
+
+        results = WorkerPool(project).run()
+
+        assert [r.task_id for r in results] == ["TASK-002"]
+        assert Coordinator(project).tasks["TASK-001"].status == TaskStatus.IN_PROGRESS
+
+    def test_token_is_kept_when_record_fails(self, project, monkeypatch):
+        async def fail(self, task_id, artifacts):
+            raise OSError("full")
+
+        monkeypatch.setattr(TaskLoop, "complete", fail)
+
+        with pytest.raises(OSError):
+            WorkerPool(project, workers=1).run(max_tasks=1)
+
+        # 記録に失敗したリースは消費せず、期限切れで回収される
+        data = json.loads(LeaseManager(project).leases_file.read_text(encoding="utf-8"))
+        assert list(data["leases"]) == ["TASK-001"]
+        assert data["finished"] == {}
@@ -195,3 +195,16 @@ def test_get_task_files_includes_dependencies(test_project):
     # TASK-004のtarget_filesとTASK-001の成果物が含まれる
     assert "file4.py" in files
     assert "file1.py" in files  # 依存タスクの成果物
+
+
+def test_symbol_targets_share_file(test_project):
+    """同じファイルのシンボルを担当するタスクは競合する"""
+    executor = ParallelExecutor(test_project)
+
+    task1 = executor.provider.coordinator.get_task("TASK-001")
+    task2 = executor.provider.coordinator.get_task("TASK-002")
+    task1.target_files = ["models.py::User"]
+    task2.target_files = ["models.py::Post"]
+
+    assert executor._get_task_files(task1) == {"models.py"}
+    assert not executor.can_run_parallel(task1, task2)
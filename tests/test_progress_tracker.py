@@ -7,7 +7,7 @@ from datetime import datetime, timedelta
 import tempfile
 import shutil
 
-from src.cmw.progress_tracker import ProgressTracker
+from src.cmw.progress_tracker import ProgressAggregate, ProgressTracker
 from src.cmw.models import Task, TaskStatus
 
 
@@ -276,3 +276,78 @@ class TestProgressTracker:
         """メトリクスファイルが存在しない場合"""
         metrics = tracker.load_metrics()
         assert metrics is None
+
+    def test_aggregate_matches_individual_metrics(self, tracker, sample_tasks):
+        """1回の集計から各メトリクスを導出"""
+        aggregate = tracker.aggregate(sample_tasks)
+
+        assert len(aggregate) == 5
+        assert aggregate.summary() == tracker.get_progress_summary(sample_tasks)
+        assert aggregate.velocity() == tracker.get_velocity_metrics(sample_tasks)
+        assert aggregate.priority_breakdown() == tracker.get_priority_breakdown(sample_tasks)
+        assert aggregate.worker_breakdown() == tracker.get_worker_breakdown(sample_tasks)
+
+    def test_aggregate_applies_task_deltas(self, sample_tasks):
+        """タスク単位の差分更新で再集計と同じ結果になる"""
+        aggregate = ProgressAggregate.from_tasks(sample_tasks)
+
+        sample_tasks[3].status = TaskStatus.COMPLETED
+        sample_tasks[3].started_at = datetime.now() - timedelta(minutes=10)
+        sample_tasks[3].completed_at = datetime.now()
+        sample_tasks[4].assigned_to = "frontend"
+        aggregate.update(sample_tasks[3])
+        aggregate.update(sample_tasks[4])
+        aggregate.remove("TASK-003")
+
+        expected = ProgressAggregate.from_tasks([t for t in sample_tasks if t.id != "TASK-003"])
+        assert aggregate.summary() == expected.summary()
+        assert aggregate.priority_breakdown() == expected.priority_breakdown()
+        assert aggregate.worker_breakdown() == expected.worker_breakdown()
+        assert "testing" not in aggregate.worker_breakdown()
+        assert aggregate.velocity() == pytest.approx(expected.velocity())
+
+    def test_save_metrics_appends_history(self, tracker, sample_tasks):
+        """メトリクス保存時にスナップショットを追記（変化がなければ追記しない）"""
+        assert tracker.save_metrics(sample_tasks) is True
+        assert tracker.save_metrics(sample_tasks) is False
+
+        sample_tasks[2].status = TaskStatus.FAILED
+        assert tracker.save_metrics(sample_tasks) is True
+
+        history = list(tracker.iter_history())
+        assert len(history) == 2
+        assert history[0]["in_progress"] == 1
+        assert history[1]["failed"] == 1
+        assert isinstance(history[1]["timestamp"], datetime)
+
+    def test_history_skips_broken_lines(self, tracker, sample_tasks):
+        """書き込み途中の行は読み飛ばす"""
+        tracker.save_metrics(sample_tasks)
+        with open(tracker.history_file, "a", encoding="utf-8") as f:
+            f.write('{"timestamp": "2025-')
+
+        assert len(list(tracker.iter_history())) == 1
+
+    def test_burndown_and_velocity_trend(self, tracker, sample_tasks):
+        """時系列からバーンダウンと完了ペースを取得"""
+        start = datetime.now() - timedelta(hours=2)
+        aggregate = ProgressAggregate.from_tasks(sample_tasks)
+        tracker.append_snapshot(aggregate, start)
+
+        for i, task in enumerate(sample_tasks[2:4]):
+            task.status = TaskStatus.COMPLETED
+            aggregate.update(task)
+            tracker.append_snapshot(aggregate, start + timedelta(hours=i + 1))
+
+        burndown = tracker.get_burndown()
+        assert [point["remaining"] for point in burndown] == [3, 2, 1]
+
+        trend = tracker.get_velocity_trend(timedelta(hours=3))
+        assert trend["completed"] == 2
+        assert trend["hours"] == pytest.approx(2.0)
+        assert trend["tasks_per_hour"] == pytest.approx(1.0)
+
+    def test_velocity_trend_no_history(self, tracker):
+        """時系列がない場合"""
+        assert tracker.get_velocity_trend()["tasks_per_hour"] == 0.0
+        assert tracker.get_burndown() == []
@@ -0,0 +1,112 @@
+"""
+PromptLayout のユニットテスト
+"""
+import pytest
+from cmw.models import Task
+from cmw.prompt_layout import PromptLayout, TemplateError, compile_sections
+from cmw.prompt_template import PromptTemplate
+
+LAYOUT = """{# コメントは出力しない #}
+{% section header %}
+# {{ task.id }}
+{% if not task.files %}
+ファイルなし
+{% elif task.many %}
+多数のファイル
+{% else %}
+{% for f in task.files %}
+{{ loop.index }}. {{ f }}{% if not loop.last %},{% endif %}
+{% endfor %}
+{% endif %}
+{% endsection %}
+
+{% section footer %}
+{% if show %}
+以上
+{% endif %}
+{% endsection %}
+"""
+
+
+def render(text, section, context):
+    out = []
+    compile_sections(text)[section](context, out)
+    return "".join(out)
+
+
+class TestCompile:
+    """テンプレートの構文"""
+
+    def test_sections_conditions_and_loops(self):
+        context = {"task": {"id": "TASK-001", "files": ["a.py", "b.py"]}}
+
+        assert list(compile_sections(LAYOUT)) == ["header", "footer"]
+        assert render(LAYOUT, "header", context) == "# TASK-001\n1. a.py,\n2. b.py\n"
+
+        context["task"]["many"] = True
+        assert render(LAYOUT, "header", context) == "# TASK-001\n多数のファイル\n"
+        assert render(LAYOUT, "header", {"task": {"id": "X"}}) == "# X\nファイルなし\n"
+
+    def test_syntax_errors(self):
+        with pytest.raises(TemplateError, match="endsection"):
+            compile_sections("{% section a %}\n{{ x }}\n")
+        with pytest.raises(TemplateError, match="不明なタグ"):
+            compile_sections("{% section a %}{% include x %}{% endsection %}")
+        with pytest.raises(TemplateError, match="不正な名前"):
+            compile_sections("{% section a %}{{ x + 1 }}{% endsection %}")
+        with pytest.raises(TemplateError, match="セクションの外"):
+            compile_sections("{% if x %}{% endif %}")
+
+
+class TestRender:
+    """レイアウトの描画"""
+
+    def test_render_skips_empty_and_missing_sections(self, tmp_path):
+        path = tmp_path / "layout.md"
+        layout = PromptLayout("layout", path, LAYOUT)
+
+        assert layout.render({"footer": {"show": True}, "header": {"task": {"id": "A"}}}) == (
+            "# A\nファイルなし\n\n以上"
+        )
+        assert layout.render({"header": {"task": {"id": "A"}}, "footer": {}}) == "# A\nファイルなし"
+        assert layout.render_section("unknown", {}) == ""
+
+    def test_fragment_cache(self, tmp_path):
+        layout = PromptLayout("layout", tmp_path / "layout.md", LAYOUT)
+        context = {"task": {"id": "A", "files": ["a.py"]}}
+
+        first = layout.render_section("header", context)
+        assert layout.render_section("header", {"task": {"files": ["a.py"], "id": "A"}}) == first
+        assert (layout.hits, layout.misses) == (1, 1)
+
+        layout.render_section("header", {"task": {"id": "B", "files": ["a.py"]}})
+        assert layout.misses == 2
+
+
+class TestLoad:
+    """テンプレートの読み込み"""
+
+    def test_builtin_layout_is_reused(self, tmp_path):
+        layout = PromptLayout.load("task_prompt", tmp_path)
+
+        assert PromptLayout.load("task_prompt", tmp_path) is layout
+        assert layout.sections[0] == "overview"
+
+    def test_project_override(self, tmp_path):
+        custom = tmp_path / "shared" / "prompts" / "task_prompt.md"
+        custom.parent.mkdir(parents=True)
+        custom.write_text(
+            "{% section overview %}\n## {{ task.id }}: {{ task.title }}\n{% endsection %}\n",
+            encoding="utf-8",
+        )
+        task = Task(id="TASK-001", title="認証", assigned_to="backend", description="説明")
+
+        prompt = PromptTemplate(project_root=tmp_path).generate_task_prompt(task)
+
+        # 差し替えたレイアウトにないセクションは出力しない
+        assert prompt == "## TASK-001: 認証"
+
+        custom.write_text(
+            "{% section overview %}\n[{{ task.id }}]\n{% endsection %}\n", encoding="utf-8"
+        )
+        assert PromptTemplate(project_root=tmp_path).generate_task_prompt(task) == "[TASK-001]"
@@ -210,6 +210,22 @@ class TestRequirementsParser:
             # 各タスクは自分自身に依存しない
             assert task.id not in task.dependencies
 
+    def test_parse_reduce_dependencies(self, parser, temp_requirements_file):
+        """reduce_dependencies=Trueで到達可能性を保ったまま依存関係を削減"""
+        import networkx as nx
+
+        full = RequirementsParser().parse(temp_requirements_file)
+        reduced = parser.parse(temp_requirements_file, reduce_dependencies=True)
+
+        def closure(tasks):
+            G = nx.DiGraph()
+            G.add_edges_from((t.id, d) for t in tasks for d in t.dependencies)
+            return set(nx.transitive_closure(G).edges())
+
+        assert [t.id for t in full] == [t.id for t in reduced]
+        assert sum(len(t.dependencies) for t in reduced) <= sum(len(t.dependencies) for t in full)
+        assert closure(full) == closure(reduced)
+
     def test_parse_file_not_found(self, parser):
         """存在しないファイルのエラー"""
         with pytest.raises(FileNotFoundError):
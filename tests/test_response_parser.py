@@ -1,7 +1,9 @@
 """
 ResponseParser のユニットテスト
 """
-from cmw.response_parser import ResponseParser
+import pytest
+import io
+from cmw.response_parser import ResponseParser, ResponseEvent, follow_file, read_chunks
 
 
 class TestResponseParserBasics:
@@ -11,7 +13,7 @@ class TestResponseParserBasics:
         """初期化のテスト"""
         parser = ResponseParser()
         assert parser is not None
-        assert len(parser.file_regex) > 0
+        assert parser.scan_regex is not None
         assert parser.task_id_regex is not None
 
 
@@ -325,6 +327,267 @@ class TestDetectErrors:
         assert len(errors) == 0
 
 
+class TestSinglePassScan:
+    """1回の走査による抽出のテスト"""
+
+    def test_scan_extracts_everything_at_once(self):
+        """成果物・タスクID・完了・エラーを1回の走査で抽出"""
+        parser = ResponseParser()
+        text = (
+            "Created `src/api.py` for TASK-002.\n"
+            "`docs/TASK-001.md` を編集しました。\n"
+            "Error: `tests/test_api.py` failed"
+        )
+
+        scan = parser._scan(text)
+
+        assert scan["artifacts"] == ("docs/TASK-001.md", "src/api.py", "tests/test_api.py")
+        assert scan["task_ids"] == ("TASK-001", "TASK-002")
+        assert scan["is_completed"] is True
+        assert scan["errors"] == (("error", "`tests/test_api.py` failed"),)
+
+    def test_scan_paths_on_same_line(self):
+        """同じ行の複数ファイルをすべて検出"""
+        parser = ResponseParser()
+        text = "`a.py` に関数を追加し、`my notes.md` を更新しました"
+
+        assert parser._extract_artifacts(text) == ["a.py", "my notes.md"]
+
+    def test_scan_errors_grouped_by_marker(self):
+        """エラーはマーカー順、同一マーカーは行末までを1件として扱う"""
+        parser = ResponseParser()
+        text = "失敗: build\nError: first Error: second\nException: boom"
+
+        errors = parser.detect_errors(text)
+
+        assert errors == [
+            {"type": "error", "message": "first Error: second"},
+            {"type": "exception", "message": "boom"},
+            {"type": "failure", "message": "build"},
+        ]
+
+    def test_scan_is_cached(self, monkeypatch):
+        """同じ応答は再走査しない"""
+        parser = ResponseParser()
+        text = "TASK-001 を完了しました。`main.py` を作成"
+        parser.parse_response(text)
+
+        def fail(*args, **kwargs):
+            raise AssertionError("rescanned")
+
+        monkeypatch.setattr(parser, "scan_regex", type("R", (), {"finditer": fail})())
+
+        assert parser.suggest_completion(text, "TASK-001") is not None
+        assert parser.detect_errors(text) == []
+
+    def test_scan_cache_is_bounded(self):
+        """キャッシュは上限件数で古いものから破棄"""
+        parser = ResponseParser()
+        for i in range(parser.SCAN_CACHE_SIZE + 5):
+            parser.parse_response(f"TASK-{i:03d} done")
+
+        assert len(parser._scan_cache) == parser.SCAN_CACHE_SIZE
+
+    def test_scan_results_are_not_shared(self):
+        """返されたリストを変更してもキャッシュに影響しない"""
+        parser = ResponseParser()
+        text = "`main.py` を作成しました"
+
+        parser.parse_response(text)["artifacts"].append("other.py")
+
+        assert parser.parse_response(text)["artifacts"] == ["main.py"]
+
+
+class TestStreamingEvents:
+    """逐次解析のテスト"""
+
+    RESPONSE = (
+        "TASK-001 に着手します。\n"
+        "Created `backend/models.py`\n"
+        "`docs/設計 メモ.md` に概要を追加\n"
+        "Error: migration failed\n"
+        "TASK-001 を完了しました。\n"
+    )
+
+    @staticmethod
+    def summarize(events):
+        events = list(events)
+        return (
+            sorted(e.value for e in events if e.kind == "artifact"),
+            sorted(e.value for e in events if e.kind == "task_id"),
+            any(e.kind == "completion" for e in events),
+            [(e.error_type, e.value) for e in events if e.kind == "error"],
+        )
+
+    def test_events_in_order(self):
+        """イベントを出現順に1回ずつ返す"""
+        parser = ResponseParser()
+
+        events = list(parser.iter_events([self.RESPONSE]))
+
+        # "Created" も完了キーワードのため、完了は最初の言及時に1回だけ
+        kinds = [e.kind for e in events]
+        assert kinds == ["task_id", "completion", "artifact", "artifact", "error"]
+        artifact = ResponseEvent("artifact", "backend/models.py", self.RESPONSE.index("`backend"))
+        assert events[2] == artifact
+        assert events[4].error_type == "error"
+
+    def test_every_split_point_matches_batch(self):
+        """どこでチャンクが分割されてもバッチ解析と同じ結果"""
+        parser = ResponseParser()
+        expected = parser.parse_response(self.RESPONSE)
+
+        for cut in range(len(self.RESPONSE) + 1):
+            chunks = [self.RESPONSE[:cut], self.RESPONSE[cut:]]
+            artifacts, task_ids, completed, errors = self.summarize(parser.iter_events(chunks))
+            assert artifacts == expected["artifacts"], cut
+            assert task_ids == expected["task_ids"], cut
+            assert completed is expected["is_completed"], cut
+            assert errors == [("error", "migration failed")], cut
+
+    def test_character_by_character(self):
+        """1文字ずつ届いても検出できる"""
+        parser = ResponseParser()
+
+        result = self.summarize(parser.iter_events(iter(self.RESPONSE)))
+
+        assert result[0] == ["backend/models.py", "docs/設計 メモ.md"]
+
+    def test_context_waits_for_line_end(self):
+        """日本語の文脈が後のチャンクで届くまで判定を待つ"""
+        parser = ResponseParser()
+        chunks = ["`my notes.md` に", "設計を追加\n"]
+
+        events = list(parser.iter_events(chunks))
+
+        assert [e.value for e in events if e.kind == "artifact"] == ["my notes.md"]
+
+    def test_unclosed_backtick_beyond_overlap(self):
+        """overlap を超えて閉じないバッククォートは待たない"""
+        parser = ResponseParser()
+        chunks = ["`" + "x" * 50, "y" * 50, "完了しました"]
+
+        events = list(parser.iter_events(chunks, overlap=16))
+
+        assert [e.kind for e in events] == ["completion"]
+
+    def test_read_chunks_splits_multibyte(self):
+        """マルチバイト文字の途中で分割されてもデコードできる"""
+        data = "完了しました".encode("utf-8")
+
+        chunks = list(read_chunks(io.BytesIO(data), chunk_size=4))
+
+        assert "".join(chunks) == "完了しました"
+
+    def test_follow_file_reads_until_idle(self, tmp_path):
+        """追記がなくなるまでファイルを読み続ける"""
+        log = tmp_path / "session.log"
+        log.write_text("TASK-001 ", encoding="utf-8")
+        chunks = follow_file(log, poll_interval=0.01, idle_timeout=0.2)
+
+        first = next(chunks)
+        with open(log, "a", encoding="utf-8") as f:
+            f.write("done\n")
+        rest = "".join(chunks)
+
+        assert first + rest == "TASK-001 done\n"
+
+
+class TestJsonlTranscript:
+    """JSON Lines 形式のトランスクリプト解析のテスト"""
+
+    @staticmethod
+    def transcript(root):
+        import json
+
+        records = [
+            {"type": "system", "subtype": "init"},
+            {"type": "assistant", "message": {"content": [
+                {"type": "text", "text": "TASK-001 に着手します。`README.md` を参照します。"},
+                {"type": "tool_use", "id": "t1", "name": "Write",
+                 "input": {"file_path": str(root / "backend" / "models.py"),
+                           "content": "`fake.py` を作成"}},
+                {"type": "tool_use", "id": "t2", "name": "Edit",
+                 "input": {"file_path": "backend/api.py", "old_string": "a", "new_string": "b"}},
+                {"type": "tool_use", "id": "t3", "name": "Read",
+                 "input": {"file_path": "backend/db.py"}},
+            ]}},
+            {"type": "user", "message": {"content": [
+                {"type": "tool_result", "tool_use_id": "t1", "content": "ok"},
+                {"type": "tool_result", "tool_use_id": "t2", "is_error": True,
+                 "content": [{"type": "text", "text": "String not found\ndetails"}]},
+            ]}},
+            {"type": "result", "subtype": "success", "result": "TASK-001 を完了しました。",
+             "is_error": False},
+        ]
+        return "\n".join(json.dumps(r, ensure_ascii=False) for r in records) + "\n"
+
+    def test_artifacts_from_tool_calls(self, tmp_path):
+        """成果物は成功したツール呼び出しのみ（本文の言及やツール入力の内容は対象外）"""
+        parser = ResponseParser()
+
+        events = list(parser.iter_jsonl_events([self.transcript(tmp_path)], root=tmp_path))
+
+        assert [e.value for e in events if e.kind == "artifact"] == ["backend/models.py"]
+        assert [e.value for e in events if e.kind == "task_id"] == ["TASK-001"]
+        assert any(e.kind == "completion" for e in events)
+        assert [(e.error_type, e.value) for e in events if e.kind == "error"] == [
+            ("tool_error", "String not found")
+        ]
+
+    def test_chunked_lines(self, tmp_path):
+        """行の途中で分割されても同じ結果"""
+        parser = ResponseParser()
+        text = self.transcript(tmp_path)
+        expected = list(parser.iter_jsonl_events([text], root=tmp_path))
+
+        for size in (1, 7, 64):
+            chunks = [text[i:i + size] for i in range(0, len(text), size)]
+            assert list(parser.iter_jsonl_events(chunks, root=tmp_path)) == expected
+
+    def test_write_without_result(self):
+        """結果が記録されていないツール呼び出しは終端で成果物とする"""
+        parser = ResponseParser()
+        line = (
+            '{"type": "assistant", "message": {"content": [{"type": "tool_use", "id": "x",'
+            ' "name": "Write", "input": {"file_path": "app.py"}}]}}'
+        )
+
+        events = list(parser.iter_jsonl_events([line]))
+
+        assert [(e.kind, e.value) for e in events] == [("artifact", "app.py")]
+
+    def test_non_json_lines_fall_back_to_regex(self):
+        """JSONでない行は通常のテキストとして走査"""
+        parser = ResponseParser()
+        text = '{"type": "system"}\n`main.py` を作成しました\n{broken\n'
+
+        events = list(parser.iter_jsonl_events([text]))
+
+        assert [(e.kind, e.value) for e in events] == [
+            ("artifact", "main.py"),
+            ("completion", "作成しました"),
+        ]
+
+    def test_auto_format_detection(self, tmp_path):
+        """先頭が "{" なら jsonl、それ以外は text として解析"""
+        parser = ResponseParser()
+
+        chunks = ["  ", self.transcript(tmp_path)]
+        jsonl = list(parser.iter_transcript_events(chunks, root=tmp_path))
+        text = list(parser.iter_transcript_events(["`main.py` を作成"]))
+
+        assert [e.value for e in jsonl if e.kind == "artifact"] == ["backend/models.py"]
+        assert [e.value for e in text if e.kind == "artifact"] == ["main.py"]
+
+    def test_unknown_format(self):
+        """不明な形式はエラー"""
+        parser = ResponseParser()
+
+        with pytest.raises(ValueError):
+            list(parser.iter_transcript_events([""], format="xml"))
+
+
 class TestIsAskingQuestion:
     """質問検出のテスト"""
 
@@ -424,3 +687,62 @@ class TestComplexScenarios:
         assert "config.py" in result['artifacts']
         assert "TASK-010" in result['task_ids']
         assert result['is_completed'] is True
+
+
+class TestAutoMarkCompleted:
+    """自動完了マークのテスト"""
+
+    @pytest.fixture
+    def project(self, tmp_path):
+        import json
+
+        coordination = tmp_path / "shared" / "coordination"
+        coordination.mkdir(parents=True)
+        tasks = {
+            "tasks": [
+                {"id": f"TASK-00{i}", "title": f"タスク{i}", "description": "",
+                 "assigned_to": "backend", "dependencies": [],
+                 "target_files": [f"backend/module{i}.py"], "acceptance_criteria": [],
+                 "priority": "medium"}
+                for i in range(1, 4)
+            ],
+            "workers": []
+        }
+        (coordination / "tasks.json").write_text(
+            json.dumps(tasks, ensure_ascii=False), encoding="utf-8"
+        )
+        return tmp_path
+
+    def test_auto_mark_completed_single(self, project):
+        """単一タスクはアーティファクトの言及だけでも完了"""
+        parser = ResponseParser()
+        response = "`backend/module1.py` を作成しました。実装しました。"
+
+        assert parser.auto_mark_completed(response, "TASK-001", project) is True
+
+    def test_auto_mark_completed_many(self, project, monkeypatch):
+        """言及された複数タスクを1回の保存でまとめて完了"""
+        from cmw.coordinator import Coordinator
+
+        saves = []
+        original_save = Coordinator._save_progress
+        monkeypatch.setattr(
+            Coordinator, "_save_progress", lambda self: saves.append(1) or original_save(self)
+        )
+
+        parser = ResponseParser()
+        response = (
+            "TASK-001 と TASK-002 を完了しました。\n"
+            "`backend/module1.py` と `backend/module2.py` を作成しました。"
+        )
+        marked = parser.auto_mark_completed_many(
+            response, ["TASK-001", "TASK-002", "TASK-003"], project
+        )
+
+        assert marked == ["TASK-001", "TASK-002"]
+        assert saves == [1]
+
+        coordinator = Coordinator(project)
+        assert coordinator.get_task("TASK-001").artifacts == ["backend/module1.py"]
+        assert coordinator.get_task("TASK-002").artifacts == ["backend/module2.py"]
+        assert coordinator.get_task("TASK-003").status.value == "pending"
@@ -0,0 +1,180 @@
+"""
+WorkStealingScheduler のユニットテスト
+"""
+import asyncio
+
+import pytest
+from cmw.coordinator import Coordinator
+from cmw.models import Priority, TaskStatus, Worker
+from cmw.scheduler import WorkerContext, WorkStealingScheduler, can_steal
+from cmw.task_loop import TaskLoop
+from cmw.worker_pool import WorkerPool
+
+
+def make_worker(worker_id, skills=None):
+    return Worker(id=worker_id, name=worker_id, description="", skills=skills or [])
+
+
+@pytest.fixture
+def make_scheduler(write_tasks):
+    """タスクとワーカーを書き込んで WorkStealingScheduler を作成する関数"""
+
+    def factory(project, tasks, workers=(), steal=True):
+        write_tasks(project, tasks, workers)
+        return WorkStealingScheduler(TaskLoop(Coordinator(project)), steal=steal)
+
+    return factory
+
+
+class TestChoose:
+    """タスクの選択"""
+
+    def test_prefers_own_queue(self, project, make_scheduler, make_task):
+        scheduler = make_scheduler(
+            project,
+            [
+                make_task("TASK-001", priority=Priority.HIGH, assigned_to="backend"),
+                make_task("TASK-002", priority=Priority.LOW, assigned_to="documentation"),
+            ],
+        )
+        docs = scheduler.register(make_worker("documentation"))
+
+        task = asyncio.run(scheduler.next_task(docs))
+
+        assert task.id == "TASK-002"
+        assert scheduler.steals == {}
+
+    def test_idle_worker_steals_from_deepest_queue(self, project, make_scheduler, make_task):
+        scheduler = make_scheduler(
+            project,
+            [
+                make_task("TASK-001", assigned_to="backend"),
+                make_task("TASK-002", assigned_to="backend"),
+                make_task("TASK-003", assigned_to="backend"),
+                make_task("TASK-004", assigned_to="frontend"),
+            ],
+        )
+        docs = scheduler.register(make_worker("documentation"))
+
+        task = asyncio.run(scheduler.next_task(docs))
+
+        assert task.id == "TASK-001"
+        assert scheduler.steals == {"documentation": 1}
+
+    def test_skills_limit_stealing(self, project, make_scheduler, make_task):
+        workers = [
+            make_worker("backend", ["python"]),
+            make_worker("frontend", ["typescript"]),
+            make_worker("fullstack", ["python", "typescript"]),
+        ]
+        backend_task = make_task("TASK-001", assigned_to="backend")
+        frontend_task = make_task("TASK-002", assigned_to="frontend")
+        registered = {w.id: w for w in workers}
+
+        assert can_steal(registered["fullstack"], backend_task, registered)
+        assert not can_steal(registered["frontend"], backend_task, registered)
+        # 担当が登録されていないタスクは誰でも実行できる
+        testing_task = make_task("TASK-003", assigned_to="testing")
+        assert can_steal(registered["frontend"], testing_task, registered)
+
+        scheduler = make_scheduler(project, [backend_task, frontend_task], workers)
+        context = scheduler.register(registered["backend"])
+        candidates = scheduler.task_loop.candidates()
+        assert [t.id for t in candidates if scheduler.can_take(context, t)] == ["TASK-001"]
+
+    def test_no_steal(self, project, make_scheduler, make_task):
+        scheduler = make_scheduler(project, [make_task("TASK-001")], steal=False)
+        docs = scheduler.register(make_worker("documentation"))
+
+        # 他に担当できるワーカーがいなければ待たずに終了
+        assert asyncio.run(scheduler.next_task(docs)) is None
+
+    def test_prefers_recently_touched_files(self, project, make_scheduler, make_task):
+        scheduler = make_scheduler(
+            project,
+            [
+                make_task("TASK-001", ["a.py"], assigned_to="backend"),
+                make_task("TASK-002", ["b.py"], assigned_to="backend"),
+                make_task("TASK-003", ["c.py"], ["TASK-010"], assigned_to="backend"),
+                make_task("TASK-010", ["z.py"], priority=Priority.LOW, assigned_to="backend"),
+            ],
+        )
+        context = scheduler.register(make_worker("backend"))
+        context.touch(make_task("TASK-100", ["b.py"], assigned_to="backend"))
+
+        candidates = scheduler.task_loop.candidates()
+        assert scheduler.choose(context, candidates).id == "TASK-002"
+
+        # 自分が完了させた依存タスクを持つタスクも優先
+        context.touch(scheduler.task_loop.tasks["TASK-010"], ["c.py"])
+        assert context.locality(scheduler.task_loop.tasks["TASK-003"]) == 2
+        assert context.recent_files[0] == "c.py"
+
+    def test_history_is_bounded(self, make_task):
+        context = WorkerContext(make_worker("backend"), history=2)
+        for i in range(5):
+            context.touch(make_task(f"TASK-00{i}", [f"{i}.py"], assigned_to="backend"))
+
+        assert context.recent_files == ["4.py", "3.py"]
+
+
+class TestWaiting:
+    """担当のタスクが他のワーカーの完了で現れる場合"""
+
+    def test_waits_for_other_workers(self, project, make_scheduler, make_task):
+        scheduler = make_scheduler(
+            project,
+            [
+                make_task("TASK-001", assigned_to="backend"),
+                make_task("TASK-002", None, ["TASK-001"], assigned_to="documentation"),
+            ],
+            steal=False,
+        )
+        backend = scheduler.register(make_worker("backend"))
+        docs = scheduler.register(make_worker("documentation"))
+        order = []
+
+        async def run(context):
+            while True:
+                task = await scheduler.next_task(context)
+                if task is None:
+                    scheduler.retire(context)
+                    return
+                order.append((context.id, task.id))
+                await asyncio.sleep(0.01)
+                await scheduler.task_loop.complete(task.id)
+
+        async def main():
+            # 担当のタスクがまだない docs のワーカーを先に起動
+            await asyncio.gather(run(docs), run(backend))
+
+        asyncio.run(main())
+
+        assert order == [("backend", "TASK-001"), ("documentation", "TASK-002")]
+
+
+class TestWorkerPool:
+    """WorkerPool との統合"""
+
+    def test_registered_workers_share_load(self, project, make_task, write_tasks):
+        write_tasks(
+            project,
+            [
+                make_task("TASK-001", assigned_to="backend"),
+                make_task("TASK-002", assigned_to="backend"),
+                make_task("TASK-003", assigned_to="backend"),
+                make_task("TASK-004", assigned_to="backend"),
+            ],
+            [
+                make_worker("backend", ["python"]),
+                make_worker("documentation", ["markdown", "python"]),
+            ],
+        )
+        pool = WorkerPool(project, workers=2)
+
+        results = pool.run()
+
+        assert len(results) == 4
+        assert pool.scheduler.steals.get("documentation", 0) >= 1
+        statuses = {t.status for t in Coordinator(project).tasks.values()}
+        assert statuses == {TaskStatus.COMPLETED}
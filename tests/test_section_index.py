@@ -0,0 +1,157 @@
+"""
+SectionIndex のユニットテスト
+"""
+import json
+
+import pytest
+from cmw.models import Task
+from cmw.section_index import SectionIndex
+
+REQUIREMENTS = """# プロジェクト要件
+
+## データモデル
+### ユーザーモデル
+- id, name, email
+
+```python
+# コードブロック内の見出しは無視
+## 見出しではない
+```
+
+### 認証
+- JWT を使用
+
+## API
+### ユーザーモデル
+- GET /users で一覧を返す
+"""
+
+API_SPEC = """# API仕様
+
+## POST /users
+ユーザーを作成する
+
+## GET /users/{id}
+ユーザーを取得する
+
+## POST /auth/login
+ログインする
+"""
+
+
+@pytest.fixture
+def requirements(tmp_path):
+    """テスト用の requirements.md"""
+    path = tmp_path / "requirements.md"
+    path.write_text(REQUIREMENTS, encoding="utf-8")
+    return path
+
+
+def titled_task(title, description="", target_files=None, acceptance_criteria=None):
+    """見出しとの照合に使う項目だけを指定したタスク"""
+    return Task(
+        id="TASK-001",
+        title=title,
+        assigned_to="backend",
+        description=description,
+        target_files=target_files or [],
+        acceptance_criteria=acceptance_criteria or [],
+    )
+
+
+class TestBuild:
+    """インデックスの構築"""
+
+    def test_sections_and_parents(self, requirements):
+        index = SectionIndex.build(requirements)
+
+        titles = [(s.level, s.title, s.parents) for s in index.sections]
+        assert titles == [
+            (1, "プロジェクト要件", ()),
+            (2, "データモデル", ("プロジェクト要件",)),
+            (3, "ユーザーモデル", ("プロジェクト要件", "データモデル")),
+            (3, "認証", ("プロジェクト要件", "データモデル")),
+            (2, "API", ("プロジェクト要件",)),
+            (3, "ユーザーモデル", ("プロジェクト要件", "API")),
+        ]
+
+    def test_byte_ranges_with_multibyte_text(self, requirements):
+        index = SectionIndex.build(requirements)
+        by_title = {(s.parents[-1] if s.parents else "", s.title): s for s in index.sections}
+
+        section = by_title[("データモデル", "認証")]
+        assert index.read(section) == "### 認証\n- JWT を使用"
+
+        # H2 は配下の H3 を含み、次の H2 の手前で終わる
+        data_model = index.read(by_title[("プロジェクト要件", "データモデル")])
+        assert data_model.startswith("## データモデル")
+        assert "## 見出しではない" in data_model
+        assert "JWT" in data_model
+        assert "GET /users" not in data_model
+
+
+class TestFind:
+    """タスクとセクションの対応"""
+
+    def test_find_for_task_prefers_parent_in_description(self, requirements):
+        index = SectionIndex.build(requirements)
+
+        task = titled_task("ユーザーモデル", "APIの一部としてユーザーモデルを実装する")
+        section = index.find_for_task(task)
+        assert section.parents[-1] == "API"
+
+        section = index.find_for_task(titled_task("ユーザーモデル", "データモデルの一部として実装"))
+        assert section.parents[-1] == "データモデル"
+
+    def test_find_for_task_partial_and_missing(self, requirements):
+        index = SectionIndex.build(requirements)
+
+        assert index.find_for_task(titled_task("認証機能")).title == "認証"
+        assert index.find_for_task(titled_task("デプロイ")) is None
+
+    def test_find_for_api(self, tmp_path):
+        path = tmp_path / "api-spec.md"
+        path.write_text(API_SPEC, encoding="utf-8")
+        index = SectionIndex.build(path)
+
+        task = titled_task("ログイン", acceptance_criteria=["POST /auth/login でトークンを返す"])
+        assert [s.title for s in index.find_for_api(task)] == ["POST /auth/login"]
+
+        task = titled_task("ユーザーAPI", target_files=["backend/routers/users.py"])
+        assert [s.title for s in index.find_for_api(task)] == ["POST /users", "GET /users/{id}"]
+
+        assert index.find_for_api(titled_task("画面")) == []
+
+
+class TestLoad:
+    """インデックスの永続化"""
+
+    def test_load_persists_and_reuses(self, requirements, tmp_path, monkeypatch):
+        cache_file = tmp_path / "coordination" / "section_index.json"
+        index = SectionIndex.load(requirements, cache_file)
+
+        entry = json.loads(cache_file.read_text(encoding="utf-8"))[str(requirements.resolve())]
+        assert len(entry["sections"]) == len(index.sections)
+
+        # 変更がなければ再構築しない
+        monkeypatch.setattr(SectionIndex, "build", classmethod(lambda cls, path: pytest.fail()))
+        assert SectionIndex.load(requirements, cache_file).sections == index.sections
+
+    def test_load_rebuilds_after_change(self, requirements, tmp_path):
+        cache_file = tmp_path / "section_index.json"
+        SectionIndex.load(requirements, cache_file)
+
+        requirements.write_text("# 要件\n\n## 新機能\n追加\n", encoding="utf-8")
+        index = SectionIndex.load(requirements, cache_file)
+
+        assert [s.title for s in index.sections] == ["要件", "新機能"]
+        assert index.read(index.sections[1]) == "## 新機能\n追加"
+
+    def test_load_ignores_corrupt_cache(self, requirements, tmp_path):
+        cache_file = tmp_path / "section_index.json"
+        cache_file.write_text("{broken", encoding="utf-8")
+
+        index = SectionIndex.load(requirements, cache_file)
+
+        assert len(index.sections) == 6
+        assert str(requirements.resolve()) in json.loads(cache_file.read_text(encoding="utf-8"))
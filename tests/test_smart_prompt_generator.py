@@ -115,6 +115,30 @@ class TestSmartPromptGenerator:
         # requirements.mdの参照が含まれる
         assert "requirements.md" in prompt
 
+    def test_generate_many(self, sample_tasks, tmp_path):
+        """複数タスクのプロンプトを並列に生成"""
+        generator = SmartPromptGenerator(sample_tasks, tmp_path)
+
+        prompts = generator.generate_many(["TASK-002", "TASK-001"], max_workers=2)
+
+        assert list(prompts) == ["TASK-002", "TASK-001"]
+        assert prompts["TASK-001"] == generator.generate("TASK-001")
+
+    def test_generate_includes_matching_section(self, sample_tasks, tmp_path):
+        """タスクに対応するセクションだけをプロンプトに含める"""
+        req_dir = tmp_path / "shared" / "docs"
+        req_dir.mkdir(parents=True)
+        (req_dir / "requirements.md").write_text(
+            "# テスト要件\n\n## 基盤タスク\n- 基盤の詳細\n\n## 依存タスク\n- 依存の詳細\n",
+            encoding="utf-8",
+        )
+
+        generator = SmartPromptGenerator(sample_tasks, tmp_path)
+        prompt = generator.generate("TASK-001")
+
+        assert "│ - 基盤の詳細" in prompt
+        assert "依存の詳細" not in prompt
+
     def test_generate_includes_test_commands(self, sample_tasks, tmp_path):
         """テストコマンドを含むプロンプト"""
         generator = SmartPromptGenerator(sample_tasks, tmp_path)
@@ -143,3 +167,62 @@ class TestSmartPromptGenerator:
 
         # TASK-001は1タスクをブロック
         assert "ブロック" in prompt
+
+
+class TestGraphAnnotations:
+    """構築時に計算するグラフ情報"""
+
+    def _make_tasks(self, edges, count):
+        dependencies = {i: [] for i in range(count)}
+        for src, dst in edges:
+            dependencies[dst].append(f"TASK-{src:03d}")
+        return [
+            Task(
+                id=f"TASK-{i:03d}",
+                title=f"タスク{i}",
+                description="",
+                assigned_to="backend",
+                dependencies=dependencies[i],
+            )
+            for i in range(count)
+        ]
+
+    @pytest.mark.parametrize("with_cycle", [False, True])
+    def test_matches_graph_traversal(self, tmp_path, with_cycle):
+        """依存タスク数・依存タスクがグラフの探索結果と一致する"""
+        import random
+
+        rng = random.Random(42)
+        count = 60
+        edges = {(a, b) for a, b in (sorted(rng.sample(range(count), 2)) for _ in range(120))}
+        if with_cycle:
+            edges |= {(40, 10), (25, 5)}
+        tasks = self._make_tasks(edges, count)
+
+        generator = SmartPromptGenerator(tasks, tmp_path)
+        visualizer = generator.analyzer.visualizer
+
+        for task in tasks:
+            expected = visualizer.get_dependent_tasks(task.id)
+            assert generator.get_blocking_count(task.id) == len(expected)
+            assert set(generator.get_dependent_ids(task.id)) == expected
+            assert [t.id for t in generator.get_direct_dependents(task.id)] == [
+                t.id for t in tasks if task.id in t.dependencies
+            ]
+
+    def test_prompts_do_not_recompute_graph(self, sample_tasks, tmp_path, monkeypatch):
+        """プロンプト生成時にクリティカルパスや依存タスクを再計算しない"""
+        generator = SmartPromptGenerator(sample_tasks, tmp_path)
+        visualizer = generator.analyzer.visualizer
+
+        def fail(*args):
+            raise AssertionError("recomputed")
+
+        monkeypatch.setattr(visualizer, "get_critical_path", fail)
+        monkeypatch.setattr(visualizer, "get_dependent_tasks", fail)
+
+        prompt = generator.generate("TASK-001")
+
+        assert "1個のタスク をブロック中" in prompt
+        assert generator.get_next_critical_task("TASK-001").id == "TASK-002"
+        assert generator.get_dependent_ids("TASK-001", limit=1) == ["TASK-002"]
@@ -358,6 +358,19 @@ class TestModuleToFile:
         file_paths = analyzer._module_to_file("nonexistent.module", "some_file.py")
         assert len(file_paths) == 0
 
+    def test_module_to_file_uses_exists_index(self, temp_python_project, monkeypatch):
+        """存在確認はパス解決インデックスでメモ化される"""
+        analyzer = StaticAnalyzer(project_root=temp_python_project)
+        analyzer._module_to_file("backend.models", "some_file.py")
+
+        def fail(self):
+            raise AssertionError("ファイルシステムを再確認しました")
+
+        monkeypatch.setattr(Path, "is_file", fail)
+        monkeypatch.setattr(Path, "exists", fail)
+
+        assert "backend/models.py" in analyzer._module_to_file("backend.models", "some_file.py")
+
 
 class TestRealWorldScenarios:
     """実世界のシナリオテスト"""
@@ -609,3 +622,200 @@ def outer():
         # エンドポイント抽出でも同様
         endpoints = analyzer.extract_api_endpoints("binary.py")
         assert endpoints == []
+
+
+class TestMultiLanguageDependencies:
+    """Python以外の言語の依存関係解析テスト"""
+
+    def test_typescript_imports(self, tmp_path):
+        """JS/TSの import / require を解決"""
+        (tmp_path / "frontend" / "components").mkdir(parents=True)
+        (tmp_path / "frontend" / "api.ts").write_text(
+            "export const get = () => 1;\n", encoding='utf-8'
+        )
+        (tmp_path / "frontend" / "components" / "index.tsx").write_text("", encoding='utf-8')
+        (tmp_path / "frontend" / "util.js").write_text("", encoding='utf-8')
+        (tmp_path / "frontend" / "app.tsx").write_text("""
+import React from 'react';
+import { get } from './api';
+import {
+  Button,
+} from "./components";
+const util = require('./util.js');
+""", encoding='utf-8')
+
+        analyzer = StaticAnalyzer(project_root=tmp_path)
+        deps = analyzer.analyze_file_dependencies("frontend/app.tsx")
+
+        assert deps == {
+            "frontend/api.ts",
+            "frontend/components/index.tsx",
+            "frontend/util.js",
+        }
+
+    def test_go_imports(self, tmp_path):
+        """go.mod のモジュールパス基準でGoのimportを解決"""
+        (tmp_path / "go.mod").write_text("module example.com/svc\n\ngo 1.21\n", encoding='utf-8')
+        store = tmp_path / "internal" / "store"
+        store.mkdir(parents=True)
+        (store / "store.go").write_text("package store\n", encoding='utf-8')
+        (store / "store_test.go").write_text("package store\n", encoding='utf-8')
+        (tmp_path / "cmd").mkdir()
+        (tmp_path / "cmd" / "main.go").write_text("""package main
+
+import (
+    "fmt"
+    st "example.com/svc/internal/store"
+)
+""", encoding='utf-8')
+
+        analyzer = StaticAnalyzer(project_root=tmp_path)
+        deps = analyzer.analyze_file_dependencies("cmd/main.go")
+
+        assert deps == {"internal/store/store.go"}
+
+    def test_rust_mod_and_use(self, tmp_path):
+        """Rustの mod / use crate:: / use super:: を解決"""
+        src = tmp_path / "src"
+        (src / "db").mkdir(parents=True)
+        (src / "main.rs").write_text("mod db;\nmod models;\nuse std::io;\n", encoding='utf-8')
+        (src / "models.rs").write_text("pub struct User;\n", encoding='utf-8')
+        (src / "db" / "mod.rs").write_text("pub mod pool;\n", encoding='utf-8')
+        (src / "db" / "pool.rs").write_text(
+            "use crate::models::User;\nuse super::super::models;\n", encoding='utf-8'
+        )
+
+        analyzer = StaticAnalyzer(project_root=tmp_path)
+
+        assert analyzer.analyze_file_dependencies("src/main.rs") == {
+            "src/db/mod.rs",
+            "src/models.rs",
+        }
+        assert analyzer.analyze_file_dependencies("src/db/mod.rs") == {"src/db/pool.rs"}
+        assert analyzer.analyze_file_dependencies("src/db/pool.rs") == {"src/models.rs"}
+
+    def test_infer_cross_language_task_dependencies(self, tmp_path):
+        """TSファイル間の依存からタスク依存を推論"""
+        (tmp_path / "web").mkdir()
+        (tmp_path / "web" / "client.ts").write_text("export {}\n", encoding='utf-8')
+        (tmp_path / "web" / "page.ts").write_text(
+            "import { x } from './client';\n", encoding='utf-8'
+        )
+
+        tasks = [
+            Task(id="TASK-001", title="クライアント", description="", assigned_to="frontend",
+                 target_files=["web/client.ts"]),
+            Task(id="TASK-002", title="ページ", description="", assigned_to="frontend",
+                 target_files=["web/page.ts"]),
+        ]
+
+        analyzer = StaticAnalyzer(project_root=tmp_path)
+        updated = analyzer.infer_task_dependencies(tasks, existing_dependencies=False)
+
+        assert updated[1].dependencies == ["TASK-001"]
+
+    def test_register_custom_extractor(self, tmp_path):
+        """カスタムエクストラクタの登録"""
+        (tmp_path / "a.vue").write_text("<script>", encoding='utf-8')
+
+        analyzer = StaticAnalyzer(project_root=tmp_path)
+        analyzer.register_extractor([".vue"], lambda source, path: {"b.vue"})
+
+        assert analyzer.analyze_file_dependencies("a.vue") == {"b.vue"}
+
+    def test_cache_invalidated_by_mtime(self, tmp_path):
+        """ファイル変更時はキャッシュを再計算"""
+        import os
+
+        (tmp_path / "a.ts").write_text("", encoding='utf-8')
+        (tmp_path / "b.ts").write_text("", encoding='utf-8')
+        main = tmp_path / "main.ts"
+        main.write_text("import './a';\n", encoding='utf-8')
+
+        analyzer = StaticAnalyzer(project_root=tmp_path)
+        assert analyzer.analyze_file_dependencies("main.ts") == {"a.ts"}
+
+        main.write_text("import './b';\n", encoding='utf-8')
+        stat = main.stat()
+        os.utime(main, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+        assert analyzer.analyze_file_dependencies("main.ts") == {"b.ts"}
+
+
+class TestSymbolGranularity:
+    """シンボル単位の依存関係解析テスト"""
+
+    @pytest.fixture
+    def symbol_project(self, tmp_path):
+        """複数のシンボルを持つモジュールと、その一部だけを使うモジュール"""
+        (tmp_path / "backend").mkdir()
+        (tmp_path / "backend" / "__init__.py").write_text("", encoding='utf-8')
+        (tmp_path / "backend" / "models.py").write_text("""
+VERSION: str = "1"
+
+class User:
+    pass
+
+class Post:
+    pass
+
+def helper():
+    pass
+""", encoding='utf-8')
+        (tmp_path / "backend" / "users.py").write_text(
+            "from backend.models import User\n", encoding='utf-8'
+        )
+        (tmp_path / "backend" / "posts.py").write_text(
+            "from backend.models import Post\n", encoding='utf-8'
+        )
+        (tmp_path / "backend" / "admin.py").write_text(
+            "import backend.models\n", encoding='utf-8'
+        )
+        return tmp_path
+
+    def test_get_defined_symbols(self, symbol_project):
+        """トップレベルの定義を取得"""
+        analyzer = StaticAnalyzer(project_root=symbol_project)
+        symbols = analyzer.get_defined_symbols("backend/models.py")
+        assert symbols == {"VERSION", "User", "Post", "helper"}
+
+    def test_analyze_symbol_dependencies(self, symbol_project):
+        """使用シンボルを依存ファイルごとに記録"""
+        analyzer = StaticAnalyzer(project_root=symbol_project)
+
+        users = analyzer.analyze_symbol_dependencies("backend/users.py")
+        assert users["backend/models.py"] == {"User"}
+
+        # import X はモジュール全体への依存
+        admin = analyzer.analyze_symbol_dependencies("backend/admin.py")
+        assert admin["backend/models.py"] is None
+
+    def test_infer_dependencies_per_symbol(self, symbol_project):
+        """別シンボルを担当するタスクには依存しない"""
+        tasks = [
+            Task(id="TASK-001", title="User", description="", assigned_to="backend",
+                 target_files=["backend/models.py::User"]),
+            Task(id="TASK-002", title="Post", description="", assigned_to="backend",
+                 target_files=["backend/models.py::Post"]),
+            Task(id="TASK-003", title="ユーザーAPI", description="", assigned_to="backend",
+                 target_files=["backend/users.py"]),
+            Task(id="TASK-004", title="管理画面", description="", assigned_to="backend",
+                 target_files=["backend/admin.py"]),
+        ]
+        analyzer = StaticAnalyzer(project_root=symbol_project)
+
+        by_symbol = {
+            t.id: t for t in analyzer.infer_task_dependencies(tasks, False, granularity="symbol")
+        }
+        assert by_symbol["TASK-003"].dependencies == ["TASK-001"]
+        assert sorted(by_symbol["TASK-004"].dependencies) == ["TASK-001", "TASK-002"]
+
+        # ファイル単位ではシンボル指定を無視してファイル全体に依存
+        by_file = {t.id: t for t in analyzer.infer_task_dependencies(tasks, False)}
+        assert sorted(by_file["TASK-003"].dependencies) == ["TASK-001", "TASK-002"]
+
+    def test_invalid_granularity(self, tmp_path):
+        """不正な粒度指定"""
+        analyzer = StaticAnalyzer(project_root=tmp_path)
+        with pytest.raises(ValueError):
+            analyzer.infer_task_dependencies([], granularity="line")
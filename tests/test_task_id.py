@@ -0,0 +1,159 @@
+"""
+TaskIdScheme のユニットテスト
+"""
+import json
+
+import pytest
+
+from cmw.models import Task
+from cmw.response_parser import ResponseParser
+from cmw.task_id import DEFAULT_TASK_ID_SCHEME, TaskIdScheme, parse_task_ordinal
+
+
+class TestTaskIdScheme:
+    """タスクID形式のテスト"""
+
+    def test_default_format(self):
+        """デフォルトはTASK-001形式"""
+        assert DEFAULT_TASK_ID_SCHEME.format(1) == "TASK-001"
+        assert DEFAULT_TASK_ID_SCHEME.format(1000) == "TASK-1000"
+
+    def test_custom_prefix_and_width(self):
+        """接頭辞と桁数を変更できる"""
+        scheme = TaskIdScheme(prefix="API", width=5)
+
+        assert scheme.format(42) == "API-00042"
+        assert scheme.parse("API-00042") == 42
+        assert scheme.parse("TASK-001") is None
+        assert scheme.findall("API-00001 と API-12 と TASK-001") == ["API-00001"]
+
+    def test_findall_beyond_width(self):
+        """999を超える連番も検出"""
+        assert DEFAULT_TASK_ID_SCHEME.findall("fix: TASK-1234, TASK-12345") == [
+            "TASK-1234",
+            "TASK-12345",
+        ]
+
+    def test_invalid_scheme(self):
+        """不正な設定はValueError"""
+        with pytest.raises(ValueError):
+            TaskIdScheme(prefix="")
+        with pytest.raises(ValueError):
+            TaskIdScheme(width=0)
+
+    def test_sort_key_orders_numerically(self):
+        """ソートキーは連番の数値順"""
+        ids = ["TASK-1000", "TASK-999", "TASK-010", "OTHER"]
+
+        assert sorted(ids, key=DEFAULT_TASK_ID_SCHEME.sort_key) == [
+            "TASK-010",
+            "TASK-999",
+            "TASK-1000",
+            "OTHER",
+        ]
+
+
+class TestTaskOrdinal:
+    """タスクの連番のテスト"""
+
+    def test_parse_task_ordinal(self):
+        """接頭辞に依存せず末尾の連番を取得"""
+        assert parse_task_ordinal("TASK-001") == 1
+        assert parse_task_ordinal("API-12345") == 12345
+        assert parse_task_ordinal("INVALID") is None
+        assert parse_task_ordinal("TASK-" + "9" * 10000) is None
+
+    def test_task_has_ordinal(self):
+        """Taskは連番を保持し、シリアライズには含めない"""
+        task = Task(id="TASK-1001", title="t", description="", assigned_to="backend")
+
+        assert task.ordinal == 1001
+        assert "ordinal" not in task.to_dict()
+        assert Task.from_dict(task.to_dict()).ordinal == 1001
+
+    def test_response_parser_uses_scheme(self):
+        """ResponseParserは指定したID形式で抽出"""
+        parser = ResponseParser(id_scheme=TaskIdScheme(prefix="JOB", width=4))
+
+        task_ids = parser._extract_task_ids("JOB-0010, JOB-0002 と TASK-001 を完了")
+        assert task_ids == ["JOB-0002", "JOB-0010"]
+
+
+class TestRequirementsParserIdScheme:
+    """RequirementsParserのID生成のテスト"""
+
+    def test_custom_scheme_and_large_ordinals(self):
+        """指定した形式でIDを生成し、999超でも順序を整数で比較"""
+        from cmw.requirements_parser import RequirementsParser
+
+        parser = RequirementsParser(id_scheme=TaskIdScheme(prefix="REQ", width=4))
+        parser.task_counter = 998
+        section = {
+            "title": "1. モデル定義",
+            "criteria": ["models.py に User モデル"],
+            "technical_notes": [],
+        }
+
+        first = parser._section_to_task(section)
+        second = parser._section_to_task(section)
+        third = parser._section_to_task(section)
+
+        assert [t.id for t in (first, second, third)] == ["REQ-0999", "REQ-1000", "REQ-1001"]
+
+        parser._infer_dependencies([third, first, second])
+        assert "REQ-0999" in third.dependencies
+        assert "REQ-1000" in third.dependencies
+        assert third.id not in first.dependencies
+
+
+class TestProjectIdScheme:
+    """tasks.json の "task_id" 設定のテスト"""
+
+    def test_load_from_tasks_json(self, tmp_path):
+        """tasks.json の設定を読み込み、設定がなければデフォルト"""
+        from cmw.task_id import load_task_id_scheme
+
+        tasks_file = tmp_path / "tasks.json"
+        assert load_task_id_scheme(tasks_file) == DEFAULT_TASK_ID_SCHEME
+
+        tasks_file.write_text(json.dumps({"task_id": {"prefix": "API", "width": 4}, "tasks": []}))
+        scheme = load_task_id_scheme(tasks_file)
+        assert scheme == TaskIdScheme(prefix="API", width=4)
+        assert TaskIdScheme.from_dict(scheme.to_dict()) == scheme
+
+        tasks_file.write_text(json.dumps({"task_id": {"width": 0}}))
+        with pytest.raises(ValueError):
+            load_task_id_scheme(tasks_file)
+
+    def test_generate_and_sync_use_project_scheme(self, tmp_path, monkeypatch):
+        """cmw task generate で指定した形式を保存し、以降のコマンドが使用"""
+        from click.testing import CliRunner
+        from cmw.cli import cli
+        from cmw.coordinator import Coordinator
+        from cmw.git_integration import GitIntegration
+
+        (tmp_path / "shared" / "docs").mkdir(parents=True)
+        (tmp_path / "shared" / "docs" / "requirements.md").write_text(
+            "# Project\n\n## Database Setup\n- Create User model in models.py\n", encoding="utf-8"
+        )
+        monkeypatch.chdir(tmp_path)
+
+        result = CliRunner().invoke(
+            cli, ["task", "generate", "--id-prefix", "API", "--id-width", "4"],
+            catch_exceptions=False,
+        )
+
+        assert result.exit_code == 0
+        data = json.loads((tmp_path / "shared" / "coordination" / "tasks.json").read_text())
+        assert data["task_id"] == {"prefix": "API", "width": 4}
+        assert [t["id"] for t in data["tasks"]] == ["API-0001"]
+
+        coordinator = Coordinator(tmp_path)
+        assert coordinator.id_scheme == TaskIdScheme(prefix="API", width=4)
+        git = GitIntegration(coordinator.id_scheme)
+        assert git._extract_task_ids([{"message": "feat: API-0001 と TASK-001"}]) == {"API-0001"}
+
+        # 再生成はオプションを省略しても既存の設定を引き継ぐ
+        CliRunner().invoke(cli, ["task", "generate", "--force"], catch_exceptions=False)
+        data = json.loads((tmp_path / "shared" / "coordination" / "tasks.json").read_text())
+        assert data["tasks"][0]["id"] == "API-0001"
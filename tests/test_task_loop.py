@@ -0,0 +1,275 @@
+"""
+TaskLoop のユニットテスト
+"""
+import asyncio
+import shutil
+import subprocess
+
+import pytest
+from cmw.coordinator import Coordinator
+from cmw.models import Priority, TaskStatus
+from cmw.task_loop import TaskLoop
+
+
+@pytest.fixture
+def make_loop(write_tasks):
+    """タスクを書き込んで TaskLoop を作成する関数"""
+
+    def factory(project, tasks):
+        write_tasks(project, tasks)
+        return TaskLoop(Coordinator(project))
+
+    return factory
+
+
+@pytest.fixture
+def chain_loop(make_loop, make_task):
+    """TASK-002 が TASK-001 に依存する TaskLoop を作成する関数"""
+
+    def factory(project):
+        return make_loop(
+            project, [make_task("TASK-001"), make_task("TASK-002", None, ["TASK-001"])]
+        )
+
+    return factory
+
+
+class TestNextReady:
+    """タスクの確保"""
+
+    def test_priority_and_file_conflicts(self, project, make_loop, make_task):
+        loop = make_loop(
+            project,
+            [
+                make_task("TASK-001", ["a.py"], priority=Priority.LOW),
+                make_task("TASK-002", ["b.py"], priority=Priority.HIGH),
+                make_task("TASK-003", ["b.py::User"]),
+            ],
+        )
+
+        async def main():
+            first = await loop.next_ready()
+            second = await loop.next_ready()
+            return first, second
+
+        first, second = asyncio.run(main())
+
+        # TASK-003 は TASK-002 とファイルが重複するため TASK-001 が先
+        assert (first.id, second.id) == ("TASK-002", "TASK-001")
+        assert loop.peek() is None
+        assert loop.tasks["TASK-002"].status == TaskStatus.IN_PROGRESS
+        assert loop.tasks["TASK-002"].started_at is not None
+
+    def test_waits_until_dependency_completes(self, project, chain_loop):
+        loop = chain_loop(project)
+        order = []
+
+        async def waiter():
+            task = await loop.next_ready()
+            order.append(f"claimed {task.id}")
+
+        async def main():
+            first = await loop.next_ready()
+            waiting = asyncio.ensure_future(waiter())
+            await asyncio.sleep(0.01)
+            order.append("completing")
+            assert await loop.complete(first.id, ["a.py"])
+            await waiting
+
+        asyncio.run(main())
+
+        assert order == ["completing", "claimed TASK-002"]
+        saved = Coordinator(project).tasks
+        assert saved["TASK-001"].status == TaskStatus.COMPLETED
+        assert saved["TASK-001"].artifacts == ["a.py"]
+        assert saved["TASK-002"].status == TaskStatus.IN_PROGRESS
+
+    def test_returns_none_when_drained(self, project, chain_loop):
+        loop = chain_loop(project)
+
+        async def main():
+            first = await loop.next_ready()
+            waiting = asyncio.ensure_future(loop.next_ready())
+            await asyncio.sleep(0.01)
+            # 失敗したタスクに依存するタスクは実行可能にならない
+            await loop.fail(first.id, "エラー")
+            return await waiting
+
+        assert asyncio.run(main()) is None
+        assert loop.tasks["TASK-001"].status == TaskStatus.FAILED
+        assert loop.tasks["TASK-001"].error_message == "エラー"
+
+    def test_predicate(self, project, make_loop, make_task):
+        loop = make_loop(project, [make_task("TASK-001"), make_task("TASK-002")])
+
+        async def main():
+            return await loop.next_ready(lambda task: task.id == "TASK-002")
+
+        assert asyncio.run(main()).id == "TASK-002"
+
+
+class TestResults:
+    """結果の記録"""
+
+    def test_complete_is_idempotent(self, project, chain_loop):
+        loop = chain_loop(project)
+
+        async def main():
+            task = await loop.next_ready()
+            assert await loop.complete(task.id)
+            assert not await loop.complete(task.id)
+            assert not await loop.complete("TASK-999")
+
+        asyncio.run(main())
+
+        # 依存数は1回だけ減る
+        assert [t.id for t in loop.ready_tasks()] == ["TASK-002"]
+
+    def test_release_returns_task_to_ready(self, project, make_loop, make_task):
+        loop = make_loop(project, [make_task("TASK-001")])
+
+        async def main():
+            task = await loop.next_ready()
+            assert await loop.release(task.id)
+            assert not await loop.release(task.id)
+
+        asyncio.run(main())
+
+        task = loop.tasks["TASK-001"]
+        assert task.status == TaskStatus.PENDING
+        assert task.started_at is None
+        assert loop.peek().id == "TASK-001"
+
+    def test_complete_many_saves_and_notifies_once(
+        self, project, monkeypatch, make_loop, make_task
+    ):
+        loop = make_loop(
+            project,
+            [
+                make_task("TASK-001"),
+                make_task("TASK-002"),
+                make_task("TASK-003"),
+                make_task("TASK-004", None, ["TASK-001", "TASK-002"]),
+            ],
+        )
+
+        async def main():
+            return await loop.next_ready()
+
+        claimed = asyncio.run(main())
+        saves = []
+        original_save = Coordinator._save_progress
+        monkeypatch.setattr(
+            Coordinator, "_save_progress", lambda self: saves.append(1) or original_save(self)
+        )
+        version = loop.version
+
+        # 確保中のタスク（TASK-001）は変更しない
+        assert loop.complete_many(["TASK-001", "TASK-002", "TASK-003", "TASK-999"]) == [
+            "TASK-002",
+            "TASK-003",
+        ]
+        assert saves == [1]
+        assert loop.version == version + 1
+        assert loop.tasks[claimed.id].status == TaskStatus.IN_PROGRESS
+        assert loop.complete_many(["TASK-002"]) == []
+        assert saves == [1]
+
+        saved = Coordinator(project).tasks
+        assert saved["TASK-002"].status == TaskStatus.COMPLETED
+        assert saved["TASK-003"].status == TaskStatus.COMPLETED
+
+        # 残りの依存タスクが完了すると実行可能になる
+        asyncio.run(loop.complete(claimed.id))
+        assert [t.id for t in loop.ready_tasks()] == ["TASK-004"]
+
+    def test_wait_for_change(self, project, chain_loop):
+        loop = chain_loop(project)
+
+        async def main():
+            version = loop.version
+            waiting = asyncio.ensure_future(loop.wait_for_change(version))
+            await asyncio.sleep(0.01)
+            assert not waiting.done()
+            task = await loop.next_ready()
+            await loop.complete(task.id)
+            await waiting
+            return version
+
+        version = asyncio.run(main())
+
+        assert sorted(loop.changed_since(version)) == ["TASK-001", "TASK-002"]
+
+
+class TestExternalChanges:
+    """他のプロセスによる更新の取り込み"""
+
+    @pytest.mark.parametrize("use_inotify", [True, False])
+    def test_watch_applies_external_completion(self, project, use_inotify, chain_loop):
+        loop = chain_loop(project)
+
+        async def main():
+            claimed = await loop.next_ready()
+            watcher = asyncio.ensure_future(loop.watch(poll_interval=0.05, use_inotify=use_inotify))
+            waiting = asyncio.ensure_future(loop.next_ready())
+            await asyncio.sleep(0.1)
+
+            # 別のプロセス（cmw task complete など）が TASK-001 を完了にする
+            other = Coordinator(project)
+            other.update_task_status(claimed.id, TaskStatus.COMPLETED)
+
+            task = await asyncio.wait_for(waiting, 5)
+            watcher.cancel()
+            return task
+
+        assert asyncio.run(main()).id == "TASK-002"
+
+    def test_own_writes_are_not_external(self, project, make_loop, make_task):
+        loop = make_loop(project, [make_task("TASK-001")])
+
+        async def main():
+            await loop.next_ready()
+
+        asyncio.run(main())
+
+        assert loop.coordinator.reload_progress() == []
+
+    def test_claimed_task_stays_in_progress(self, project, make_loop, make_task):
+        loop = make_loop(project, [make_task("TASK-001")])
+
+        async def main():
+            return await loop.next_ready()
+
+        task = asyncio.run(main())
+        other = Coordinator(project)
+        other.update_task_status(task.id, TaskStatus.PENDING)
+
+        loop.apply_external(loop.coordinator.reload_progress())
+
+        assert loop.tasks["TASK-001"].status == TaskStatus.IN_PROGRESS
+        assert loop.peek() is None
+
+    @pytest.mark.skipif(shutil.which("git") is None, reason="gitが必要")
+    def test_sync_git(self, project, chain_loop):
+        loop = chain_loop(project)
+        subprocess.run(["git", "init", "-q"], cwd=project, check=True)
+        subprocess.run(
+            [
+                "git", "-c", "user.name=test", "-c", "user.email=test@example.com",
+                "commit", "-q", "--allow-empty", "-m", "feat: TASK-001 を実装",
+            ],
+            cwd=project,
+            check=True,
+        )
+
+        async def main():
+            syncing = asyncio.ensure_future(loop.sync_git(interval=0.05))
+            version = await loop.wait_for_change(loop.version)
+            syncing.cancel()
+            await asyncio.gather(syncing, return_exceptions=True)
+            return version
+
+        asyncio.run(main())
+
+        assert loop.tasks["TASK-001"].status == TaskStatus.COMPLETED
+        assert loop.peek().id == "TASK-002"
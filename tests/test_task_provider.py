@@ -81,6 +81,27 @@ def test_get_next_task_respects_dependencies(test_project):
     assert task.id == "TASK-002"
 
 
+def test_get_next_task_for_worker(test_project):
+    """ワーカーを指定すると担当のタスクを優先し、なければ担当できる他のタスク"""
+    from cmw.models import Worker
+
+    provider = TaskProvider(test_project)
+    coordinator = provider.coordinator
+    coordinator.tasks["TASK-002"].dependencies = []
+    coordinator.tasks["TASK-002"].assigned_to = "worker2"
+
+    assert provider.get_next_task("worker2").id == "TASK-002"
+    assert provider.get_next_task("worker3").id == "TASK-001"
+
+    # 担当のワーカーとスキルが重ならない場合は他の担当のタスクを取らない
+    worker_skills = {"worker1": ["python"], "worker2": ["python"], "worker3": ["go"]}
+    for worker_id, skills in worker_skills.items():
+        coordinator.workers[worker_id] = Worker(
+            id=worker_id, name=worker_id, description="", skills=skills
+        )
+    assert provider.get_next_task("worker3") is None
+
+
 def test_mark_completed_updates_status(test_project):
     """完了マークでステータスが更新される"""
     provider = TaskProvider(test_project)
@@ -161,3 +182,83 @@ def test_progress_persistence(test_project):
     task = provider2.coordinator.get_task("TASK-001")
     assert task.status == TaskStatus.COMPLETED
     assert task.artifacts == ["file1.py"]
+
+
+def test_batch_saves_once(test_project, monkeypatch):
+    """batch内の記録はprogress.jsonへの保存が1回"""
+    provider = TaskProvider(test_project)
+    saves = []
+    original_save = provider._save_progress
+    monkeypatch.setattr(provider, "_save_progress", lambda: saves.append(1) or original_save())
+
+    with provider.batch():
+        provider.mark_completed("TASK-001", ["file1.py"])
+        provider.mark_started("TASK-002")
+
+    assert saves == [1]
+
+    provider2 = TaskProvider(test_project)
+    assert provider2.coordinator.get_task("TASK-001").status == TaskStatus.COMPLETED
+    assert provider2.coordinator.get_task("TASK-002").status == TaskStatus.IN_PROGRESS
+
+
+def test_batch_rolls_back_on_error(test_project):
+    """batch内で例外が発生した場合は変更を元に戻し、後続の保存にも含めない"""
+    provider = TaskProvider(test_project)
+
+    with pytest.raises(RuntimeError):
+        with provider.batch():
+            provider.mark_completed("TASK-001", ["file1.py"])
+            provider.mark_failed("TASK-002", "エラー")
+            raise RuntimeError("中断")
+
+    task1 = provider.coordinator.get_task("TASK-001")
+    task2 = provider.coordinator.get_task("TASK-002")
+    assert task1.status == TaskStatus.PENDING
+    assert task1.artifacts == []
+    assert task1.completed_at is None
+    assert task2.status == TaskStatus.PENDING
+    assert task2.error is None
+    assert task2.failed_at is None
+
+    provider.mark_started("TASK-001")
+    saved = TaskProvider(test_project).coordinator
+    assert saved.get_task("TASK-001").status == TaskStatus.IN_PROGRESS
+    assert saved.get_task("TASK-002").status == TaskStatus.PENDING
+
+
+def test_get_task_context_loads_matching_sections(test_project):
+    """requirements.md / api-spec.md からタスクに対応するセクションだけを読み込む"""
+    (test_project / "shared/docs/requirements.md").write_text(
+        "# 要件\n\n## タスク1\n- 詳細1\n\n## タスク2\n- 詳細2\n", encoding="utf-8"
+    )
+    (test_project / "shared/docs/api-spec.md").write_text(
+        "# API\n\n## GET /items\n一覧\n\n## POST /orders\n注文\n", encoding="utf-8"
+    )
+    provider = TaskProvider(test_project)
+    provider.coordinator.tasks["TASK-001"].acceptance_criteria.append("GET /items が動作する")
+
+    context = provider.get_task_context("TASK-001")
+
+    assert context["requirements"] == "## タスク1\n- 詳細1"
+    assert context["api_spec"] == "## GET /items\n一覧"
+    assert (test_project / "shared/coordination/section_index.json").exists()
+
+
+def test_get_task_context_respects_budget(test_project):
+    """関連ファイルと依存タスクの成果物は予算内で読み込む"""
+    artifacts_dir = test_project / "shared/artifacts"
+    (artifacts_dir / "file1.py").write_text("def main():\n    pass\n", encoding="utf-8")
+    (artifacts_dir / "dep.py").write_text("x = 1\n" * 1000, encoding="utf-8")
+
+    provider = TaskProvider(test_project, context_tokens=20)
+    provider.mark_completed("TASK-001", ["dep.py"])
+    provider.coordinator.tasks["TASK-002"].target_files = ["file1.py"]
+
+    context = provider.get_task_context("TASK-002")
+
+    assert context["related_files"] == [
+        {"path": "file1.py", "content": "def main():\n    pass\n", "mode": "full", "size": 21}
+    ]
+    assert context["dependencies_artifacts"][0]["mode"] == "truncated"
+    assert context["context_budget"]["used_bytes"] <= 80
@@ -0,0 +1,171 @@
+"""
+WorkerPool のユニットテスト
+"""
+import asyncio
+import sys
+import time
+
+import pytest
+from cmw.coordinator import Coordinator
+from cmw.models import Priority, TaskStatus
+from cmw.worker_pool import WorkerPool, parse_command
+
+
+def python_command(code):
+    """インラインのPythonコードを実行するワーカーコマンド"""
+    return [sys.executable, "-c", code, "{task_id}"]
+
+
+class TestScheduling:
+    """タスクの割り当て"""
+
+    def test_runs_all_tasks_in_dependency_order(self, project, make_task, write_tasks):
+        write_tasks(
+            project,
+            [
+                make_task("TASK-001", ["a.py"]),
+                make_task("TASK-002", ["b.py"], ["TASK-001"]),
+                make_task("TASK-003", ["c.py"], ["TASK-002"]),
+            ],
+        )
+        events = []
+        pool = WorkerPool(project, workers=2, reporter=lambda e, t, r: events.append((e, t.id)))
+
+        results = pool.run()
+
+        assert [r.task_id for r in results] == ["TASK-001", "TASK-002", "TASK-003"]
+        assert all(r.success for r in results)
+        assert events[:2] == [("started", "TASK-001"), ("completed", "TASK-001")]
+
+        # progress.json に記録される
+        statuses = {t.id: t.status for t in Coordinator(project).tasks.values()}
+        assert set(statuses.values()) == {TaskStatus.COMPLETED}
+        transcript = (project / "shared" / "coordination" / "runs" / "TASK-003.log").read_text(
+            encoding="utf-8"
+        )
+        assert "TASK-003 完了" in transcript
+
+    def test_conflicting_tasks_do_not_overlap(self, project, make_task, write_tasks):
+        write_tasks(
+            project,
+            [
+                make_task("TASK-001", ["shared.py"]),
+                make_task("TASK-002", ["shared.py::User"]),
+                make_task("TASK-003", ["other.py"], priority=Priority.LOW),
+            ],
+        )
+        command = [sys.executable, "-m", "cmw.stub_worker", "{task_id}", "--delay", "0.3"]
+        intervals = {}
+
+        def report(event, task, result):
+            intervals.setdefault(task.id, []).append(time.monotonic())
+
+        WorkerPool(project, workers=3, command=command, reporter=report).run()
+
+        # 同じファイルのタスクは順に、別ファイルのタスクは並行して実行される
+        start_1, end_1 = intervals["TASK-001"]
+        start_2, _ = intervals["TASK-002"]
+        start_3, _ = intervals["TASK-003"]
+        assert start_2 >= end_1
+        assert start_3 < end_1
+
+    def test_max_tasks(self, project, make_task, write_tasks):
+        write_tasks(project, [make_task("TASK-001", ["a.py"]), make_task("TASK-002", ["b.py"])])
+
+        results = WorkerPool(project, workers=2).run(max_tasks=1)
+
+        assert [r.task_id for r in results] == ["TASK-001"]
+        assert Coordinator(project).tasks["TASK-002"].status == TaskStatus.PENDING
+
+
+class TestResults:
+    """終了コードとトランスクリプトの判定"""
+
+    def test_failure_skips_dependents(self, project, make_task, write_tasks):
+        write_tasks(
+            project,
+            [make_task("TASK-001", ["a.py"]), make_task("TASK-002", ["b.py"], ["TASK-001"])],
+        )
+        command = [sys.executable, "-m", "cmw.stub_worker", "{task_id}", "--exit-code", "3"]
+
+        results = WorkerPool(project, command=command).run()
+
+        assert len(results) == 1
+        assert not results[0].success
+        assert results[0].error.startswith("終了コード 3")
+        tasks = Coordinator(project).tasks
+        assert tasks["TASK-001"].status == TaskStatus.FAILED
+        assert tasks["TASK-002"].status == TaskStatus.PENDING
+
+    def test_artifacts_from_transcript_and_prompt_on_stdin(self, project, make_task, write_tasks):
+        write_tasks(project, [make_task("TASK-001", ["backend/api.py"])])
+        code = (
+            "import sys; prompt = sys.stdin.read(); "
+            "print(f'{sys.argv[1]} prompt={len(prompt)}'); "
+            "print('`backend/api.py` を作成しました'); print('完了')"
+        )
+
+        results = WorkerPool(project, command=python_command(code)).run()
+
+        assert results[0].success
+        assert results[0].generated_files == ["backend/api.py"]
+        task = Coordinator(project).tasks["TASK-001"]
+        assert task.artifacts == ["backend/api.py"]
+        transcript = (project / "shared" / "coordination" / "runs" / "TASK-001.log").read_text(
+            encoding="utf-8"
+        )
+        assert "prompt=0" not in transcript
+
+    def test_require_completion(self, project, make_task, write_tasks):
+        write_tasks(project, [make_task("TASK-001", ["a.py"])])
+
+        results = WorkerPool(
+            project, command=python_command("print('作業中')"), require_completion=True
+        ).run()
+
+        assert not results[0].success
+        assert "完了の報告" in results[0].error
+
+    def test_timeout_kills_worker(self, project, make_task, write_tasks):
+        write_tasks(project, [make_task("TASK-001", ["a.py"])])
+
+        results = WorkerPool(
+            project, command=python_command("import time; time.sleep(30)"), timeout=0.5
+        ).run()
+
+        assert not results[0].success
+        assert "制限時間" in results[0].error
+        assert results[0].execution_time < 10
+
+    def test_missing_command(self, project, make_task, write_tasks):
+        write_tasks(project, [make_task("TASK-001", ["a.py"])])
+
+        results = WorkerPool(project, command=["/nonexistent/worker"]).run()
+
+        assert "起動できません" in results[0].error
+
+    def test_cancel_returns_tasks_to_pending(self, project, make_task, write_tasks):
+        write_tasks(project, [make_task("TASK-001", ["a.py"])])
+        pool = WorkerPool(project, command=python_command("import time; time.sleep(30)"))
+
+        async def main():
+            runner = asyncio.ensure_future(pool.run_async())
+            await asyncio.sleep(0.5)
+            runner.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await runner
+
+        asyncio.run(main())
+
+        assert Coordinator(project).tasks["TASK-001"].status == TaskStatus.PENDING
+
+
+def test_parse_command():
+    assert parse_command('claude -p --append-system-prompt "a b"') == [
+        "claude",
+        "-p",
+        "--append-system-prompt",
+        "a b",
+    ]
+    with pytest.raises(ValueError):
+        parse_command("  ")